@@ -0,0 +1,482 @@
+r"""
+Module/Script Name: answer_cache.py
+Path: E:\projects\Project Tracking\answer_cache.py
+
+Description:
+Cross-client FAQ answer store. Answers are saved as templates with
+{business_name}, {city}, {state} and {state_name} placeholders under a
+content hash of (niche, model, normalized question), so a question already
+answered for one HVAC client is personalized locally for the next one
+instead of costing another GPT-4 call. A reuse policy bounds how old and
+how widely shared an answer may be; entries are evicted least-recently-used
+over a size budget, and reuse is tracked per niche.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.01
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.01 - State abbreviations are only templated right after the city
+* v1.00 - Initial release with templated answers, reuse policy and stats
+
+Usage:
+    python answer_cache.py stats
+    python answer_cache.py purge (--expired | --all | --niche NICHE)
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from text_dedup import question_tokens
+from uule_encoder import US_STATE_ABBREVIATIONS
+
+DEFAULT_ANSWER_CACHE_FILE = "answer_cache.sqlite3"
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+DEFAULT_NICHE = "hvac"
+
+PLACEHOLDERS = ("{business_name}", "{city}", "{state}", "{state_name}")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key TEXT PRIMARY KEY,
+    niche TEXT NOT NULL,
+    model TEXT NOT NULL,
+    question TEXT NOT NULL,
+    template TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    reuse_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_answers_access ON answers (last_access);
+CREATE TABLE IF NOT EXISTS niche_stats (
+    niche TEXT PRIMARY KEY,
+    lookups INTEGER NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 0,
+    stores INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+@dataclass
+class ReusePolicy:
+    """Rules for when a stored answer may be served again.
+
+    Attributes:
+        max_age_days: Oldest answer (in days) that is still served.
+        max_reuses: Times one answer may be served to other businesses
+            before it is regenerated, limiting duplicate copy across client
+            sites. None for no limit.
+        reuse_with_context: Read and write the cache for requests grounded
+            in a business's own site corpus. Off by default, since those
+            answers describe one company's services.
+    """
+
+    max_age_days: float = 90.0
+    max_reuses: Optional[int] = 10
+    reuse_with_context: bool = False
+
+
+def answer_key(question: str, niche: str, model: str) -> str:
+    """Return the content hash an answer is stored under.
+
+    Rewordings that normalize to the same token set (see
+    text_dedup.question_tokens) share a key.
+
+    Args:
+        question: Question text.
+        niche: Business niche, e.g. "hvac".
+        model: Model that wrote the answer.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    normalized = " ".join(sorted(question_tokens(question)))
+    if not normalized:
+        normalized = " ".join(question.casefold().split())
+    payload = f"{niche.casefold()}\0{model}\0{normalized}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _replace_word(text: str, value: str, placeholder: str) -> str:
+    """Replace whole-word occurrences of ``value`` with a placeholder."""
+    if not value:
+        return text
+    return re.sub(rf"(?<!\w){re.escape(value)}(?!\w)", placeholder, text)
+
+
+def make_template(answer: str, business_name: str, city: str, state: str) -> str:
+    """Swap a business's name and location in an answer for placeholders.
+
+    Args:
+        answer: Answer text written for one business.
+        business_name: Business the answer was written for.
+        city: Its city.
+        state: Its state abbreviation (e.g. "AZ") or full name.
+
+    Returns:
+        Answer with {business_name}, {city}, {state} and {state_name}. The
+        abbreviation is only replaced as "{city}, {state}"; on its own it is
+        left alone so words like "IN", "OR" or "OK" survive.
+
+    Example:
+        >>> make_template("ABC Heating serves Phoenix, Arizona.",
+        ...               "ABC Heating", "Phoenix", "AZ")
+        '{business_name} serves {city}, {state_name}.'
+    """
+    state_name = US_STATE_ABBREVIATIONS.get(state.upper(), state)
+    template = _replace_word(answer, business_name, "{business_name}")
+    template = _replace_word(template, city, "{city}")
+    template = _replace_word(template, state_name, "{state_name}")
+    if state.upper() in US_STATE_ABBREVIATIONS:
+        template = re.sub(
+            rf"(\{{city\}},\s*){re.escape(state.upper())}(?!\w)",
+            r"\1{state}",
+            template,
+        )
+    return template
+
+
+def render_template(template: str, business_name: str, city: str, state: str) -> str:
+    """Personalize a stored answer template for a business.
+
+    Args:
+        template: Template from make_template().
+        business_name: Business to answer as.
+        city: Its city.
+        state: Its state abbreviation or full name.
+
+    Returns:
+        Answer text for that business.
+
+    Example:
+        >>> render_template("{business_name} serves {city}, {state_name}.",
+        ...                 "Tri-State Heating", "Adrian", "MI")
+        'Tri-State Heating serves Adrian, Michigan.'
+    """
+    values = {
+        "{business_name}": business_name,
+        "{city}": city,
+        "{state}": state,
+        "{state_name}": US_STATE_ABBREVIATIONS.get(state.upper(), state),
+    }
+    return re.sub(
+        "|".join(re.escape(p) for p in PLACEHOLDERS),
+        lambda m: values[m.group(0)],
+        template,
+    )
+
+
+class AnswerCache:
+    """SQLite-backed store of templated FAQ answers shared across clients.
+
+    Safe to share between the worker threads of generate_answers().
+
+    Attributes:
+        path: Location of the SQLite cache file.
+        policy: ReusePolicy applied to lookups and stores.
+        max_bytes: Size cap for stored templates.
+        hits: Lookups served from the cache this session.
+        misses: Lookups that needed a new answer this session.
+        evictions: Answers removed to stay under max_bytes.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_ANSWER_CACHE_FILE,
+        policy: Optional[ReusePolicy] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        """Open (or create) the cache file.
+
+        Args:
+            path: SQLite file path. Defaults to answer_cache.sqlite3.
+            policy: Reuse rules. Defaults to ReusePolicy().
+            max_bytes: Size cap in bytes. Defaults to 20 MB.
+        """
+        self.path = path
+        self.policy = policy or ReusePolicy()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def usable(self, context: str = "") -> bool:
+        """Return whether the policy allows caching for this request.
+
+        Args:
+            context: Business context the answer would be grounded in.
+        """
+        return not context or self.policy.reuse_with_context
+
+    def get(
+        self,
+        question: str,
+        niche: str,
+        model: str,
+        business_name: str,
+        city: str,
+        state: str,
+    ) -> Optional[str]:
+        """Return a stored answer personalized for a business, if allowed.
+
+        Args:
+            question: Question text.
+            niche: Business niche.
+            model: Model the answer must come from.
+            business_name: Business to answer as.
+            city: Its city.
+            state: Its state.
+
+        Returns:
+            Personalized answer, or None on a miss or when the reuse
+            policy rules the stored answer out.
+        """
+        key = answer_key(question, niche, model)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT template, origin, created_at, reuse_count "
+                "FROM answers WHERE key = ?",
+                (key,),
+            ).fetchone()
+            usable = (
+                row is not None and now - row[2] <= self.policy.max_age_days * 86400
+            )
+            other_business = usable and row[1] != business_name
+            if (
+                usable
+                and other_business
+                and self.policy.max_reuses is not None
+                and row[3] >= self.policy.max_reuses
+            ):
+                usable = False
+            self._count(niche, "lookups")
+            if not usable:
+                self.misses += 1
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE answers SET last_access = ?, reuse_count = reuse_count + ? "
+                "WHERE key = ?",
+                (now, int(other_business), key),
+            )
+            self._count(niche, "hits")
+            self._conn.commit()
+            self.hits += 1
+        return render_template(row[0], business_name, city, state)
+
+    def put(
+        self,
+        question: str,
+        niche: str,
+        model: str,
+        answer: str,
+        business_name: str,
+        city: str,
+        state: str,
+    ) -> None:
+        """Store a freshly generated answer as a template.
+
+        Args:
+            question: Question the answer is for.
+            niche: Business niche.
+            model: Model that wrote the answer.
+            answer: Answer text as written for this business.
+            business_name: Business it was written for.
+            city: Its city.
+            state: Its state.
+        """
+        if not answer:
+            return
+        template = make_template(answer, business_name, city, state)
+        size = len(template.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (
+                    answer_key(question, niche, model),
+                    niche.casefold(),
+                    model,
+                    question,
+                    template,
+                    business_name,
+                    size,
+                    now,
+                    now,
+                ),
+            )
+            self._count(niche, "stores")
+            self._evict()
+            self._conn.commit()
+
+    def _count(self, niche: str, column: str) -> None:
+        """Increment a per-niche counter. Must be called with the lock held."""
+        self._conn.execute(
+            f"INSERT INTO niche_stats (niche, {column}) VALUES (?, 1) "
+            f"ON CONFLICT(niche) DO UPDATE SET {column} = {column} + 1",
+            (niche.casefold(),),
+        )
+
+    def _evict(self) -> None:
+        """Delete least recently used answers until under max_bytes.
+
+        Must be called with the lock held.
+        """
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM answers"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM answers ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def purge(self, expired_only: bool = True, niche: Optional[str] = None) -> int:
+        """Delete stored answers.
+
+        Args:
+            expired_only: Only delete answers older than the policy's
+                max_age_days. Ignored when ``niche`` is given.
+            niche: Delete every answer for this niche.
+
+        Returns:
+            Number of answers deleted.
+        """
+        with self._lock:
+            if niche:
+                cursor = self._conn.execute(
+                    "DELETE FROM answers WHERE niche = ?", (niche.casefold(),)
+                )
+            elif expired_only:
+                cursor = self._conn.execute(
+                    "DELETE FROM answers WHERE created_at < ?",
+                    (time.time() - self.policy.max_age_days * 86400,),
+                )
+            else:
+                cursor = self._conn.execute("DELETE FROM answers")
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return lifetime reuse statistics per niche.
+
+        Returns:
+            Mapping of niche to lookups, hits, reuse_rate (hits / lookups),
+            stores and entries (answers currently stored).
+        """
+        with self._lock:
+            counters = self._conn.execute(
+                "SELECT niche, lookups, hits, stores FROM niche_stats"
+            ).fetchall()
+            entries = dict(
+                self._conn.execute(
+                    "SELECT niche, COUNT(*) FROM answers GROUP BY niche"
+                ).fetchall()
+            )
+        return {
+            niche: {
+                "lookups": lookups,
+                "hits": hits,
+                "reuse_rate": hits / lookups if lookups else 0.0,
+                "stores": stores,
+                "entries": entries.get(niche, 0),
+            }
+            for niche, lookups, hits, stores in counters
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[AnswerCache] = None
+_default_lock = threading.Lock()
+
+
+def default_answer_cache() -> AnswerCache:
+    """Return the process-wide answer cache used by the FAQ generator.
+
+    Returns:
+        Lazily opened AnswerCache at DEFAULT_ANSWER_CACHE_FILE.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = AnswerCache()
+        return _default_cache
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Show reuse statistics or purge the answer cache.
+
+    Args:
+        argv: Command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Inspect or purge the answer cache")
+    parser.add_argument("--path", default=DEFAULT_ANSWER_CACHE_FILE)
+    parser.add_argument("--max-age-days", type=float, default=90.0)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="show reuse rate per niche")
+    purge_parser = commands.add_parser("purge", help="delete stored answers")
+    group = purge_parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--expired", action="store_true", help="answers past max age")
+    group.add_argument("--all", action="store_true", help="every answer")
+    group.add_argument("--niche", help="answers for one niche")
+    args = parser.parse_args(argv)
+
+    cache = AnswerCache(args.path, ReusePolicy(max_age_days=args.max_age_days))
+    try:
+        if args.command == "stats":
+            rows: List[str] = []
+            for niche, stats in sorted(cache.stats().items()):
+                rows.append(
+                    f"{niche}: {stats['entries']} answers, {stats['hits']}/"
+                    f"{stats['lookups']} reused ({stats['reuse_rate']:.0%}), "
+                    f"{stats['stores']} generated"
+                )
+            print("\n".join(rows) if rows else "[INFO] Answer cache is empty")
+        else:
+            removed = cache.purge(expired_only=args.expired, niche=args.niche)
+            print(f"[SUCCESS] Purged {removed} answers")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
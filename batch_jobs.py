@@ -0,0 +1,529 @@
+r"""
+Module/Script Name: batch_jobs.py
+Path: E:\projects\Project Tracking\batch_jobs.py
+
+Description:
+Offline batch mode for the monthly refresh of every client's FAQs and
+background summaries. Every pending generate_answer() request and the
+first summary stage of each client are compiled into JSONL request files
+for the OpenAI Batch API, submitted, polled, and the JSONL results are
+ingested into the shared LLM cache under the same content hash a live call
+would use. Running the generators afterwards then writes each client's
+output files from the cache. Requests and results are streamed line by
+line, so tens of thousands of them never sit in memory at once.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.01
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.01 - Batch endpoint and window constants typed Final for the SDK literals
+* v1.00 - Initial release with compile, submit, status, ingest and write
+
+Usage:
+    python batch_jobs.py compile CONFIG.json [CONFIG.json ...]
+    python batch_jobs.py submit
+    python batch_jobs.py status
+    python batch_jobs.py ingest
+    python batch_jobs.py write CONFIG.json [CONFIG.json ...]
+
+    Pass --base-url to use a local stand-in for the OpenAI API (see
+    benchmarks/fixture_server.start_fake_batch_api).
+"""
+
+import argparse
+import glob
+import json
+import os
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    Final,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from openai import OpenAI
+
+import chatgpt_background
+import faq_generator
+from llm_cache import LLMCache, completion_key, default_llm_cache
+from llm_client import default_client
+from summarizer import SUMMARY_MODEL
+from text_dedup import estimate_tokens
+
+DEFAULT_BATCH_DIR = "batch_jobs"
+BATCH_ENDPOINT: Final = "/v1/chat/completions"
+COMPLETION_WINDOW: Final = "24h"
+
+# Results stored in the LLM cache per transaction while ingesting
+INGEST_CHUNK = 500
+
+# Per-file limits of the Batch API (50,000 requests, 200 MB), with headroom
+BATCH_MAX_REQUESTS = 50000
+BATCH_MAX_BYTES = 190 * 1024 * 1024
+
+# Batch states after which no more results will appear
+FINAL_STATES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+STATE_FILE = "batches.json"
+
+# Settings that make a run read the batch results from the LLM cache
+_WRITE_OVERRIDES = {
+    "cache_llm": True,
+    "refresh_llm_cache": False,
+    "batch_answers": False,
+}
+
+
+@dataclass
+class BatchRequest:
+    """One chat completion to run through the Batch API.
+
+    Attributes:
+        model: Model name.
+        messages: Chat messages.
+        params: Sampling parameters (temperature, max_tokens, ...), exactly
+            as the live call passes them.
+    """
+
+    model: str
+    messages: List[Dict[str, str]]
+    params: Dict[str, Any] = field(default_factory=lambda: {"temperature": 0.7})
+
+    @property
+    def key(self) -> str:
+        """LLM cache key of the request; also its batch custom_id."""
+        return completion_key(self.model, self.messages, self.params)
+
+    def line(self) -> str:
+        """Return the request as one Batch API JSONL line (with newline)."""
+        body = {"model": self.model, "messages": self.messages, **self.params}
+        record = {
+            "custom_id": self.key,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": body,
+        }
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def client_requests(
+    client_configs: Iterable[Dict[str, Any]],
+    faq: bool = True,
+    background: bool = True,
+) -> Iterator[BatchRequest]:
+    """Yield every pending request of a set of clients, client by client.
+
+    A client whose questions or site text cannot be gathered is reported
+    and skipped, so one bad config does not stop the compile.
+
+    Args:
+        client_configs: Client configuration dictionaries.
+        faq: Include unanswered FAQ questions. Defaults to True.
+        background: Include the background summaries. Defaults to True.
+
+    Yields:
+        BatchRequest objects.
+    """
+    for config in client_configs:
+        name = config.get("name", "?")
+        if faq:
+            try:
+                for messages in faq_generator.pending_answer_messages(config):
+                    yield BatchRequest(faq_generator.ANSWER_MODEL, messages)
+            except Exception as e:
+                print(f"[ERROR] {name}: FAQ questions not compiled: {e}")
+        if background:
+            try:
+                batch, params = chatgpt_background.pending_summary_messages(config)
+                for messages in batch:
+                    yield BatchRequest(SUMMARY_MODEL, messages, dict(params))
+            except Exception as e:
+                print(f"[ERROR] {name}: background not compiled: {e}")
+
+
+def write_request_files(
+    requests: Iterable[BatchRequest],
+    directory: str = DEFAULT_BATCH_DIR,
+    cache: Optional[LLMCache] = None,
+    max_requests: int = BATCH_MAX_REQUESTS,
+    max_bytes: int = BATCH_MAX_BYTES,
+) -> List[str]:
+    """Stream requests into Batch API JSONL files.
+
+    Requests already answered by ``cache`` and repeats of an earlier
+    request are left out. A new file is started whenever the next line
+    would exceed ``max_requests`` or ``max_bytes``. Only the keys written so
+    far are kept in memory.
+
+    Args:
+        requests: Requests to write, e.g. from client_requests().
+        directory: Folder for "requests-001.jsonl", ... The previous
+            round's request, result and state files there are replaced.
+            Defaults to "batch_jobs".
+        cache: LLMCache whose fresh entries need no request.
+        max_requests: Requests per file. Defaults to 50,000.
+        max_bytes: Bytes per file. Defaults to 190 MB.
+
+    Returns:
+        Paths of the files written, in order; empty if nothing is pending.
+
+    Raises:
+        RuntimeError: If the previous round has batches that are still
+            running or whose results were not ingested yet.
+    """
+    os.makedirs(directory, exist_ok=True)
+    waiting = [
+        batch["id"]
+        for batch in _load_state(directory)
+        if not batch["ingested"]
+        and (batch["status"] not in FINAL_STATES or batch["results"])
+    ]
+    if waiting:
+        raise RuntimeError(
+            f"Batches {', '.join(waiting)} are not ingested yet; "
+            "run status and ingest first"
+        )
+    for pattern in ("requests-*.jsonl", "results-*.jsonl", STATE_FILE):
+        for old in glob.glob(os.path.join(directory, pattern)):
+            os.remove(old)
+
+    paths: List[str] = []
+    seen: Set[str] = set()
+    handle = None
+    count = size = 0
+    skipped = 0
+    try:
+        for request in requests:
+            key = request.key
+            if key in seen or (cache is not None and cache.contains(key)):
+                skipped += 1
+                continue
+            seen.add(key)
+            data = request.line().encode("utf-8")
+            if handle is None or count >= max_requests or size + len(data) > max_bytes:
+                if handle is not None:
+                    handle.close()
+                path = os.path.join(directory, f"requests-{len(paths) + 1:03d}.jsonl")
+                handle = open(path, "wb")
+                paths.append(path)
+                count = size = 0
+            handle.write(data)
+            count += 1
+            size += len(data)
+    finally:
+        if handle is not None:
+            handle.close()
+
+    print(
+        f"[INFO] Compiled {len(seen)} requests into {len(paths)} files "
+        f"({skipped} cached or repeated)"
+    )
+    return paths
+
+
+def _load_state(directory: str) -> List[Dict[str, Any]]:
+    path = os.path.join(directory, STATE_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_state(directory: str, batches: List[Dict[str, Any]]) -> None:
+    path = os.path.join(directory, STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(batches, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def submit_batches(
+    paths: Sequence[str],
+    directory: str = DEFAULT_BATCH_DIR,
+    client: Optional[OpenAI] = None,
+) -> List[Dict[str, Any]]:
+    """Upload request files and start one batch per file.
+
+    Submitted batches are recorded in "batches.json" in ``directory`` so
+    a later process can poll and ingest them. Files already submitted are
+    not submitted again.
+
+    Args:
+        paths: Request files from write_request_files().
+        directory: Folder holding the batch state. Defaults to "batch_jobs".
+        client: OpenAI client. Defaults to llm_client.default_client().
+
+    Returns:
+        The recorded batches (input, input_file_id, id, status, results,
+        ingested).
+
+    Raises:
+        openai.OpenAIError: If an upload or batch creation fails; batches
+            created before it stay recorded.
+    """
+    client = client or default_client()
+    batches = _load_state(directory)
+    submitted = {batch["input"] for batch in batches}
+    for path in paths:
+        if path in submitted:
+            continue
+        with open(path, "rb") as f:
+            uploaded = client.files.create(file=f, purpose="batch")
+        batch = client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=COMPLETION_WINDOW,
+        )
+        batches.append(
+            {
+                "input": path,
+                "input_file_id": uploaded.id,
+                "id": batch.id,
+                "status": batch.status,
+                "results": None,
+                "ingested": False,
+            }
+        )
+        _save_state(directory, batches)
+        print(f"[INFO] Submitted {os.path.basename(path)} as batch {batch.id}")
+    return batches
+
+
+def poll_batches(
+    directory: str = DEFAULT_BATCH_DIR, client: Optional[OpenAI] = None
+) -> List[Dict[str, Any]]:
+    """Refresh batch states and download the results of finished batches.
+
+    Output files are streamed to "results-NNN.jsonl" next to their request
+    file. Batches that expired or were cancelled still deliver the results
+    they finished.
+
+    Args:
+        directory: Folder holding the batch state. Defaults to "batch_jobs".
+        client: OpenAI client. Defaults to llm_client.default_client().
+
+    Returns:
+        The recorded batches with their current status.
+    """
+    client = client or default_client()
+    batches = _load_state(directory)
+    for record in batches:
+        if record["status"] in FINAL_STATES and record["results"]:
+            continue
+        batch = client.batches.retrieve(record["id"])
+        record["status"] = batch.status
+        counts = getattr(batch, "request_counts", None)
+        if counts is not None:
+            record["counts"] = {
+                "total": counts.total,
+                "completed": counts.completed,
+                "failed": counts.failed,
+            }
+        if batch.status in FINAL_STATES and batch.output_file_id:
+            results = record["input"].replace("requests-", "results-")
+            with client.files.with_streaming_response.content(
+                batch.output_file_id
+            ) as response:
+                response.stream_to_file(results)
+            record["results"] = results
+        print(f"[INFO] Batch {record['id']}: {record['status']}")
+    _save_state(directory, batches)
+    return batches
+
+
+def ingest_results(path: str, cache: LLMCache) -> Dict[str, int]:
+    """Store the completions of a Batch API results file in the LLM cache.
+
+    Each line is keyed by its custom_id, the cache key of the request, so
+    the next live call with the same inputs is served from the cache.
+
+    Args:
+        path: Results JSONL file.
+        cache: LLMCache to store the completions in.
+
+    Returns:
+        Counts of "stored" completions and "failed" lines (errors, non-200
+        responses, empty or unreadable results).
+    """
+    counts = {"stored": 0, "failed": 0}
+    rows: List[Tuple[str, str, str, int]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                response = record.get("response") or {}
+                body = response.get("body") or {}
+                content = (body["choices"][0]["message"]["content"] or "").strip()
+                ok = (
+                    not record.get("error")
+                    and response.get("status_code") == 200
+                    and bool(content)
+                )
+            except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+                ok = False
+            if not ok:
+                counts["failed"] += 1
+                continue
+            usage = body.get("usage") or {}
+            tokens = usage.get("total_tokens") or estimate_tokens(content)
+            rows.append((record["custom_id"], body.get("model", ""), content, tokens))
+            if len(rows) >= INGEST_CHUNK:
+                counts["stored"] += cache.put_many(rows)
+                rows = []
+    if rows:
+        counts["stored"] += cache.put_many(rows)
+    return counts
+
+
+def ingest_batches(
+    directory: str = DEFAULT_BATCH_DIR, cache: Optional[LLMCache] = None
+) -> Dict[str, int]:
+    """Ingest every downloaded, not yet ingested results file.
+
+    Args:
+        directory: Folder holding the batch state. Defaults to "batch_jobs".
+        cache: LLMCache to fill. Defaults to llm_cache.default_llm_cache().
+
+    Returns:
+        Total "stored" and "failed" counts.
+    """
+    cache = cache or default_llm_cache()
+    batches = _load_state(directory)
+    totals = {"stored": 0, "failed": 0}
+    for record in batches:
+        if not record["results"] or record["ingested"]:
+            continue
+        counts = ingest_results(record["results"], cache)
+        for name, value in counts.items():
+            totals[name] += value
+        record["ingested"] = True
+        _save_state(directory, batches)
+        print(
+            f"[INFO] Batch {record['id']}: stored {counts['stored']}, "
+            f"failed {counts['failed']}"
+        )
+    return totals
+
+
+def write_outputs(
+    client_configs: Iterable[Dict[str, Any]],
+    faq: bool = True,
+    background: bool = True,
+) -> Dict[str, int]:
+    """Run the generators so each client's files are written from the cache.
+
+    Runs use the shared LLM cache with single-question answers, the form
+    the requests were compiled in. Requests that failed in the batch, and
+    the merge stages of large summaries, are sent live. A client that
+    fails is reported and skipped.
+
+    Args:
+        client_configs: Client configuration dictionaries.
+        faq: Write the FAQ pages. Defaults to True.
+        background: Write the background documents. Defaults to True.
+
+    Returns:
+        Counts of "written" and "failed" outputs.
+    """
+    counts = {"written": 0, "failed": 0}
+    for config in client_configs:
+        run_config = dict(config, **_WRITE_OVERRIDES)
+        jobs = []
+        if faq:
+            jobs.append(("FAQ", faq_generator.run_faq_generator))
+        if background:
+            jobs.append(("background", chatgpt_background.run))
+        for label, job in jobs:
+            try:
+                job(run_config)
+                counts["written"] += 1
+            except Exception as e:
+                counts["failed"] += 1
+                print(f"[ERROR] {config.get('name', '?')}: {label} not written: {e}")
+    return counts
+
+
+def _load_configs(paths: Sequence[str]) -> List[Dict[str, Any]]:
+    """Load client configs; a file may hold one config or a list of them."""
+    configs: List[Dict[str, Any]] = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        configs.extend(data if isinstance(data, list) else [data])
+    return configs
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run a batch-mode step from the command line.
+
+    Args:
+        argv: Command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Offline Batch API mode")
+    parser.add_argument("--dir", default=DEFAULT_BATCH_DIR)
+    parser.add_argument("--base-url", help="OpenAI-compatible API base URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, text in (
+        ("compile", "write request files for the clients"),
+        ("write", "write output files from the ingested results"),
+    ):
+        command = commands.add_parser(name, help=text)
+        command.add_argument("configs", nargs="+", help="client config JSON files")
+        command.add_argument("--no-faq", action="store_true")
+        command.add_argument("--no-background", action="store_true")
+    commands.add_parser("submit", help="upload request files and start batches")
+    commands.add_parser("status", help="poll batches and download results")
+    commands.add_parser("ingest", help="store downloaded results in the LLM cache")
+    args = parser.parse_args(argv)
+
+    client = None
+    if args.base_url:
+        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=args.base_url)
+
+    if args.command == "compile":
+        configs = _load_configs(args.configs)
+        paths = write_request_files(
+            client_requests(configs, not args.no_faq, not args.no_background),
+            args.dir,
+            cache=default_llm_cache(),
+        )
+        for path in paths:
+            print(path)
+    elif args.command == "submit":
+        paths = sorted(glob.glob(os.path.join(args.dir, "requests-*.jsonl")))
+        submit_batches(paths, args.dir, client)
+    elif args.command == "status":
+        for batch in poll_batches(args.dir, client):
+            results = batch["results"] or "-"
+            print(f"{batch['id']} {batch['status']} {results}")
+    elif args.command == "ingest":
+        totals = ingest_batches(args.dir)
+        print(f"[SUCCESS] Stored {totals['stored']}, failed {totals['failed']}")
+    else:
+        configs = _load_configs(args.configs)
+        counts = write_outputs(configs, not args.no_faq, not args.no_background)
+        print(f"[SUCCESS] Wrote {counts['written']}, failed {counts['failed']}")
+
+
+if __name__ == "__main__":
+    main()
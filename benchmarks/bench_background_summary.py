@@ -0,0 +1,85 @@
+r"""
+Module/Script Name: bench_background_summary.py
+Path: E:\projects\Project Tracking\benchmarks\bench_background_summary.py
+
+Description:
+Benchmark for the map-reduce background summary against a simulated
+chat-completions server whose latency grows with prompt length. For site
+corpora of increasing size it compares one prompt holding the whole corpus
+(what chatgpt_background used to send, ignoring the context window) with
+summarizer.summarize_text(), and prints the per-stage report.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_background_summary.py [seconds_per_1k_prompt_tokens]
+"""
+
+import contextlib
+import io
+import sys
+import time
+from typing import Any, Dict
+
+from fixture_server import start_fake_openai  # (adds the repo root to sys.path)
+
+from openai import OpenAI
+
+from summarizer import summarize_text
+from text_dedup import estimate_tokens
+
+SENTENCE = (
+    "ABC Heating has served Lenawee County since 1987 with furnace repair, "
+    "heat pump installs and 24/7 emergency service from NATE-certified techs. "
+)
+
+
+def main() -> None:
+    """Time single-prompt vs map-reduce summaries for growing corpora."""
+    per_1k = float(sys.argv[1]) if len(sys.argv) > 1 else 0.25
+
+    def reply(request: Dict[str, Any]) -> str:
+        prompt = sum(estimate_tokens(m["content"]) for m in request["messages"])
+        time.sleep(per_1k * prompt / 1000)
+        return "- " + SENTENCE * 3
+
+    server, base, _ = start_fake_openai(0.2, reply=reply)
+    client = OpenAI(api_key="x", base_url=base + "/v1")
+    try:
+        for pages in (4, 20, 60):
+            corpus = "\n".join(SENTENCE * 6 for _ in range(pages * 4))
+            line = f"{len(corpus):>7,} chars (~{estimate_tokens(corpus):,} tokens):"
+            for label, chunk_tokens in (("one prompt", 10**9), ("map-reduce", 3000)):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _, report = summarize_text(
+                        corpus, "Summarize.", chunk_tokens=chunk_tokens, client=client
+                    )
+                line += (
+                    f" {label} {report.seconds:.2f}s/{report.calls} calls"
+                    f"/~{report.tokens:,} tokens;"
+                )
+            print(line)
+            for stage in report.stages:
+                print(f"    {stage.describe()}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
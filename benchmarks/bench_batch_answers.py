@@ -0,0 +1,223 @@
+r"""
+Module/Script Name: bench_batch_answers.py
+Path: E:\projects\Project Tracking\benchmarks\bench_batch_answers.py
+
+Description:
+Quality-equivalence harness for batched FAQ answering. Answers the same
+questions per-question (generate_answers) and batched
+(generate_answers_batched), then reports request count, estimated prompt
+tokens, wall time, and per-answer similarity: length ratio, content-word
+overlap and whether both answers mention the city. Runs against a local
+fake by default; --live uses the real OpenAI API (costs credits).
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_batch_answers.py [--live] [--questions FILE]
+        [--token-budget N] [--min-overlap F] [--max-flagged F]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import re
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+from unittest.mock import patch
+
+from fixture_server import start_fake_openai  # (adds the repo root to sys.path)
+
+from openai import OpenAI
+
+import faq_generator
+from text_dedup import estimate_tokens
+
+BUSINESS = ("ABC Heating", "Phoenix", "AZ")
+
+DEFAULT_QUESTIONS = [
+    "How much does HVAC repair cost?",
+    "How often should I replace my furnace filter?",
+    "Why is my AC blowing warm air?",
+    "How long does a furnace last?",
+    "Is a heat pump worth it in Arizona?",
+    "What size air conditioner do I need?",
+    "How do I know if my AC needs refrigerant?",
+    "What is a SEER rating?",
+    "Should I repair or replace my AC unit?",
+    "How much does a new HVAC system cost?",
+    "Why does my furnace keep shutting off?",
+    "How often should ductwork be cleaned?",
+]
+
+_WORD_RE = re.compile(r"[a-z]{4,}")
+_NUMBERED_RE = re.compile(r"^\d+\. (.+)$", re.MULTILINE)
+
+
+def _fake_answer(question: str) -> str:
+    """Deterministic stand-in answer used by the local fake server."""
+    return (
+        f"Great question! {question} At {BUSINESS[0]} in {BUSINESS[1]}, "
+        "we see this often; the answer depends on your system's age, size "
+        "and maintenance history. Call us for a free inspection."
+    )
+
+
+def _fake_reply(request: Dict[str, Any]) -> str:
+    """Answer single prompts with text and batch prompts with a JSON array."""
+    prompt = request["messages"][-1]["content"]
+    if "JSON array" in prompt:
+        return json.dumps(
+            [
+                {"id": i, "answer": _fake_answer(q)}
+                for i, q in enumerate(_NUMBERED_RE.findall(prompt), 1)
+            ]
+        )
+    question = prompt.split("Q: ", 1)[-1].split("\n", 1)[0]
+    return _fake_answer(question)
+
+
+def compare_answers(
+    single: str, batched: str, city: str, min_overlap: float
+) -> Dict[str, Any]:
+    """Score how closely a batched answer matches its per-question answer.
+
+    Args:
+        single: Answer generated on its own.
+        batched: Answer generated in a batch.
+        city: City both answers should mention.
+        min_overlap: Content-word Jaccard below which the pair is flagged.
+
+    Returns:
+        Dictionary with length_ratio, overlap, local (both or neither
+        mention the city) and flagged.
+    """
+    single_words = set(_WORD_RE.findall(single.lower()))
+    batched_words = set(_WORD_RE.findall(batched.lower()))
+    union = single_words | batched_words
+    overlap = len(single_words & batched_words) / len(union) if union else 1.0
+    ratio = len(batched.split()) / max(1, len(single.split()))
+    local = (city.lower() in single.lower()) == (city.lower() in batched.lower())
+    flagged = not batched or ratio < 0.5 or ratio > 2.0 or overlap < min_overlap
+    return {
+        "length_ratio": ratio,
+        "overlap": overlap,
+        "local": local,
+        "flagged": flagged or not local,
+    }
+
+
+def _measure(
+    run: Callable[[], List[str]],
+) -> Tuple[List[str], float, int, int]:
+    """Run one answering mode, counting requests and estimated prompt tokens."""
+    calls = {"requests": 0, "prompt_tokens": 0}
+    lock = threading.Lock()
+    real_completion = faq_generator.chat_completion
+
+    def counting_completion(messages: List[Dict[str, str]], **kwargs: Any) -> str:
+        with lock:
+            calls["requests"] += 1
+            calls["prompt_tokens"] += sum(
+                estimate_tokens(m["content"]) for m in messages
+            )
+        return real_completion(messages, **kwargs)
+
+    with patch.object(
+        faq_generator, "chat_completion", side_effect=counting_completion
+    ), contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        answers = run()
+        elapsed = time.perf_counter() - start
+    return answers, elapsed, calls["requests"], calls["prompt_tokens"]
+
+
+def main() -> None:
+    """Answer the questions both ways and print cost and similarity."""
+    parser = argparse.ArgumentParser(
+        description="Compare batched and per-question FAQ answers"
+    )
+    parser.add_argument("--live", action="store_true", help="use the OpenAI API")
+    parser.add_argument("--questions", help="file with one question per line")
+    parser.add_argument(
+        "--token-budget", type=int, default=faq_generator.ANSWER_BATCH_TOKEN_BUDGET
+    )
+    parser.add_argument("--context", default="", help="business context text")
+    parser.add_argument("--min-overlap", type=float, default=0.15)
+    parser.add_argument(
+        "--max-flagged", type=float, default=0.1, help="allowed flagged fraction"
+    )
+    args = parser.parse_args()
+
+    questions = DEFAULT_QUESTIONS
+    if args.questions:
+        with open(args.questions, encoding="utf-8") as f:
+            questions = [line.strip() for line in f if line.strip()]
+
+    server = None
+    client = faq_generator.client
+    if not args.live:
+        server, base, _ = start_fake_openai(latency=0.3, reply=_fake_reply)
+        client = OpenAI(api_key="x", base_url=base + "/v1")
+
+    with patch.object(faq_generator, "client", client):
+        single, single_time, single_requests, single_tokens = _measure(
+            lambda: faq_generator.generate_answers(questions, *BUSINESS, args.context)
+        )
+        batched, batched_time, batched_requests, batched_tokens = _measure(
+            lambda: faq_generator.generate_answers_batched(
+                questions, *BUSINESS, args.context, token_budget=args.token_budget
+            )
+        )
+    if server:
+        server.shutdown()
+
+    print(
+        f"per-question: {single_requests} requests, ~{single_tokens} prompt "
+        f"tokens, {single_time:.2f}s"
+    )
+    print(
+        f"batched:      {batched_requests} requests, ~{batched_tokens} prompt "
+        f"tokens, {batched_time:.2f}s"
+    )
+
+    scores = [
+        compare_answers(s, b, BUSINESS[1], args.min_overlap)
+        for s, b in zip(single, batched)
+    ]
+    for question, score in zip(questions, scores):
+        mark = "FLAG" if score["flagged"] else "ok  "
+        print(
+            f"{mark} ratio={score['length_ratio']:.2f} "
+            f"overlap={score['overlap']:.2f} local={score['local']} {question}"
+        )
+    flagged = sum(score["flagged"] for score in scores)
+    mean_overlap = sum(score["overlap"] for score in scores) / max(1, len(scores))
+    print(
+        f"{flagged}/{len(scores)} flagged, mean overlap {mean_overlap:.2f}, "
+        f"{single_requests / max(1, batched_requests):.1f}x fewer requests"
+    )
+    if flagged > args.max_flagged * len(scores):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+r"""
+Module/Script Name: bench_batch_jobs.py
+Path: E:\projects\Project Tracking\benchmarks\bench_batch_jobs.py
+
+Description:
+Benchmark for the offline batch mode against the local Batch API stand-in.
+Compiles tens of thousands of FAQ answer requests into JSONL files, submits
+and polls them, ingests the results into an LLM cache and checks that a
+live call is then served from the cache. Prints time and peak traced
+memory per step next to the size of the files, to show the requests are
+streamed rather than held in memory. Times include tracemalloc overhead,
+and the stand-in server runs in the same traced process.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_batch_jobs.py [requests]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Iterator, TypeVar
+
+from fixture_server import start_fake_batch_api  # (adds the repo root to sys.path)
+
+from openai import OpenAI
+
+from batch_jobs import (
+    BatchRequest,
+    ingest_batches,
+    poll_batches,
+    submit_batches,
+    write_request_files,
+)
+from faq_generator import ANSWER_MODEL, answer_messages
+from llm_cache import LLMCache
+from llm_client import chat_completion
+
+T = TypeVar("T")
+
+
+def synthetic_requests(count: int) -> Iterator[BatchRequest]:
+    """Yield answer requests for ``count`` distinct client questions."""
+    for i in range(count):
+        question = f"How much does furnace repair {i} cost in winter?"
+        messages = answer_messages(question, f"Client {i // 20}", "Adrian", "MI")
+        yield BatchRequest(ANSWER_MODEL, messages)
+
+
+def measure(label: str, step: Callable[[], T]) -> T:
+    """Run a step quietly and print its time and peak traced memory."""
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = step()
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    print(f"{label:<8} {seconds:6.2f}s  peak {peak:6.1f} MB")
+    return result
+
+
+def main() -> None:
+    """Compile, submit, poll and ingest a large synthetic batch."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    server, base, counters = start_fake_batch_api()
+    client = OpenAI(api_key="x", base_url=base + "/v1")
+    with tempfile.TemporaryDirectory() as folder:
+        directory = os.path.join(folder, "batch")
+        cache = LLMCache(os.path.join(folder, "llm.sqlite3"), max_bytes=1 << 40)
+        tracemalloc.start()
+        try:
+            paths = measure(
+                "compile",
+                lambda: write_request_files(
+                    synthetic_requests(count), directory, cache, max_requests=10000
+                ),
+            )
+            measure("submit", lambda: submit_batches(paths, directory, client))
+            measure("poll", lambda: poll_batches(directory, client))
+            batches = measure("poll", lambda: poll_batches(directory, client))
+            totals = measure("ingest", lambda: ingest_batches(directory, cache))
+        finally:
+            tracemalloc.stop()
+            server.shutdown()
+
+        size = sum(os.path.getsize(path) for path in paths) / 1024 / 1024
+        results = sum(os.path.getsize(batch["results"]) for batch in batches)
+        print(
+            f"{counters['requests']:,} requests in {len(paths)} files "
+            f"({size:.1f} MB requests, {results / 1024 / 1024:.1f} MB results); "
+            f"stored {totals['stored']:,}, failed {totals['failed']}"
+        )
+
+        request = next(synthetic_requests(1))
+        answer = chat_completion(
+            request.messages,
+            model=request.model,
+            client=OpenAI(api_key="x", base_url="http://127.0.0.1:9/v1"),
+            cache=cache,
+        )
+        print(f"live call after ingest served from cache: {answer[:40]!r}...")
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
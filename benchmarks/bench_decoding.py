@@ -0,0 +1,134 @@
+r"""
+Module/Script Name: bench_decoding.py
+Path: E:\projects\Project Tracking\benchmarks\bench_decoding.py
+
+Description:
+Micro-benchmark for page decoding when the server sends no charset. Compares
+requests' response.text (statistical detection over the whole body) with
+scraper.detect_encoding() (header/meta/prefix sniffing) over a page corpus.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_decoding.py [corpus_dir]
+
+    corpus_dir may hold saved client pages (*.html, raw bytes as downloaded).
+    A synthetic corpus is generated when it is omitted.
+"""
+
+import glob
+import os
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from fixture_server import make_page
+from requests.models import Response  # type: ignore[import-untyped]
+from requests.structures import CaseInsensitiveDict  # type: ignore[import-untyped]
+
+from scraper import detect_encoding, extract_text
+
+
+def load_corpus(directory: str) -> List[Tuple[str, bytes]]:
+    """Load saved pages from a directory.
+
+    Args:
+        directory: Folder containing *.html files.
+
+    Returns:
+        List of (file name, raw bytes).
+    """
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, "rb") as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def synthetic_corpus() -> List[Tuple[str, bytes]]:
+    """Build undeclared-charset pages in the encodings seen on client sites.
+
+    Returns:
+        List of (label, raw bytes).
+    """
+    french = "<p>R\u00e9paration de chauffage \u00e0 domicile, caf\u00e9 offert.</p>"
+    corpus = []
+    for kb in (64, 512):
+        page = make_page(filler_kb=kb)
+        corpus.append(
+            (
+                f"utf8-meta-{kb}kb",
+                page.replace("<head>", '<head><meta charset="utf-8">').encode("utf-8"),
+            )
+        )
+        corpus.append((f"utf8-bare-{kb}kb", (page + french).encode("utf-8")))
+        corpus.append((f"cp1252-bare-{kb}kb", (french + page).encode("cp1252")))
+    return corpus
+
+
+def make_response(body: bytes) -> Response:
+    """Build a requests Response with no Content-Type charset.
+
+    Args:
+        body: Raw page bytes.
+
+    Returns:
+        Response whose .text will run full-body detection.
+    """
+    response = Response()
+    response._content = body
+    response.headers = CaseInsensitiveDict()
+    response.encoding = None
+    response.status_code = 200
+    return response
+
+
+def time_it(func: Callable[[], object], repeat: int = 5) -> float:
+    """Return the best wall time of ``repeat`` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    """Run the decoding micro-benchmark and print per-page timings."""
+    corpus = load_corpus(sys.argv[1]) if len(sys.argv) > 1 else synthetic_corpus()
+
+    print(
+        f"{'page':<22} {'KB':>6} {'.text ms':>9} {'sniff ms':>9} "
+        f"{'old parse ms':>13} {'new parse ms':>13}"
+    )
+    for label, body in corpus:
+        old_decode = time_it(lambda: make_response(body).text)
+        new_decode = time_it(lambda: detect_encoding(None, body))
+        old_total = time_it(lambda: extract_text(make_response(body).text), repeat=2)
+        new_total = time_it(
+            lambda: extract_text(body, encoding=detect_encoding(None, body)), repeat=2
+        )
+        print(
+            f"{label:<22} {len(body) // 1024:>6} {old_decode:>9.2f} {new_decode:>9.2f} "
+            f"{old_total:>13.1f} {new_total:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+r"""
+Module/Script Name: bench_faq_answers.py
+Path: E:\projects\Project Tracking\benchmarks\bench_faq_answers.py
+
+Description:
+Benchmark for generate_answers() against a local OpenAI-compatible server
+with fixed completion latency and a concurrency cap that answers 429 with
+retry-after-ms. Compares the old one-at-a-time loop with the adaptive
+concurrent path, and reports how many requests were throttled.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.01
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.01 - Fake OpenAI server moved to fixture_server
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_faq_answers.py [latency_seconds] [questions] [server_cap]
+"""
+
+import contextlib
+import io
+import sys
+import time
+from unittest.mock import patch
+
+from fixture_server import start_fake_openai  # (adds the repo root to sys.path)
+
+from openai import OpenAI
+
+import faq_generator
+import llm_client
+from llm_client import AdaptiveConcurrency
+
+
+def main() -> None:
+    """Time sequential vs concurrent answer generation and print the results."""
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 24
+    cap = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    questions = [f"How much does HVAC repair cost? ({i})" for i in range(count)]
+
+    results = []
+    for concurrency in (1, llm_client.MAX_LLM_CONCURRENCY):
+        server, base, counters = start_fake_openai(latency, cap)
+        client = OpenAI(api_key="x", base_url=base + "/v1")
+        limiter = AdaptiveConcurrency(concurrency)
+        with patch.object(faq_generator, "client", client), patch.object(
+            llm_client, "default_limiter", return_value=limiter
+        ), contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            answers = faq_generator.generate_answers(
+                questions, "ABC Heating", "Phoenix", "AZ", max_concurrency=concurrency
+            )
+            elapsed = time.perf_counter() - start
+        server.shutdown()
+        results.append(answers)
+        print(
+            f"max_concurrency={concurrency}: {elapsed:.2f}s, "
+            f"{counters['ok']} completions, {counters['throttled']} throttled, "
+            f"final limit {limiter.limit}"
+        )
+    assert results[0] == results[1]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+r"""
+Module/Script Name: bench_faq_html.py
+Path: E:\projects\Project Tracking\benchmarks\bench_faq_html.py
+
+Description:
+Benchmark for FAQ accordion output with 1,000-item (and larger) pages.
+Compares the previous string-concatenation writer with the streaming
+FaqHtmlWriter, and reports plain, minified and gzip output sizes.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_faq_html.py
+"""
+
+import os
+import tempfile
+import time
+from typing import List, Tuple
+
+import fixture_server  # noqa: F401  (adds the repository root to sys.path)
+
+from faq_generator import write_html_accordion
+
+
+def legacy_write(
+    faq_list: List[Tuple[str, str]], business_name: str, path: str
+) -> None:
+    """The pre-v1.17 writer: unescaped text, page built with ``+=``."""
+    html = f"<!DOCTYPE html><html><head><title>{business_name} - FAQs</title>"
+    html += '</head><body><div class="accordion">\n'
+    for i, (q, a) in enumerate(faq_list):
+        html += f"""
+        <div class=\"accordion-item\">
+            <div class=\"accordion-header\" onclick=\"toggleContent('content{i}')\">{q}</div>
+            <div class=\"accordion-content\" id=\"content{i}\">{a}</div>
+        </div>
+"""
+    html += "</div></body></html>"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+
+
+def make_faq(count: int) -> List[Tuple[str, str]]:
+    """Build FAQ pairs with GPT-4-length answers (~120 words)."""
+    answer = (
+        "Most homeowners in Phoenix pay between $150 and $450 for a typical "
+        "HVAC repair, depending on the part & labor involved. "
+    ) * 6
+    return [(f"How much does repair job {i} cost?", answer) for i in range(count)]
+
+
+def main() -> None:
+    """Time legacy vs streaming output and print sizes."""
+    print(
+        f"{'items':>6} {'legacy s':>9} {'stream s':>9} {'min+gz s':>9} "
+        f"{'html KB':>8} {'min KB':>7} {'gz KB':>6}"
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for count in (1000, 10000, 50000):
+            faq = make_faq(count)
+            paths = [os.path.join(tmpdir, f"{name}.html") for name in "abc"]
+            timings = []
+            for write in (
+                lambda: legacy_write(faq, "ABC Heating", paths[0]),
+                lambda: write_html_accordion(faq, "ABC Heating", paths[1]),
+                lambda: write_html_accordion(
+                    faq, "ABC Heating", paths[2], minify=True, gzip_output=True
+                ),
+            ):
+                start = time.perf_counter()
+                write()
+                timings.append(time.perf_counter() - start)
+            sizes = [
+                os.path.getsize(path) / 1024
+                for path in (paths[1], paths[2], paths[2] + ".gz")
+            ]
+            print(
+                f"{count:>6} {timings[0]:>9.3f} {timings[1]:>9.3f} {timings[2]:>9.3f} "
+                f"{sizes[0]:>8.0f} {sizes[1]:>7.0f} {sizes[2]:>6.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
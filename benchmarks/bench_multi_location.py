@@ -0,0 +1,162 @@
+r"""
+Module/Script Name: bench_multi_location.py
+Path: E:\projects\Project Tracking\benchmarks\bench_multi_location.py
+
+Description:
+Benchmark for the multi-location FAQ mode against a simulated SerpAPI whose
+location-dependent variants return a few city-specific questions and whose
+other variants return the same questions everywhere. Counts SerpAPI searches
+and GPT-4 answers for 1-5 cities, next to running the single-city generator
+once per city.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.01
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.01 - Fake answerer takes generate_answer()'s keyword arguments
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_multi_location.py [max_questions]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+from typing import Any, Dict
+from unittest.mock import patch
+
+import fixture_server  # noqa: F401  (adds the repo root to sys.path)
+
+import faq_generator
+from query_planner import LOCAL_VARIANT_TEMPLATES, QueryPlanner, YieldStats
+from serp_cache import SerpCache
+
+SEED = "hvac repair"
+STATE = "MI"
+CITIES = ["Adrian", "Tecumseh", "Blissfield", "Onsted", "Hudson"]
+TOPICS = ["furnace", "heat pump", "boiler", "air conditioner", "duct", "thermostat"]
+LOCAL_QUERIES = {t.format(seed=SEED, geo="") for t in LOCAL_VARIANT_TEMPLATES}
+
+
+class FakeSerpSession:
+    """Returns PAA questions that depend on the query, page and uule."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: Dict[str, Any], timeout: float) -> Any:
+        with self._lock:
+            self.calls += 1
+        city = params["uule"].split(":", 1)[1].split(",")[0]
+        page = params["start"] // 10
+        query = params["q"].replace(city, "").replace(f", {STATE}", "")
+        if query in LOCAL_QUERIES:
+            questions = [
+                f"Who is the best {TOPICS[page * 2 + i]} installer in {city}?"
+                for i in range(2)
+            ] + [f"How much does {TOPICS[page]} repair cost per hour?"]
+        else:
+            offset = sum(map(ord, query)) % 4
+            questions = [
+                f"How long does a {TOPICS[(offset + page + i) % 6]} last, "
+                f"question {offset * 10 + page * 3 + i}?"
+                for i in range(3)
+            ]
+        payload = {"related_questions": [{"question": q} for q in questions]}
+
+        class Response:
+            status_code = 200
+
+            @staticmethod
+            def json() -> Dict[str, Any]:
+                return payload
+
+        return Response()
+
+
+def run(cities: list, multi: bool, tmpdir: str, max_questions: int) -> tuple:
+    """Run one configuration and return (searches, answers)."""
+    session = FakeSerpSession()
+    answers = []
+
+    def fake_answer(question: str, *args: Any, **kwargs: Any) -> str:
+        answers.append(question)
+        return "answer"
+
+    cache = SerpCache(os.path.join(tmpdir, f"serp-{multi}-{len(cities)}.sqlite3"))
+    planner = QueryPlanner(YieldStats(":memory:"))
+    config = {
+        "name": "ABC Heating",
+        "state": STATE,
+        "seed_keyword": SEED,
+        "output_root": os.path.join(tmpdir, f"out-{multi}-{len(cities)}"),
+        "max_questions": max_questions,
+        "reuse_answers": False,
+        "cache_llm": False,
+    }
+    with patch.object(
+        faq_generator, "_get_serp_session", return_value=session
+    ), patch.object(
+        faq_generator, "resolve_uule", side_effect=lambda geo: "uule:" + geo
+    ), patch.object(
+        faq_generator, "default_serp_cache", return_value=cache
+    ), patch.object(
+        faq_generator, "default_query_planner", return_value=planner
+    ), patch.object(
+        faq_generator, "generate_answer", side_effect=fake_answer
+    ), contextlib.redirect_stdout(
+        io.StringIO()
+    ):
+        if multi:
+            faq_generator.run_faq_generator(
+                dict(
+                    config,
+                    city=cities[0],
+                    nearby_10mi=cities[1:],
+                    nearby_20mi=[],
+                    multi_location=True,
+                )
+            )
+        else:
+            for city in cities:
+                faq_generator.run_faq_generator(
+                    dict(config, city=city, name=f"ABC Heating {city}")
+                )
+    cache.close()
+    return session.calls, len(answers)
+
+
+def main() -> None:
+    """Print API calls per number of cities for both modes."""
+    max_questions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n in range(1, len(CITIES) + 1):
+            cities = CITIES[:n]
+            single = run(cities, False, tmpdir, max_questions)
+            multi = run(cities, True, tmpdir, max_questions)
+            print(
+                f"{n} cities: per-city runs {single[0]} searches + {single[1]} answers"
+                f" = {sum(single)} calls; multi-location {multi[0]} searches + "
+                f"{multi[1]} answers = {sum(multi)} calls"
+            )
+
+
+if __name__ == "__main__":
+    main()
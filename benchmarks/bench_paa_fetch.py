@@ -0,0 +1,143 @@
+r"""
+Module/Script Name: bench_paa_fetch.py
+Path: E:\projects\Project Tracking\benchmarks\bench_paa_fetch.py
+
+Description:
+Benchmark for fetch_paa_questions() against a simulated SerpAPI with fixed
+per-search latency and a realistic yield profile: three variants return new
+questions on pages 1-2, page 3 only repeats, and the other variants repeat
+the seed's questions. Reports wall time and paid searches for one search at
+a time, concurrent searches with cold planner stats, the same run with
+learned stats, and an identical re-run answered by the SERP cache.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.03
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.03 - Handles a planner with no recorded plan
+* v1.02 - Realistic yield profile; cold vs learned query planner runs
+* v1.01 - Added a cached re-run (SERP cache) measurement
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_paa_fetch.py [latency_seconds] [max_questions]
+"""
+
+import contextlib
+import io
+import sys
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict
+from unittest.mock import patch
+
+import fixture_server  # noqa: F401  (adds the repo root to sys.path)
+
+import faq_generator
+from query_planner import VARIANT_TEMPLATES, QueryPlanner, YieldStats
+from serp_cache import SerpCache
+
+TOPICS = [f"system{i}" for i in range(24)]
+
+
+class FakeSerpSession:
+    """Stands in for the pooled SerpAPI session; each search sleeps."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: Dict[str, Any], timeout: float) -> Any:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        variant = VARIANTS.index(params["q"])
+        page = params["start"] // 10
+        if variant >= 3:
+            ids = range(4)  # repeats of the seed's first page
+        elif page == 2:
+            ids = range(variant * 8, variant * 8 + 4)  # repeats of page 1
+        else:
+            ids = range(variant * 8 + page * 4, variant * 8 + page * 4 + 4)
+        questions = [{"question": f"How much does a {TOPICS[i]} cost?"} for i in ids]
+
+        class Response:
+            status_code = 200
+
+            @staticmethod
+            def json() -> Dict[str, Any]:
+                return {"related_questions": questions}
+
+        return Response()
+
+
+SEED = "hvac repair"
+GEO = "Adrian, MI"
+VARIANTS = [t.format(seed=SEED, geo=GEO) for t in VARIANT_TEMPLATES]
+
+
+def main() -> None:
+    """Time PAA fetching under each schedule and print the results."""
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    max_questions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        stats = YieldStats(os.path.join(tmpdir, "yield.sqlite3"))
+        runs = [
+            ("max_concurrency=1, cold stats", 1, "a", YieldStats(":memory:")),
+            ("max_concurrency=6, cold stats", 6, "b", stats),
+            ("max_concurrency=6, learned stats", 6, "c", stats),
+            ("cached re-run", 6, "c", stats),
+        ]
+        results = []
+        for label, concurrency, cache_name, run_stats in runs:
+            session = FakeSerpSession(latency)
+            cache = SerpCache(os.path.join(tmpdir, cache_name + ".sqlite3"))
+            planner = QueryPlanner(run_stats)
+            with patch.object(
+                faq_generator, "_get_serp_session", return_value=session
+            ), patch.object(
+                faq_generator, "resolve_uule", return_value=None
+            ), contextlib.redirect_stdout(
+                io.StringIO()
+            ):
+                start = time.perf_counter()
+                questions = faq_generator.fetch_paa_questions(
+                    SEED,
+                    max_questions=max_questions,
+                    geo_target=GEO,
+                    max_concurrency=concurrency,
+                    serp_cache=cache,
+                    planner=planner,
+                )
+                elapsed = time.perf_counter() - start
+                # Let cancelled-but-running searches finish quietly
+                time.sleep(2 * latency)
+            cache.close()
+            results.append(sorted(questions))
+            plan = planner.last_plan
+            print(
+                f"{label}: {elapsed:.2f}s, {len(questions)} questions, "
+                f"{session.calls} searches sent ({plan.summary() if plan else 'no plan'})"
+            )
+        stats.close()
+    assert all(len(r) == max_questions for r in results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+r"""
+Module/Script Name: bench_page_data.py
+Path: E:\projects\Project Tracking\benchmarks\bench_page_data.py
+
+Description:
+Benchmark comparing per-field extraction (one BeautifulSoup parse for the
+text plus separate parses for title/meta, JSON-LD and NAP scanning) against
+the single-pass extract_page_data() on a generated fixture page.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_page_data.py [iterations] [filler_kb]
+"""
+
+import json
+import re
+import sys
+import time
+
+from fixture_server import make_page
+
+from bs4 import BeautifulSoup
+
+from scraper import extract_page_data, extract_text
+
+JSON_LD = (
+    '<script type="application/ld+json">{"@type": "HVACBusiness", "name": '
+    '"Fixture HVAC", "telephone": "(512) 555-0100"}</script>'
+)
+
+
+def per_field(body: bytes) -> None:
+    """Extract the same fields the way ad-hoc tooling would: one parse each."""
+    extract_text(body, 20, "utf-8")
+    soup = BeautifulSoup(body, "lxml", from_encoding="utf-8")
+    _ = soup.title.string if soup.title else ""
+    _ = {m.get("name"): m.get("content") for m in soup.find_all("meta")}
+    soup = BeautifulSoup(body, "lxml", from_encoding="utf-8")
+    for script in soup.find_all("script", type="application/ld+json"):
+        json.loads(script.string or "{}")
+    text = BeautifulSoup(body, "lxml", from_encoding="utf-8").get_text(" ")
+    re.findall(r"\(?\d{3}\)?[\s.-]?\d{3}[\s.-]\d{4}", text)
+
+
+def main() -> None:
+    """Time both approaches and print per-page costs."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    filler_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    page = make_page(filler_kb=filler_kb).replace("</head>", JSON_LD + "</head>")
+    body = page.encode("utf-8")
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        per_field(body)
+    separate = (time.perf_counter() - start) / iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        extract_page_data(body, 20, "utf-8")
+    single = (time.perf_counter() - start) / iterations
+
+    print(f"page size: {len(body) / 1024:.0f} KB")
+    print(f"per-field parses:    {separate * 1000:.1f} ms/page")
+    print(
+        f"extract_page_data(): {single * 1000:.1f} ms/page ({separate / single:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
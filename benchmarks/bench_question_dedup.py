@@ -0,0 +1,119 @@
+r"""
+Module/Script Name: bench_question_dedup.py
+Path: E:\projects\Project Tracking\benchmarks\bench_question_dedup.py
+
+Description:
+Scaling benchmark for text_dedup.collapse_questions() on synthetic PAA
+harvests in which many questions are rewordings of one another. Compares
+the prefix-indexed deduper with comparing every question against every
+kept question, and reports how many GPT-4 answers were avoided.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.01
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.01 - Annotated the all-pairs baseline's kept lists
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_question_dedup.py
+"""
+
+import random
+import time
+from typing import FrozenSet, List
+
+import fixture_server  # noqa: F401  (adds the repository root to sys.path)
+
+from text_dedup import DEFAULT_QUESTION_SIMILARITY, collapse_questions, question_tokens
+
+TEMPLATES = [
+    "How much does {s} {t} cost?",
+    "How much does an {s} {t} cost",
+    "How much do {s} {t}s cost in {c}?",
+    "Is {s} {t} worth it?",
+    "How long does {s} {t} take?",
+    "What is the best {s} {t} company in {c}?",
+    "Can I do {s} {t} myself?",
+    "Why is {s} {t} so expensive?",
+]
+SERVICES = [
+    f"{kind} {part}"
+    for kind in (
+        "hvac",
+        "ac",
+        "furnace",
+        "heat pump",
+        "boiler",
+        "duct",
+        "water heater",
+        "mini split",
+    )
+    for part in ("unit", "system", "coil", "fan", "motor", "valve", "line", "pump")
+]
+TASKS = ["repair", "replacement", "installation", "inspection", "cleaning"]
+CITIES = [f"city{i}" for i in range(40)]
+
+
+def make_questions(count: int, seed: int = 1) -> List[str]:
+    """Build a PAA-like harvest with many rewordings of the same question."""
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(
+            s=rng.choice(SERVICES), t=rng.choice(TASKS), c=rng.choice(CITIES)
+        )
+        for _ in range(count)
+    ]
+
+
+def collapse_all_pairs(questions: List[str], threshold: float) -> List[str]:
+    """Baseline: compare each question with every kept question."""
+    kept: List[str] = []
+    kept_tokens: List[FrozenSet[str]] = []
+    for question in questions:
+        tokens = question_tokens(question)
+        if not any(
+            len(tokens & other) / len(tokens | other) >= threshold
+            for other in kept_tokens
+        ):
+            kept.append(question)
+            kept_tokens.append(tokens)
+    return kept
+
+
+def main() -> None:
+    """Time question collapsing over 1k to 20k harvested questions."""
+    print(
+        f"{'questions':>9} {'kept':>6} {'avoided':>8} "
+        f"{'indexed s':>10} {'all-pairs s':>12}"
+    )
+    for count in (1000, 5000, 20000):
+        questions = make_questions(count)
+        start = time.perf_counter()
+        kept, report = collapse_questions(questions)
+        indexed = time.perf_counter() - start
+        baseline = "-"
+        if count <= 5000:
+            start = time.perf_counter()
+            assert collapse_all_pairs(questions, DEFAULT_QUESTION_SIMILARITY) == kept
+            baseline = f"{time.perf_counter() - start:.2f}"
+        print(
+            f"{count:>9} {len(kept):>6} {report.llm_calls_avoided:>8} "
+            f"{indexed:>10.2f} {baseline:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+r"""
+Module/Script Name: bench_scrape_many.py
+Path: E:\projects\Project Tracking\benchmarks\bench_scrape_many.py
+
+Description:
+Benchmark comparing a serial scrape_website_text() loop against the pooled,
+concurrent scrape_many() API on a local fixture server with injected latency.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_scrape_many.py [num_urls] [latency_seconds]
+"""
+
+import sys
+import time
+
+from fixture_server import make_page, start_server
+
+from scraper import scrape_many, scrape_website_text
+
+
+def main() -> None:
+    """Run the serial vs batch scraping benchmark and print timings."""
+    num_urls = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+
+    page = make_page().encode("utf-8")
+    pages = {
+        f"/service-{i}/": (page, "text/html; charset=utf-8") for i in range(num_urls)
+    }
+    server, base = start_server(pages, latency=latency)
+    urls = [base + path for path in pages]
+
+    try:
+        start = time.perf_counter()
+        serial = [scrape_website_text(u) for u in urls]
+        serial_time = time.perf_counter() - start
+        print(
+            f"serial scrape_website_text loop: {serial_time:.3f}s for {num_urls} URLs"
+        )
+
+        for concurrency in (1, 4, 8):
+            start = time.perf_counter()
+            results = scrape_many(urls, max_concurrency=concurrency)
+            batch_time = time.perf_counter() - start
+            assert [r.text for r in results] == serial
+            print(
+                f"scrape_many(max_concurrency={concurrency}): {batch_time:.3f}s "
+                f"({serial_time / batch_time:.1f}x vs serial)"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
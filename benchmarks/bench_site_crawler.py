@@ -0,0 +1,125 @@
+r"""
+Module/Script Name: bench_site_crawler.py
+Path: E:\projects\Project Tracking\benchmarks\bench_site_crawler.py
+
+Description:
+Benchmark for site_crawler.crawl_site() on fixture sites of growing size.
+Reports pages/sec and peak RSS growth so flat throughput and memory on sites
+with thousands of URLs can be checked.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_site_crawler.py
+"""
+
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Tuple
+
+from fixture_server import make_page, start_server
+
+from host_scheduler import HostScheduler
+from site_crawler import crawl_site
+
+SITEMAP_CHUNK = 1000
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def build_site(num_pages: int) -> Dict[str, Tuple[bytes, str]]:
+    """Build a fixture site with a sitemap index split into 1,000-URL sitemaps.
+
+    Args:
+        num_pages: Number of content pages.
+
+    Returns:
+        Mapping of path to (body, content type) for the fixture server.
+    """
+    xml = "application/xml"
+    html = "text/html; charset=utf-8"
+    pages: Dict[str, Tuple[bytes, str]] = {}
+    children = []
+    for chunk_start in range(0, num_pages, SITEMAP_CHUNK):
+        name = f"/page-sitemap{chunk_start // SITEMAP_CHUNK}.xml"
+        children.append(f"<sitemap><loc>{name}</loc></sitemap>")
+        locs = "".join(
+            f"<url><loc>/services/page-{i}/</loc></url>"
+            for i in range(chunk_start, min(num_pages, chunk_start + SITEMAP_CHUNK))
+        )
+        pages[name] = (f"<urlset {NS}>{locs}</urlset>".encode(), xml)
+    pages["/sitemap_index.xml"] = (
+        f"<sitemapindex {NS}>{''.join(children)}</sitemapindex>".encode(),
+        xml,
+    )
+    for i in range(num_pages):
+        body = make_page(paragraphs=10).replace("Fixture", f"Fixture {i}")
+        pages[f"/services/page-{i}/"] = (body.encode("utf-8"), html)
+    return pages
+
+
+def crawl(base: str) -> Tuple[float, float]:
+    """Crawl the fixture site in the current process.
+
+    Args:
+        base: Fixture server base URL.
+
+    Returns:
+        Tuple of (elapsed seconds, peak RSS growth in MiB).
+    """
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config = {
+            "name": "Bench HVAC",
+            "url": base + "/",
+            "output_root": tmpdir,
+            "sitemap_url": base + "/sitemap_index.xml",
+        }
+        start = time.perf_counter()
+        crawl_site(
+            config,
+            max_pages=100_000,
+            max_concurrency=8,
+            scheduler=HostScheduler(rate=None, respect_robots=False),
+        )
+        elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, (peak - baseline) / 1024
+
+
+def main() -> None:
+    """Crawl 500, 2,000 and 5,000 page sites and print throughput and memory."""
+    rows = []
+    for num_pages in (500, 2000, 5000):
+        server, base = start_server(build_site(num_pages))
+        try:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                elapsed, peak = pool.submit(crawl, base).result()
+        finally:
+            server.shutdown()
+        rows.append((num_pages, num_pages / elapsed, peak))
+
+    print(f"{'pages':>7} {'pages/sec':>10} {'peak MiB':>9}")
+    for num_pages, rate, peak in rows:
+        print(f"{num_pages:>7} {rate:>10.1f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
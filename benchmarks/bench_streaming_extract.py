@@ -0,0 +1,100 @@
+r"""
+Module/Script Name: bench_streaming_extract.py
+Path: E:\projects\Project Tracking\benchmarks\bench_streaming_extract.py
+
+Description:
+Benchmark comparing the full-download BeautifulSoup path against streaming
+early-exit extraction (stream=True) on large page-builder fixture pages.
+Reports time-to-result and peak RSS growth, each run in a fresh process.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_streaming_extract.py
+"""
+
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+
+from fixture_server import make_page, start_server
+
+from scraper import scrape_website_text
+
+
+def measure(url: str, stream: bool) -> Tuple[float, float, str]:
+    """Scrape one URL in the current process and record time and memory.
+
+    Args:
+        url: Fixture page URL.
+        stream: Whether to use streaming extraction.
+
+    Returns:
+        Tuple of (seconds, peak RSS growth in MiB, extracted text).
+    """
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    text = scrape_website_text(url, stream=stream)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, (peak - baseline) / 1024, text
+
+
+def measure_isolated(url: str, stream: bool) -> Tuple[float, float, str]:
+    """Run measure() in a fresh child process so peak RSS is not shared.
+
+    Args:
+        url: Fixture page URL.
+        stream: Whether to use streaming extraction.
+
+    Returns:
+        Tuple of (seconds, peak RSS growth in MiB, extracted text).
+    """
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(measure, url, stream).result()
+
+
+def main() -> None:
+    """Run the benchmark over 256 KB, 1 MB and 2 MB fixture pages."""
+    sizes_kb = (256, 1024, 2048)
+    pages = {
+        f"/page-{kb}kb/": (
+            make_page(filler_kb=kb).encode("utf-8"),
+            "text/html; charset=utf-8",
+        )
+        for kb in sizes_kb
+    }
+    server, base = start_server(pages)
+
+    try:
+        print(f"{'page':>10} {'mode':>8} {'seconds':>9} {'peak MiB':>9}")
+        for kb in sizes_kb:
+            url = f"{base}/page-{kb}kb/"
+            full = measure_isolated(url, stream=False)
+            streamed = measure_isolated(url, stream=True)
+            assert full[2] == streamed[2]
+            for mode, (seconds, peak, _) in (("full", full), ("stream", streamed)):
+                print(f"{kb:>8}KB {mode:>8} {seconds:>9.3f} {peak:>9.1f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+r"""
+Module/Script Name: bench_text_dedup.py
+Path: E:\projects\Project Tracking\benchmarks\bench_text_dedup.py
+
+Description:
+Scaling benchmark for text_dedup.dedupe_pages() on synthetic client sites
+where every page repeats the same CTA, testimonial and service-area blocks.
+Shows blocks/sec staying roughly constant as the block count grows.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release
+
+Usage:
+    python benchmarks/bench_text_dedup.py
+"""
+
+import random
+import time
+from typing import List
+
+import fixture_server  # noqa: F401  (adds the repository root to sys.path)
+
+from text_dedup import dedupe_pages
+
+
+def make_site(num_pages: int, seed: int = 1) -> List[List[str]]:
+    """Build pages of unique blocks plus lightly varied shared boilerplate.
+
+    Args:
+        num_pages: Number of pages.
+        seed: Random seed.
+
+    Returns:
+        One list of text blocks per page.
+    """
+    rng = random.Random(seed)
+    vocab = [f"word{i}" for i in range(5000)]
+    boilerplate = [" ".join(rng.choices(vocab, k=35)) for _ in range(8)]
+    pages = []
+    for _ in range(num_pages):
+        unique = [" ".join(rng.choices(vocab, k=35)) for _ in range(12)]
+        shared = [b if rng.random() < 0.5 else b + " today" for b in boilerplate]
+        pages.append(unique + shared)
+    return pages
+
+
+def main() -> None:
+    """Time deduplication over 1k to 20k blocks."""
+    print(
+        f"{'blocks':>7} {'seconds':>8} {'blocks/sec':>11} {'removed':>8} {'tokens saved':>13}"
+    )
+    for num_pages in (50, 200, 500, 1000):
+        pages = make_site(num_pages)
+        start = time.perf_counter()
+        _, report = dedupe_pages(pages)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{report.blocks_in:>7} {elapsed:>8.2f} {report.blocks_in / elapsed:>11.0f} "
+            f"{report.blocks_removed:>8} {report.tokens_saved:>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+r"""
+Module/Script Name: fixture_server.py
+Path: E:\projects\Project Tracking\benchmarks\fixture_server.py
+
+Description:
+Local threaded HTTP server used by the benchmark scripts. Serves generated
+HTML fixture pages with optional injected latency so network-bound code can
+be measured without touching client sites, and fakes the OpenAI
+chat-completions endpoint for the answer-generation benchmarks and the
+files/batches endpoints for the offline batch mode.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.03
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.03 - Base URLs decode the bound host instead of formatting bytes
+* v1.02 - Added a stand-in for the OpenAI files and Batch API
+* v1.01 - Added an OpenAI-compatible chat-completions fake
+* v1.00 - Initial release with latency-injecting fixture server
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Make the repository modules importable when run as a script
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    """Return the ``http://host:port`` URL a started server is bound to."""
+    host, port = server.server_address[:2]
+    if isinstance(host, bytes):
+        host = host.decode("ascii")
+    return f"http://{host}:{port}"
+
+
+def make_page(paragraphs: int = 40, filler_kb: int = 0) -> str:
+    """Build a WordPress-style fixture page.
+
+    Args:
+        paragraphs: Number of content paragraphs in the body.
+        filler_kb: Approximate kilobytes of page-builder markup (inline
+            scripts, styles and nested divs) appended after the content.
+
+    Returns:
+        HTML document as a string.
+    """
+    body = "\n".join(
+        f"<p>Service paragraph {i} about heating and cooling repair.</p>"
+        for i in range(paragraphs)
+    )
+    filler_unit = (
+        '<div class="elementor-widget"><div class="inner"><span>x</span></div></div>'
+        "<script>var a = 1;</script><style>.x{color:red}</style>\n"
+    )
+    filler = filler_unit * max(0, (filler_kb * 1024) // len(filler_unit))
+    return (
+        "<!DOCTYPE html><html><head><title>Fixture</title></head><body>"
+        "<header><nav>Home | Services | Contact</nav></header>"
+        f"<h1>Fixture Heating &amp; Cooling</h1>{body}{filler}"
+        "<footer>Copyright</footer></body></html>"
+    )
+
+
+def start_server(
+    pages: Dict[str, Tuple[bytes, str]], latency: float = 0.0
+) -> Tuple[ThreadingHTTPServer, str]:
+    """Start a fixture server in a daemon thread.
+
+    Args:
+        pages: Mapping of request path to (body bytes, content type).
+        latency: Seconds to sleep before answering each request.
+
+    Returns:
+        Tuple of (server, base URL). Call server.shutdown() when finished.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Buffer headers and body into one write; avoids Nagle/delayed-ACK
+        # stalls on keep-alive connections that would skew timings.
+        wbufsize = 64 * 1024
+
+        def do_GET(self) -> None:
+            if latency:
+                time.sleep(latency)
+            body, content_type = pages.get(self.path, (b"not found", "text/plain"))
+            self.send_response(200 if self.path in pages else 404)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def handle(self) -> None:
+            try:
+                super().handle()
+            except (BrokenPipeError, ConnectionResetError):
+                # Streaming clients hang up early by design
+                pass
+
+        def log_message(self, format: str, *args: object) -> None:
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, base_url(server)
+
+
+def start_fake_openai(
+    latency: float,
+    cap: int = 1000,
+    reply: Optional[Callable[[Dict[str, Any]], str]] = None,
+) -> Tuple[ThreadingHTTPServer, str, Dict[str, int]]:
+    """Start a chat-completions server that throttles above ``cap`` requests.
+
+    Requests over the concurrency cap get a 429 with retry-after-ms, like
+    the real API under a per-minute limit.
+
+    Args:
+        latency: Seconds each accepted completion takes.
+        cap: Concurrent requests served before answering 429.
+        reply: Builds the completion text from the request JSON. Defaults
+            to echoing the last message.
+
+    Returns:
+        Tuple of (server, base URL, counters). Counters hold "ok",
+        "throttled" and "prompt_chars" (characters across all messages of
+        accepted requests). Pass base + "/v1" as the client's base_url.
+    """
+    counters = {"ok": 0, "throttled": 0, "prompt_chars": 0, "active": 0}
+    lock = threading.Lock()
+    make_reply: Callable[[Dict[str, Any]], str] = reply or (
+        lambda request: "Answer to " + request["messages"][-1]["content"]
+    )
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        wbufsize = 64 * 1024
+
+        def do_POST(self) -> None:
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with lock:
+                throttled = counters["active"] >= cap
+                if throttled:
+                    counters["throttled"] += 1
+                else:
+                    counters["active"] += 1
+            if throttled:
+                body = json.dumps(
+                    {"error": {"message": "Rate limit reached", "code": None}}
+                ).encode()
+                self._send(429, body, {"retry-after-ms": str(int(latency * 500))})
+                return
+            time.sleep(latency)
+            with lock:
+                counters["active"] -= 1
+                counters["ok"] += 1
+                counters["prompt_chars"] += sum(
+                    len(m["content"]) for m in request["messages"]
+                )
+            body = json.dumps(
+                {
+                    "id": "chatcmpl-fixture",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request["model"],
+                    "choices": [
+                        {
+                            "index": 0,
+                            "finish_reason": "stop",
+                            "message": {
+                                "role": "assistant",
+                                "content": make_reply(request),
+                            },
+                        }
+                    ],
+                }
+            ).encode()
+            self._send(200, body, {})
+
+        def _send(self, status: int, body: bytes, headers: Dict[str, str]) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, base_url(server), counters
+
+
+def start_fake_batch_api(
+    reply: Optional[Callable[[Dict[str, Any]], str]] = None,
+    fail: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    polls_until_done: int = 1,
+) -> Tuple[ThreadingHTTPServer, str, Dict[str, int]]:
+    """Start a stand-in for the OpenAI files and Batch API endpoints.
+
+    Supports POST /v1/files (multipart upload), POST /v1/batches,
+    GET /v1/batches/{id} and GET /v1/files/{id}/content. Uploaded and
+    result files are kept in a temporary folder and read line by line, so
+    the server does not hold large batches in memory.
+
+    Args:
+        reply: Builds the completion text from a request body. Defaults to
+            echoing the last message.
+        fail: Returns True for request bodies that should get a 500
+            result line. Defaults to never.
+        polls_until_done: Times a batch is reported "in_progress" before
+            it is processed and "completed". Defaults to 1.
+
+    Returns:
+        Tuple of (server, base URL, counters). Counters hold "uploads",
+        "batches", "requests" and "polls". Pass base + "/v1" as the
+        client's base_url.
+    """
+    counters = {"uploads": 0, "batches": 0, "requests": 0, "polls": 0}
+    lock = threading.Lock()
+    folder = tempfile.mkdtemp(prefix="fake_batch_")
+    files: Dict[str, str] = {}
+    batches: Dict[str, Dict[str, Any]] = {}
+    reply = reply or (lambda body: "Answer to " + body["messages"][-1]["content"])
+    fail = fail or (lambda body: False)
+
+    def process(batch: Dict[str, Any]) -> None:
+        output_id = f"file-out-{batch['id']}"
+        output = os.path.join(folder, output_id)
+        done = failed = 0
+        with open(files[batch["input_file_id"]], "r", encoding="utf-8") as src:
+            with open(output, "w", encoding="utf-8") as dst:
+                for i, line in enumerate(src):
+                    request = json.loads(line)
+                    body = request["body"]
+                    if fail(body):
+                        failed += 1
+                        response = {"status_code": 500, "body": {"error": "fake"}}
+                    else:
+                        done += 1
+                        content = reply(body)
+                        response = {
+                            "status_code": 200,
+                            "request_id": f"req-{i}",
+                            "body": {
+                                "id": f"chatcmpl-{i}",
+                                "object": "chat.completion",
+                                "model": body["model"],
+                                "choices": [
+                                    {
+                                        "index": 0,
+                                        "finish_reason": "stop",
+                                        "message": {
+                                            "role": "assistant",
+                                            "content": content,
+                                        },
+                                    }
+                                ],
+                                "usage": {"total_tokens": len(line) // 4},
+                            },
+                        }
+                    record = {
+                        "id": f"batch_req_{i}",
+                        "custom_id": request["custom_id"],
+                        "response": response,
+                        "error": None,
+                    }
+                    dst.write(json.dumps(record) + "\n")
+        files[output_id] = output
+        with lock:
+            counters["requests"] += done + failed
+        batch.update(
+            status="completed",
+            output_file_id=output_id,
+            request_counts={
+                "total": done + failed,
+                "completed": done,
+                "failed": failed,
+            },
+        )
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            length = int(self.headers["Content-Length"])
+            if self.path == "/v1/files":
+                self._upload(length)
+            elif self.path == "/v1/batches":
+                request = json.loads(self.rfile.read(length))
+                with lock:
+                    counters["batches"] += 1
+                    batch_id = f"batch_{counters['batches']}"
+                batch = {
+                    "id": batch_id,
+                    "object": "batch",
+                    "endpoint": request["endpoint"],
+                    "input_file_id": request["input_file_id"],
+                    "completion_window": request["completion_window"],
+                    "created_at": int(time.time()),
+                    "status": "validating",
+                    "polls": 0,
+                }
+                batches[batch_id] = batch
+                self._json(batch)
+            else:
+                self._json({"error": {"message": "not found"}}, 404)
+
+        def do_GET(self) -> None:
+            parts = self.path.strip("/").split("/")
+            if parts[:2] == ["v1", "batches"] and parts[2] in batches:
+                batch = batches[parts[2]]
+                with lock:
+                    counters["polls"] += 1
+                batch["polls"] += 1
+                if batch["status"] != "completed":
+                    if batch["polls"] > polls_until_done:
+                        process(batch)
+                    else:
+                        batch["status"] = "in_progress"
+                self._json(batch)
+            elif parts[:2] == ["v1", "files"] and parts[-1] == "content":
+                path = files[parts[2]]
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(os.path.getsize(path)))
+                self.end_headers()
+                with open(path, "rb") as f:
+                    while True:
+                        block = f.read(64 * 1024)
+                        if not block:
+                            break
+                        self.wfile.write(block)
+            else:
+                self._json({"error": {"message": "not found"}}, 404)
+
+        def _upload(self, length: int) -> None:
+            head = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n"
+            message = BytesParser(policy=HTTP).parsebytes(
+                head.encode() + self.rfile.read(length)
+            )
+            fields = {
+                part.get_param("name", header="content-disposition"): part
+                for part in message.iter_parts()
+            }
+            data = fields["file"].get_payload(decode=True)
+            if not isinstance(data, bytes):
+                self._json({"error": {"message": "file part is not a file"}}, 400)
+                return
+            with lock:
+                counters["uploads"] += 1
+                file_id = f"file-{counters['uploads']}"
+            path = os.path.join(folder, file_id)
+            with open(path, "wb") as f:
+                f.write(data)
+            files[file_id] = path
+            self._json(
+                {
+                    "id": file_id,
+                    "object": "file",
+                    "bytes": len(data),
+                    "created_at": int(time.time()),
+                    "filename": fields["file"].get_filename() or file_id,
+                    "purpose": fields["purpose"].get_content().strip(),
+                    "status": "processed",
+                }
+            )
+
+        def _json(self, data: Dict[str, Any], status: int = 200) -> None:
+            body = json.dumps(data).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, base_url(server), counters
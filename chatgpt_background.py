@@ -5,6 +5,7 @@ Path: E:\projects\Project Tracking\chatgpt_background.py
 Description:
 Generates business background summaries using OpenAI GPT-4. Scrapes website content
 and creates comprehensive service and background information documents for SEO clients.
+Large sites are summarized chunk by chunk within a token budget (see summarizer).
 
 Author(s):
 Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
@@ -13,33 +14,59 @@ Created Date:
 2024-01-15
 
 Last Modified Date:
-2025-10-23
+2026-10-18
 
 Version:
-v1.02
+v1.09
 
 License:
 CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
 
 Comments:
+* v1.09 - pending_summary_messages() compiles the first stage for batch_jobs
+* v1.08 - Completions served from the shared LLM cache; shared OpenAI client
+* v1.07 - Final summary streamed to an optional LiveOutput (GUI)
+* v1.06 - Token-budgeted map-reduce summary with per-stage token/latency report
+* v1.05 - Scrapes through the shared per-host scheduler
+* v1.04 - Uses the crawled site corpus when corpus_file is configured
+* v1.03 - Scrapes through the persistent ScrapeCache
 * v1.02 - Added type hints and Google-style docstrings
 * v1.01 - Added standardized file header and ASCII-only output
 * v1.00 - Initial release with GPT-4 background generation
 """
 
 import os
-from typing import Dict, Any
-from openai import OpenAI
+from typing import Dict, Any, List, Optional, Tuple
 from dotenv import load_dotenv
 from docx import Document  # type: ignore[import-not-found]
+from host_scheduler import default_scheduler
+from live_output import LiveOutput
+from llm_cache import llm_cache_for_config
+from llm_client import default_client
 from scraper import scrape_website_text
+from scrape_cache import ScrapeCache
+from site_crawler import corpus_text
+from summarizer import first_stage_requests, summarize_text
 
 # Load API Key from .env
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = default_client()
 
+BACKGROUND_INSTRUCTIONS = (
+    "Based on the following website content, provide a summary of services\n"
+    "and background information for this HVAC company."
+)
 
-def run(client_config: Dict[str, Any]) -> None:
+# LiveOutput label of the streamed summary
+BACKGROUND_LABEL = "Background summary"
+
+# Input caps; the summarizer chunks whatever is read, so these only bound
+# the cost of very large sites
+BACKGROUND_MAX_PARAGRAPHS = 400
+BACKGROUND_CORPUS_CHARS = 200000
+
+
+def run(client_config: Dict[str, Any], live: Optional[LiveOutput] = None) -> None:
     """Generate business background summary document using GPT-4.
 
     Scrapes website content and uses OpenAI GPT-4 to create a comprehensive
@@ -47,8 +74,9 @@ def run(client_config: Dict[str, Any]) -> None:
 
     Workflow:
     1. Scrapes text from client website URL
-    2. Sends scraped content to GPT-4 with business context
-    3. Generates professional background summary
+    2. Splits the content into token-budgeted chunks and summarizes them
+       concurrently with GPT-4 (a single call when it fits one prompt)
+    3. Merges the chunk summaries into a professional background summary
     4. Saves summary to DOCX file in client output directory
 
     Args:
@@ -57,6 +85,14 @@ def run(client_config: Dict[str, Any]) -> None:
             - address (str, optional): Business address. Defaults to "Unknown"
             - url (str, optional): Website URL to scrape. Defaults to ""
             - output_root (str): Base output directory path
+            - corpus_file (str, optional): Site corpus from site_crawler.
+              Used instead of scraping the single URL when present.
+            - cache_llm (bool, optional): Serve identical completions from
+              the shared LLM cache. Defaults to True.
+            - refresh_llm_cache (bool, optional): Regenerate every
+              completion and overwrite the cached ones. Defaults to False.
+        live: Optional LiveOutput; the final summary text is streamed to
+            it under BACKGROUND_LABEL as it is generated.
 
     Returns:
         None. Writes DOCX file to: {output_root}/{name}/{name} background information.docx
@@ -73,8 +109,6 @@ def run(client_config: Dict[str, Any]) -> None:
         Saved background info to ./output/ABC Heating & Cooling/ABC Heating & Cooling background information.docx
     """
     client_name = client_config["name"]
-    address = client_config.get("address", "Unknown")
-    url = client_config.get("url", "").strip()
     base_output = client_config["output_root"]
 
     if not base_output.lower().endswith(client_name.lower()):
@@ -84,31 +118,38 @@ def run(client_config: Dict[str, Any]) -> None:
 
     os.makedirs(output_path, exist_ok=True)
 
-    # Scrape site content
-    site_text = scrape_website_text(url)
-
-    # Use triple quotes to avoid escape hell
-    prompt = f"""Based on the following website content, provide a summary of services
-and background information for this HVAC company.
-
-Business Name: {client_name}
-Address: {address}
-Website Content:
-{site_text}
-"""
+    site_text = load_site_text(client_config)
 
     print(f"Generating background summary for {client_name}...")
 
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": "You are an SEO assistant."},
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0.7,
+    llm_cache = llm_cache_for_config(client_config)
+    if live:
+        live.start(BACKGROUND_LABEL)
+    try:
+        summary, report = summarize_text(
+            site_text,
+            BACKGROUND_INSTRUCTIONS,
+            header=_header(client_config),
+            client=client,
+            on_token=live.writer(BACKGROUND_LABEL) if live else None,
+            cache=llm_cache,
+        )
+    except Exception as e:
+        if live:
+            live.end(BACKGROUND_LABEL, str(e))
+        raise
+    if live:
+        live.end(BACKGROUND_LABEL)
+    print(
+        f"[INFO] Background summary: {report.chunks} chunks, {report.calls} calls, "
+        f"~{report.tokens:,} tokens, {report.seconds:.1f}s"
     )
-
-    summary = response.choices[0].message.content
+    if llm_cache is not None:
+        stats = llm_cache.stats()
+        print(
+            f"[INFO] LLM cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"~{stats['tokens_saved']:,} tokens saved this session"
+        )
 
     doc = Document()
     doc.add_heading(f"{client_name} – Background Information", 0)
@@ -119,3 +160,59 @@ Website Content:
     doc.save(output_file)
 
     print(f"Saved background info to {output_file}")
+
+
+def _header(client_config: Dict[str, Any]) -> str:
+    """Return the business lines placed above the site content."""
+    address = client_config.get("address", "Unknown")
+    return f"Business Name: {client_config['name']}\nAddress: {address}"
+
+
+def load_site_text(client_config: Dict[str, Any]) -> str:
+    """Return the site text a background summary is written from.
+
+    Reads the crawled corpus_file when present, otherwise scrapes the url
+    (unchanged pages are served from the local ScrapeCache).
+
+    Args:
+        client_config: Configuration dictionary, as for run().
+
+    Returns:
+        Site text, one block per line.
+    """
+    corpus_file = client_config.get("corpus_file")
+    if corpus_file and os.path.exists(corpus_file):
+        return corpus_text(corpus_file, max_chars=BACKGROUND_CORPUS_CHARS)
+    cache = ScrapeCache()
+    try:
+        return scrape_website_text(
+            client_config.get("url", "").strip(),
+            max_paragraphs=BACKGROUND_MAX_PARAGRAPHS,
+            cache=cache,
+            scheduler=default_scheduler(),
+        )
+    finally:
+        cache.close()
+
+
+def pending_summary_messages(
+    client_config: Dict[str, Any],
+) -> Tuple[List[List[Dict[str, str]]], Dict[str, Any]]:
+    """Return the first requests run() would send for a client's summary.
+
+    These are the exact messages of the summarizer's first stage (see
+    summarizer.first_stage_requests), so batch_jobs can submit them
+    offline and a later run() finds them in the LLM cache. For sites
+    larger than one chunk the merge and final calls still run live.
+
+    Args:
+        client_config: Configuration dictionary, as for run().
+
+    Returns:
+        Tuple of (one message list per request, sampling parameters).
+    """
+    return first_stage_requests(
+        load_site_text(client_config),
+        BACKGROUND_INSTRUCTIONS,
+        header=_header(client_config),
+    )
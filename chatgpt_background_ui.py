@@ -5,6 +5,7 @@ Path: E:\projects\Project Tracking\chatgpt_background_ui.py
 Description:
 Tkinter UI tab for the Business Background Summary Generator. Provides form
 inputs for client configuration and triggers GPT-4 background summary generation.
+The summary is shown live as it streams in, with time-to-first-token and total time.
 
 Author(s):
 Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
@@ -13,23 +14,26 @@ Created Date:
 2026-04-23
 
 Last Modified Date:
-2026-04-23
+2026-10-18
 
 Version:
-v1.00
+v1.02
 
 License:
 CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
 
 Comments:
+* v1.02 - Status updates go through a typed _set_status() method
+* v1.01 - Live streamed summary output with first-token and total time
 * v1.00 - Initial release with Tkinter UI tab for BackgroundSummaryTab
 """
 
 import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, scrolledtext
 
 from chatgpt_background import run
+from live_output import LiveTextView
 
 
 class BackgroundSummaryTab:
@@ -51,6 +55,9 @@ class BackgroundSummaryTab:
         url_entry: Entry field for website URL.
         output_root_entry: Entry field for output directory path.
         run_btn: Button to trigger summary generation.
+        status_label: Time-to-first-token and total time of the run.
+        output_text: Summary text, filled in live as it streams.
+        view: LiveTextView rendering the streamed summary.
     """
 
     def __init__(self, parent: tk.Widget) -> None:
@@ -103,12 +110,36 @@ class BackgroundSummaryTab:
         ttk.Button(self.frame, text="Help", command=self.show_help).grid(
             row=row, column=0, columnspan=2
         )
+        row += 1
+
+        self.status_label = ttk.Label(self.frame, text="")
+        self.status_label.grid(row=row, column=0, columnspan=2, pady=5)
+        row += 1
+
+        self.output_text = scrolledtext.ScrolledText(
+            self.frame, width=80, height=16, wrap="word"
+        )
+        self.output_text.grid(row=row, column=0, columnspan=2, padx=5, pady=5)
+        self.view = LiveTextView(
+            self.output_text,
+            on_status=self._set_status,
+            headings=False,
+        )
+
+    def _set_status(self, text: str) -> None:
+        """Show the live output's timing status under the form.
+
+        Args:
+            text: Status line from LiveTextView.
+        """
+        self.status_label.config(text=text)
 
     def run_summary(self) -> None:
         """Validate inputs and launch background summary generation in a thread.
 
         Disables the run button during execution to prevent duplicate runs.
-        Shows a completion or error dialog when finished.
+        The summary streams into the output box as it is generated; a
+        completion or error dialog is shown when finished.
         """
         name = self.name_entry.get().strip()
         address = self.address_entry.get().strip()
@@ -130,10 +161,11 @@ class BackgroundSummaryTab:
         }
 
         self.run_btn.config(state="disabled", text="Generating...")
+        live = self.view.begin()
 
         def task() -> None:
             try:
-                run(client_config)
+                run(client_config, live)
                 self.frame.after(
                     0,
                     lambda: messagebox.showinfo(
@@ -148,6 +180,7 @@ class BackgroundSummaryTab:
                     lambda: messagebox.showerror("Error", err),
                 )
             finally:
+                self.frame.after(0, self.view.finish)
                 self.frame.after(
                     0,
                     lambda: self.run_btn.config(
@@ -13,21 +13,25 @@ Created Date:
 2024-01-15
 
 Last Modified Date:
-2025-10-23
+2026-10-18
 
 Version:
-v1.02
+v1.03
 
 License:
 CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
 
 Comments:
+* v1.03 - Added fan-out city list and location-mention matching
 * v1.02 - Added type hints and Google-style docstrings
 * v1.01 - Added standardized file header
 * v1.00 - Initial release with dummy city generation logic
 """
 
-from typing import Dict, Any, List
+import re
+from typing import Dict, Any, List, Pattern
+
+from uule_encoder import US_STATE_ABBREVIATIONS
 
 
 def handle_city_inputs(config: Dict[str, Any]) -> Dict[str, Any]:
@@ -57,3 +61,61 @@ def handle_city_inputs(config: Dict[str, Any]) -> Dict[str, Any]:
     config["nearby_10mi"] = generated_10mi
     config["nearby_20mi"] = generated_20mi
     return config
+
+
+def fanout_cities(config: Dict[str, Any]) -> List[str]:
+    """List the primary city followed by its nearby cities.
+
+    Nearby cities are generated with handle_city_inputs() unless the
+    configuration already lists them.
+
+    Args:
+        config: Client configuration dictionary with 'city' key.
+
+    Returns:
+        Primary city, then 10mi and 20mi cities, without duplicates.
+
+    Example:
+        >>> fanout_cities({"city": "Austin"})
+        ['Austin', 'Austin Heights', 'Austin North', 'Austin Valley', 'Austin Junction']
+    """
+    if "nearby_10mi" not in config or "nearby_20mi" not in config:
+        handle_city_inputs(config)
+    cities: List[str] = []
+    for city in (
+        [config.get("city", "")] + config["nearby_10mi"] + config["nearby_20mi"]
+    ):
+        city = city.strip()
+        if city and city.lower() not in (c.lower() for c in cities):
+            cities.append(city)
+    return cities
+
+
+def location_pattern(cities: List[str], state: str) -> Pattern[str]:
+    """Compile a pattern that finds a mention of any of the cities or the state.
+
+    City and full state names match in any case; the state abbreviation
+    only matches in capitals so "in"/"or"/"me" in a question do not count.
+
+    Args:
+        cities: City names, e.g. from fanout_cities().
+        state: State abbreviation or name (e.g. "MI").
+
+    Returns:
+        Compiled pattern; ``pattern.search(question)`` is truthy when the
+        question names a location.
+
+    Example:
+        >>> pattern = location_pattern(["Adrian"], "MI")
+        >>> bool(pattern.search("Who fixes furnaces in Adrian?"))
+        True
+    """
+    names = [c for c in cities if c]
+    abbreviation = state.strip().upper()
+    names.append(US_STATE_ABBREVIATIONS.get(abbreviation, state.strip()))
+    # Longest first so "Adrian Heights" wins over "Adrian"
+    names = sorted({n for n in names if n}, key=len, reverse=True)
+    alternatives = [rf"(?i:\b{re.escape(name)}\b)" for name in names]
+    if abbreviation in US_STATE_ABBREVIATIONS:
+        alternatives.append(rf"\b{abbreviation}\b")
+    return re.compile("|".join(alternatives) or r"(?!)")
@@ -13,47 +13,182 @@ Created Date:
 2025-04-03
 
 Last Modified Date:
-2025-10-23
+2026-10-18
 
 Version:
-v1.06
+v1.30
 
 License:
 CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
 
 Comments:
+* v1.30 - Multi-location runs plan each city's searches with its own planner
+* v1.29 - The search that fills the quota records its full new-question yield
+* v1.28 - Answers served from the answer cache reach on_answer (and the journal)
+* v1.27 - Run summaries count geo targets missing from the bundled geotargets table
+* v1.26 - Searches still running at early exit are archived before returning
+* v1.25 - Multi-location: local questions answered per city; one SerpAPI bound
+* v1.24 - Cross-client answer reuse is opt-in (reuse_answers defaults to False)
+* v1.23 - pending_answer_messages() compiles a run's requests for batch_jobs
+* v1.22 - Completions served from the shared LLM cache; shared OpenAI client
+* v1.21 - Answers can stream token by token to a LiveOutput (GUI)
+* v1.20 - Every paid SerpAPI response archived per client (serp_archive)
+* v1.19 - Multi-location mode: one FAQ page per nearby city, shared answers
+* v1.18 - PAA searches scheduled by the yield-aware query planner
+* v1.17 - FAQ HTML streamed and escaped via faq_html, optional minify/.gz
+* v1.16 - Runs checkpointed to a journal in the output folder and resumed
+* v1.15 - Answers reused across clients through the templated answer cache
+* v1.14 - Near-duplicate PAA questions collapsed before answering
+* v1.13 - Optional batched answering (JSON array per token-budgeted batch)
+* v1.12 - Answers generated concurrently with rate-limit-aware retries
+* v1.11 - SerpAPI searches served from the TTL'd SERP cache
+* v1.10 - resolve_uule() encodes bundled locations offline first
+* v1.09 - resolve_uule() served from the persistent uule cache
+* v1.08 - PAA searches run concurrently with early cancellation
+* v1.07 - Answers can draw on the crawled site corpus (corpus_file)
 * v1.06 - Added type hints and Google-style docstrings
 * v1.05 - Added standardized file header, removed emojis (Windows compat)
 * v1.04 - Removed broken location param from final SerpAPI query
 * v1.04 - Fully relies on resolved uule for geo-targeting
 """
 
+import json
 import os
-from typing import Dict, Any, List, Tuple, Optional
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Callable, Dict, Any, List, Pattern, Sequence, Tuple, Optional
 import requests  # type: ignore[import-untyped]
-from openai import OpenAI
 from dotenv import load_dotenv
+from faq_html import FaqHtmlWriter
+from faq_journal import FaqJournal
+from live_output import LiveOutput
+from answer_cache import DEFAULT_NICHE, AnswerCache, default_answer_cache
+from city_utils import fanout_cities, location_pattern
+from llm_cache import LLMCache, llm_cache_for_config
+from llm_client import (
+    MAX_LLM_CONCURRENCY,
+    chat_completion,
+    default_client,
+    map_ordered,
+)
+from query_planner import (
+    LOCAL_VARIANT_TEMPLATES,
+    VARIANT_TEMPLATES,
+    PlannedQuery,
+    QueryPlanner,
+    default_query_planner,
+)
+from scraper import create_session
+from serp_archive import SerpArchive, client_archive_path
+from serp_cache import SerpCache, default_serp_cache
+from site_crawler import corpus_text
+from text_dedup import DEFAULT_QUESTION_SIMILARITY, QuestionDeduper, estimate_tokens
+from uule_cache import default_uule_cache, geo_targets_from_configs
+from uule_encoder import offline_uule
 
 # Load environment variables
 load_dotenv()
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+client = default_client()
 
+SERPAPI_SEARCH_URL = "https://serpapi.com/search"
+SERPAPI_LOCATIONS_URL = "https://serpapi.com/locations.json"
 
-def resolve_uule(geo_target: str) -> Optional[str]:
-    """Resolve geographic location to Google UULE (Unique User Location Encoding).
+# Seconds to wait for one SerpAPI search before giving up on it
+SERPAPI_TIMEOUT = 30
+
+# Maximum SerpAPI searches in flight per fetch_paa_questions() call
+MAX_SERP_CONCURRENCY = 6
+
+ANSWER_MODEL = "gpt-4"
+
+ANSWER_SYSTEM_PROMPT = (
+    "You are a helpful, local HVAC expert providing SEO-optimized, "
+    "conversational answers."
+)
+
+# Expected completion tokens per answer, used to size answer batches
+ANSWER_TOKEN_ESTIMATE = 220
+
+# Completion-token budget for one batched answer request (~10 questions)
+ANSWER_BATCH_TOKEN_BUDGET = 2400
+
+_serp_session: Optional[requests.Session] = None
+_serp_session_lock = threading.Lock()
+
+
+def _get_serp_session() -> requests.Session:
+    """Return the pooled keep-alive session shared by all SerpAPI calls."""
+    global _serp_session
+    with _serp_session_lock:
+        if _serp_session is None:
+            _serp_session = create_session(MAX_SERP_CONCURRENCY)
+        return _serp_session
+
+
+def _search_serp(
+    session: requests.Session,
+    params: Dict[str, Any],
+    cache: Optional[SerpCache] = None,
+    archive: Optional[SerpArchive] = None,
+) -> Optional[Dict[str, Any]]:
+    """Run one SerpAPI search, answering from the SERP cache when fresh.
 
     Args:
-        geo_target: Location string (e.g., "Adrian, MI", "Phoenix, AZ").
+        session: Pooled session to send the request through.
+        params: SerpAPI query parameters, including api_key.
+        cache: Optional SerpCache; successful responses are stored in it.
+        archive: Optional client SerpArchive; every response, cached or
+            fresh, is recorded in it.
 
     Returns:
-        UULE code string for SerpAPI geo-targeting, or None if resolution fails.
+        Parsed JSON response, or None if the request failed, the body was
+        not JSON, or SerpAPI reported an error.
+    """
+    if cache is not None:
+        data = cache.get(params)
+        if data is not None:
+            print(f"Cached result for variant: {params['q']} (start={params['start']})")
+            if archive is not None:
+                archive.record(params, data)
+            return data
 
-    Example:
-        >>> resolve_uule("Phoenix, AZ")
-        'w+CAIQICI...'
+    print(f"Fetching for variant: {params['q']} (start={params['start']})")
+    try:
+        res = session.get(SERPAPI_SEARCH_URL, params=params, timeout=SERPAPI_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"[ERROR] SerpAPI request failed for {params['q']}: {e}")
+        return None
+    print("SerpAPI status code:", res.status_code)
+
+    try:
+        data = res.json()
+    except Exception as e:
+        print("Error decoding SerpAPI response:", e)
+        return None
+
+    if "error" in data:
+        print("SerpAPI error:", data["error"])
+        return None
+    if cache is not None:
+        cache.put(params, data)
+    if archive is not None:
+        archive.record(params, data)
+    return data
+
+
+def fetch_uule(geo_target: str) -> Optional[str]:
+    """Look up a location's uule from the SerpAPI locations API.
+
+    Args:
+        geo_target: Location string (e.g., "Adrian, MI").
+
+    Returns:
+        UULE code string, or None if the lookup fails.
     """
     print(f"[INFO] Resolving uule for: {geo_target}")
     try:
@@ -62,7 +197,9 @@ def resolve_uule(geo_target: str) -> Optional[str]:
             "limit": 1,
             "api_key": SERPAPI_KEY,
         }
-        res = requests.get("https://serpapi.com/locations.json", params=loc_params)  # type: ignore[arg-type]
+        res = _get_serp_session().get(
+            SERPAPI_LOCATIONS_URL, params=loc_params, timeout=SERPAPI_TIMEOUT
+        )
         data = res.json()
         if data and isinstance(data, list) and "uule" in data[0]:
             print(f"[SUCCESS] uule found: {data[0]['uule']}")
@@ -75,22 +212,96 @@ def resolve_uule(geo_target: str) -> Optional[str]:
         return None
 
 
+def resolve_uule(geo_target: str) -> Optional[str]:
+    """Resolve geographic location to Google UULE (Unique User Location Encoding).
+
+    Locations in the bundled geotargets table are encoded locally with no
+    network call. Others (most small towns; the bundled table only covers
+    states and larger cities) are served from the persistent uule cache,
+    and SerpAPI is only called the first time such a geo target is seen.
+
+    Args:
+        geo_target: Location string (e.g., "Adrian, MI", "Phoenix, AZ").
+
+    Returns:
+        UULE code string for SerpAPI geo-targeting, or None if resolution fails.
+
+    Example:
+        >>> resolve_uule("Phoenix, AZ")
+        'w+CAIQICI...'
+    """
+    uule = offline_uule(geo_target)
+    if uule:
+        return uule
+    return default_uule_cache().resolve(geo_target, fetch_uule)
+
+
+def prewarm_uule_cache(client_configs: List[Dict[str, Any]]) -> int:
+    """Resolve and cache the uule for every client's city ahead of FAQ runs.
+
+    Args:
+        client_configs: Client configuration dictionaries with city and state.
+
+    Returns:
+        Number of client geo targets that now resolve without SerpAPI.
+    """
+    targets = geo_targets_from_configs(client_configs)
+    # Locations in the bundled table are encoded offline and never cached
+    remote = [target for target in targets if not offline_uule(target)]
+    cached = len(targets) - len(remote)
+    cached += default_uule_cache().prewarm(remote, fetch_uule)
+    print(
+        f"[INFO] uule cache warm for {cached}/{len(targets)} locations "
+        f"({len(remote)} not in the bundled geotargets table)"
+    )
+    return cached
+
+
 def fetch_paa_questions(
     seed_keyword: str,
     location: str = "us",
     max_questions: int = 20,
     geo_target: str = "Adrian, MI",
+    max_concurrency: int = MAX_SERP_CONCURRENCY,
+    serp_cache: Optional[SerpCache] = None,
+    similarity: Optional[float] = DEFAULT_QUESTION_SIMILARITY,
+    planner: Optional[QueryPlanner] = None,
+    templates: Sequence[str] = VARIANT_TEMPLATES,
+    serp_archive: Optional[SerpArchive] = None,
 ) -> List[str]:
     """Fetch 'People Also Ask' questions from Google search results via SerpAPI.
 
     Queries multiple keyword variants and pagination to collect unique questions
     from Google's "People Also Ask" feature for SEO FAQ content generation.
+    The query planner picks searches by expected new-question yield, only
+    requests a variant's next page when its previous page added questions,
+    and keeps just enough searches in flight over the pooled session to
+    reach ``max_questions``. Results are consumed in the order searches
+    were issued, and searches not yet started are cancelled once
+    ``max_questions`` unique questions are collected (with a
+    ``serp_archive``, running ones are finished and archived first). Near-duplicate
+    wordings of an earlier question ("How much does an HVAC repair cost")
+    are collapsed so each distinct question is answered only once.
 
     Args:
         seed_keyword: Primary keyword to base question research on.
         location: Two-letter country code for search region. Defaults to "us".
         max_questions: Maximum number of unique questions to collect. Defaults to 20.
         geo_target: City/state for local geo-targeting (e.g., "Adrian, MI").
+        max_concurrency: Maximum SerpAPI searches in flight. Defaults to 6.
+        serp_cache: SerpCache for responses. Defaults to the shared
+            default_serp_cache(); re-runs within its TTL cost no credits.
+        similarity: Token-set Jaccard at which two questions count as the
+            same (see text_dedup.QuestionDeduper). Defaults to 0.8; None
+            keeps every distinct string.
+        planner: QueryPlanner to schedule searches and record their yield.
+            Defaults to default_query_planner(); its last_plan.decisions
+            shows what was run or skipped and why.
+        templates: Keyword variant templates to search. Defaults to
+            query_planner.VARIANT_TEMPLATES.
+        serp_archive: Client SerpArchive that keeps the full response of
+            every search (organic results, local pack, related searches...)
+            for rank checks and competitor analysis. Defaults to None.
 
     Returns:
         List of unique question strings from PAA results, limited to max_questions.
@@ -105,63 +316,109 @@ def fetch_paa_questions(
     print(f"Starting PAA fetch for seed: {seed_keyword}")
     uule_code = resolve_uule(geo_target)
 
-    keyword_variants = [
-        seed_keyword,
-        f"{seed_keyword} near me",
-        f"{seed_keyword} {geo_target}",
-        f"common questions about {seed_keyword}",
-        f"{seed_keyword} services",
-        f"what to know about {seed_keyword}",
-    ]
+    def search_params(query: PlannedQuery) -> Dict[str, Any]:
+        params: Dict[str, Any] = {
+            "engine": "google",
+            "q": query.keyword,
+            "hl": "en",
+            "gl": location,
+            "start": query.start,
+            "api_key": SERPAPI_KEY,
+        }
+        if uule_code:
+            params["uule"] = uule_code
+        return params
 
     questions: List[str] = []
     seen: set[str] = set()
+    deduper = QuestionDeduper(similarity) if similarity else None
+    if max_questions <= 0:
+        return questions
 
-    for kw in keyword_variants:
-        for start in [0, 10, 20]:
-            if len(questions) >= max_questions:
-                break
+    planner = planner or default_query_planner()
+    plan = planner.plan(seed_keyword, geo_target, templates)
+    session = _get_serp_session()
+    cache = serp_cache or default_serp_cache()
+    hits_before, misses_before = cache.hits, cache.misses
+    executor = ThreadPoolExecutor(max_workers=max(1, max_concurrency))
+    in_flight: deque[Tuple[PlannedQuery, Future]] = deque()
 
-            print(f"Fetching for variant: {kw} (start={start})")
-            params: dict[str, Any] = {
-                "engine": "google",
-                "q": kw,
-                "hl": "en",
-                "gl": location,
-                "start": start,
-                "api_key": SERPAPI_KEY,
-            }
-            if uule_code:
-                params["uule"] = uule_code
-
-            res = requests.get("https://serpapi.com/search", params=params)  # type: ignore[arg-type]
-            print("SerpAPI status code:", res.status_code)
+    def fill() -> None:
+        # Issue searches until their expected yield covers what is missing
+        expected = sum(query.expected_yield for query, _ in in_flight)
+        while (
+            len(in_flight) < max_concurrency
+            and len(questions) + expected < max_questions
+        ):
+            query = plan.next_query()
+            if query is None:
+                return
+            future = executor.submit(
+                _search_serp, session, search_params(query), cache, serp_archive
+            )
+            in_flight.append((query, future))
+            expected += query.expected_yield
 
-            try:
-                data = res.json()
-            except Exception as e:
-                print("Error decoding SerpAPI response:", e)
-                continue
-
-            if "error" in data:
-                print("SerpAPI error:", data["error"])
-                continue
-
-            if "related_questions" in data:
-                print(f"→ {len(data['related_questions'])} results found for variant")
+    try:
+        fill()
+        while in_flight and len(questions) < max_questions:
+            query, future = in_flight.popleft()
+            data = future.result()
+            new = 0
+            results = None
+            if data and "related_questions" in data:
+                results = len(data["related_questions"])
+                print(f"→ {results} results found for variant")
+                # Count every new question for the yield stats, even past
+                # max_questions; the list is cut to size on return
                 for q in data["related_questions"]:
                     question = q.get("question")
                     if question and question not in seen:
-                        questions.append(question)
                         seen.add(question)
-                    if len(questions) >= max_questions:
-                        break
+                        if deduper is None or deduper.match(question) is None:
+                            questions.append(question)
+                            new += 1
+            elif data is not None:
+                results = 0
+            plan.record(query, new, results)
+            fill()
+    finally:
+        # Cancel searches whose results are no longer needed. Running ones
+        # are only waited for when archiving, so their paid responses are
+        # recorded before the caller closes the archive.
+        executor.shutdown(wait=serp_archive is not None, cancel_futures=True)
+        plan.finish([query for query, _ in in_flight])
 
+    print(f"[INFO] Query plan: {plan.summary()}")
+    if offline_uule(geo_target) is None:
+        print(
+            f"[INFO] {geo_target} is not in the bundled geotargets table "
+            "(uule from the uule cache or SerpAPI)"
+        )
+    hits, misses = cache.hits - hits_before, cache.misses - misses_before
+    if hits + misses:
+        print(
+            f"[INFO] SERP cache: {hits}/{hits + misses} hits "
+            f"({hits / (hits + misses):.0%}), {hits} credits saved"
+        )
+    if deduper and deduper.report.llm_calls_avoided:
+        print(
+            f"[INFO] Collapsed {deduper.report.llm_calls_avoided} near-duplicate "
+            f"questions ({deduper.report.llm_calls_avoided} GPT-4 answers avoided)"
+        )
     print(f"✅ Returning {len(questions)} unique questions.")
     return questions[:max_questions]
 
 
-def generate_answer(question: str, business_name: str, city: str, state: str) -> str:
+def generate_answer(
+    question: str,
+    business_name: str,
+    city: str,
+    state: str,
+    context: str = "",
+    on_token: Optional[Callable[[str], None]] = None,
+    llm_cache: Optional[LLMCache] = None,
+) -> str:
     """Generate SEO-optimized answer to a question using OpenAI GPT-4.
 
     Creates conversational, locally-targeted answers as if from the business perspective.
@@ -171,6 +428,12 @@ def generate_answer(question: str, business_name: str, city: str, state: str) ->
         business_name: Name of the business to answer as.
         city: City where business is located.
         state: State where business is located.
+        context: Optional business information (e.g. from the site corpus)
+            to ground the answer in the client's actual services.
+        on_token: Called with each piece of the answer as it streams in.
+            Defaults to None (no streaming).
+        llm_cache: LLMCache that answers an identical request without an
+            API call. Defaults to None (always call).
 
     Returns:
         Generated answer text as a string.
@@ -185,38 +448,443 @@ def generate_answer(question: str, business_name: str, city: str, state: str) ->
         >>> print(answer[:50])
         'HVAC repair costs can vary depending on the type...'
     """
+    return chat_completion(
+        answer_messages(question, business_name, city, state, context),
+        model=ANSWER_MODEL,
+        temperature=0.7,
+        client=client,
+        on_token=on_token,
+        cache=llm_cache,
+    )
+
+
+def answer_messages(
+    question: str, business_name: str, city: str, state: str, context: str = ""
+) -> List[Dict[str, str]]:
+    """Build the chat messages generate_answer() sends for a question.
+
+    Args:
+        question: Question text to answer.
+        business_name: Name of the business to answer as.
+        city: City where business is located.
+        state: State where business is located.
+        context: Optional business information to ground the answer in.
+
+    Returns:
+        System and user messages.
+    """
     prompt = f"""Answer the following question as if you are an HVAC contractor named {business_name}, based in {city}, {state}:
 
 Q: {question}
 
 A:"""
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {
-                "role": "system",
-                "content": "You are a helpful, local HVAC expert providing SEO-optimized, conversational answers.",
-            },
-            {"role": "user", "content": prompt},
-        ],
+    return _answer_messages(prompt, business_name, context)
+
+
+def _answer_messages(
+    prompt: str, business_name: str, context: str = ""
+) -> List[Dict[str, str]]:
+    """Wrap an answer prompt in the system message and business context."""
+    if context:
+        prompt = f"Business information from {business_name}'s website:\n{context}\n\n{prompt}"
+    return [
+        {"role": "system", "content": ANSWER_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _with_answer_cache(
+    questions: List[str],
+    business_name: str,
+    city: str,
+    state: str,
+    context: str,
+    answer_cache: Optional[AnswerCache],
+    niche: str,
+    generate: Callable[[List[str]], List[str]],
+    on_answer: Optional[Callable[[str, str], None]] = None,
+) -> List[str]:
+    """Serve cached answers and call ``generate`` only for the rest.
+
+    Cached answers are passed to ``on_answer`` before anything is
+    generated (``generate`` reports its own). New answers are stored back
+    as templates for other clients. When the cache's reuse policy excludes
+    this request (e.g. it carries business context), every question goes
+    to ``generate``.
+    """
+    if answer_cache is None or not answer_cache.usable(context):
+        return generate(questions)
+
+    answers = [
+        answer_cache.get(q, niche, ANSWER_MODEL, business_name, city, state)
+        for q in questions
+    ]
+    pending = [i for i, answer in enumerate(answers) if answer is None]
+    reused = len(questions) - len(pending)
+    if reused:
+        print(f"[INFO] Reused {reused}/{len(questions)} answers from the answer cache")
+        if on_answer:
+            for question, answer in zip(questions, answers):
+                if answer is not None:
+                    on_answer(question, answer)
+    if pending:
+        generated = generate([questions[i] for i in pending])
+        for i, answer in zip(pending, generated):
+            answers[i] = answer
+            answer_cache.put(
+                questions[i], niche, ANSWER_MODEL, answer, business_name, city, state
+            )
+    return [answer or "" for answer in answers]
+
+
+def generate_answers(
+    questions: List[str],
+    business_name: str,
+    city: str,
+    state: str,
+    context: str = "",
+    max_concurrency: int = MAX_LLM_CONCURRENCY,
+    answer_cache: Optional[AnswerCache] = None,
+    niche: str = DEFAULT_NICHE,
+    on_answer: Optional[Callable[[str, str], None]] = None,
+    live: Optional[LiveOutput] = None,
+    llm_cache: Optional[LLMCache] = None,
+) -> List[str]:
+    """Generate answers for several questions concurrently.
+
+    Calls generate_answer() on a bounded worker pool. The shared adaptive
+    limiter in llm_client lowers concurrency on 429 responses and waits out
+    Retry-After, so throttling slows the run down instead of failing it.
+
+    Args:
+        questions: Questions to answer.
+        business_name: Name of the business to answer as.
+        city: City where business is located.
+        state: State where business is located.
+        context: Optional business information for every answer.
+        max_concurrency: Maximum answers generated at once. Defaults to 8.
+        answer_cache: Cross-client AnswerCache to reuse answers from and
+            store new ones in. Defaults to None (always generate).
+        niche: Business niche the cached answers are shared within.
+        on_answer: Called with (question, answer) as soon as each answer
+            is generated or served from the answer cache, e.g.
+            FaqJournal.record_answer.
+        live: Optional LiveOutput each generated answer is streamed to,
+            labelled with its question.
+        llm_cache: LLMCache for identical completion requests. Defaults
+            to None.
+
+    Returns:
+        Answers in the same order as ``questions``.
+
+    Raises:
+        openai.OpenAIError: If an answer still fails after all retries.
+    """
+
+    def answer(question: str) -> str:
+        print(f"Generating answer for: {question}")
+        if live is None:
+            result = generate_answer(
+                question, business_name, city, state, context, llm_cache=llm_cache
+            )
+        else:
+            live.start(question)
+            try:
+                result = generate_answer(
+                    question,
+                    business_name,
+                    city,
+                    state,
+                    context,
+                    on_token=live.writer(question),
+                    llm_cache=llm_cache,
+                )
+            except Exception as e:
+                live.end(question, str(e))
+                raise
+            live.end(question)
+        if on_answer:
+            on_answer(question, result)
+        return result
+
+    return _with_answer_cache(
+        questions,
+        business_name,
+        city,
+        state,
+        context,
+        answer_cache,
+        niche,
+        lambda pending: map_ordered(answer, pending, max_workers=max_concurrency),
+        on_answer,
+    )
+
+
+def plan_answer_batches(
+    questions: List[str],
+    token_budget: int = ANSWER_BATCH_TOKEN_BUDGET,
+    answer_tokens: int = ANSWER_TOKEN_ESTIMATE,
+) -> List[List[int]]:
+    """Split questions into batches that fit a completion-token budget.
+
+    Each question is costed at its own estimated length plus
+    ``answer_tokens`` for its answer. Every batch holds at least one
+    question, so an oversized question still gets a batch of its own.
+
+    Args:
+        questions: Questions to answer.
+        token_budget: Estimated tokens allowed per batch. Defaults to 2400.
+        answer_tokens: Expected tokens per answer. Defaults to 220.
+
+    Returns:
+        Batches of indices into ``questions``, in order.
+
+    Example:
+        >>> plan_answer_batches(["a?"] * 5, token_budget=450, answer_tokens=220)
+        [[0, 1], [2, 3], [4]]
+    """
+    batches: List[List[int]] = []
+    batch: List[int] = []
+    used = 0
+    for i, question in enumerate(questions):
+        cost = estimate_tokens(question) + answer_tokens
+        if batch and used + cost > token_budget:
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(i)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def parse_batch_answers(content: str, count: int) -> List[Optional[str]]:
+    """Parse the JSON array returned for a batched answer request.
+
+    Accepts ``[{"id": 1, "answer": "..."}, ...]`` (matched by id) or a plain
+    array of strings (matched by position), with or without a Markdown code
+    fence around it.
+
+    Args:
+        content: Raw model output.
+        count: Number of questions in the batch.
+
+    Returns:
+        One answer per question; None where an item is missing or unusable.
+
+    Example:
+        >>> parse_batch_answers('[{"id": 2, "answer": "B"}]', 2)
+        [None, 'B']
+    """
+    answers: List[Optional[str]] = [None] * count
+    start, end = content.find("["), content.rfind("]")
+    if start == -1 or end < start:
+        return answers
+    try:
+        items = json.loads(content[start : end + 1])
+    except ValueError:
+        return answers
+    if not isinstance(items, list):
+        return answers
+
+    for position, item in enumerate(items):
+        index, answer = position, item
+        if isinstance(item, dict):
+            answer = item.get("answer")
+            item_id = item.get("id")
+            if isinstance(item_id, int) and 1 <= item_id <= count:
+                index = item_id - 1
+        if (
+            isinstance(answer, str)
+            and answer.strip()
+            and index < count
+            and answers[index] is None
+        ):
+            answers[index] = answer.strip()
+    return answers
+
+
+def generate_answer_batch(
+    questions: List[str],
+    business_name: str,
+    city: str,
+    state: str,
+    context: str = "",
+    llm_cache: Optional[LLMCache] = None,
+) -> List[Optional[str]]:
+    """Answer several questions with one chat completion.
+
+    The system prompt and business context are sent once for the whole
+    batch instead of once per question.
+
+    Args:
+        questions: Questions to answer together.
+        business_name: Name of the business to answer as.
+        city: City where business is located.
+        state: State where business is located.
+        context: Optional business information for every answer.
+        llm_cache: LLMCache for identical batch requests. Defaults to None.
+
+    Returns:
+        One answer per question; None for items that could not be parsed.
+    """
+    numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(questions, 1))
+    prompt = f"""Answer each of the following questions as if you are an HVAC contractor named {business_name}, based in {city}, {state}. Answer every question fully, as you would if it were the only question asked.
+
+{numbered}
+
+Respond with only a JSON array containing one object per question, in the same order: [{{"id": 1, "answer": "..."}}, ...]"""
+    content = chat_completion(
+        _answer_messages(prompt, business_name, context),
+        model=ANSWER_MODEL,
         temperature=0.7,
+        client=client,
+        cache=llm_cache,
+    )
+    return parse_batch_answers(content, len(questions))
+
+
+def generate_answers_batched(
+    questions: List[str],
+    business_name: str,
+    city: str,
+    state: str,
+    context: str = "",
+    token_budget: int = ANSWER_BATCH_TOKEN_BUDGET,
+    max_concurrency: int = MAX_LLM_CONCURRENCY,
+    answer_cache: Optional[AnswerCache] = None,
+    niche: str = DEFAULT_NICHE,
+    on_answer: Optional[Callable[[str, str], None]] = None,
+    llm_cache: Optional[LLMCache] = None,
+) -> List[str]:
+    """Generate answers with one request per token-budgeted batch.
+
+    Batches run concurrently. Any answer that is missing from, or cannot be
+    parsed out of, its batch response is regenerated with generate_answer().
+
+    Args:
+        questions: Questions to answer.
+        business_name: Name of the business to answer as.
+        city: City where business is located.
+        state: State where business is located.
+        context: Optional business information for every answer.
+        token_budget: Estimated completion tokens per batch. Defaults to 2400.
+        max_concurrency: Maximum batch requests at once. Defaults to 8.
+        answer_cache: Cross-client AnswerCache to reuse answers from and
+            store new ones in. Defaults to None (always generate).
+        niche: Business niche the cached answers are shared within.
+        on_answer: Called with (question, answer) as soon as each answer
+            is generated or served from the answer cache, e.g.
+            FaqJournal.record_answer.
+        llm_cache: LLMCache for identical completion requests. Defaults
+            to None.
+
+    Returns:
+        Answers in the same order as ``questions``.
+
+    Raises:
+        openai.OpenAIError: If a request still fails after all retries.
+    """
+    return _with_answer_cache(
+        questions,
+        business_name,
+        city,
+        state,
+        context,
+        answer_cache,
+        niche,
+        lambda pending: _answer_in_batches(
+            pending,
+            business_name,
+            city,
+            state,
+            context,
+            token_budget,
+            max_concurrency,
+            on_answer,
+            llm_cache,
+        ),
+        on_answer,
     )
-    content = response.choices[0].message.content
-    return content.strip() if content else ""
+
+
+def _answer_in_batches(
+    questions: List[str],
+    business_name: str,
+    city: str,
+    state: str,
+    context: str,
+    token_budget: int,
+    max_concurrency: int,
+    on_answer: Optional[Callable[[str, str], None]] = None,
+    llm_cache: Optional[LLMCache] = None,
+) -> List[str]:
+    """Answer questions batch by batch, retrying unusable items singly."""
+    batches = plan_answer_batches(questions, token_budget)
+
+    def answer_batch(batch: List[int]) -> List[Optional[str]]:
+        print(f"Generating answers for {len(batch)} questions in one request")
+        batch_questions = [questions[i] for i in batch]
+        results = generate_answer_batch(
+            batch_questions, business_name, city, state, context, llm_cache
+        )
+        if on_answer:
+            for question, answer in zip(batch_questions, results):
+                if answer is not None:
+                    on_answer(question, answer)
+        return results
+
+    answers: List[Optional[str]] = [None] * len(questions)
+    for batch, results in zip(
+        batches, map_ordered(answer_batch, batches, max_workers=max_concurrency)
+    ):
+        for i, answer in zip(batch, results):
+            answers[i] = answer
+
+    failed = [i for i, answer in enumerate(answers) if answer is None]
+    if failed:
+        print(f"[WARNING] {len(failed)} batched answers unusable, retrying singly")
+        retried = generate_answers(
+            [questions[i] for i in failed],
+            business_name,
+            city,
+            state,
+            context,
+            max_concurrency,
+            on_answer=on_answer,
+            llm_cache=llm_cache,
+        )
+        for i, answer in zip(failed, retried):
+            answers[i] = answer
+
+    print(
+        f"[INFO] {len(questions)} answers from {len(batches) + len(failed)} "
+        f"requests ({len(batches)} batches, {len(failed)} single retries)"
+    )
+    return [answer or "" for answer in answers]
 
 
 def write_html_accordion(
-    faq_list: List[Tuple[str, str]], business_name: str, output_path: str
+    faq_list: List[Tuple[str, str]],
+    business_name: str,
+    output_path: str,
+    minify: bool = False,
+    gzip_output: bool = False,
 ) -> None:
     """Write FAQ question/answer pairs to an HTML accordion file.
 
     Generates an interactive HTML page with collapsible FAQ sections using
     vanilla JavaScript. Output styled with inline CSS for portability.
+    Question and answer text is HTML-escaped. See faq_html.FaqHtmlWriter
+    for writing items as they are generated.
 
     Args:
         faq_list: List of (question, answer) tuples.
         business_name: Business name for page title and heading.
         output_path: Full file path where HTML should be saved.
+        minify: Strip template whitespace. Defaults to False.
+        gzip_output: Also write a precompressed ``output_path + ".gz"``.
+            Defaults to False.
 
     Returns:
         None. Writes HTML file to disk.
@@ -225,53 +893,303 @@ def write_html_accordion(
         >>> faq_list = [("What is HVAC?", "HVAC stands for...")]
         >>> write_html_accordion(faq_list, "ABC Heating", "./output/faq.html")
     """
-    html = f"""<!DOCTYPE html>
-<html lang=\"en\">
-<head>
-    <meta charset=\"UTF-8\">
-    <title>{business_name} - FAQs</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; background: #f9f9f9; padding: 20px; }}
-        .accordion {{ background-color: #fff; border-radius: 10px; padding: 20px; box-shadow: 0 0 10px rgba(0,0,0,0.1); }}
-        .accordion-item {{ margin-bottom: 10px; }}
-        .accordion-header {{ background-color: #eee; cursor: pointer; padding: 10px; border-radius: 6px; transition: 0.3s; }}
-        .accordion-header:hover {{ background-color: #ddd; }}
-        .accordion-content {{ display: none; padding: 10px; margin-top: 5px; }}
-    </style>
-</head>
-<body>
-    <h1>{business_name} - People Also Ask</h1>
-    <div class=\"accordion\">
-"""
-    for i, (q, a) in enumerate(faq_list):
-        html += f"""
-        <div class=\"accordion-item\">
-            <div class=\"accordion-header\" onclick=\"toggleContent('content{i}')\">{q}</div>
-            <div class=\"accordion-content\" id=\"content{i}\">{a}</div>
-        </div>
-"""
-    html += """
-    </div>
-    <script>
-        function toggleContent(id) {
-            var x = document.getElementById(id);
-            x.style.display = (x.style.display === "block") ? "none" : "block";
+    with FaqHtmlWriter(
+        output_path,
+        business_name,
+        minify=minify,
+        gzip_output=gzip_output,
+        flush_items=False,
+    ) as writer:
+        for question, answer in faq_list:
+            writer.add(question, answer)
+
+
+def _config_context(client_config: Dict[str, Any]) -> str:
+    """Return the site corpus text named by a config's corpus_file, if any."""
+    corpus_file = client_config.get("corpus_file")
+    if corpus_file and os.path.exists(corpus_file):
+        return corpus_text(corpus_file, max_chars=4000)
+    return ""
+
+
+def _open_serp_archive(
+    client_config: Dict[str, Any], output_dir: str
+) -> Optional[SerpArchive]:
+    """Open the client's SERP archive unless the config turns it off."""
+    if not client_config.get("archive_serps", True):
+        return None
+    return SerpArchive(client_archive_path(output_dir, client_config["name"]))
+
+
+def _answer_for_config(
+    client_config: Dict[str, Any],
+    questions: List[str],
+    context: str,
+    on_answer: Optional[Callable[[str, str], None]] = None,
+    live: Optional[LiveOutput] = None,
+) -> List[str]:
+    """Answer questions with the batching and cache settings of a config.
+
+    Batched requests are not streamed to ``live``.
+    """
+    answer_cache = (
+        default_answer_cache() if client_config.get("reuse_answers", False) else None
+    )
+    llm_cache = llm_cache_for_config(client_config)
+    niche = client_config.get("niche", DEFAULT_NICHE)
+    if llm_cache is not None:
+        hits_before, misses_before = llm_cache.hits, llm_cache.misses
+    if client_config.get("batch_answers"):
+        answers = generate_answers_batched(
+            questions,
+            client_config["name"],
+            client_config["city"],
+            client_config["state"],
+            context,
+            token_budget=client_config.get(
+                "answer_batch_tokens", ANSWER_BATCH_TOKEN_BUDGET
+            ),
+            answer_cache=answer_cache,
+            niche=niche,
+            on_answer=on_answer,
+            llm_cache=llm_cache,
+        )
+    else:
+        answers = generate_answers(
+            questions,
+            client_config["name"],
+            client_config["city"],
+            client_config["state"],
+            context,
+            answer_cache=answer_cache,
+            niche=niche,
+            on_answer=on_answer,
+            live=live,
+            llm_cache=llm_cache,
+        )
+    if llm_cache is not None:
+        hits = llm_cache.hits - hits_before
+        lookups = hits + llm_cache.misses - misses_before
+        if lookups:
+            print(f"[INFO] LLM cache: {hits}/{lookups} completions served from cache")
+    return answers
+
+
+def plan_location_pages(
+    harvests: Dict[str, List[str]],
+    location: Pattern[str],
+    max_questions: int = 20,
+    similarity: Optional[float] = DEFAULT_QUESTION_SIMILARITY,
+) -> Dict[str, List[str]]:
+    """Build each city's FAQ question list from the per-city PAA harvests.
+
+    Questions that name a location (``location.search``) stay with the city
+    they were harvested for. All other questions form one shared pool,
+    near-duplicates across cities collapsed to their first wording. Each
+    city's page lists its own harvest first, then is topped up from the
+    shared pool, so location-independent questions are answered once no
+    matter how many pages show them.
+
+    Args:
+        harvests: City -> PAA questions, primary city first.
+        location: Pattern from city_utils.location_pattern().
+        max_questions: Questions per page. Defaults to 20.
+        similarity: Token-set Jaccard for collapsing shared questions.
+            Defaults to 0.8; None only collapses identical strings.
+
+    Returns:
+        City -> questions for its page, in the order of ``harvests``.
+
+    Example:
+        >>> pages = plan_location_pages(
+        ...     {"Adrian": ["Is AC repair worth it?", "Best HVAC in Adrian?"],
+        ...      "Tecumseh": ["Best HVAC in Tecumseh?"]},
+        ...     location_pattern(["Adrian", "Tecumseh"], "MI"),
+        ... )
+        >>> pages["Tecumseh"]
+        ['Best HVAC in Tecumseh?', 'Is AC repair worth it?']
+    """
+    deduper = QuestionDeduper(similarity) if similarity else None
+    shared: List[str] = []
+    own: Dict[str, List[str]] = {}
+    for city, questions in harvests.items():
+        own[city] = []
+        for question in questions:
+            if not location.search(question):
+                kept = deduper.match(question) if deduper else None
+                if kept is None:
+                    if question in shared:
+                        kept = question
+                    else:
+                        shared.append(question)
+                question = kept or question
+            if question not in own[city]:
+                own[city].append(question)
+
+    pages: Dict[str, List[str]] = {}
+    for city, questions in own.items():
+        page = questions[:max_questions]
+        listed = set(page)
+        for question in shared:
+            if len(page) >= max_questions:
+                break
+            if question not in listed:
+                page.append(question)
+                listed.add(question)
+        pages[city] = page
+    return pages
+
+
+def run_multi_location_faq(
+    client_config: Dict[str, Any], live: Optional[LiveOutput] = None
+) -> None:
+    """Generate one FAQ page per city for a client and its nearby cities.
+
+    PAA questions are harvested for every city concurrently, with at most
+    MAX_SERP_CONCURRENCY searches in flight across all cities. The primary
+    city searches every keyword variant; nearby cities only repeat the
+    location-dependent ones (LOCAL_VARIANT_TEMPLATES), since the rest
+    return the same questions anywhere nearby. Questions are split with
+    plan_location_pages(). Location-free questions are answered once (as
+    the primary city) and shared by every page that lists them; questions
+    naming a place are answered for each page's own city. SerpAPI and
+    GPT-4 calls therefore grow with the location-specific questions rather
+    than with the number of cities. Multi-location runs are not journaled.
+
+    Args:
+        client_config: Same keys as run_faq_generator(), plus optional
+            "nearby_10mi"/"nearby_20mi" city lists (generated with
+            city_utils.handle_city_inputs() when missing).
+        live: Optional LiveOutput answers are streamed to as generated.
+
+    Returns:
+        None. Writes one HTML file per city to:
+        {output_root}/{name}/G Site/{name} - {city} FAQs.html
+
+    Example:
+        >>> config = {"name": "ABC Heating", "city": "Adrian", "state": "MI",
+        ...           "seed_keyword": "hvac repair", "output_root": "./output",
+        ...           "multi_location": True}
+        >>> run_multi_location_faq(config)  # run_faq_generator() dispatches here
+        [INFO] 5 cities: 31 answers for 100 FAQ items (18 shared)
+    """
+    business_name = client_config["name"]
+    state = client_config["state"]
+    keyword = client_config["seed_keyword"]
+    max_questions = client_config.get("max_questions", 20)
+    cities = fanout_cities(client_config)
+
+    output_dir = os.path.join(client_config["output_root"], business_name, "G Site")
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Keep cities x searches per city within the SerpAPI concurrency limit
+    per_city = max(1, MAX_SERP_CONCURRENCY // len(cities))
+    workers = min(len(cities), max(1, MAX_SERP_CONCURRENCY // per_city))
+    # One planner per city over the shared yield stats, so each city's
+    # last_plan keeps its own decisions
+    stats = default_query_planner().stats
+    planners = {city: QueryPlanner(stats) for city in cities}
+    archive = _open_serp_archive(client_config, output_dir)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    fetch_paa_questions,
+                    keyword,
+                    geo_target=f"{city}, {state}",
+                    max_questions=max_questions,
+                    max_concurrency=per_city,
+                    planner=planners[city],
+                    templates=VARIANT_TEMPLATES if i == 0 else LOCAL_VARIANT_TEMPLATES,
+                    serp_archive=archive,
+                )
+                for i, city in enumerate(cities)
+            ]
+            harvests = {city: f.result() for city, f in zip(cities, futures)}
+    finally:
+        if archive is not None:
+            archive.close()
+    for city, planner in planners.items():
+        if planner.last_plan is not None:
+            print(f"[INFO] {city} query plan: {planner.last_plan.summary()}")
+
+    location = location_pattern(cities, state)
+    pages = plan_location_pages(harvests, location, max_questions)
+    questions: List[str] = []
+    pages_for: Dict[str, List[str]] = {}
+    local: Dict[str, List[str]] = {}
+    for city, page in pages.items():
+        local[city] = [question for question in page if location.search(question)]
+        for question in page:
+            if question in local[city]:
+                continue
+            if question not in pages_for:
+                questions.append(question)
+                pages_for[question] = []
+            pages_for[question].append(city)
+    shared = sum(1 for page_cities in pages_for.values() if len(page_cities) > 1)
+    answer_count = len(questions) + sum(len(q) for q in local.values())
+    print(
+        f"[INFO] {len(cities)} cities: {answer_count} answers for "
+        f"{sum(len(page) for page in pages.values())} FAQ items ({shared} shared)"
+    )
+
+    minify = client_config.get("minify_html", False)
+    gzip_html = client_config.get("gzip_html", False)
+    with ExitStack() as stack:
+        writers = {
+            city: stack.enter_context(
+                FaqHtmlWriter(
+                    os.path.join(output_dir, f"{business_name} - {city} FAQs.html"),
+                    business_name,
+                    page,
+                    minify=minify,
+                    gzip_output=gzip_html,
+                )
+            )
+            for city, page in pages.items()
         }
-    </script>
-</body>
-</html>"""
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+        def on_shared_answer(question: str, answer: str) -> None:
+            for city in pages_for[question]:
+                writers[city].add(question, answer)
+
+        context = _config_context(client_config)
+        # One group of shared questions, then one per city for its local ones
+        groups = [(client_config, questions, on_shared_answer)] + [
+            (dict(client_config, city=city), local[city], writers[city].add)
+            for city in cities
+            if local[city]
+        ]
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            futures = [
+                executor.submit(
+                    _answer_for_config, config, group, context, on_answer, live
+                )
+                for config, group, on_answer in groups
+            ]
+            for future in futures:
+                future.result()
 
+    for city, writer in writers.items():
+        print(f"✅ Saved {city} FAQ HTML to: {writer.output_path}")
 
-def run_faq_generator(client_config: Dict[str, Any]) -> None:
+
+def run_faq_generator(
+    client_config: Dict[str, Any], live: Optional[LiveOutput] = None
+) -> None:
     """Execute complete FAQ generation workflow for a client.
 
     Main orchestration function that:
     1. Fetches PAA questions from Google via SerpAPI
-    2. Generates answers using OpenAI GPT-4
-    3. Writes HTML accordion file with all Q&A pairs
+    2. Generates answers using OpenAI GPT-4 (concurrently, in question order)
+    3. Writes HTML accordion file with all Q&A pairs, item by item as
+       answers arrive
+
+    The question list and each answer are appended to
+    "{name} - FAQs.journal.jsonl" in the output folder as they arrive. If a
+    run fails part-way, re-running the same config resumes from the journal
+    and only generates the answers that are still missing.
 
     Args:
         client_config: Configuration dictionary containing:
@@ -281,6 +1199,31 @@ def run_faq_generator(client_config: Dict[str, Any]) -> None:
             - seed_keyword (str): Primary keyword for question research
             - output_root (str): Base output directory path
             - max_questions (int, optional): Max questions to generate. Defaults to 20.
+            - corpus_file (str, optional): Site corpus from site_crawler used
+              as business context for every answer.
+            - batch_answers (bool, optional): Answer several questions per
+              request. Defaults to False.
+            - answer_batch_tokens (int, optional): Token budget per batch.
+              Defaults to ANSWER_BATCH_TOKEN_BUDGET.
+            - niche (str, optional): Niche whose cached answers may be
+              reused. Defaults to "hvac".
+            - reuse_answers (bool, optional): Reuse and store answers in the
+              cross-client answer cache. Defaults to False.
+            - cache_llm (bool, optional): Serve identical completions from
+              the shared LLM cache (see llm_cache). Defaults to True.
+            - refresh_llm_cache (bool, optional): Regenerate every
+              completion and overwrite the cached ones. Defaults to False.
+            - minify_html (bool, optional): Minify the FAQ page. Defaults
+              to False.
+            - gzip_html (bool, optional): Also write "{name} - FAQs.html.gz".
+              Defaults to False.
+            - multi_location (bool, optional): Write one page per nearby
+              city instead (see run_multi_location_faq()). Defaults to False.
+            - archive_serps (bool, optional): Keep every SerpAPI response in
+              "{name} - SERP archive.sqlite3" (see serp_archive). Defaults
+              to True.
+        live: Optional LiveOutput (live_output) each generated answer is
+            streamed to, e.g. from the FAQ tab. Defaults to None.
 
     Returns:
         None. Writes HTML file to: {output_root}/{name}/G Site/{name} - FAQs.html
@@ -297,6 +1240,54 @@ def run_faq_generator(client_config: Dict[str, Any]) -> None:
         >>> run_faq_generator(config)
         [INFO] Saved FAQ HTML to: ./output/ABC Heating/G Site/ABC Heating - FAQs.html
     """
+    if client_config.get("multi_location"):
+        run_multi_location_faq(client_config, live)
+        return
+
+    business_name = client_config["name"]
+    output_dir, journal, questions = _journal_questions(client_config)
+    done = journal.answers()
+    pending = [q for q in questions if q not in done]
+    if done:
+        print(
+            f"[INFO] Resuming from journal: {len(questions) - len(pending)}/"
+            f"{len(questions)} answers already generated"
+        )
+
+    context = _config_context(client_config)
+
+    output_file = os.path.join(output_dir, f"{business_name} - FAQs.html")
+    print("Output path:", output_file)
+
+    with FaqHtmlWriter(
+        output_file,
+        business_name,
+        questions,
+        minify=client_config.get("minify_html", False),
+        gzip_output=client_config.get("gzip_html", False),
+    ) as writer:
+        for question in questions:
+            if question in done:
+                writer.add(question, done[question])
+
+        def on_answer(question: str, answer: str) -> None:
+            journal.record_answer(question, answer)
+            writer.add(question, answer)
+
+        _answer_for_config(client_config, pending, context, on_answer, live)
+
+    journal.mark_complete()
+    print(f"✅ Saved FAQ HTML to: {output_file}")
+
+
+def _journal_questions(
+    client_config: Dict[str, Any],
+) -> Tuple[str, FaqJournal, List[str]]:
+    """Open a config's FAQ journal and resume or fetch its question list.
+
+    Returns:
+        Tuple of (output folder, journal, questions).
+    """
     business_name = client_config["name"]
     city = client_config["city"]
     state = client_config["state"]
@@ -307,18 +1298,81 @@ def run_faq_generator(client_config: Dict[str, Any]) -> None:
     output_dir = os.path.join(output_root, business_name, "G Site")
     os.makedirs(output_dir, exist_ok=True)
 
-    questions = fetch_paa_questions(
-        keyword, geo_target=f"{city}, {state}", max_questions=max_questions
+    journal = FaqJournal(
+        os.path.join(output_dir, f"{business_name} - FAQs.journal.jsonl")
     )
-    faq_list = []
+    run_params = {
+        "seed_keyword": keyword,
+        "geo_target": f"{city}, {state}",
+        "max_questions": max_questions,
+    }
+    questions = journal.resume(run_params)
+    if questions is None:
+        archive = _open_serp_archive(client_config, output_dir)
+        try:
+            questions = fetch_paa_questions(
+                keyword,
+                geo_target=f"{city}, {state}",
+                max_questions=max_questions,
+                serp_archive=archive,
+            )
+        finally:
+            if archive is not None:
+                archive.close()
+        journal.record_questions(run_params, questions)
+    return output_dir, journal, questions
 
-    for q in questions:
-        print(f"Generating answer for: {q}")
-        answer = generate_answer(q, business_name, city, state)
-        faq_list.append((q, answer))
 
-    output_file = os.path.join(output_dir, f"{business_name} - FAQs.html")
-    print("Output path:", output_file)
+def pending_answer_messages(
+    client_config: Dict[str, Any],
+) -> List[List[Dict[str, str]]]:
+    """Return the answer requests a run of this config would still send.
 
-    write_html_accordion(faq_list, business_name, output_file)
-    print(f"✅ Saved FAQ HTML to: {output_file}")
+    Fetches (or resumes) the question list into the client's journal, as
+    run_faq_generator() does, and journals every answer the cross-client
+    answer cache can already serve (when "reuse_answers" is set). The rest are returned as the exact
+    messages generate_answer() would send (model ANSWER_MODEL, temperature
+    0.7), so batch_jobs can submit them offline and a later run finds them
+    in the LLM cache. Multi-location configs are not supported.
+
+    Args:
+        client_config: Configuration dictionary, as for run_faq_generator().
+
+    Returns:
+        One message list per unanswered question, in question order.
+    """
+    if client_config.get("multi_location"):
+        print(
+            f"[WARNING] {client_config['name']}: multi-location FAQs are not "
+            "batched; run them directly"
+        )
+        return []
+
+    business_name = client_config["name"]
+    city = client_config["city"]
+    state = client_config["state"]
+    _, journal, questions = _journal_questions(client_config)
+    done = journal.answers()
+    pending = [q for q in questions if q not in done]
+    context = _config_context(client_config)
+
+    answer_cache = (
+        default_answer_cache() if client_config.get("reuse_answers", False) else None
+    )
+    if answer_cache is not None and answer_cache.usable(context):
+        niche = client_config.get("niche", DEFAULT_NICHE)
+        unanswered = []
+        for question in pending:
+            answer = answer_cache.get(
+                question, niche, ANSWER_MODEL, business_name, city, state
+            )
+            if answer is None:
+                unanswered.append(question)
+            else:
+                journal.record_answer(question, answer)
+        pending = unanswered
+
+    return [
+        answer_messages(question, business_name, city, state, context)
+        for question in pending
+    ]
@@ -4,7 +4,8 @@ Path: E:\projects\Project Tracking\faq_generator_ui.py
 
 Description:
 Tkinter UI tab for the FAQ Content Generator. Provides form inputs for client
-configuration and triggers SerpAPI + GPT-4 FAQ generation workflow.
+configuration and triggers SerpAPI + GPT-4 FAQ generation workflow. Answers are
+shown live as they stream in, with time-to-first-token and total time.
 
 Author(s):
 Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
@@ -13,23 +14,26 @@ Created Date:
 2026-04-23
 
 Last Modified Date:
-2026-04-23
+2026-10-18
 
 Version:
-v1.00
+v1.02
 
 License:
 CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
 
 Comments:
+* v1.02 - Status updates go through a typed _set_status() method
+* v1.01 - Live streamed answers with first-token and total time
 * v1.00 - Initial release with Tkinter UI tab for FAQTab
 """
 
 import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, scrolledtext
 
 from faq_generator import run_faq_generator
+from live_output import LiveTextView
 
 
 class FAQTab:
@@ -55,6 +59,9 @@ class FAQTab:
         output_root_entry: Entry field for output directory path.
         max_questions_entry: Entry field for max question count.
         run_btn: Button to trigger FAQ generation.
+        status_label: Time-to-first-token and total time of the run.
+        output_text: Questions and answers, filled in live as they stream.
+        view: LiveTextView rendering the streamed answers.
     """
 
     def __init__(self, parent: tk.Widget) -> None:
@@ -123,12 +130,35 @@ class FAQTab:
         ttk.Button(self.frame, text="Help", command=self.show_help).grid(
             row=row, column=0, columnspan=2
         )
+        row += 1
+
+        self.status_label = ttk.Label(self.frame, text="")
+        self.status_label.grid(row=row, column=0, columnspan=2, pady=5)
+        row += 1
+
+        self.output_text = scrolledtext.ScrolledText(
+            self.frame, width=80, height=16, wrap="word"
+        )
+        self.output_text.grid(row=row, column=0, columnspan=2, padx=5, pady=5)
+        self.view = LiveTextView(
+            self.output_text,
+            on_status=self._set_status,
+        )
+
+    def _set_status(self, text: str) -> None:
+        """Show the live output's timing status under the form.
+
+        Args:
+            text: Status line from LiveTextView.
+        """
+        self.status_label.config(text=text)
 
     def run_faq(self) -> None:
         """Validate inputs and launch FAQ generation in a thread.
 
         Disables the run button during execution to prevent duplicate runs.
-        Shows a completion or error dialog when finished.
+        Answers stream into the output box as they are generated; a
+        completion or error dialog is shown when finished.
         """
         name = self.name_entry.get().strip()
         city = self.city_entry.get().strip()
@@ -160,10 +190,11 @@ class FAQTab:
         }
 
         self.run_btn.config(state="disabled", text="Generating FAQs...")
+        live = self.view.begin()
 
         def task() -> None:
             try:
-                run_faq_generator(client_config)
+                run_faq_generator(client_config, live)
                 self.frame.after(
                     0,
                     lambda: messagebox.showinfo(
@@ -175,6 +206,7 @@ class FAQTab:
                 err = str(exc)
                 self.frame.after(0, lambda: messagebox.showerror("Error", err))
             finally:
+                self.frame.after(0, self.view.finish)
                 self.frame.after(
                     0,
                     lambda: self.run_btn.config(state="normal", text="Generate FAQs"),
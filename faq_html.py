@@ -0,0 +1,263 @@
+r"""
+Module/Script Name: faq_html.py
+Path: E:\projects\Project Tracking\faq_html.py
+
+Description:
+Streaming HTML accordion writer for FAQ output. The page is rendered from
+templates prepared once at import, text is HTML-escaped, and each question
+is written and flushed as soon as its answer is ready (in question order),
+so a long run shows partial output. Optionally minifies the markup and
+writes a gzip copy alongside for direct upload.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.01
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.01 - Questions missing from the order are queued after it, not overwritten
+* v1.00 - Initial release with escaped streaming writer, minify and .gz
+"""
+
+import gzip
+import html
+import os
+import threading
+from types import TracebackType
+from typing import Dict, IO, List, Optional, Tuple, Type
+
+_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>{title} - FAQs</title>
+    <style>
+        body { font-family: Arial, sans-serif; background: #f9f9f9; padding: 20px; }
+        .accordion { background-color: #fff; border-radius: 10px; padding: 20px; box-shadow: 0 0 10px rgba(0,0,0,0.1); }
+        .accordion-item { margin-bottom: 10px; }
+        .accordion-header { background-color: #eee; cursor: pointer; padding: 10px; border-radius: 6px; transition: 0.3s; }
+        .accordion-header:hover { background-color: #ddd; }
+        .accordion-content { display: none; padding: 10px; margin-top: 5px; }
+    </style>
+</head>
+<body>
+    <h1>{title} - People Also Ask</h1>
+    <div class="accordion">
+"""
+
+_ITEM = """
+        <div class="accordion-item">
+            <div class="accordion-header" onclick="toggleContent('content{index}')">{question}</div>
+            <div class="accordion-content" id="content{index}">{answer}</div>
+        </div>
+"""
+
+_FOOT = """
+    </div>
+    <script>
+        function toggleContent(id) {
+            var x = document.getElementById(id);
+            x.style.display = (x.style.display === "block") ? "none" : "block";
+        }
+    </script>
+</body>
+</html>"""
+
+
+def _minify(template: str) -> str:
+    """Drop indentation and line breaks between tags and statements."""
+    return "".join(line.strip() for line in template.splitlines())
+
+
+def _compile(template: str) -> List[Tuple[str, Optional[str]]]:
+    """Split a template into (literal text, field name) pieces.
+
+    Only ``{title}``, ``{index}``, ``{question}`` and ``{answer}`` are
+    fields; CSS and JavaScript braces are literal text.
+    """
+    pieces: List[Tuple[str, Optional[str]]] = []
+    rest = template
+    while True:
+        positions = [
+            (rest.find("{" + name + "}"), name)
+            for name in ("title", "index", "question", "answer")
+            if "{" + name + "}" in rest
+        ]
+        if not positions:
+            pieces.append((rest, None))
+            return pieces
+        start, name = min(positions)
+        pieces.append((rest[:start], name))
+        rest = rest[start + len(name) + 2 :]
+
+
+_TEMPLATES = {
+    minify: tuple(_compile(_minify(t) if minify else t) for t in (_HEAD, _ITEM, _FOOT))
+    for minify in (False, True)
+}
+
+
+def _render(pieces: List[Tuple[str, Optional[str]]], values: Dict[str, str]) -> str:
+    """Fill a compiled template with already-escaped values."""
+    return "".join(text + (values[name] if name else "") for text, name in pieces)
+
+
+def escape_text(text: str) -> str:
+    """Escape text for HTML element content, keeping its line breaks.
+
+    Args:
+        text: Plain question or answer text.
+
+    Returns:
+        Escaped text with newlines as <br> tags.
+
+    Example:
+        >>> escape_text('Use "R-410A" <not R-22>\\nCall us')
+        'Use &quot;R-410A&quot; &lt;not R-22&gt;<br>Call us'
+    """
+    return html.escape(text.strip()).replace("\r\n", "\n").replace("\n", "<br>")
+
+
+class FaqHtmlWriter:
+    """Write an FAQ accordion page item by item.
+
+    Use as a context manager. The page head is written on entry and the
+    closing markup on a clean exit; if the block raises, the partial page
+    is left on disk (readable in a browser) and no .gz is produced.
+
+    When ``questions`` is given, add() may be called in any order (e.g.
+    from answer worker threads): items are held back until every earlier
+    question has been written, so the page keeps question order.
+
+    Attributes:
+        output_path: HTML file being written.
+        gzip_path: Companion .gz path, or None.
+        written: Number of items written so far.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        business_name: str,
+        questions: Optional[List[str]] = None,
+        minify: bool = False,
+        gzip_output: bool = False,
+        flush_items: bool = True,
+    ) -> None:
+        """Prepare a writer; nothing is written until the block is entered.
+
+        Args:
+            output_path: HTML file to write.
+            business_name: Business name for the page title and heading.
+            questions: Question order to enforce. Defaults to call order.
+            minify: Strip template whitespace. Defaults to False.
+            gzip_output: Also write ``output_path + ".gz"``. Defaults to False.
+            flush_items: Flush the file after every add() so partial output
+                is visible on disk. Turn off when writing a finished list.
+                Defaults to True.
+        """
+        self.output_path = output_path
+        self.gzip_path = output_path + ".gz" if gzip_output else None
+        self.written = 0
+        self._title = escape_text(business_name)
+        self._head, self._item, self._foot = _TEMPLATES[minify]
+        self._flush_items = flush_items
+        self._order = {q: i for i, q in enumerate(questions)} if questions else None
+        self._next_index = len(questions) if questions else 0
+        self._ready: Dict[int, Tuple[str, str]] = {}
+        self._seen: set = set()
+        self._lock = threading.Lock()
+        self._file: Optional[IO[str]] = None
+        self._gzip: Optional[IO[str]] = None
+
+    def __enter__(self) -> "FaqHtmlWriter":
+        self._file = open(self.output_path, "w", encoding="utf-8", buffering=1 << 16)
+        if self.gzip_path:
+            self._gzip = gzip.open(
+                self.gzip_path + ".part", "wt", encoding="utf-8", compresslevel=9
+            )
+        self._write(_render(self._head, {"title": self._title}))
+        self._file.flush()
+        return self
+
+    def _write(self, text: str) -> None:
+        """Write text to the HTML file and the gzip stream."""
+        assert self._file is not None
+        self._file.write(text)
+        if self._gzip:
+            self._gzip.write(text)
+
+    def add(self, question: str, answer: str) -> None:
+        """Write one FAQ item (or hold it until earlier items arrive).
+
+        Questions already added are ignored, so callers may re-add a full
+        list at the end to pick up anything not streamed.
+
+        Args:
+            question: Question text.
+            answer: Answer text.
+        """
+        with self._lock:
+            if question in self._seen:
+                return
+            self._seen.add(question)
+            if self._order is None:
+                self._write_item(question, answer)
+            else:
+                index = self._order.get(question)
+                if index is None:
+                    # Not in the question list: place after it, in call order
+                    index = self._order[question] = self._next_index
+                    self._next_index += 1
+                self._ready[index] = (question, answer)
+                while self.written in self._ready:
+                    self._write_item(*self._ready.pop(self.written))
+            if self._flush_items:
+                assert self._file is not None
+                self._file.flush()
+
+    def _write_item(self, question: str, answer: str) -> None:
+        """Render and write one item. Must be called with the lock held."""
+        self._write(
+            _render(
+                self._item,
+                {
+                    "index": str(self.written),
+                    "question": escape_text(question),
+                    "answer": escape_text(answer),
+                },
+            )
+        )
+        self.written += 1
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        with self._lock:
+            if exc_type is None:
+                for key in sorted(self._ready):
+                    self._write_item(*self._ready[key])
+                self._ready.clear()
+                self._write(_render(self._foot, {}))
+            assert self._file is not None
+            self._file.close()
+            if self._gzip:
+                self._gzip.close()
+                assert self.gzip_path is not None
+                if exc_type is None:
+                    os.replace(self.gzip_path + ".part", self.gzip_path)
+                else:
+                    os.remove(self.gzip_path + ".part")
@@ -0,0 +1,139 @@
+r"""
+Module/Script Name: faq_journal.py
+Path: E:\projects\Project Tracking\faq_journal.py
+
+Description:
+Append-only checkpoint journal for FAQ generation runs. The fetched
+question list and every generated answer are appended as JSON lines to a
+file in the client's output folder the moment they exist, so a run that
+dies part-way can be resumed without repeating SerpAPI or OpenAI calls.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.01
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.01 - A torn last line is cut off on load so later appends stay whole
+* v1.00 - Initial release with fsynced JSONL journal and resume
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class FaqJournal:
+    """JSON-lines journal of one client's FAQ run.
+
+    Records are {"type": "run", "params": ..., "questions": [...]},
+    {"type": "answer", "question": ..., "answer": ...} and
+    {"type": "complete"}. Each append is flushed and fsynced. A torn last
+    line from a crash is truncated away on load, so the next append starts
+    on a fresh line. Safe to share between threads.
+
+    Attributes:
+        path: Journal file location.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open a journal, reading any records already in it.
+
+        Args:
+            path: Journal file path; its directory must exist.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._records: List[Dict[str, Any]] = []
+        if os.path.exists(path):
+            with open(path, "rb+") as f:
+                data = f.read()
+                end = data.rfind(b"\n") + 1
+                if end < len(data):
+                    # Partial write from an interrupted run
+                    f.truncate(end)
+                    os.fsync(f.fileno())
+            for line in data[:end].decode("utf-8", "replace").splitlines():
+                try:
+                    self._records.append(json.loads(line))
+                except ValueError:
+                    continue
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Durably append one record."""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._records.append(record)
+
+    def resume(self, params: Dict[str, Any]) -> Optional[List[str]]:
+        """Return the journaled questions if an unfinished matching run exists.
+
+        A journal from a completed run, or from a run with different
+        parameters, is discarded so the new run starts clean.
+
+        Args:
+            params: JSON-serializable settings that define the run (seed
+                keyword, geo target, question limit).
+
+        Returns:
+            The run's questions, or None if there is nothing to resume.
+        """
+        run = next((r for r in self._records if r.get("type") == "run"), None)
+        finished = any(r.get("type") == "complete" for r in self._records)
+        if run is not None and not finished and run.get("params") == params:
+            return list(run["questions"])
+        self.reset()
+        return None
+
+    def reset(self) -> None:
+        """Delete the journal file and forget its records."""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._records = []
+
+    def record_questions(self, params: Dict[str, Any], questions: List[str]) -> None:
+        """Journal the fetched questions at the start of a run.
+
+        Args:
+            params: Settings passed to resume() for this run.
+            questions: Questions that will be answered.
+        """
+        self._append({"type": "run", "params": params, "questions": questions})
+
+    def record_answer(self, question: str, answer: str) -> None:
+        """Journal one generated answer.
+
+        Args:
+            question: Question text.
+            answer: Its answer.
+        """
+        self._append({"type": "answer", "question": question, "answer": answer})
+
+    def answers(self) -> Dict[str, str]:
+        """Return every journaled answer keyed by question."""
+        with self._lock:
+            return {
+                r["question"]: r["answer"]
+                for r in self._records
+                if r.get("type") == "answer"
+            }
+
+    def mark_complete(self) -> None:
+        """Record that the run's output was written successfully."""
+        self._append({"type": "complete"})
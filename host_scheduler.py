@@ -0,0 +1,465 @@
+r"""
+Module/Script Name: host_scheduler.py
+Path: E:\projects\Project Tracking\host_scheduler.py
+
+Description:
+Shared per-host fetch scheduler for all outbound scraping. Caches robots.txt
+rules with a TTL, rate-limits each host with a token bucket, and dispatches
+batch work to whichever host is ready soonest so one slow or throttled host
+(e.g. a franchise network shared by several clients) never stalls the rest.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.02
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.02 - map() refunds the rate token of URLs blocked by robots.txt
+* v1.01 - Unreachable or denied robots.txt is parsed as rules, not flags
+* v1.00 - Initial release with robots.txt cache and token-bucket scheduling
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests  # type: ignore[import-untyped]
+
+# Agent name matched against robots.txt rules (what the scraper actually sends)
+ROBOTS_USER_AGENT = requests.utils.default_user_agent()
+
+# Default per-host request rate (requests/second) and burst size
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 2
+
+# Seconds a fetched robots.txt is trusted before refetching
+DEFAULT_ROBOTS_TTL = 3600.0
+
+# Rules stood in for a robots.txt that is missing (allow) or denied (disallow)
+ALLOW_ALL_RULES: Tuple[str, ...] = ()
+DISALLOW_ALL_RULES: Tuple[str, ...] = ("User-agent: *", "Disallow: /")
+
+
+def host_of(url: str) -> str:
+    """Return the scheme://host[:port] key a URL is scheduled under.
+
+    Args:
+        url: Absolute URL.
+
+    Returns:
+        Lowercase origin string.
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate to a single host.
+
+    Attributes:
+        rate: Tokens added per second, or None for no limit.
+        capacity: Maximum burst of back-to-back requests.
+    """
+
+    def __init__(self, rate: Optional[float], capacity: int) -> None:
+        """Create a full bucket.
+
+        Args:
+            rate: Requests per second, or None to disable limiting.
+            capacity: Burst size.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if self.rate is None:
+            self._tokens = float(self.capacity)
+        else:
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def ready_at(self, now: float) -> float:
+        """Return the monotonic time at which a token will be available.
+
+        Args:
+            now: Current monotonic time.
+
+        Returns:
+            ``now`` if a token is available, otherwise a future time.
+        """
+        self._refill(now)
+        if self._tokens >= 1 or self.rate is None:
+            return now
+        return now + (1 - self._tokens) / self.rate
+
+    def consume(self, now: float) -> None:
+        """Take one token. Call only once ready_at(now) <= now.
+
+        Args:
+            now: Current monotonic time.
+        """
+        self._refill(now)
+        self._tokens -= 1
+
+    def refund(self, now: float) -> None:
+        """Return a token taken for a request that was never sent.
+
+        Args:
+            now: Current monotonic time.
+        """
+        self._refill(now)
+        self._tokens = min(float(self.capacity), self._tokens + 1)
+
+
+class RobotsCache:
+    """Thread-safe robots.txt cache with a TTL.
+
+    Concurrent lookups for the same host share a single fetch. Missing
+    robots.txt (4xx) allows everything; 401/403 disallow everything, and
+    network errors allow everything until the next refresh, matching the
+    conventions of urllib.robotparser.
+
+    Attributes:
+        ttl: Seconds a fetched robots.txt stays valid.
+        user_agent: Agent name matched against robots.txt rules.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_ROBOTS_TTL,
+        user_agent: str = ROBOTS_USER_AGENT,
+        session: Optional[requests.Session] = None,
+        timeout: float = 10,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            ttl: Seconds a fetched robots.txt stays valid. Defaults to 1 hour.
+            user_agent: Agent name matched against robots.txt rules.
+            session: Optional HTTP session for robots.txt requests.
+            timeout: Request timeout in seconds. Defaults to 10.
+        """
+        self.ttl = ttl
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self._session = session if session is not None else requests.Session()
+        self._entries: Dict[str, Tuple[RobotFileParser, float]] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, host: str) -> RobotFileParser:
+        """Download and parse robots.txt for a host."""
+        parser = RobotFileParser(host + "/robots.txt")
+        try:
+            response = self._session.get(host + "/robots.txt", timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"[WARNING] robots.txt unavailable for {host}: {e}")
+            parser.parse(ALLOW_ALL_RULES)
+            return parser
+        if response.status_code in (401, 403):
+            parser.parse(DISALLOW_ALL_RULES)
+        elif response.status_code >= 400:
+            parser.parse(ALLOW_ALL_RULES)
+        else:
+            parser.parse(response.text.splitlines())
+        return parser
+
+    def rules(self, url: str) -> RobotFileParser:
+        """Return cached robots.txt rules for a URL's host, fetching if stale.
+
+        Args:
+            url: Any URL on the host.
+
+        Returns:
+            Parsed robots.txt rules.
+        """
+        host = host_of(url)
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry and entry[1] > time.monotonic():
+                return entry[0]
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+
+        with host_lock:
+            # Another thread may have refreshed the entry while we waited
+            with self._lock:
+                entry = self._entries.get(host)
+                if entry and entry[1] > time.monotonic():
+                    return entry[0]
+            parser = self._fetch(host)
+            with self._lock:
+                self._entries[host] = (parser, time.monotonic() + self.ttl)
+            return parser
+
+    def allowed(self, url: str) -> bool:
+        """Check whether robots.txt permits fetching a URL.
+
+        Args:
+            url: URL to check.
+
+        Returns:
+            True if the URL may be fetched.
+        """
+        return self.rules(url).can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """Return the host's Crawl-delay (or Request-rate) in seconds, if any.
+
+        Args:
+            url: Any URL on the host.
+
+        Returns:
+            Minimum seconds between requests, or None if unspecified.
+        """
+        rules = self.rules(url)
+        delay = rules.crawl_delay(self.user_agent)
+        if delay:
+            return float(delay)
+        rate = rules.request_rate(self.user_agent)
+        if rate and rate.requests:
+            return rate.seconds / rate.requests
+        return None
+
+
+class HostScheduler:
+    """Per-host rate limiting and robots.txt enforcement for outbound fetches.
+
+    One scheduler is meant to be shared by every scrape in the process (see
+    default_scheduler()), so parallel client runs that hit the same host
+    share its token bucket instead of each hammering it at full speed.
+
+    Attributes:
+        rate: Default requests/second per host, or None for no limit.
+        burst: Token bucket capacity per host.
+        robots: RobotsCache, or None when robots.txt is not enforced.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        robots: Optional[RobotsCache] = None,
+        respect_robots: bool = True,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            rate: Requests per second per host. None disables limiting.
+            burst: Back-to-back requests allowed per host. Defaults to 2.
+            robots: Optional RobotsCache to use; one is created if omitted.
+            respect_robots: Enforce robots.txt rules. Defaults to True.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.robots = (robots or RobotsCache()) if respect_robots else None
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._cond = threading.Condition()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        """Return the host's bucket. Must be called with the condition held."""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    def allowed(self, url: str) -> bool:
+        """Check robots.txt and apply any Crawl-delay to the host's bucket.
+
+        Args:
+            url: URL about to be fetched.
+
+        Returns:
+            True if the URL may be fetched.
+        """
+        if self.robots is None:
+            return True
+        allowed = self.robots.allowed(url)
+        delay = self.robots.crawl_delay(url)
+        if delay:
+            with self._cond:
+                bucket = self._bucket(host_of(url))
+                host_rate = 1.0 / delay
+                if bucket.rate is None or host_rate < bucket.rate:
+                    bucket.rate = host_rate
+        return allowed
+
+    def acquire(self, url: str) -> bool:
+        """Block until the URL's host has a free token, honoring robots.txt.
+
+        Args:
+            url: URL about to be fetched.
+
+        Returns:
+            False if robots.txt disallows the URL, otherwise True once the
+            request may be sent.
+        """
+        if not self.allowed(url):
+            return False
+        host = host_of(url)
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                ready = self._bucket(host).ready_at(now)
+                if ready <= now:
+                    self._bucket(host).consume(now)
+                    return True
+                self._cond.wait(ready - now)
+
+    def map(
+        self,
+        func: Callable[[str], Any],
+        urls: Iterable[str],
+        max_workers: int = 8,
+        on_blocked: Optional[Callable[[str], Any]] = None,
+        window: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """Run ``func`` over URLs, always dispatching the host ready soonest.
+
+        URLs are pulled lazily into per-host queues (at most ``window`` at a
+        time). Each free worker takes the next URL from whichever host has a
+        token available, so a rate-limited host never blocks work queued for
+        other hosts. URLs blocked by robots.txt give their token back, as
+        acquire() never takes one for them. Results are yielded in input
+        order.
+
+        Args:
+            func: Function called with each allowed URL on a worker thread.
+            urls: URLs to process. May be a lazy iterator.
+            max_workers: Number of worker threads. Defaults to 8.
+            on_blocked: Called instead of ``func`` for URLs disallowed by
+                robots.txt. Defaults to returning None.
+            window: Maximum URLs pulled but not yet yielded. Defaults to
+                4 * max_workers.
+
+        Yields:
+            ``func(url)`` (or ``on_blocked(url)``) for each URL, in order.
+
+        Raises:
+            ValueError: If max_workers is less than 1.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        limit = window or 4 * max_workers
+        source = iter(urls)
+        queues: Dict[str, Deque[Tuple[int, str]]] = {}
+        results: Dict[int, Tuple[bool, Any]] = {}
+        state = {"pulled": 0, "exhausted": False, "stop": False}
+
+        def take() -> Optional[Tuple[int, str]]:
+            """Pop the next URL whose host is ready; wait if none is."""
+            with self._cond:
+                while not state["stop"]:
+                    now = time.monotonic()
+                    best_host, best_ready = None, None
+                    for host, queue in queues.items():
+                        if queue:
+                            ready = self._bucket(host).ready_at(now)
+                            if best_ready is None or ready < best_ready:
+                                best_host, best_ready = host, ready
+                    if best_host is None:
+                        if state["exhausted"]:
+                            return None
+                        self._cond.wait()
+                    elif best_ready is not None and best_ready > now:
+                        self._cond.wait(best_ready - now)
+                    else:
+                        self._bucket(best_host).consume(now)
+                        return queues[best_host].popleft()
+                return None
+
+        def worker() -> None:
+            while True:
+                item = take()
+                if item is None:
+                    return
+                index, url = item
+                try:
+                    if self.robots is not None and not self.allowed(url):
+                        # take() spent the host's token before robots.txt
+                        # could be checked without the lock; give it back
+                        with self._cond:
+                            self._bucket(host_of(url)).refund(time.monotonic())
+                            self._cond.notify_all()
+                        outcome = (True, on_blocked(url) if on_blocked else None)
+                    else:
+                        outcome = (True, func(url))
+                except Exception as e:  # re-raised in input order below
+                    outcome = (False, e)
+                with self._cond:
+                    results[index] = outcome
+                    self._cond.notify_all()
+
+        threads = [
+            threading.Thread(target=worker, daemon=True) for _ in range(max_workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        next_index = 0
+        try:
+            while True:
+                # Top up the per-host queues without holding the lock while
+                # the source iterator does its own work (e.g. sitemap paging)
+                while not state["exhausted"] and state["pulled"] - next_index < limit:
+                    url = next(source, None)
+                    with self._cond:
+                        if url is None:
+                            state["exhausted"] = True
+                        else:
+                            queues.setdefault(host_of(url), deque()).append(
+                                (state["pulled"], url)
+                            )
+                            state["pulled"] += 1
+                        self._cond.notify_all()
+
+                with self._cond:
+                    while next_index not in results:
+                        if state["exhausted"] and next_index >= state["pulled"]:
+                            return
+                        self._cond.wait()
+                    ok, value = results.pop(next_index)
+                next_index += 1
+                if not ok:
+                    raise value
+                yield value
+        finally:
+            with self._cond:
+                state["stop"] = True
+                state["exhausted"] = True
+                self._cond.notify_all()
+            for thread in threads:
+                thread.join()
+
+
+_default_scheduler: Optional[HostScheduler] = None
+_default_lock = threading.Lock()
+
+
+def default_scheduler() -> HostScheduler:
+    """Return the process-wide scheduler shared by all scrapes.
+
+    Returns:
+        Lazily created HostScheduler with default rate and robots settings.
+    """
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = HostScheduler()
+        return _default_scheduler
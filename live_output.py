@@ -0,0 +1,243 @@
+r"""
+Module/Script Name: live_output.py
+Path: E:\projects\Project Tracking\live_output.py
+
+Description:
+Thread-safe channel for showing streamed GPT-4 output in the Tk tabs.
+Worker threads push start/token/end events onto a queue; a LiveTextView
+polls it from the Tk event loop with after(), appends each completion's
+tokens to its own section of a Text widget, and reports time-to-first-token
+next to the total run time. Nothing here imports tkinter, so the content
+generators can accept a LiveOutput without depending on the GUI.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release with event queue, timing and Text widget view
+"""
+
+import queue
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+# Milliseconds between LiveTextView polls of the queue
+POLL_INTERVAL_MS = 50
+
+# Events rendered per poll, so a burst cannot stall the Tk event loop
+MAX_EVENTS_PER_POLL = 500
+
+
+@dataclass
+class LiveEvent:
+    """One streamed-output event.
+
+    Attributes:
+        kind: "start", "token" or "end".
+        label: Completion the event belongs to (e.g. the FAQ question).
+        text: Token text for "token" events, error text for a failed "end".
+        at: time.monotonic() when the event was produced.
+    """
+
+    kind: str
+    label: str
+    text: str = ""
+    at: float = 0.0
+
+
+class LiveOutput:
+    """Queue of streamed-output events, safe to feed from any thread."""
+
+    def __init__(self) -> None:
+        self._events: "queue.Queue[LiveEvent]" = queue.Queue()
+
+    def _put(self, kind: str, label: str, text: str = "") -> None:
+        self._events.put(LiveEvent(kind, label, text, time.monotonic()))
+
+    def start(self, label: str) -> None:
+        """Announce that a completion request for ``label`` was sent."""
+        self._put("start", label)
+
+    def token(self, label: str, text: str) -> None:
+        """Add streamed text to ``label``'s output."""
+        self._put("token", label, text)
+
+    def end(self, label: str, error: str = "") -> None:
+        """Mark ``label``'s completion as finished (or failed with ``error``)."""
+        self._put("end", label, error)
+
+    def writer(self, label: str) -> Callable[[str], None]:
+        """Return an ``on_token`` callback that streams into ``label``."""
+        return lambda text: self.token(label, text)
+
+    def drain(self, max_events: int = MAX_EVENTS_PER_POLL) -> List[LiveEvent]:
+        """Remove and return queued events, oldest first.
+
+        Args:
+            max_events: Most events to return. Defaults to 500.
+        """
+        events: List[LiveEvent] = []
+        while len(events) < max_events:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+
+class StreamTiming:
+    """Time-to-first-token and total time from a sequence of LiveEvents.
+
+    Attributes:
+        started: Run start (time.monotonic()), set by begin().
+        first_tokens: Seconds from each completion's start to its first token.
+        finished: Completions that have ended.
+    """
+
+    def __init__(self) -> None:
+        self.started = 0.0
+        self.first_tokens: List[float] = []
+        self.finished = 0
+        self._pending: Dict[str, float] = {}
+        self.begin()
+
+    def begin(self) -> None:
+        """Reset for a new run starting now."""
+        self.started = time.monotonic()
+        self.first_tokens.clear()
+        self.finished = 0
+        self._pending.clear()
+
+    def apply(self, event: LiveEvent) -> None:
+        """Update the timing with one event."""
+        if event.kind == "start":
+            self._pending[event.label] = event.at
+        elif event.kind == "token" and event.label in self._pending:
+            self.first_tokens.append(event.at - self._pending.pop(event.label))
+        elif event.kind == "end":
+            self._pending.pop(event.label, None)
+            self.finished += 1
+
+    def describe(self, now: Optional[float] = None) -> str:
+        """Return a status line such as "First token 0.8s | total 12.3s".
+
+        Args:
+            now: Clock reading for the total. Defaults to time.monotonic().
+        """
+        total = (now if now is not None else time.monotonic()) - self.started
+        if not self.first_tokens:
+            return f"Waiting for first token | total {total:.1f}s"
+        first = self.first_tokens[0]
+        text = f"First token {first:.1f}s"
+        if len(self.first_tokens) > 1:
+            average = sum(self.first_tokens) / len(self.first_tokens)
+            text += f" (avg {average:.1f}s over {len(self.first_tokens)})"
+        return f"{text} | total {total:.1f}s"
+
+
+class LiveTextView:
+    """Renders a LiveOutput into a Tk Text widget from the Tk event loop.
+
+    Each label gets its own section ("Q: label" heading, then its tokens),
+    so concurrent completions stream side by side without interleaving.
+
+    Attributes:
+        live: Event queue the worker threads write to.
+        timing: Timing of the current run.
+    """
+
+    def __init__(
+        self,
+        text: Any,
+        on_status: Optional[Callable[[str], None]] = None,
+        headings: bool = True,
+    ) -> None:
+        """Attach to a Text widget.
+
+        Args:
+            text: tk.Text (or scrolledtext) widget to write into.
+            on_status: Called on the Tk thread with the timing status line.
+            headings: Start each label's section with the label itself.
+                Defaults to True.
+        """
+        self.text = text
+        self.on_status = on_status
+        self.headings = headings
+        self.live = LiveOutput()
+        self.timing = StreamTiming()
+        self._marks: Dict[str, str] = {}
+        self._job: Optional[str] = None
+
+    def begin(self) -> LiveOutput:
+        """Clear the widget, reset the timing and start polling.
+
+        Returns:
+            The LiveOutput to hand to the worker thread.
+        """
+        self.stop()
+        self.live = LiveOutput()
+        self.timing.begin()
+        self._marks.clear()
+        self.text.delete("1.0", "end")
+        self._job = self.text.after(POLL_INTERVAL_MS, self._poll)
+        return self.live
+
+    def finish(self) -> None:
+        """Render the remaining events and stop polling. Call on the Tk thread."""
+        self.stop()
+        self.render(self.live.drain(max_events=1 << 30))
+
+    def stop(self) -> None:
+        """Stop polling without rendering queued events."""
+        if self._job is not None:
+            self.text.after_cancel(self._job)
+            self._job = None
+
+    def _poll(self) -> None:
+        self.render(self.live.drain())
+        self._job = self.text.after(POLL_INTERVAL_MS, self._poll)
+
+    def _section(self, label: str) -> str:
+        """Return the mark tokens for ``label`` are inserted at."""
+        mark = self._marks.get(label)
+        if mark is None:
+            mark = f"live{len(self._marks)}"
+            self._marks[label] = mark
+            heading = f"Q: {label}\nA: " if self.headings else ""
+            self.text.insert("end", heading)
+            # Left gravity keeps the mark before the blank line that separates
+            # this section from the next; right gravity afterwards makes each
+            # token inserted at the mark land before it, in order
+            self.text.mark_set(mark, "end-1c")
+            self.text.mark_gravity(mark, "left")
+            self.text.insert("end", "\n\n")
+            self.text.mark_gravity(mark, "right")
+        return mark
+
+    def render(self, events: List[LiveEvent]) -> None:
+        """Apply events to the widget and the timing. Call on the Tk thread."""
+        for event in events:
+            self.timing.apply(event)
+            if event.kind == "start":
+                self._section(event.label)
+            elif event.kind == "token":
+                self.text.insert(self._section(event.label), event.text)
+            elif event.kind == "end" and event.text:
+                self.text.insert(self._section(event.label), f"\n[ERROR] {event.text}")
+        if events:
+            self.text.see("end")
+        if self.on_status:
+            self.on_status(self.timing.describe())
@@ -0,0 +1,495 @@
+r"""
+Module/Script Name: llm_cache.py
+Path: E:\projects\Project Tracking\llm_cache.py
+
+Description:
+Content-addressed SQLite cache of chat completions shared by the content
+generators. A completion is keyed by a SHA-256 hash of its model, messages
+and sampling parameters, so re-running a tab with the same inputs returns
+the stored text without an OpenAI call. Bodies are zstd-compressed when the
+zstandard package is installed (zlib otherwise), entries expire after a TTL
+and are evicted least-recently-used over a size budget. A bypassing cache
+skips lookups but still stores fresh results. Run as a script to inspect or
+purge entries.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.02
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.02 - Refresh mode shares the default connection; SQLite busy timeout
+* v1.01 - contains(), put_many() and API token counts for batch results
+* v1.00 - Initial release with hashed keys, zstd bodies, TTL, LRU budget and CLI
+
+Usage:
+    python llm_cache.py stats
+    python llm_cache.py list [--model NAME] [--limit N]
+    python llm_cache.py purge (--expired | --all | --model NAME)
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:  # optional; bodies fall back to zlib
+    zstandard = None
+
+from text_dedup import estimate_tokens
+
+DEFAULT_LLM_CACHE_FILE = "llm_cache.sqlite3"
+DEFAULT_TTL = 30 * 24 * 3600
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# Seconds to wait for another process (e.g. a batch ingest) holding the lock
+DB_TIMEOUT = 30.0
+
+# Request options that do not change the completion text
+_UNKEYED_PARAMS = frozenset({"stream", "timeout", "user"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS completions (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    tokens INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_completions_access ON completions (last_access);
+"""
+
+
+def completion_key(
+    model: str, messages: Sequence[Mapping[str, Any]], params: Mapping[str, Any]
+) -> str:
+    """Return the content hash a completion is stored under.
+
+    Args:
+        model: Model name.
+        messages: Chat messages, in order.
+        params: Sampling parameters (temperature, max_tokens, ...). Options
+            that do not change the text, such as stream, are ignored.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    payload = {
+        "model": model,
+        "messages": [dict(message) for message in messages],
+        "params": {k: v for k, v in params.items() if k not in _UNKEYED_PARAMS},
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _compress(data: bytes) -> Tuple[str, bytes]:
+    """Return (codec, compressed bytes) using the best available codec."""
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+    return "zlib", zlib.compress(data, 6)
+
+
+def _decompress(codec: str, body: bytes) -> Optional[bytes]:
+    """Decompress a stored body, or None if its codec is unavailable here."""
+    if codec == "zlib":
+        return zlib.decompress(body)
+    if codec == "zstd" and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(body)
+    return None
+
+
+class LLMCache:
+    """SQLite-backed cache of chat completion text with TTL and size budget.
+
+    Safe to share between the worker threads of the content generators.
+
+    Attributes:
+        path: Location of the SQLite cache file.
+        ttl: Seconds a stored completion stays fresh.
+        max_bytes: Size cap for compressed bodies.
+        bypass: Skip lookups (always call the API) but store the results.
+        hits: Lookups answered from the cache this session.
+        misses: Lookups that needed an API call this session.
+        stores: Completions stored this session.
+        evictions: Completions removed to stay under max_bytes.
+        tokens_saved: Estimated prompt and completion tokens not spent
+            because of this session's hits.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_LLM_CACHE_FILE,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        bypass: bool = False,
+    ) -> None:
+        """Open (or create) the cache file.
+
+        Args:
+            path: SQLite file path. Defaults to llm_cache.sqlite3.
+            ttl: Freshness lifetime in seconds. Defaults to 30 days.
+            max_bytes: Size cap in bytes. Defaults to 50 MB.
+            bypass: Skip lookups but keep storing. Defaults to False.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.tokens_saved = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=DB_TIMEOUT, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def bypassing(self) -> "LLMCache":
+        """Return a view of this cache that skips lookups but still stores.
+
+        The view shares this cache's connection and lock, so both can be
+        used in one process without a second connection to the file.
+        Session counters start at zero; closing either closes both.
+
+        Returns:
+            LLMCache with ``bypass`` set.
+        """
+        view = copy.copy(self)
+        view.bypass = True
+        view.hits = view.misses = view.stores = view.evictions = 0
+        view.tokens_saved = 0
+        return view
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a fresh cached completion, if any.
+
+        Args:
+            key: Key from completion_key().
+
+        Returns:
+            Completion text, or None on a miss, an expired entry or when
+            the cache is bypassed.
+        """
+        if self.bypass:
+            with self._lock:
+                self.misses += 1
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT codec, body, tokens, created_at FROM completions WHERE key = ?",
+                (key,),
+            ).fetchone()
+            data = None
+            if row is not None and now - row[3] <= self.ttl:
+                data = _decompress(row[0], row[1])
+            if data is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE completions SET last_access = ?, hit_count = hit_count + 1 "
+                "WHERE key = ?",
+                (now, key),
+            )
+            self._conn.commit()
+            self.hits += 1
+            self.tokens_saved += row[2]
+        return data.decode("utf-8")
+
+    def contains(self, key: str) -> bool:
+        """Return whether get() would serve ``key``, without counting a lookup.
+
+        Args:
+            key: Key from completion_key().
+        """
+        if self.bypass:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT codec, created_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+        return (
+            row is not None
+            and time.time() - row[1] <= self.ttl
+            and (row[0] == "zlib" or zstandard is not None)
+        )
+
+    def put(
+        self,
+        key: str,
+        model: str,
+        content: str,
+        messages: Sequence[Mapping[str, Any]] = (),
+        tokens: Optional[int] = None,
+    ) -> None:
+        """Store a completion.
+
+        Args:
+            key: Key from completion_key().
+            model: Model that wrote the completion.
+            content: Completion text.
+            messages: Prompt messages, used only to estimate the tokens a
+                later hit saves.
+            tokens: Prompt and completion tokens reported by the API, used
+                instead of the estimate when given.
+        """
+        if tokens is None:
+            tokens = estimate_tokens(content) + sum(
+                estimate_tokens(str(message.get("content", ""))) for message in messages
+            )
+        self.put_many([(key, model, content, tokens)])
+
+    def put_many(self, items: Iterable[Tuple[str, str, str, int]]) -> int:
+        """Store several completions in one transaction.
+
+        Args:
+            items: (key, model, content, tokens) tuples.
+
+        Returns:
+            Number of completions stored.
+        """
+        now = time.time()
+        rows = []
+        for key, model, content, tokens in items:
+            codec, body = _compress(content.encode("utf-8"))
+            rows.append((key, model, codec, body, len(body), tokens, now, now))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                rows,
+            )
+            self._evict()
+            self._conn.commit()
+            self.stores += len(rows)
+        return len(rows)
+
+    def _evict(self) -> None:
+        """Delete least recently used completions until under max_bytes.
+
+        Must be called with the lock held.
+        """
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM completions"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM completions ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def entries(self, model: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """List stored completions, most recently used first.
+
+        Args:
+            model: Only completions written by this model.
+            limit: Maximum rows to return. Defaults to 50.
+
+        Returns:
+            One dictionary per entry with its key, model, codec, size,
+            estimated tokens, hit count, age and whether it is still fresh.
+        """
+        sql = (
+            "SELECT key, model, codec, size, tokens, hit_count, created_at "
+            "FROM completions"
+        )
+        args: List[Any] = []
+        if model:
+            sql += " WHERE model = ?"
+            args.append(model)
+        sql += " ORDER BY last_access DESC LIMIT ?"
+        args.append(limit)
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [
+            {
+                "key": key,
+                "model": entry_model,
+                "codec": codec,
+                "size": size,
+                "tokens": tokens,
+                "hits": hits,
+                "age_seconds": int(now - created),
+                "fresh": now - created <= self.ttl,
+            }
+            for key, entry_model, codec, size, tokens, hits, created in rows
+        ]
+
+    def purge(self, expired_only: bool = True, model: Optional[str] = None) -> int:
+        """Delete cached completions.
+
+        Args:
+            expired_only: Only delete entries older than the TTL. Ignored
+                when ``model`` is given.
+            model: Delete every entry written by this model.
+
+        Returns:
+            Number of entries deleted.
+        """
+        with self._lock:
+            if model:
+                cursor = self._conn.execute(
+                    "DELETE FROM completions WHERE model = ?", (model,)
+                )
+            elif expired_only:
+                cursor = self._conn.execute(
+                    "DELETE FROM completions WHERE created_at < ?",
+                    (time.time() - self.ttl,),
+                )
+            else:
+                cursor = self._conn.execute("DELETE FROM completions")
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit rate, tokens saved and current cache size.
+
+        Returns:
+            Dictionary with this session's hits, misses, hit_rate, stores,
+            evictions and tokens_saved, plus entries, size_bytes, codec
+            (used for new entries) and lifetime_tokens_saved (hits on the
+            entries still stored).
+        """
+        with self._lock:
+            entries, size, lifetime = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), "
+                "COALESCE(SUM(hit_count * tokens), 0) FROM completions"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "tokens_saved": self.tokens_saved,
+            "entries": entries,
+            "size_bytes": size,
+            "codec": "zstd" if zstandard is not None else "zlib",
+            "lifetime_tokens_saved": lifetime,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_default_caches: Dict[bool, LLMCache] = {}
+_default_lock = threading.Lock()
+
+
+def default_llm_cache(bypass: bool = False) -> LLMCache:
+    """Return the process-wide LLM cache used by the content generators.
+
+    Args:
+        bypass: Return the view that skips lookups but still stores. It
+            shares the default instance's connection (see bypassing()).
+
+    Returns:
+        Lazily opened LLMCache.
+    """
+    with _default_lock:
+        if not _default_caches:
+            cache = LLMCache()
+            _default_caches[False] = cache
+            _default_caches[True] = cache.bypassing()
+        return _default_caches[bypass]
+
+
+def llm_cache_for_config(client_config: Dict[str, Any]) -> Optional[LLMCache]:
+    """Return the LLM cache a client configuration asks for.
+
+    Args:
+        client_config: Client configuration. "cache_llm" (default True)
+            turns the cache on; "refresh_llm_cache" (default False) bypasses
+            lookups so every completion is regenerated and re-stored.
+
+    Returns:
+        Shared LLMCache, or None when caching is off.
+    """
+    if not client_config.get("cache_llm", True):
+        return None
+    return default_llm_cache(bypass=bool(client_config.get("refresh_llm_cache")))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Inspect or purge the LLM cache from the command line.
+
+    Args:
+        argv: Command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Inspect or purge the LLM cache")
+    parser.add_argument("--path", default=DEFAULT_LLM_CACHE_FILE)
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="show entry count, size and tokens saved")
+    list_parser = commands.add_parser("list", help="list cached completions")
+    list_parser.add_argument("--model", help="only completions from this model")
+    list_parser.add_argument("--limit", type=int, default=50)
+    purge_parser = commands.add_parser("purge", help="delete cached completions")
+    group = purge_parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--expired", action="store_true", help="entries past TTL")
+    group.add_argument("--all", action="store_true", help="every entry")
+    group.add_argument("--model", help="completions from this model")
+    args = parser.parse_args(argv)
+
+    cache = LLMCache(args.path, ttl=args.ttl)
+    try:
+        if args.command == "stats":
+            stats = cache.stats()
+            print(
+                f"[INFO] {stats['entries']} entries, {stats['size_bytes']} bytes "
+                f"({stats['codec']}), ~{stats['lifetime_tokens_saved']:,} tokens saved"
+            )
+        elif args.command == "list":
+            for entry in cache.entries(args.model, args.limit):
+                state = "fresh" if entry["fresh"] else "expired"
+                print(
+                    f"{entry['key'][:12]} {entry['model']} {entry['codec']} "
+                    f"{entry['size']}B ~{entry['tokens']} tokens "
+                    f"{entry['hits']} hits {entry['age_seconds']}s {state}"
+                )
+        else:
+            removed = cache.purge(expired_only=args.expired, model=args.model)
+            print(f"[SUCCESS] Purged {removed} entries")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+r"""
+Module/Script Name: llm_client.py
+Path: E:\projects\Project Tracking\llm_client.py
+
+Description:
+Shared OpenAI chat-completion helper for the content generators. Adds a
+per-call timeout, jittered exponential retries, and an adaptive concurrency
+limit that backs off on 429 responses, honors Retry-After and the
+x-ratelimit-* headers, and grows again while requests succeed. Completions
+can be streamed token by token to a callback, and answered from an LLMCache.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.03
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.03 - Typed the create() arguments and the rate-limit reset waits
+* v1.02 - Optional LLMCache consulted before, and filled after, each call
+* v1.01 - Streaming path (on_token) for live output in the GUI
+* v1.00 - Initial release with adaptive concurrency and rate-limit backoff
+"""
+
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, TypeVar
+
+import openai
+from openai import OpenAI
+
+from llm_cache import LLMCache, completion_key
+
+DEFAULT_MODEL = "gpt-4"
+
+# Seconds allowed for one chat completion before it is retried
+DEFAULT_TIMEOUT = 60.0
+
+DEFAULT_MAX_RETRIES = 5
+
+# Upper bound on concurrent completions per process
+MAX_LLM_CONCURRENCY = 8
+
+# Exponential backoff base and cap (seconds) when no Retry-After is given
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """Parse an OpenAI reset duration such as "6m0s", "1.5s" or "20ms".
+
+    Args:
+        value: Duration string from an x-ratelimit-reset-* header.
+
+    Returns:
+        Seconds, or None if the value is not a duration.
+    """
+    parts = _DURATION_RE.findall(value or "")
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Return how long the server asked us to wait, in seconds.
+
+    Checks retry-after-ms, Retry-After (seconds or HTTP date), then the
+    x-ratelimit-reset-requests/tokens headers.
+
+    Args:
+        headers: Response headers (case-insensitive mapping), or None.
+
+    Returns:
+        Seconds to wait, or None if the server gave no hint.
+    """
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    waits: List[float] = []
+    for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        wait = parse_duration(headers.get(name, ""))
+        if wait is not None:
+            waits.append(wait)
+    return max(waits) if waits else None
+
+
+class AdaptiveConcurrency:
+    """Additive-increase / multiplicative-decrease limit on concurrent calls.
+
+    A 429 halves the limit and pauses every caller until the server's
+    Retry-After has passed; each run of ``limit`` consecutive successes
+    raises the limit by one, up to ``max_concurrency``.
+
+    Attributes:
+        max_concurrency: Upper bound on the limit.
+        limit: Current number of calls allowed in flight.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_LLM_CONCURRENCY) -> None:
+        """Start at full concurrency.
+
+        Args:
+            max_concurrency: Upper bound on concurrent calls. Defaults to 8.
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = self.max_concurrency
+        self._active = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a call may start."""
+        with self._cond:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                elif self._active >= self.limit:
+                    self._cond.wait()
+                else:
+                    self._active += 1
+                    return
+
+    def pause(self, seconds: float) -> None:
+        """Stop new calls from starting for a while.
+
+        Args:
+            seconds: Pause length.
+        """
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def release(self, throttled: bool = False, wait: Optional[float] = None) -> None:
+        """Finish a call and adapt the limit.
+
+        Args:
+            throttled: True if the call was rejected with 429.
+            wait: Server-requested wait in seconds, if any.
+        """
+        with self._cond:
+            self._active -= 1
+            if throttled:
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+                if wait:
+                    self._paused_until = max(
+                        self._paused_until, time.monotonic() + wait
+                    )
+            else:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+    def observe(self, headers: Optional[Mapping[str, str]]) -> None:
+        """Pause ahead of time when rate-limit headers show no quota left.
+
+        Args:
+            headers: Headers of a successful response.
+        """
+        if not headers:
+            return
+        for kind in ("requests", "tokens"):
+            if headers.get(f"x-ratelimit-remaining-{kind}") == "0":
+                wait = parse_duration(headers.get(f"x-ratelimit-reset-{kind}", ""))
+                if wait:
+                    self.pause(wait)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return a full-jitter exponential backoff delay.
+
+    Args:
+        attempt: Zero-based retry number.
+
+    Returns:
+        Seconds to sleep, uniformly drawn from [0, min(cap, base * 2**attempt)].
+    """
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+
+
+_default_client: Optional[OpenAI] = None
+_default_limiter: Optional[AdaptiveConcurrency] = None
+_default_lock = threading.Lock()
+
+
+def default_client() -> OpenAI:
+    """Return a process-wide OpenAI client configured from OPENAI_API_KEY."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return _default_client
+
+
+def default_limiter() -> AdaptiveConcurrency:
+    """Return the process-wide adaptive concurrency limiter."""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = AdaptiveConcurrency()
+        return _default_limiter
+
+
+def chat_completion(
+    messages: List[Dict[str, str]],
+    model: str = DEFAULT_MODEL,
+    temperature: float = 0.7,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    client: Optional[OpenAI] = None,
+    limiter: Optional[AdaptiveConcurrency] = None,
+    on_token: Optional[Callable[[str], None]] = None,
+    cache: Optional[LLMCache] = None,
+    **kwargs: Any,
+) -> str:
+    """Run one chat completion with timeout, retries and adaptive throttling.
+
+    Retries 429s (after Retry-After, or jittered backoff), timeouts,
+    connection errors and 5xx responses. Quota exhaustion
+    (``insufficient_quota``) and other 4xx errors are raised immediately.
+    With ``on_token`` the response is streamed: each piece of text is
+    passed to it as it arrives, and the timeout applies between pieces
+    rather than to the whole answer. A stream that fails after text was
+    delivered is raised, not retried, so no text is delivered twice.
+    With ``cache``, a stored completion for the same model, messages and
+    sampling parameters is returned without an API call (and passed to
+    ``on_token`` in one piece); new completions are stored in it.
+
+    Args:
+        messages: Chat messages.
+        model: Model name. Defaults to "gpt-4".
+        temperature: Sampling temperature. Defaults to 0.7.
+        timeout: Per-attempt timeout in seconds. Defaults to 60.
+        max_retries: Retries after the first attempt. Defaults to 5.
+        client: OpenAI client. Defaults to default_client().
+        limiter: Concurrency limiter. Defaults to default_limiter().
+        on_token: Called with each streamed piece of text. Defaults to
+            None (no streaming).
+        cache: LLMCache to answer from and store in. Defaults to None
+            (no caching).
+        **kwargs: Extra arguments for chat.completions.create.
+
+    Returns:
+        Stripped message content ("" if the model returned none).
+
+    Raises:
+        openai.OpenAIError: If the call still fails after all retries.
+    """
+    key = ""
+    if cache is not None:
+        key = completion_key(model, messages, dict(kwargs, temperature=temperature))
+        cached = cache.get(key)
+        if cached is not None:
+            if on_token and cached:
+                on_token(cached)
+            return cached
+
+    client = client or default_client()
+    limiter = limiter or default_limiter()
+    api = client.with_options(timeout=timeout, max_retries=0).chat.completions
+    options: Dict[str, Any] = dict(
+        kwargs, model=model, messages=messages, temperature=temperature
+    )
+    if on_token is not None:
+        options["stream"] = True
+
+    attempt = 0
+    while True:
+        limiter.acquire()
+        throttled = False
+        wait: Optional[float] = None
+        streamed = False
+        try:
+            raw = api.with_raw_response.create(**options)
+            limiter.observe(raw.headers)
+            if on_token is None:
+                content = raw.parse().choices[0].message.content
+                result = content.strip() if content else ""
+            else:
+                parts: List[str] = []
+                for chunk in raw.parse():
+                    piece = chunk.choices[0].delta.content if chunk.choices else None
+                    if piece:
+                        streamed = True
+                        parts.append(piece)
+                        on_token(piece)
+                result = "".join(parts).strip()
+            if cache is not None and result:
+                cache.put(key, model, result, messages)
+            return result
+        except openai.RateLimitError as e:
+            if getattr(e, "code", None) == "insufficient_quota":
+                raise
+            throttled = True
+            wait = retry_after(e.response.headers)
+            error: Exception = e
+        except (
+            openai.APITimeoutError,
+            openai.APIConnectionError,
+            openai.InternalServerError,
+        ) as e:
+            error = e
+        finally:
+            limiter.release(throttled, wait)
+
+        if attempt == max_retries or streamed:
+            raise error
+        delay = (wait + random.uniform(0, 0.5)) if wait else backoff_delay(attempt)
+        print(
+            f"[WARNING] OpenAI call failed ({type(error).__name__}), "
+            f"retry {attempt + 1}/{max_retries} in {delay:.1f}s"
+        )
+        time.sleep(delay)
+        attempt += 1
+
+
+def map_ordered(
+    func: Callable[[T], R], items: List[T], max_workers: int = MAX_LLM_CONCURRENCY
+) -> List[R]:
+    """Apply ``func`` to items on a worker pool, keeping input order.
+
+    Concurrency is further limited by the adaptive limiter inside
+    chat_completion(); the pool size is only the upper bound.
+
+    Args:
+        func: Function to call for each item.
+        items: Inputs.
+        max_workers: Pool size. Defaults to 8.
+
+    Returns:
+        Results in the same order as ``items``.
+
+    Raises:
+        Exception: The first exception raised by ``func``, in input order.
+    """
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as pool:
+        return list(pool.map(func, items))
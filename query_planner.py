@@ -0,0 +1,442 @@
+r"""
+Module/Script Name: query_planner.py
+Path: E:\projects\Project Tracking\query_planner.py
+
+Description:
+Yield-aware planner for the SerpAPI searches behind fetch_paa_questions().
+Records how many new PAA questions each keyword variant and result page
+produced in a small SQLite stats file, runs the searches with the highest
+expected yield first, only opens a variant's next page when the previous
+page returned something new, and keeps just enough searches in flight to
+reach max_questions. Every run/skip decision is kept for inspection.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.02
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.02 - QueryStats.rows() typed as Dict[str, Any] (template is a string)
+* v1.01 - Plans can be limited to a subset of variants (local-only)
+* v1.00 - Initial release with per-variant/page yield stats and plan log
+
+Usage:
+    python query_planner.py
+"""
+
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_YIELD_STATS_FILE = "query_yield.sqlite3"
+
+# Keyword variants searched for every seed keyword, in tie-break order
+VARIANT_TEMPLATES = [
+    "{seed}",
+    "{seed} near me",
+    "{seed} {geo}",
+    "common questions about {seed}",
+    "{seed} services",
+    "what to know about {seed}",
+]
+
+# Variants whose results depend on the searched location; the only ones
+# worth repeating for each nearby city of a multi-location run
+LOCAL_VARIANT_TEMPLATES = [
+    t for t in VARIANT_TEMPLATES if "{geo}" in t or "near me" in t
+]
+
+# Result offsets requested for each variant (pages 1-3)
+PAGE_STARTS = [0, 10, 20]
+
+# Expected new questions per page before any runs are recorded, and how
+# many runs' worth of weight that guess carries against observed yields
+PRIOR_YIELD = {0: 4.0, 10: 2.0, 20: 1.0}
+PRIOR_WEIGHT = 2.0
+
+# A page whose recorded average is at least this many new questions lets
+# the variant's next page be issued alongside it instead of after it
+SPECULATE_MIN_YIELD = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS query_yield (
+    template TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    new_questions INTEGER NOT NULL,
+    results INTEGER NOT NULL,
+    PRIMARY KEY (template, start)
+)
+"""
+
+
+class YieldStats:
+    """SQLite store of new-question yield per (variant template, page).
+
+    Attributes:
+        path: Location of the SQLite stats file.
+    """
+
+    def __init__(self, path: str = DEFAULT_YIELD_STATS_FILE) -> None:
+        """Open (or create) the stats file and load it into memory.
+
+        Args:
+            path: SQLite file path. Defaults to query_yield.sqlite3.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._rows: Dict[Tuple[str, int], List[int]] = {
+            (template, start): [runs, new, results]
+            for template, start, runs, new, results in self._conn.execute(
+                "SELECT template, start, runs, new_questions, results FROM query_yield"
+            )
+        }
+
+    def expected_yield(self, template: str, start: int) -> float:
+        """Return the expected number of new questions from one search.
+
+        Observed yield is blended with PRIOR_YIELD, so untried variants
+        are neither ignored nor trusted blindly.
+
+        Args:
+            template: Variant template, e.g. "{seed} near me".
+            start: Result offset.
+
+        Returns:
+            Expected new questions.
+        """
+        runs, new, _ = self._rows.get((template, start), (0, 0, 0))
+        prior = PRIOR_YIELD.get(start, 1.0)
+        return (new + prior * PRIOR_WEIGHT) / (runs + PRIOR_WEIGHT)
+
+    def observed_yield(self, template: str, start: int) -> Optional[float]:
+        """Return the recorded average new questions, or None if never run.
+
+        Args:
+            template: Variant template.
+            start: Result offset.
+        """
+        runs, new, _ = self._rows.get((template, start), (0, 0, 0))
+        return new / runs if runs else None
+
+    def record(self, template: str, start: int, new: int, results: int) -> None:
+        """Add one search outcome.
+
+        Args:
+            template: Variant template.
+            start: Result offset.
+            new: Questions it added to the run.
+            results: Questions it returned in total.
+        """
+        with self._lock:
+            row = self._rows.setdefault((template, start), [0, 0, 0])
+            row[0] += 1
+            row[1] += new
+            row[2] += results
+            self._conn.execute(
+                "INSERT OR REPLACE INTO query_yield VALUES (?, ?, ?, ?, ?)",
+                (template, start, *row),
+            )
+            self._conn.commit()
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Return every recorded (template, page) with its averages.
+
+        Returns:
+            Dictionaries with template, start, runs, avg_new, avg_results
+            and expected, highest expected yield first.
+        """
+        with self._lock:
+            items = list(self._rows.items())
+        rows = [
+            {
+                "template": template,
+                "start": start,
+                "runs": runs,
+                "avg_new": new / runs if runs else 0.0,
+                "avg_results": results / runs if runs else 0.0,
+                "expected": self.expected_yield(template, start),
+            }
+            for (template, start), (runs, new, results) in items
+        ]
+        return sorted(rows, key=lambda row: -row["expected"])
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class PlannedQuery:
+    """One search chosen by the planner.
+
+    Attributes:
+        template: Variant template.
+        keyword: Search text with seed and geo target filled in.
+        start: Result offset.
+        expected_yield: Expected new questions when it was chosen.
+    """
+
+    template: str
+    keyword: str
+    start: int
+    expected_yield: float
+
+
+@dataclass
+class QueryDecision:
+    """What the planner did with one candidate search, and why.
+
+    Attributes:
+        keyword: Search text.
+        start: Result offset.
+        expected_yield: Expected new questions at decision time.
+        action: "run", "skipped", "cancelled" or "not needed".
+        reason: Short explanation.
+        new_questions: Questions it added (runs only).
+        results: Questions it returned (runs only).
+    """
+
+    keyword: str
+    start: int
+    expected_yield: float
+    action: str
+    reason: str
+    new_questions: Optional[int] = None
+    results: Optional[int] = None
+
+
+class QueryPlan:
+    """Search schedule for one fetch_paa_questions() call.
+
+    Each variant's pages are issued in order. The next page opens once
+    the previous one added questions, or straight away when recorded stats
+    show the previous page reliably does (SPECULATE_MIN_YIELD). A page that
+    adds nothing closes the variant's deeper pages.
+
+    Attributes:
+        decisions: Decision log, in the order decisions were made.
+    """
+
+    def __init__(
+        self,
+        stats: YieldStats,
+        seed_keyword: str,
+        geo_target: str,
+        templates: Sequence[str] = VARIANT_TEMPLATES,
+        starts: Sequence[int] = PAGE_STARTS,
+    ) -> None:
+        """Create a plan where only each variant's first page is open.
+
+        Args:
+            stats: Yield store to rank searches by and record into.
+            seed_keyword: Seed keyword.
+            geo_target: City/state for the "{geo}" placeholder.
+            templates: Variant templates. Defaults to VARIANT_TEMPLATES.
+            starts: Result offsets per variant. Defaults to PAGE_STARTS.
+        """
+        self.stats = stats
+        self.starts = list(starts)
+        self.decisions: List[QueryDecision] = []
+        self._keywords = {
+            t: t.format(seed=seed_keyword, geo=geo_target) for t in templates
+        }
+        self._order = {t: i for i, t in enumerate(templates)}
+        # Variant template -> index into starts of its next unissued page
+        self._next: Dict[str, int] = {t: 0 for t in templates}
+        self._open = set(templates)
+        self._runs: Dict[Tuple[str, int], QueryDecision] = {}
+
+    def next_query(self) -> Optional[PlannedQuery]:
+        """Pick the open search with the highest expected yield.
+
+        Returns:
+            The search to run next, or None if nothing is open.
+        """
+        candidates = [t for t in self._open if self._next[t] < len(self.starts)]
+        if not candidates:
+            return None
+        template = max(
+            candidates,
+            key=lambda t: (
+                self.stats.expected_yield(t, self.starts[self._next[t]]),
+                -self._order[t],
+            ),
+        )
+        start = self.starts[self._next[template]]
+        self._next[template] += 1
+        expected = self.stats.expected_yield(template, start)
+        observed = self.stats.observed_yield(template, start)
+        reason = f"highest expected yield ({expected:.1f} new)"
+        if observed is not None and observed >= SPECULATE_MIN_YIELD:
+            reason += "; next page opened early"
+        else:
+            self._open.discard(template)
+        decision = QueryDecision(
+            self._keywords[template], start, expected, "run", reason
+        )
+        self.decisions.append(decision)
+        self._runs[(template, start)] = decision
+        return PlannedQuery(template, self._keywords[template], start, expected)
+
+    def record(self, query: PlannedQuery, new: int, results: Optional[int]) -> None:
+        """Record a finished search and open or close the variant's next page.
+
+        Call in the order searches were issued.
+
+        Args:
+            query: Search returned by next_query().
+            new: Questions it added to the run.
+            results: Questions it returned, or None if the search failed.
+        """
+        decision = self._runs[(query.template, query.start)]
+        decision.new_questions, decision.results = new, results
+        if results is not None:
+            self.stats.record(query.template, query.start, new, results)
+        if new:
+            self._open.add(query.template)
+            return
+        if self._next[query.template] >= len(self.starts):
+            return
+        reason = (
+            f"page at start={query.start} failed"
+            if results is None
+            else f"page at start={query.start} returned nothing new"
+        )
+        for start in self.starts[self._next[query.template] :]:
+            self.decisions.append(
+                QueryDecision(
+                    query.keyword,
+                    start,
+                    self.stats.expected_yield(query.template, start),
+                    "skipped",
+                    reason,
+                )
+            )
+        self._next[query.template] = len(self.starts)
+        self._open.discard(query.template)
+
+    def finish(self, cancelled: Sequence[PlannedQuery] = ()) -> None:
+        """Close the plan once enough questions are collected.
+
+        Args:
+            cancelled: Searches in flight whose results were not used.
+        """
+        for query in cancelled:
+            decision = self._runs[(query.template, query.start)]
+            decision.action, decision.reason = "cancelled", "max_questions reached"
+        for template in sorted(self._next, key=self._order.__getitem__):
+            for start in self.starts[self._next[template] :]:
+                self.decisions.append(
+                    QueryDecision(
+                        self._keywords[template],
+                        start,
+                        self.stats.expected_yield(template, start),
+                        "not needed",
+                        "max_questions reached",
+                    )
+                )
+            self._next[template] = len(self.starts)
+        self._open.clear()
+
+    def summary(self) -> str:
+        """Return a one-line count of decisions by action."""
+        counts: Dict[str, int] = {}
+        for decision in self.decisions:
+            counts[decision.action] = counts.get(decision.action, 0) + 1
+        return ", ".join(f"{count} {action}" for action, count in counts.items())
+
+
+class QueryPlanner:
+    """Creates QueryPlans from a shared YieldStats store.
+
+    Attributes:
+        stats: Yield store shared by every plan.
+        last_plan: Most recent plan, for inspecting its decisions.
+    """
+
+    def __init__(self, stats: Optional[YieldStats] = None) -> None:
+        """Create a planner.
+
+        Args:
+            stats: Yield store. Defaults to YieldStats() at
+                DEFAULT_YIELD_STATS_FILE.
+        """
+        self.stats = stats or YieldStats()
+        self.last_plan: Optional[QueryPlan] = None
+
+    def plan(
+        self,
+        seed_keyword: str,
+        geo_target: str,
+        templates: Sequence[str] = VARIANT_TEMPLATES,
+    ) -> QueryPlan:
+        """Start a plan for one seed keyword and location.
+
+        Args:
+            seed_keyword: Seed keyword.
+            geo_target: City/state, e.g. "Adrian, MI".
+            templates: Variant templates to search. Defaults to
+                VARIANT_TEMPLATES.
+
+        Returns:
+            New QueryPlan (also kept as last_plan).
+        """
+        self.last_plan = QueryPlan(self.stats, seed_keyword, geo_target, templates)
+        return self.last_plan
+
+
+_default_planner: Optional[QueryPlanner] = None
+_default_lock = threading.Lock()
+
+
+def default_query_planner() -> QueryPlanner:
+    """Return the process-wide planner used by the FAQ generator.
+
+    Returns:
+        Lazily created QueryPlanner over DEFAULT_YIELD_STATS_FILE.
+    """
+    global _default_planner
+    with _default_lock:
+        if _default_planner is None:
+            _default_planner = QueryPlanner()
+        return _default_planner
+
+
+def main() -> None:
+    """Print the recorded yield of every variant and page."""
+    stats = YieldStats()
+    try:
+        rows = stats.rows()
+        if not rows:
+            print("[INFO] No searches recorded yet")
+        for row in rows:
+            print(
+                f"{row['template']!r:38} start={row['start']:<3} runs={row['runs']:<4} "
+                f"new/run={row['avg_new']:.2f} expected={row['expected']:.2f}"
+            )
+    finally:
+        stats.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+r"""
+Module/Script Name: run_site_crawler.py
+Path: E:\projects\Project Tracking\run_site_crawler.py
+
+Description:
+Runner script for the sitemap-driven site crawler. Example client configuration
+for harvesting service pages into a site corpus file.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release with example client config
+"""
+
+from typing import Dict, Any
+from site_crawler import crawl_site
+
+# Example client configuration for site crawling
+client_config: Dict[str, Any] = {
+    "name": "Tri-State Heating & Cooling, LLC",
+    "url": "https://www.tri-stateheating.com/",
+    "output_root": r"C:\Users\georg\OneDrive\RankRocket\Clients\Patrick Rombyer",
+}
+
+if __name__ == "__main__":
+    corpus_file = crawl_site(client_config, include=[r"/services/", r"/about"])
+    print(f"Set corpus_file to {corpus_file} in the background/FAQ configs")
@@ -0,0 +1,41 @@
+r"""
+Module/Script Name: run_uule_prewarm.py
+Path: E:\projects\Project Tracking\run_uule_prewarm.py
+
+Description:
+Runner script that pre-warms the persistent uule cache from saved client
+configuration files, so month-long FAQ runs never wait on SerpAPI's
+locations API.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release
+"""
+
+import sys
+from typing import Any, Dict, List
+
+from config_handler import load_config
+from faq_generator import prewarm_uule_cache
+
+# Client configuration files to pre-warm (override on the command line)
+config_files: List[str] = ["rank_rocket.json"]
+
+if __name__ == "__main__":
+    paths = sys.argv[1:] or config_files
+    configs: List[Dict[str, Any]] = [load_config(path) for path in paths]
+    prewarm_uule_cache([config for config in configs if config])
@@ -0,0 +1,292 @@
+r"""
+Module/Script Name: scrape_cache.py
+Path: E:\projects\Project Tracking\scrape_cache.py
+
+Description:
+Persistent on-disk HTTP cache for the website scraper. Stores the raw page
+body, its ETag/Last-Modified validators and the extracted text per URL in a
+SQLite file, so re-scraping an unchanged client page costs one conditional
+request and no HTML parsing.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.01
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.01 - Stores the sniffed page encoding and parses cached bytes directly
+* v1.00 - Initial release with conditional revalidation and LRU size cap
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_CACHE_FILE = "scrape_cache.sqlite3"
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    encoding TEXT,
+    body BLOB NOT NULL,
+    body_hash TEXT NOT NULL,
+    text TEXT,
+    max_paragraphs INTEGER,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class CachedPage:
+    """A cached page as stored on disk.
+
+    Attributes:
+        url: Page URL (cache key).
+        etag: ETag validator from the last full response, if any.
+        last_modified: Last-Modified validator from the last full response.
+        encoding: Character encoding used to decode the body.
+        body: Raw response body.
+        body_hash: SHA-256 of the body.
+        text: Extracted text, if previously computed.
+        max_paragraphs: Block limit the cached text was extracted with.
+    """
+
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    encoding: Optional[str]
+    body: bytes
+    body_hash: str
+    text: Optional[str]
+    max_paragraphs: Optional[int]
+
+    def validators(self) -> Dict[str, str]:
+        """Build conditional request headers for revalidating this page.
+
+        Returns:
+            Dictionary with If-None-Match and/or If-Modified-Since headers.
+        """
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ScrapeCache:
+    """SQLite-backed page cache with conditional revalidation and LRU eviction.
+
+    Safe to share between the worker threads of scraper.scrape_many().
+
+    Attributes:
+        path: Location of the SQLite cache file.
+        max_bytes: Size cap for stored bodies and text. Least recently used
+            pages are evicted once the cap is exceeded.
+        hits: Requests answered 304 Not Modified and served from disk.
+        misses: Requests that downloaded a full body.
+        text_hits: Requests that reused cached text and skipped HTML parsing.
+        evictions: Pages removed to stay under max_bytes.
+    """
+
+    def __init__(
+        self, path: str = DEFAULT_CACHE_FILE, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """Open (or create) the cache file.
+
+        Args:
+            path: SQLite file path. Defaults to scrape_cache.sqlite3.
+            max_bytes: Size cap in bytes. Defaults to 100 MB.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.text_hits = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_pages_access ON pages (last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Look up a cached page.
+
+        Args:
+            url: Page URL.
+
+        Returns:
+            CachedPage if present, otherwise None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, etag, last_modified, encoding, body, body_hash, text, "
+                "max_paragraphs FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+        return CachedPage(*row) if row else None
+
+    def resolve(
+        self,
+        url: str,
+        entry: Optional[CachedPage],
+        response: Any,
+        max_paragraphs: int,
+        extract: Callable[[bytes, int, Optional[str]], str],
+        encoding: Optional[str] = None,
+    ) -> str:
+        """Turn a (possibly conditional) response into extracted text.
+
+        Serves 304 responses from the cached body and reuses cached text
+        whenever the body is unchanged, so HTML is only parsed when the page
+        content or the block limit differs from what was stored.
+
+        Args:
+            url: Requested page URL (cache key).
+            entry: Cached page the request was revalidated against, if any.
+            response: requests.Response for the page.
+            max_paragraphs: Maximum number of text blocks to return.
+            extract: Text extractor, called as
+                extract(body, max_paragraphs, encoding).
+            encoding: Encoding of a freshly downloaded body. 304 responses
+                reuse the encoding stored with the cached page.
+
+        Returns:
+            Extracted text for the page.
+        """
+        if entry is not None and response.status_code == 304:
+            with self._lock:
+                self.hits += 1
+            page = entry
+        else:
+            with self._lock:
+                self.misses += 1
+            body = response.content
+            page = CachedPage(
+                url=url,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                encoding=encoding,
+                body=body,
+                body_hash=hashlib.sha256(body).hexdigest(),
+                text=None,
+                max_paragraphs=None,
+            )
+            if entry is not None and entry.body_hash == page.body_hash:
+                page.text = entry.text
+                page.max_paragraphs = entry.max_paragraphs
+
+        if page.text is not None and page.max_paragraphs == max_paragraphs:
+            with self._lock:
+                self.text_hits += 1
+            text = page.text
+        else:
+            text = extract(page.body, max_paragraphs, page.encoding)
+            page.text = text
+            page.max_paragraphs = max_paragraphs
+
+        self._put(page)
+        return text
+
+    def _put(self, page: CachedPage) -> None:
+        """Insert or refresh a page and evict old pages over the size cap.
+
+        Args:
+            page: Page to store.
+        """
+        size = len(page.body) + len((page.text or "").encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    page.url,
+                    page.etag,
+                    page.last_modified,
+                    page.encoding,
+                    page.body,
+                    page.body_hash,
+                    page.text,
+                    page.max_paragraphs,
+                    size,
+                    time.time(),
+                ),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Delete least recently used pages until under max_bytes.
+
+        Must be called with the lock held.
+        """
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM pages"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT url, size FROM pages ORDER BY last_access ASC"
+        ).fetchall()
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current cache size.
+
+        Returns:
+            Dictionary with hits, misses, text_hits, evictions, entries and
+            size_bytes.
+        """
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "text_hits": self.text_hits,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+    def clear(self) -> None:
+        """Remove every cached page."""
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
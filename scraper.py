@@ -13,26 +13,653 @@ Created Date:
 2024-01-15
 
 Last Modified Date:
-2025-10-23
+2026-10-18
 
 Version:
-v1.02
+v1.10
 
 License:
 CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
 
 Comments:
+* v1.10 - detect_encoding() keeps the header and meta regex matches apart
+* v1.09 - Added single-pass extract_page_data()/scrape_page_data()
+* v1.08 - Optional shared HostScheduler (robots.txt + per-host rate limit)
+* v1.07 - Added iter_scrape() ordered bounded-window generator
+* v1.06 - Parse raw bytes with a sniffed encoding instead of response.text
+* v1.05 - Added streaming early-exit extraction mode (stream=True)
+* v1.04 - Added optional persistent ScrapeCache with conditional revalidation
+* v1.03 - Added scrape_many() batch API with pooled keep-alive session
 * v1.02 - Added type hints and Google-style docstrings
 * v1.01 - Added standardized file header
 * v1.00 - Initial release with BeautifulSoup scraping
 """
 
+import codecs
+import json
+import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
 import requests  # type: ignore[import-untyped]
+from requests.adapters import HTTPAdapter  # type: ignore[import-untyped]
 from bs4 import BeautifulSoup
-from typing import List
+from charset_normalizer import from_bytes
+from lxml import etree  # type: ignore[import-untyped]
+from host_scheduler import HostScheduler
+from scrape_cache import CachedPage, ScrapeCache
+
+# Elements stripped before text extraction
+NON_CONTENT_TAGS = ["script", "style", "header", "footer", "nav", "form"]
+
+# Elements whose text is kept
+CONTENT_TAGS = ["h1", "h2", "p"]
+
+# Bytes read from the socket per parser feed in streaming mode
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Leading bytes inspected for a BOM, <meta> charset or statistical detection
+SNIFF_BYTES = 8 * 1024
+
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+_HEADER_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(
+    rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE
+)
+
+# Elements whose contents are never visible text (NAP scanning skips them)
+RAW_TEXT_TAGS = ["script", "style", "noscript", "template"]
+
+HEADING_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6"]
+
+# Elements that start a new line of visible text for NAP scanning (<br> does
+# not, so multi-line <address> blocks are matched as one line)
+_BLOCK_TAGS = {"p", "div", "li", "td", "th", "section", "address", *HEADING_TAGS}
+
+# North American phone numbers, e.g. (512) 555-0100, 512.555.0100, +1 512 555 0100
+_PHONE_RE = re.compile(
+    r"(?<!\d)(?:\+?1[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]\d{4}(?!\d)"
+)
+
+# US street addresses ending in "City, ST 12345"
+_ADDRESS_RE = re.compile(
+    r"(?<![\w.-])\d{1,6}\s+(?:[A-Za-z0-9.'#-]+\s+){0,5}?"
+    r"(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Way|Ct|"
+    r"Court|Pkwy|Parkway|Hwy|Highway|Pl|Place|Cir|Circle|Trl|Trail|Loop)\b\.?"
+    r"(?:,?\s+(?:Suite|Ste|Unit|#)\.?\s*[\w-]+)?,?\s+"
+    r"[A-Za-z][A-Za-z .'-]*?,\s*[A-Z]{2}\s+\d{5}(?:-\d{4})?"
+)
+
+
+@dataclass
+class ScrapeResult:
+    """Outcome of scraping a single URL in a batch.
+
+    Attributes:
+        url: The URL that was requested.
+        text: Extracted text content (empty string on error).
+        status_code: HTTP status code, or None if no response was received.
+        error: Error message if the fetch failed, otherwise None.
+    """
+
+    url: str
+    text: str = ""
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the URL was fetched without error."""
+        return self.error is None
+
+
+@dataclass
+class NapCandidates:
+    """Name, address and phone strings found on a page, in document order.
+
+    Attributes:
+        names: Business names from JSON-LD and og:site_name.
+        addresses: Street addresses from JSON-LD and visible text.
+        phones: Phone numbers from JSON-LD, tel: links and visible text.
+    """
+
+    names: List[str] = field(default_factory=list)
+    addresses: List[str] = field(default_factory=list)
+    phones: List[str] = field(default_factory=list)
+
+
+@dataclass
+class PageData:
+    """Everything extract_page_data() collects from one parse of a page.
+
+    Attributes:
+        url: Page URL, if known.
+        title: Contents of <title>.
+        meta: <meta> content keyed by lowercase name or property
+            (e.g. "description", "og:site_name").
+        canonical: <link rel="canonical"> href, if any.
+        headings: (tag, text) pairs for h1-h6 outside non-content elements.
+        text_blocks: Content blocks, identical to extract_text()'s lines.
+        json_ld: Parsed application/ld+json blobs (malformed ones skipped).
+        nap: Name/address/phone candidates.
+    """
+
+    url: str = ""
+    title: str = ""
+    meta: Dict[str, str] = field(default_factory=dict)
+    canonical: Optional[str] = None
+    headings: List[Tuple[str, str]] = field(default_factory=list)
+    text_blocks: List[str] = field(default_factory=list)
+    json_ld: List[Any] = field(default_factory=list)
+    nap: NapCandidates = field(default_factory=NapCandidates)
+
+    @property
+    def text(self) -> str:
+        """Return the content blocks joined like scrape_website_text()."""
+        return "\n".join(self.text_blocks)
+
+    @property
+    def meta_description(self) -> str:
+        """Return the meta description, or an empty string."""
+        return self.meta.get("description", "")
+
+    def schema_types(self) -> List[str]:
+        """Return every JSON-LD @type on the page (e.g. "FAQPage").
+
+        Returns:
+            Type names in document order, without duplicates.
+        """
+        types: List[str] = []
+        for node in _json_ld_nodes(self.json_ld):
+            value = node.get("@type")
+            for name in value if isinstance(value, list) else [value]:
+                if isinstance(name, str) and name not in types:
+                    types.append(name)
+        return types
+
+
+def _known_encoding(name: str) -> Optional[str]:
+    """Normalize an encoding label, returning None if Python does not know it."""
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def detect_encoding(content_type: Optional[str], body: bytes) -> str:
+    """Determine a page's character encoding without decoding the whole body.
+
+    Checks, in order: the Content-Type charset, a byte-order mark, a
+    ``<meta charset>`` / ``http-equiv`` declaration in the first SNIFF_BYTES,
+    then a strict UTF-8 decode of that prefix. Statistical detection runs only
+    as a last resort and only over the prefix, unlike response.text which
+    runs it over the entire body when no charset is declared.
+
+    Args:
+        content_type: Content-Type header value, or None.
+        body: Raw response body (only the first SNIFF_BYTES are read).
+
+    Returns:
+        A Python codec name.
+
+    Example:
+        >>> detect_encoding("text/html", b'<meta charset="windows-1252">')
+        'cp1252'
+    """
+    if content_type:
+        match = _HEADER_CHARSET_RE.search(content_type)
+        if match:
+            encoding = _known_encoding(match.group(1))
+            if encoding:
+                return encoding
+
+    prefix = body[:SNIFF_BYTES]
+    for bom, encoding in _BOMS:
+        if prefix.startswith(bom):
+            return encoding
+
+    meta_match = _META_CHARSET_RE.search(prefix)
+    if meta_match:
+        encoding = _known_encoding(meta_match.group(1).decode("ascii", "ignore"))
+        if encoding:
+            return encoding
+
+    try:
+        # final=False tolerates a multi-byte character cut off by the prefix
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    best = from_bytes(prefix).best()
+    if best is not None:
+        encoding = _known_encoding(best.encoding)
+        if encoding:
+            return encoding
+    # windows-1252 is the HTML default for undeclared Western pages
+    return "cp1252"
+
+
+def extract_text(
+    markup: Union[str, bytes], max_paragraphs: int = 20, encoding: Optional[str] = None
+) -> str:
+    """Extract heading and paragraph text from an HTML document.
+
+    Args:
+        markup: Raw HTML document, as text or undecoded bytes.
+        max_paragraphs: Maximum number of text blocks to return. Defaults to 20.
+        encoding: Encoding of ``markup`` when it is bytes. The lxml parser
+            decodes the bytes directly, skipping BeautifulSoup's detection.
+
+    Returns:
+        Extracted text blocks joined with newlines.
+    """
+    soup = BeautifulSoup(markup, "lxml", from_encoding=encoding)
+
+    # Remove non-content elements
+    for element in soup(NON_CONTENT_TAGS):
+        element.decompose()
+
+    text_blocks: List[str] = []
+    for tag in soup.find_all(CONTENT_TAGS):
+        text = tag.get_text(strip=True)
+        if text:
+            text_blocks.append(text)
+
+    return "\n".join(text_blocks[:max_paragraphs])
+
+
+class _TextBlockCollector:
+    """lxml parser target that collects content blocks while parsing.
+
+    Mirrors extract_text(): subtrees of NON_CONTENT_TAGS are dropped as they
+    are parsed and each h1/h2/p becomes one block of its stripped text
+    nodes. No tree is built, and ``done`` flips once enough blocks exist so
+    the caller can stop reading.
+    """
+
+    def __init__(self, max_paragraphs: int) -> None:
+        self.max_paragraphs = max_paragraphs
+        self.blocks: List[str] = []
+        self.done = max_paragraphs <= 0
+        self._skip_depth = 0
+        self._content_depth = 0
+        self._block_parts: List[str] = []
+        self._node: List[str] = []
+
+    def _flush_node(self) -> None:
+        if self._node:
+            text = "".join(self._node).strip()
+            if text and self._content_depth and not self._skip_depth:
+                self._block_parts.append(text)
+            self._node = []
+
+    def start(self, tag: str, attrib: Any) -> None:
+        self._flush_node()
+        if self._skip_depth or tag in NON_CONTENT_TAGS:
+            self._skip_depth += 1
+        elif tag in CONTENT_TAGS:
+            self._content_depth += 1
+
+    def end(self, tag: str) -> None:
+        self._flush_node()
+        if self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in CONTENT_TAGS and self._content_depth:
+            self._content_depth -= 1
+            if not self._content_depth:
+                block = "".join(self._block_parts)
+                self._block_parts = []
+                if block and not self.done:
+                    self.blocks.append(block)
+                    self.done = len(self.blocks) >= self.max_paragraphs
+
+    def data(self, data: str) -> None:
+        if self._content_depth and not self._skip_depth:
+            self._node.append(data)
+
+    def comment(self, text: str) -> None:
+        self._flush_node()
+
+    def close(self) -> List[str]:
+        return self.blocks
+
+
+def extract_text_stream(
+    chunks: Iterable[bytes], max_paragraphs: int = 20, encoding: Optional[str] = None
+) -> str:
+    """Extract heading and paragraph text from an HTML byte stream.
+
+    Feeds chunks to an incremental lxml parser and stops consuming the
+    iterator as soon as ``max_paragraphs`` blocks have been collected, so
+    large pages are never fully downloaded or held in memory.
+
+    Args:
+        chunks: Iterable of raw HTML byte chunks (e.g. response.iter_content()).
+        max_paragraphs: Maximum number of text blocks to return. Defaults to 20.
+        encoding: Document encoding, or None to let lxml detect it.
+
+    Returns:
+        Extracted text blocks joined with newlines.
+    """
+    collector = _TextBlockCollector(max_paragraphs)
+    parser = etree.HTMLParser(target=collector, encoding=encoding)
+    for chunk in chunks:
+        if collector.done:
+            break
+        if chunk:
+            parser.feed(chunk)
+    if not collector.done:
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            pass
+    return "\n".join(collector.blocks[:max_paragraphs])
+
+
+def _json_ld_nodes(value: Any) -> Iterator[Dict[str, Any]]:
+    """Yield every JSON-LD object in a blob, including @graph and nested ones."""
+    if isinstance(value, list):
+        for item in value:
+            yield from _json_ld_nodes(item)
+    elif isinstance(value, dict):
+        yield value
+        for item in value.values():
+            if isinstance(item, (list, dict)):
+                yield from _json_ld_nodes(item)
+
+
+def _format_address(value: Any) -> str:
+    """Flatten a JSON-LD address (string or PostalAddress) to one line."""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if not isinstance(value, dict):
+        return ""
+    street = value.get("streetAddress", "")
+    if isinstance(street, list):
+        street = " ".join(str(part) for part in street)
+    region = " ".join(
+        str(value[key]) for key in ("addressRegion", "postalCode") if value.get(key)
+    )
+    parts = [str(street), str(value.get("addressLocality", "")), region]
+    return ", ".join(" ".join(part.split()) for part in parts if part.strip())
+
+
+def _add_unique(values: List[str], value: str) -> None:
+    """Append a NAP string unless an equivalent one is already present."""
+    value = " ".join(value.split())
+    if value and _nap_key(value) not in {_nap_key(v) for v in values}:
+        values.append(value)
+
+
+def _nap_key(value: str) -> str:
+    """Comparison key for NAP strings: last 10 digits of phones, else lowercase."""
+    digits = re.sub(r"\D", "", value)
+    if len(digits) >= 10 and not re.search(r"[A-Za-z]", value):
+        return digits[-10:]
+    return value.lower()
+
+
+class _PageDataCollector(_TextBlockCollector):
+    """lxml parser target that fills a PageData in a single pass.
+
+    Builds on _TextBlockCollector for the content blocks and additionally
+    records the title, meta tags, canonical link, headings, JSON-LD script
+    bodies, tel: links and all visible text (for NAP scanning). Unlike the
+    streaming collector it always reads the whole page, since contact
+    details usually live in the footer.
+    """
+
+    def __init__(self, max_paragraphs: int) -> None:
+        super().__init__(max_paragraphs)
+        self.page = PageData()
+        self.visible: List[str] = []
+        self.tel_links: List[str] = []
+        self._raw_depth = 0
+        self._json_ld: Optional[List[str]] = None
+        self._title: Optional[List[str]] = None
+        self._heading: Optional[Tuple[str, List[str]]] = None
+
+    def start(self, tag: str, attrib: Any) -> None:
+        skipped = self._skip_depth > 0
+        super().start(tag, attrib)
+        if tag in RAW_TEXT_TAGS:
+            self._raw_depth += 1
+            if tag == "script" and "ld+json" in attrib.get("type", "").lower():
+                self._json_ld = []
+        elif tag == "title" and self._title is None and not self.page.title:
+            self._title = []
+        elif tag == "meta":
+            key = attrib.get("name") or attrib.get("property")
+            if key and "content" in attrib:
+                self.page.meta.setdefault(key.lower(), attrib["content"].strip())
+        elif tag == "link":
+            rel = attrib.get("rel", "").lower().split()
+            if "canonical" in rel and self.page.canonical is None:
+                self.page.canonical = attrib.get("href")
+        elif tag == "a":
+            href = attrib.get("href", "")
+            if href.lower().startswith("tel:"):
+                self.tel_links.append(href[4:])
+        elif tag in HEADING_TAGS and not skipped and self._heading is None:
+            self._heading = (tag, [])
+        if tag in _BLOCK_TAGS:
+            # Keep block boundaries so NAP regexes never span two blocks
+            self.visible.append("\n")
+        elif tag == "br":
+            self.visible.append(" ")
 
+    def end(self, tag: str) -> None:
+        super().end(tag)
+        if tag in RAW_TEXT_TAGS:
+            self._raw_depth = max(0, self._raw_depth - 1)
+            if tag == "script" and self._json_ld is not None:
+                try:
+                    self.page.json_ld.append(json.loads("".join(self._json_ld)))
+                except ValueError:
+                    pass
+                self._json_ld = None
+        elif tag == "title" and self._title is not None:
+            self.page.title = " ".join("".join(self._title).split())
+            self._title = None
+        elif self._heading is not None and tag == self._heading[0]:
+            text = " ".join("".join(self._heading[1]).split())
+            if text:
+                self.page.headings.append((tag, text))
+            self._heading = None
+        if tag in _BLOCK_TAGS:
+            self.visible.append("\n")
 
-def scrape_website_text(url: str, max_paragraphs: int = 20) -> str:
+    def data(self, data: str) -> None:
+        super().data(data)
+        if self._json_ld is not None:
+            self._json_ld.append(data)
+        elif not self._raw_depth:
+            self.visible.append(data)
+            if self._title is not None:
+                self._title.append(data)
+            if self._heading is not None:
+                self._heading[1].append(data)
+
+    def close(self) -> List[str]:
+        self._flush_node()
+        self.page.text_blocks = self.blocks[: self.max_paragraphs]
+        self._collect_nap()
+        return self.blocks
+
+    def _collect_nap(self) -> None:
+        nap = self.page.nap
+        for node in _json_ld_nodes(self.page.json_ld):
+            if "address" in node or "telephone" in node:
+                if isinstance(node.get("name"), str):
+                    _add_unique(nap.names, node["name"])
+                address = _format_address(node.get("address"))
+                if address:
+                    _add_unique(nap.addresses, address)
+                if isinstance(node.get("telephone"), str):
+                    _add_unique(nap.phones, node["telephone"])
+        if self.page.meta.get("og:site_name"):
+            _add_unique(nap.names, self.page.meta["og:site_name"])
+
+        for phone in self.tel_links:
+            _add_unique(nap.phones, phone)
+        for line in "".join(self.visible).split("\n"):
+            line = " ".join(line.split())
+            for match in _PHONE_RE.finditer(line):
+                _add_unique(nap.phones, match.group(0))
+            for match in _ADDRESS_RE.finditer(line):
+                _add_unique(nap.addresses, match.group(0))
+
+
+def extract_page_data(
+    markup: Union[str, bytes],
+    max_paragraphs: int = 20,
+    encoding: Optional[str] = None,
+    url: str = "",
+) -> PageData:
+    """Extract text, headings, meta, JSON-LD and NAP from one parse of a page.
+
+    Runs a single lxml parser-target pass over the document; no tree is
+    built and the page is never re-parsed for the individual fields.
+    ``text_blocks`` matches extract_text() exactly.
+
+    Args:
+        markup: Raw HTML document, as text or undecoded bytes.
+        max_paragraphs: Maximum number of text blocks to keep. Defaults to 20.
+        encoding: Encoding of ``markup`` when it is bytes, or None to let
+            lxml detect it.
+        url: Page URL recorded on the result.
+
+    Returns:
+        PageData for the document.
+
+    Example:
+        >>> page = extract_page_data(b'<title>Acme</title><p>Call (512) 555-0100</p>')
+        >>> page.title, page.nap.phones
+        ('Acme', ['(512) 555-0100'])
+    """
+    collector = _PageDataCollector(max_paragraphs)
+    if isinstance(markup, str):
+        parser = etree.HTMLParser(target=collector)
+    else:
+        parser = etree.HTMLParser(target=collector, encoding=encoding)
+    if markup:
+        parser.feed(markup)
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        collector.close()
+    collector.page.url = url
+    return collector.page
+
+
+def _conditional_get(
+    get: Callable[..., Any],
+    url: str,
+    timeout: float,
+    cache: Optional[ScrapeCache],
+) -> Tuple[Any, Optional[CachedPage], Optional[str]]:
+    """GET a page, revalidating against its cache entry when there is one.
+
+    Args:
+        get: HTTP GET callable (requests.get or Session.get).
+        url: Page URL.
+        timeout: Request timeout in seconds.
+        cache: Optional page cache.
+
+    Returns:
+        Tuple of (response, cache entry or None, encoding of the downloaded
+        body). The encoding is None for a 304 response.
+
+    Raises:
+        requests.RequestException: If the request fails or returns an error status.
+    """
+    entry = cache.get(url) if cache is not None else None
+    if entry is not None:
+        response = get(url, timeout=timeout, headers=entry.validators())
+    else:
+        response = get(url, timeout=timeout)
+    response.raise_for_status()
+
+    if entry is not None and response.status_code == 304:
+        return response, entry, None
+    encoding = detect_encoding(response.headers.get("Content-Type"), response.content)
+    return response, entry, encoding
+
+
+def _fetch_text(
+    get: Callable[..., Any],
+    url: str,
+    max_paragraphs: int,
+    timeout: float,
+    cache: Optional[ScrapeCache],
+    stream: bool = False,
+) -> Tuple[Any, str]:
+    """Fetch a page and extract its text, revalidating against the cache.
+
+    Args:
+        get: HTTP GET callable (requests.get or Session.get).
+        url: The website URL to scrape.
+        max_paragraphs: Maximum number of text blocks to return.
+        timeout: Request timeout in seconds.
+        cache: Optional page cache.
+        stream: Extract incrementally and stop reading early. Ignored when
+            a cache is given, since the cache stores complete bodies.
+
+    Returns:
+        Tuple of (response, extracted text).
+
+    Raises:
+        requests.RequestException: If the request fails or returns an error status.
+    """
+    if stream and cache is None:
+        response = get(url, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+            first = next(chunks, b"")
+            text = extract_text_stream(
+                chain([first], chunks),
+                max_paragraphs,
+                detect_encoding(response.headers.get("Content-Type"), first),
+            )
+        finally:
+            response.close()
+        return response, text
+
+    response, entry, encoding = _conditional_get(get, url, timeout, cache)
+    if cache is None:
+        return response, extract_text(response.content, max_paragraphs, encoding)
+    return response, cache.resolve(
+        url, entry, response, max_paragraphs, extract_text, encoding
+    )
+
+
+def scrape_website_text(
+    url: str,
+    max_paragraphs: int = 20,
+    cache: Optional[ScrapeCache] = None,
+    stream: bool = False,
+    scheduler: Optional[HostScheduler] = None,
+) -> str:
     """Scrape main text content from a website URL.
 
     Fetches webpage content and extracts text from headings and paragraphs,
@@ -41,6 +668,16 @@ def scrape_website_text(url: str, max_paragraphs: int = 20) -> str:
     Args:
         url: The website URL to scrape.
         max_paragraphs: Maximum number of text blocks to return. Defaults to 20.
+        cache: Optional ScrapeCache. When given, the request is made
+            conditional on the cached ETag/Last-Modified and unchanged pages
+            are served from disk without re-parsing.
+        stream: Parse the response incrementally, dropping non-content
+            subtrees as they arrive and closing the connection once
+            ``max_paragraphs`` blocks are found. Intended for very large
+            page-builder pages. Ignored when a cache is given.
+        scheduler: Optional HostScheduler (usually default_scheduler()). When
+            given, robots.txt is honored and the request waits for the
+            host's rate limit.
 
     Returns:
         Extracted text content joined with newlines, or empty string on error.
@@ -50,23 +687,268 @@ def scrape_website_text(url: str, max_paragraphs: int = 20) -> str:
         >>> print(len(text))
         1234
     """
+    if scheduler is not None and not scheduler.acquire(url):
+        print(f"[WARNING] Skipping {url}: disallowed by robots.txt")
+        return ""
+
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+        _, text = _fetch_text(requests.get, url, max_paragraphs, 10, cache, stream)
     except requests.RequestException as e:
         print(f"[ERROR] Failed to retrieve content from {url}: {e}")
         return ""
 
-    soup = BeautifulSoup(response.text, "lxml")
+    return text
 
-    # Remove non-content elements
-    for element in soup(["script", "style", "header", "footer", "nav", "form"]):
-        element.decompose()
 
-    text_blocks: List[str] = []
-    for tag in soup.find_all(["h1", "h2", "p"]):
-        text = tag.get_text(strip=True)
-        if text:
-            text_blocks.append(text)
+def scrape_page_data(
+    url: str,
+    max_paragraphs: int = 20,
+    cache: Optional[ScrapeCache] = None,
+    scheduler: Optional[HostScheduler] = None,
+    session: Optional[requests.Session] = None,
+    timeout: float = 10,
+) -> Optional[PageData]:
+    """Fetch a page once and extract all of its PageData in one parse.
 
-    return "\n".join(text_blocks[:max_paragraphs])
+    Use instead of scrape_website_text() when more than the body text is
+    needed (phone, address, existing schema, meta description), so every
+    consumer shares a single fetch and a single parse.
+
+    Args:
+        url: The website URL to scrape.
+        max_paragraphs: Maximum number of text blocks to keep. Defaults to 20.
+        cache: Optional ScrapeCache. Unchanged pages are parsed from the
+            cached body, and the cached text is kept in sync for
+            scrape_website_text().
+        scheduler: Optional HostScheduler for robots.txt and rate limits.
+        session: Optional session to fetch through; requests.get otherwise.
+        timeout: Request timeout in seconds. Defaults to 10.
+
+    Returns:
+        PageData for the page, or None if it could not be fetched or is
+        disallowed by robots.txt.
+
+    Example:
+        >>> page = scrape_page_data("https://example.com")
+        >>> page.nap.phones
+        ['(512) 555-0100']
+    """
+    if scheduler is not None and not scheduler.acquire(url):
+        print(f"[WARNING] Skipping {url}: disallowed by robots.txt")
+        return None
+
+    get = session.get if session is not None else requests.get
+    try:
+        response, entry, encoding = _conditional_get(get, url, timeout, cache)
+    except requests.RequestException as e:
+        print(f"[ERROR] Failed to retrieve content from {url}: {e}")
+        return None
+
+    if entry is not None and response.status_code == 304:
+        body, encoding = entry.body, entry.encoding
+    else:
+        body = response.content
+    page = extract_page_data(body, max_paragraphs, encoding, url=url)
+    if cache is not None:
+        # Store the page; the text comes from the parse above, not a second one
+        cache.resolve(
+            url, entry, response, max_paragraphs, lambda *_: page.text, encoding
+        )
+    return page
+
+
+def create_session(pool_size: int = 10) -> requests.Session:
+    """Create a keep-alive HTTP session with a connection pool.
+
+    Reusing one session across requests avoids a fresh DNS lookup, TCP
+    connect and TLS handshake for every URL on the same host.
+
+    Args:
+        pool_size: Maximum connections kept open per host. Defaults to 10.
+
+    Returns:
+        Configured requests.Session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _scrape_with_session(
+    session: requests.Session,
+    url: str,
+    max_paragraphs: int,
+    timeout: float,
+    cache: Optional[ScrapeCache] = None,
+    stream: bool = False,
+) -> ScrapeResult:
+    """Fetch and extract one URL using a shared session.
+
+    Args:
+        session: Pooled session to fetch through.
+        url: The website URL to scrape.
+        max_paragraphs: Maximum number of text blocks to return.
+        timeout: Request timeout in seconds.
+        cache: Optional page cache.
+        stream: Use streaming early-exit extraction.
+
+    Returns:
+        ScrapeResult for the URL. Errors are captured, never raised.
+    """
+    try:
+        response, text = _fetch_text(
+            session.get, url, max_paragraphs, timeout, cache, stream
+        )
+    except requests.RequestException as e:
+        status = e.response.status_code if e.response is not None else None
+        print(f"[ERROR] Failed to retrieve content from {url}: {e}")
+        return ScrapeResult(url=url, status_code=status, error=str(e))
+
+    return ScrapeResult(url=url, text=text, status_code=response.status_code)
+
+
+def iter_scrape(
+    urls: Iterable[str],
+    max_concurrency: int = 8,
+    max_paragraphs: int = 20,
+    timeout: float = 10,
+    session: Optional[requests.Session] = None,
+    cache: Optional[ScrapeCache] = None,
+    stream: bool = False,
+    before_fetch: Optional[Callable[[str], None]] = None,
+    scheduler: Optional[HostScheduler] = None,
+) -> Iterator[ScrapeResult]:
+    """Scrape URLs in parallel, yielding results in input order as they finish.
+
+    Only a bounded window of URLs is in flight or buffered at once, so
+    memory stays flat however many URLs the iterable produces.
+
+    Args:
+        urls: Website URLs to scrape. May be a lazy iterator.
+        max_concurrency: Maximum number of requests in flight. Defaults to 8.
+        max_paragraphs: Maximum text blocks per page. Defaults to 20.
+        timeout: Per-request timeout in seconds. Defaults to 10.
+        session: Optional existing session to reuse. A pooled session is
+            created (and closed afterwards) when omitted.
+        cache: Optional ScrapeCache shared by all workers.
+        stream: Use streaming early-exit extraction (see scrape_website_text).
+        before_fetch: Optional hook called with each URL on the worker thread
+            just before it is fetched.
+        scheduler: Optional HostScheduler. When given, URLs disallowed by
+            robots.txt are skipped (reported as errors) and workers always
+            pick the next URL from whichever host's rate limit allows a
+            request soonest.
+
+    Yields:
+        One ScrapeResult per input URL, in the same order as ``urls``.
+
+    Raises:
+        ValueError: If max_concurrency is less than 1.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    def work(url: str) -> ScrapeResult:
+        if before_fetch is not None:
+            before_fetch(url)
+        return _scrape_with_session(
+            active_session, url, max_paragraphs, timeout, cache, stream
+        )
+
+    own_session = session is None
+    active_session = session if session is not None else create_session(max_concurrency)
+    pending: Deque[Future] = deque()
+
+    if scheduler is not None:
+        try:
+            yield from scheduler.map(
+                work,
+                urls,
+                max_workers=max_concurrency,
+                on_blocked=lambda u: ScrapeResult(
+                    url=u, error="Disallowed by robots.txt"
+                ),
+            )
+        finally:
+            if own_session:
+                active_session.close()
+        return
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            try:
+                for url in urls:
+                    pending.append(executor.submit(work, url))
+                    if len(pending) >= 2 * max_concurrency:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                # Consumer stopped early: drop queued work before shutdown
+                for future in pending:
+                    future.cancel()
+    finally:
+        if own_session:
+            active_session.close()
+
+
+def scrape_many(
+    urls: List[str],
+    max_concurrency: int = 8,
+    max_paragraphs: int = 20,
+    timeout: float = 10,
+    session: Optional[requests.Session] = None,
+    cache: Optional[ScrapeCache] = None,
+    stream: bool = False,
+    scheduler: Optional[HostScheduler] = None,
+) -> List[ScrapeResult]:
+    """Scrape several URLs in parallel over a pooled keep-alive session.
+
+    Intended for client onboarding, where the homepage and every service
+    URL are scraped together. A failure on one URL does not affect the others.
+
+    Args:
+        urls: Website URLs to scrape.
+        max_concurrency: Maximum number of requests in flight. Defaults to 8.
+        max_paragraphs: Maximum text blocks per page. Defaults to 20.
+        timeout: Per-request timeout in seconds. Defaults to 10.
+        session: Optional existing session to reuse. A pooled session is
+            created (and closed afterwards) when omitted.
+        cache: Optional ScrapeCache shared by all workers.
+        stream: Use streaming early-exit extraction (see scrape_website_text).
+        scheduler: Optional HostScheduler for robots.txt and per-host rate
+            limits (see iter_scrape).
+
+    Returns:
+        One ScrapeResult per input URL, in the same order as ``urls``.
+
+    Raises:
+        ValueError: If max_concurrency is less than 1.
+
+    Example:
+        >>> results = scrape_many([
+        ...     "https://www.abchvac.com/",
+        ...     "https://www.abchvac.com/services/ac-repair/",
+        ... ])
+        >>> [r.ok for r in results]
+        [True, True]
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    if not urls:
+        return []
+
+    return list(
+        iter_scrape(
+            urls,
+            max_concurrency=min(max_concurrency, len(urls)),
+            max_paragraphs=max_paragraphs,
+            timeout=timeout,
+            session=session,
+            cache=cache,
+            stream=stream,
+            scheduler=scheduler,
+        )
+    )
@@ -0,0 +1,411 @@
+r"""
+Module/Script Name: serp_archive.py
+Path: E:\projects\Project Tracking\serp_archive.py
+
+Description:
+Per-client archive of every SerpAPI response the FAQ generator pays for.
+Unlike the TTL'd SERP cache, entries never expire; a repeated search
+replaces its earlier entry. Each response
+is trimmed to the SERP features worth reusing (organic results, local pack,
+related searches, knowledge graph, PAA, answer box, ads), stripped of
+thumbnails and SerpAPI links, and stored as zlib-compressed JSON. Extractors
+turn the archive into competitor domains, local pack ranks and related
+searches, so rank checks and competitor analysis need no new searches.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.01
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.01 - Documented that fetches finish their searches before close()
+* v1.00 - Initial release with compact storage, extractors and CLI
+
+Usage:
+    python serp_archive.py PATH stats
+    python serp_archive.py PATH competitors [--exclude DOMAIN ...] [--limit N]
+    python serp_archive.py PATH local-rank BUSINESS_NAME
+    python serp_archive.py PATH related
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from serp_cache import cache_key
+
+# Top-level response keys kept in the archive
+SERP_FEATURES = (
+    "search_parameters",
+    "search_information",
+    "organic_results",
+    "local_results",
+    "related_searches",
+    "related_questions",
+    "knowledge_graph",
+    "answer_box",
+    "ads",
+)
+
+# Keys dropped at any depth: images, favicons and links back into SerpAPI
+_DROPPED_KEYS = {"thumbnail", "thumbnails", "favicon", "image", "images"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS serps (
+    engine TEXT NOT NULL,
+    q TEXT NOT NULL,
+    hl TEXT NOT NULL,
+    gl TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    uule TEXT NOT NULL,
+    body BLOB NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (engine, q, hl, gl, start, uule)
+)
+"""
+
+_NAME_RE = re.compile(r"[^a-z0-9]+")
+
+
+def client_archive_path(output_dir: str, business_name: str) -> str:
+    """Return the archive file for a client's output folder.
+
+    Args:
+        output_dir: Client output folder ("{output_root}/{name}/G Site").
+        business_name: Client business name.
+
+    Returns:
+        Path to "{business_name} - SERP archive.sqlite3" in ``output_dir``.
+    """
+    return os.path.join(output_dir, f"{business_name} - SERP archive.sqlite3")
+
+
+def _strip(value: Any) -> Any:
+    """Drop image and ``serpapi_*`` keys from a value at any depth."""
+    if isinstance(value, dict):
+        return {
+            key: _strip(item)
+            for key, item in value.items()
+            if key not in _DROPPED_KEYS and not key.startswith("serpapi")
+        }
+    if isinstance(value, list):
+        return [_strip(item) for item in value]
+    return value
+
+
+def compact_serp(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Trim a SerpAPI response to the features kept in the archive.
+
+    Args:
+        data: Decoded SerpAPI JSON response.
+
+    Returns:
+        Copy with only SERP_FEATURES at the top level and no image or
+        ``serpapi_*`` keys at any depth.
+
+    Example:
+        >>> compact_serp({"organic_results": [{"link": "a", "thumbnail": "b"}],
+        ...               "pagination": {}})
+        {'organic_results': [{'link': 'a'}]}
+    """
+    return {key: _strip(data[key]) for key in SERP_FEATURES if key in data}
+
+
+def domain_of(url: str) -> str:
+    """Return a URL's host without a leading "www.".
+
+    Example:
+        >>> domain_of("https://www.example.com/hvac?x=1")
+        'example.com'
+    """
+    host = urlparse(url).netloc.lower().split("@")[-1].split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+def _domain_matches(domain: str, excluded: Iterable[str]) -> bool:
+    """Return True if domain is one of ``excluded`` or a subdomain of one."""
+    return any(domain == d or domain.endswith("." + d) for d in excluded)
+
+
+def competitor_domains(serp: Dict[str, Any], exclude: Sequence[str] = ()) -> List[str]:
+    """List the organic-result domains of one SERP, best position first.
+
+    Args:
+        serp: Archived (or raw) SerpAPI response.
+        exclude: Domains to leave out, e.g. the client's own site;
+            subdomains of these are left out too.
+
+    Returns:
+        Unique domains in ranking order.
+    """
+    excluded = [domain_of(d) if "//" in d else d.lower() for d in exclude]
+    results = sorted(
+        serp.get("organic_results") or [],
+        key=lambda r: r.get("position") or 0,
+    )
+    domains: List[str] = []
+    for result in results:
+        domain = domain_of(result.get("link") or "")
+        if domain and domain not in domains and not _domain_matches(domain, excluded):
+            domains.append(domain)
+    return domains
+
+
+def _local_places(serp: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the local pack entries, whichever shape SerpAPI used."""
+    local = serp.get("local_results") or []
+    if isinstance(local, dict):
+        local = local.get("places") or []
+    return [place for place in local if isinstance(place, dict)]
+
+
+def _normalize_name(name: str) -> str:
+    return _NAME_RE.sub(" ", name.lower()).strip()
+
+
+def local_pack_rank(serp: Dict[str, Any], business_name: str) -> Optional[int]:
+    """Return a business's position in one SERP's local pack.
+
+    A place matches when its normalized title contains the normalized
+    business name or the other way round ("ABC Heating" matches
+    "ABC Heating & Cooling LLC").
+
+    Args:
+        serp: Archived (or raw) SerpAPI response.
+        business_name: Business to look for.
+
+    Returns:
+        1-based local pack position, or None if the business is not listed.
+    """
+    target = _normalize_name(business_name)
+    if not target:
+        return None
+    for index, place in enumerate(_local_places(serp), start=1):
+        title = _normalize_name(place.get("title") or "")
+        if title and (target in title or title in target):
+            return int(place.get("position") or index)
+    return None
+
+
+def related_searches(serp: Dict[str, Any]) -> List[str]:
+    """Return the related search queries of one SERP, in page order."""
+    return [
+        item["query"]
+        for item in serp.get("related_searches") or []
+        if isinstance(item, dict) and item.get("query")
+    ]
+
+
+class SerpArchive:
+    """SQLite archive of compacted SerpAPI responses for one client.
+
+    Safe to share between the worker threads of fetch_paa_questions().
+    fetch_paa_questions() finishes its running searches before returning,
+    so close the archive only after it returns; recording into a closed
+    archive is a no-op.
+
+    Attributes:
+        path: Location of the SQLite archive file.
+        recorded: Responses recorded since the archive was opened.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open (or create) the archive file.
+
+        Args:
+            path: SQLite file path, e.g. from client_archive_path().
+        """
+        self.path = path
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            path, check_same_thread=False
+        )
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def record(self, params: Dict[str, Any], data: Dict[str, Any]) -> None:
+        """Store a SerpAPI response, replacing any earlier one for the search.
+
+        Args:
+            params: SerpAPI query parameters the response answers.
+            data: Decoded JSON response.
+        """
+        body = zlib.compress(
+            json.dumps(compact_serp(data), separators=(",", ":")).encode("utf-8"), 9
+        )
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO serps VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*cache_key(params), body, time.time()),
+            )
+            self._conn.commit()
+            self.recorded += 1
+
+    def entries(self, query: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return archived searches, oldest first.
+
+        Args:
+            query: Optional substring filter on the search query.
+
+        Returns:
+            One dictionary per search with q, start, gl, uule, fetched_at
+            and the compacted response under "serp".
+        """
+        sql = "SELECT q, start, gl, uule, fetched_at, body FROM serps"
+        args: List[Any] = []
+        if query:
+            sql += " WHERE q LIKE ?"
+            args.append(f"%{query}%")
+        sql += " ORDER BY fetched_at, q, start"
+        with self._lock:
+            if self._conn is None:
+                return []
+            rows = self._conn.execute(sql, args).fetchall()
+        return [
+            {
+                "q": q,
+                "start": start,
+                "gl": gl,
+                "uule": uule,
+                "fetched_at": fetched_at,
+                "serp": json.loads(zlib.decompress(body)),
+            }
+            for q, start, gl, uule, fetched_at, body in rows
+        ]
+
+    def competitor_counts(
+        self, exclude: Sequence[str] = (), first_page_only: bool = True
+    ) -> List[Tuple[str, int]]:
+        """Count how many archived searches each competitor domain ranks in.
+
+        Args:
+            exclude: Domains to leave out (e.g. the client's own site).
+            first_page_only: Only count page-one (start=0) searches.
+                Defaults to True.
+
+        Returns:
+            (domain, searches) pairs, most frequent first.
+        """
+        counts: Dict[str, int] = {}
+        for entry in self.entries():
+            if first_page_only and entry["start"]:
+                continue
+            for domain in competitor_domains(entry["serp"], exclude):
+                counts[domain] = counts.get(domain, 0) + 1
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+    def local_pack_ranks(
+        self, business_name: str
+    ) -> Dict[Tuple[str, str], Optional[int]]:
+        """Return the business's local pack rank for every archived page-one search.
+
+        Args:
+            business_name: Business to look for.
+
+        Returns:
+            (query, uule) -> 1-based position, or None if not in the pack.
+            Searches without a local pack are left out.
+        """
+        return {
+            (entry["q"], entry["uule"]): local_pack_rank(entry["serp"], business_name)
+            for entry in self.entries()
+            if entry["start"] == 0 and _local_places(entry["serp"])
+        }
+
+    def related_searches(self) -> List[str]:
+        """Return every related search in the archive, without duplicates."""
+        queries: List[str] = []
+        seen = set()
+        for entry in self.entries():
+            for query in related_searches(entry["serp"]):
+                if query.lower() not in seen:
+                    seen.add(query.lower())
+                    queries.append(query)
+        return queries
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of archived searches and their stored size."""
+        with self._lock:
+            if self._conn is None:
+                return {"entries": 0, "size_bytes": 0}
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM serps"
+            ).fetchone()
+        return {"entries": entries, "size_bytes": size}
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Report competitors, local pack ranks or related searches from an archive.
+
+    Args:
+        argv: Command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Query a client's SERP archive")
+    parser.add_argument("path", help="archive file, e.g. '... - SERP archive.sqlite3'")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="show entry count and size")
+    competitors = commands.add_parser("competitors", help="rank competitor domains")
+    competitors.add_argument("--exclude", nargs="*", default=[], help="own domains")
+    competitors.add_argument("--limit", type=int, default=20)
+    rank = commands.add_parser("local-rank", help="local pack rank per search")
+    rank.add_argument("business_name")
+    commands.add_parser("related", help="list related searches")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        print(f"[ERROR] Archive not found: {args.path}")
+        return
+    archive = SerpArchive(args.path)
+    try:
+        if args.command == "stats":
+            stats = archive.stats()
+            print(f"[INFO] {stats['entries']} searches, {stats['size_bytes']} bytes")
+        elif args.command == "competitors":
+            for domain, count in archive.competitor_counts(args.exclude)[: args.limit]:
+                print(f"{count:4} {domain}")
+        elif args.command == "local-rank":
+            for (query, uule), position in archive.local_pack_ranks(
+                args.business_name
+            ).items():
+                where = f" uule={uule}" if uule else ""
+                print(f"{query!r}{where}: {position if position else 'not in pack'}")
+        else:
+            for query in archive.related_searches():
+                print(query)
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
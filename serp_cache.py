@@ -0,0 +1,357 @@
+r"""
+Module/Script Name: serp_cache.py
+Path: E:\projects\Project Tracking\serp_cache.py
+
+Description:
+TTL'd SQLite response cache for SerpAPI searches. Responses are keyed by
+(engine, q, hl, gl, start, uule), stored as zlib-compressed JSON and evicted
+least-recently-used over a size budget, so re-running a client within the
+TTL costs no SerpAPI credits. Run as a script to inspect or purge entries.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release with TTL, compression, LRU budget and CLI
+
+Usage:
+    python serp_cache.py stats
+    python serp_cache.py list [--query TEXT] [--limit N]
+    python serp_cache.py purge (--expired | --all | --query TEXT)
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_SERP_CACHE_FILE = "serp_cache.sqlite3"
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    engine TEXT NOT NULL,
+    q TEXT NOT NULL,
+    hl TEXT NOT NULL,
+    gl TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    uule TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (engine, q, hl, gl, start, uule)
+)
+"""
+
+
+def cache_key(params: Dict[str, Any]) -> Tuple[str, str, str, str, int, str]:
+    """Build the cache key for a SerpAPI parameter dictionary.
+
+    Only the parameters that change the results are used; api_key and other
+    request options are ignored.
+
+    Args:
+        params: SerpAPI query parameters.
+
+    Returns:
+        (engine, q, hl, gl, start, uule) with empty strings for missing values.
+    """
+    return (
+        str(params.get("engine", "google")),
+        str(params.get("q", "")),
+        str(params.get("hl", "")),
+        str(params.get("gl", "")),
+        int(params.get("start") or 0),
+        str(params.get("uule") or ""),
+    )
+
+
+class SerpCache:
+    """SQLite-backed SerpAPI response cache with TTL and size budget.
+
+    Safe to share between the worker threads of fetch_paa_questions().
+
+    Attributes:
+        path: Location of the SQLite cache file.
+        ttl: Seconds a stored response stays fresh.
+        max_bytes: Size cap for compressed bodies.
+        hits: Lookups answered from the cache (each one a credit saved).
+        misses: Lookups that had to call SerpAPI.
+        evictions: Responses removed to stay under max_bytes.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_SERP_CACHE_FILE,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        """Open (or create) the cache file.
+
+        Args:
+            path: SQLite file path. Defaults to serp_cache.sqlite3.
+            ttl: Freshness lifetime in seconds. Defaults to 24 hours.
+            max_bytes: Size cap in bytes. Defaults to 50 MB.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_access "
+            "ON responses (last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached response for a search, if any.
+
+        Args:
+            params: SerpAPI query parameters.
+
+        Returns:
+            Decoded JSON response, or None on a miss or expired entry.
+        """
+        key = cache_key(params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, created_at FROM responses WHERE engine = ? AND q = ? "
+                "AND hl = ? AND gl = ? AND start = ? AND uule = ?",
+                key,
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ?, hit_count = hit_count + 1 "
+                "WHERE engine = ? AND q = ? "
+                "AND hl = ? AND gl = ? AND start = ? AND uule = ?",
+                (now, *key),
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, params: Dict[str, Any], data: Dict[str, Any]) -> None:
+        """Store a successful SerpAPI response.
+
+        Args:
+            params: SerpAPI query parameters the response answers.
+            data: Decoded JSON response.
+        """
+        body = zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (*cache_key(params), body, len(body), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Delete least recently used responses until under max_bytes.
+
+        Must be called with the lock held.
+        """
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT rowid, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        for rowid, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE rowid = ?", (rowid,))
+            total -= size
+            self.evictions += 1
+
+    def entries(self, query: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """List stored responses, most recently used first.
+
+        Args:
+            query: Optional substring filter on the search query.
+            limit: Maximum rows to return. Defaults to 50.
+
+        Returns:
+            One dictionary per entry with its key fields, size, age and
+            whether it is still fresh.
+        """
+        sql = "SELECT engine, q, hl, gl, start, uule, size, created_at FROM responses"
+        args: List[Any] = []
+        if query:
+            sql += " WHERE q LIKE ?"
+            args.append(f"%{query}%")
+        sql += " ORDER BY last_access DESC LIMIT ?"
+        args.append(limit)
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [
+            {
+                "engine": engine,
+                "q": q,
+                "hl": hl,
+                "gl": gl,
+                "start": start,
+                "uule": uule,
+                "size": size,
+                "age_seconds": int(now - created),
+                "fresh": now - created <= self.ttl,
+            }
+            for engine, q, hl, gl, start, uule, size, created in rows
+        ]
+
+    def purge(self, expired_only: bool = True, query: Optional[str] = None) -> int:
+        """Delete cached responses.
+
+        Args:
+            expired_only: Only delete entries older than the TTL. Ignored
+                when ``query`` is given.
+            query: Delete every entry whose search query contains this text.
+
+        Returns:
+            Number of entries deleted.
+        """
+        with self._lock:
+            if query:
+                cursor = self._conn.execute(
+                    "DELETE FROM responses WHERE q LIKE ?", (f"%{query}%",)
+                )
+            elif expired_only:
+                cursor = self._conn.execute(
+                    "DELETE FROM responses WHERE created_at < ?",
+                    (time.time() - self.ttl,),
+                )
+            else:
+                cursor = self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit rate, credits saved and current cache size.
+
+        Returns:
+            Dictionary with this session's hits, misses, hit_rate,
+            credits_saved and evictions, plus entries, size_bytes and
+            lifetime_credits_saved (hits on the entries still stored).
+        """
+        with self._lock:
+            entries, size, lifetime = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hit_count), 0) "
+                "FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "credits_saved": self.hits,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+            "lifetime_credits_saved": lifetime,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[SerpCache] = None
+_default_lock = threading.Lock()
+
+
+def default_serp_cache() -> SerpCache:
+    """Return the process-wide SERP cache used by the FAQ generator.
+
+    Returns:
+        Lazily opened SerpCache at DEFAULT_SERP_CACHE_FILE.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SerpCache()
+        return _default_cache
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Inspect or purge the SERP cache from the command line.
+
+    Args:
+        argv: Command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Inspect or purge the SERP cache")
+    parser.add_argument("--path", default=DEFAULT_SERP_CACHE_FILE)
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="show entry count and size")
+    list_parser = commands.add_parser("list", help="list cached searches")
+    list_parser.add_argument("--query", help="only searches containing this text")
+    list_parser.add_argument("--limit", type=int, default=50)
+    purge_parser = commands.add_parser("purge", help="delete cached searches")
+    group = purge_parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--expired", action="store_true", help="entries past TTL")
+    group.add_argument("--all", action="store_true", help="every entry")
+    group.add_argument("--query", help="searches containing this text")
+    args = parser.parse_args(argv)
+
+    cache = SerpCache(args.path, ttl=args.ttl)
+    try:
+        if args.command == "stats":
+            stats = cache.stats()
+            print(
+                f"[INFO] {stats['entries']} entries, {stats['size_bytes']} bytes, "
+                f"{stats['lifetime_credits_saved']} credits saved"
+            )
+        elif args.command == "list":
+            for entry in cache.entries(args.query, args.limit):
+                state = "fresh" if entry["fresh"] else "expired"
+                print(
+                    f"{entry['q']!r} start={entry['start']} gl={entry['gl']} "
+                    f"uule={'yes' if entry['uule'] else 'no'} "
+                    f"{entry['size']}B {entry['age_seconds']}s {state}"
+                )
+        else:
+            removed = cache.purge(expired_only=args.expired, query=args.query)
+            print(f"[SUCCESS] Purged {removed} entries")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+r"""
+Module/Script Name: summarizer.py
+Path: E:\projects\Project Tracking\summarizer.py
+
+Description:
+Token-budgeted map-reduce summarization for long site corpora. Text is
+packed line by line into chunks that fit a prompt token budget, every chunk
+is summarized concurrently (map), and the chunk summaries are merged into
+the final document (reduce), in several rounds if they do not fit one
+prompt. Wall time is bounded by the slowest chunk rather than the corpus
+size; calls, estimated tokens and latency are reported per stage.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.03
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.03 - first_stage_requests() exposes the first stage for batch_jobs
+* v1.02 - Completions can be served from an LLMCache
+* v1.01 - Final stage can stream its text to an on_token callback
+* v1.00 - Initial release with budgeted chunking, tree reduce and stage report
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from openai import OpenAI
+
+from llm_cache import LLMCache
+from llm_client import MAX_LLM_CONCURRENCY, chat_completion, map_ordered
+from text_dedup import estimate_tokens
+
+SUMMARY_MODEL = "gpt-4"
+
+SUMMARY_SYSTEM_PROMPT = "You are an SEO assistant."
+
+# Corpus tokens per map prompt; with instructions and the reply this stays
+# well inside gpt-4's 8k context
+CHUNK_TOKEN_BUDGET = 3000
+
+# Completion cap for each chunk (and intermediate merge) summary
+PARTIAL_SUMMARY_TOKENS = 500
+
+# Summary tokens merged by one reduce call; more are merged in rounds
+REDUCE_TOKEN_BUDGET = 5000
+
+MAP_INSTRUCTIONS = (
+    "Summarize the facts in this part of a business website: services, "
+    "service area, history, credentials, people, prices and anything that "
+    "sets the business apart. Keep names, numbers and places exactly. Use "
+    "short bullet points and leave out navigation and boilerplate."
+)
+
+MERGE_INSTRUCTIONS = (
+    "Merge these partial summaries of one business website into a single "
+    "bullet list. Keep every distinct fact and drop repeats."
+)
+
+
+@dataclass
+class StageStats:
+    """Calls, estimated tokens and latency of one map-reduce stage.
+
+    Attributes:
+        stage: Stage name ("single", "map", "merge 1", "reduce").
+        calls: Completions requested.
+        prompt_tokens: Estimated prompt tokens across calls.
+        completion_tokens: Estimated completion tokens across calls.
+        seconds: Wall time of the stage.
+        slowest_call: Wall time of its slowest completion.
+    """
+
+    stage: str
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    seconds: float = 0.0
+    slowest_call: float = 0.0
+
+    def describe(self) -> str:
+        """Return a one-line description for the log."""
+        return (
+            f"{self.stage}: {self.calls} calls, ~{self.prompt_tokens:,} prompt + "
+            f"~{self.completion_tokens:,} completion tokens, {self.seconds:.1f}s "
+            f"(slowest call {self.slowest_call:.1f}s)"
+        )
+
+
+@dataclass
+class SummaryReport:
+    """Per-stage statistics of one summarize_text() run.
+
+    Attributes:
+        chunks: Number of chunks the text was split into.
+        stages: Stage statistics in execution order.
+    """
+
+    chunks: int = 0
+    stages: List[StageStats] = field(default_factory=list)
+
+    @property
+    def calls(self) -> int:
+        """Completions requested across all stages."""
+        return sum(stage.calls for stage in self.stages)
+
+    @property
+    def tokens(self) -> int:
+        """Estimated prompt and completion tokens across all stages."""
+        return sum(s.prompt_tokens + s.completion_tokens for s in self.stages)
+
+    @property
+    def seconds(self) -> float:
+        """Wall time across all stages."""
+        return sum(stage.seconds for stage in self.stages)
+
+
+def chunk_text(text: str, token_budget: int = CHUNK_TOKEN_BUDGET) -> List[str]:
+    """Pack text into chunks of whole lines that fit a token budget.
+
+    Lines longer than the budget on their own are split between words.
+
+    Args:
+        text: Text to split (scraped blocks or corpus pages, one per line).
+        token_budget: Estimated tokens per chunk. Defaults to 3000.
+
+    Returns:
+        Chunks in text order, each at most ``token_budget`` tokens; empty
+        for blank text.
+
+    Example:
+        >>> chunk_text("a" * 40 + "\\n" + "b" * 40, token_budget=12)
+        ['aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa', 'bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb']
+    """
+    max_chars = max(1, token_budget) * 4
+    pieces: List[str] = []
+    for line in text.splitlines():
+        line = line.strip()
+        while len(line) > max_chars:
+            cut = line.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(line[:cut])
+            line = line[cut:].lstrip()
+        if line:
+            pieces.append(line)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for piece in pieces:
+        tokens = estimate_tokens(piece + "\n")
+        if current and size + tokens > token_budget:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _messages(prompt: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _prefix(instructions: str, header: str) -> str:
+    return f"{instructions}\n\n{header}\n" if header else f"{instructions}\n\n"
+
+
+def _single_prompt(instructions: str, header: str, text: str) -> str:
+    return f"{_prefix(instructions, header)}Website Content:\n{text}\n"
+
+
+def _map_prompts(chunks: List[str]) -> List[str]:
+    total = len(chunks)
+    return [
+        f"{MAP_INSTRUCTIONS}\n\nWebsite content, part {i} of {total}:\n{chunk}\n"
+        for i, chunk in enumerate(chunks, start=1)
+    ]
+
+
+def first_stage_requests(
+    text: str,
+    instructions: str,
+    header: str = "",
+    chunk_tokens: int = CHUNK_TOKEN_BUDGET,
+) -> Tuple[List[List[Dict[str, str]]], Dict[str, Any]]:
+    """Return the requests summarize_text() sends first for a text.
+
+    That is the single call for text that fits one chunk, or the map
+    calls otherwise. Used by batch_jobs to send them offline; the merge
+    and reduce calls depend on their results and run later.
+
+    Args:
+        text: Text to summarize.
+        instructions: What the final document should contain.
+        header: Lines placed above the content in the final prompt.
+        chunk_tokens: Estimated text tokens per map prompt. Defaults to 3000.
+
+    Returns:
+        Tuple of (one message list per call, sampling parameters shared by
+        the calls). The model is SUMMARY_MODEL.
+    """
+    chunks = chunk_text(text, chunk_tokens)
+    if len(chunks) <= 1:
+        return [_messages(_single_prompt(instructions, header, text))], {
+            "temperature": 0.7
+        }
+    return [_messages(prompt) for prompt in _map_prompts(chunks)], {
+        "temperature": 0.7,
+        "max_tokens": PARTIAL_SUMMARY_TOKENS,
+    }
+
+
+def _run_stage(
+    name: str,
+    prompts: List[str],
+    report: SummaryReport,
+    complete: Callable[[List[Dict[str, str]], Dict], str],
+    max_concurrency: int,
+    max_tokens: Optional[int] = None,
+    on_token: Optional[Callable[[str], None]] = None,
+) -> List[str]:
+    """Run one stage's prompts concurrently and record its statistics."""
+    stats = StageStats(name, calls=len(prompts))
+    durations: List[float] = [0.0] * len(prompts)
+    kwargs: Dict[str, Any] = {"max_tokens": max_tokens} if max_tokens else {}
+    if on_token:
+        kwargs["on_token"] = on_token
+
+    def call(index: int) -> str:
+        started = time.perf_counter()
+        result = complete(_messages(prompts[index]), kwargs)
+        durations[index] = time.perf_counter() - started
+        return result
+
+    started = time.perf_counter()
+    results = map_ordered(call, list(range(len(prompts))), max_concurrency)
+    stats.seconds = time.perf_counter() - started
+    stats.slowest_call = max(durations, default=0.0)
+    stats.prompt_tokens = sum(
+        estimate_tokens(SUMMARY_SYSTEM_PROMPT + prompt) for prompt in prompts
+    )
+    stats.completion_tokens = sum(estimate_tokens(result) for result in results)
+    report.stages.append(stats)
+    print(f"[INFO] {stats.describe()}")
+    return results
+
+
+def _pack(summaries: List[str], token_budget: int) -> List[List[str]]:
+    """Group summaries in order, at least two per group, under a token budget."""
+    groups: List[List[str]] = []
+    size = 0
+    for summary in summaries:
+        tokens = estimate_tokens(summary)
+        if groups and (len(groups[-1]) < 2 or size + tokens <= token_budget):
+            groups[-1].append(summary)
+            size += tokens
+        else:
+            groups.append([summary])
+            size = tokens
+    return groups
+
+
+def summarize_text(
+    text: str,
+    instructions: str,
+    header: str = "",
+    chunk_tokens: int = CHUNK_TOKEN_BUDGET,
+    reduce_tokens: int = REDUCE_TOKEN_BUDGET,
+    max_concurrency: int = MAX_LLM_CONCURRENCY,
+    model: str = SUMMARY_MODEL,
+    client: Optional[OpenAI] = None,
+    on_token: Optional[Callable[[str], None]] = None,
+    cache: Optional[LLMCache] = None,
+) -> Tuple[str, SummaryReport]:
+    """Summarize text of any length with a map-reduce over token-budgeted chunks.
+
+    Text that fits one chunk is answered with a single call. Otherwise each
+    chunk is summarized concurrently, the summaries are merged in rounds
+    until they fit ``reduce_tokens``, and a final call applies
+    ``instructions`` to them. Token counts use text_dedup.estimate_tokens().
+
+    Args:
+        text: Text to summarize (e.g. a scraped site or corpus_text()).
+        instructions: What the final document should contain.
+        header: Lines placed above the content in the final prompt, such
+            as the business name and address.
+        chunk_tokens: Estimated text tokens per map prompt. Defaults to 3000.
+        reduce_tokens: Estimated summary tokens per reduce prompt.
+            Defaults to 5000.
+        max_concurrency: Maximum completions at once. Defaults to 8.
+        model: Model name. Defaults to "gpt-4".
+        client: OpenAI client. Defaults to llm_client.default_client().
+        on_token: Called with each piece of the final text as it streams
+            in. Map and merge calls are not streamed. Defaults to None.
+        cache: LLMCache for identical map, merge and final prompts, so an
+            unchanged site is summarized without API calls. Defaults to None.
+
+    Returns:
+        Tuple of (final text, SummaryReport).
+
+    Raises:
+        openai.OpenAIError: If a completion still fails after all retries.
+    """
+    report = SummaryReport()
+
+    def complete(messages: List[Dict[str, str]], kwargs: Dict) -> str:
+        return chat_completion(
+            messages,
+            model=model,
+            temperature=0.7,
+            client=client,
+            cache=cache,
+            **kwargs,
+        )
+
+    chunks = chunk_text(text, chunk_tokens)
+    report.chunks = len(chunks)
+    if len(chunks) <= 1:
+        prompt = _single_prompt(instructions, header, text)
+        summary = _run_stage(
+            "single", [prompt], report, complete, 1, on_token=on_token
+        )[0]
+        return summary, report
+
+    summaries = _run_stage(
+        "map",
+        _map_prompts(chunks),
+        report,
+        complete,
+        max_concurrency,
+        PARTIAL_SUMMARY_TOKENS,
+    )
+
+    round_number = 0
+    while len(summaries) > 2 and sum(map(estimate_tokens, summaries)) > reduce_tokens:
+        round_number += 1
+        summaries = _run_stage(
+            f"merge {round_number}",
+            [
+                f"{MERGE_INSTRUCTIONS}\n\n" + "\n\n".join(group)
+                for group in _pack(summaries, reduce_tokens)
+            ],
+            report,
+            complete,
+            max_concurrency,
+            PARTIAL_SUMMARY_TOKENS,
+        )
+
+    parts = "\n\n".join(
+        f"Part {i}:\n{summary}" for i, summary in enumerate(summaries, start=1)
+    )
+    prompt = f"{_prefix(instructions, header)}Summaries of the website content, in page order:\n{parts}\n"
+    summary = _run_stage("reduce", [prompt], report, complete, 1, on_token=on_token)[0]
+    return summary, report
@@ -0,0 +1,169 @@
+"""Unit tests for answer_cache module."""
+
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+
+import faq_generator
+from answer_cache import (
+    AnswerCache,
+    ReusePolicy,
+    answer_key,
+    make_template,
+    render_template,
+)
+
+ANSWER = (
+    "At ABC Heating, most Phoenix homeowners pay $150-$450 for an HVAC repair. "
+    "Arizona summers are hard on AC units, so Phoenix, AZ residents should "
+    "book early."
+)
+
+
+class TestTemplates:
+    """Test suite for answer templating and keys."""
+
+    def test_round_trip_personalizes_for_another_business(self):
+        """Test that names and locations are swapped for the new client."""
+        template = make_template(ANSWER, "ABC Heating", "Phoenix", "AZ")
+
+        assert "ABC Heating" not in template and "Arizona" not in template
+        assert render_template(template, "Tri-State Heating", "Adrian", "MI") == (
+            "At Tri-State Heating, most Adrian homeowners pay $150-$450 for an "
+            "HVAC repair. Michigan summers are hard on AC units, so Adrian, MI "
+            "residents should book early."
+        )
+
+    def test_state_abbreviation_only_templated_after_city(self):
+        """Test that words spelled like a state code are left alone."""
+        template = make_template(
+            "OK, IN winter Indianapolis, IN homes need a tune-up.",
+            "ABC Heating",
+            "Indianapolis",
+            "IN",
+        )
+
+        assert template == "OK, IN winter {city}, {state} homes need a tune-up."
+
+    def test_key_ignores_rewording_but_not_niche_or_model(self):
+        """Test that the content key is shared only by equivalent requests."""
+        key = answer_key("How much does HVAC repair cost?", "hvac", "gpt-4")
+
+        assert key == answer_key("how much does an HVAC repair cost", "HVAC", "gpt-4")
+        assert key != answer_key("How much does HVAC repair cost?", "plumbing", "gpt-4")
+        assert key != answer_key("How much does HVAC repair cost?", "hvac", "gpt-4o")
+
+
+class TestAnswerCache:
+    """Test suite for the cross-client answer cache."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "answers.sqlite3")
+        self.cache = AnswerCache(self.path)
+
+    def teardown_method(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def _put(self, question="How much does HVAC repair cost?"):
+        self.cache.put(
+            question, "hvac", "gpt-4", ANSWER, "ABC Heating", "Phoenix", "AZ"
+        )
+
+    def test_reuses_across_clients_and_tracks_niche_stats(self):
+        """Test a cross-client hit, a miss, and the per-niche reuse rate."""
+        self._put()
+
+        answer = self.cache.get(
+            "How much does an HVAC repair cost",
+            "hvac",
+            "gpt-4",
+            "Tri-State Heating",
+            "Adrian",
+            "MI",
+        )
+        miss = self.cache.get(
+            "Is a heat pump worth it?", "hvac", "gpt-4", "X", "Y", "MI"
+        )
+
+        assert answer.startswith("At Tri-State Heating, most Adrian homeowners")
+        assert miss is None
+        assert self.cache.stats()["hvac"] == {
+            "lookups": 2,
+            "hits": 1,
+            "reuse_rate": 0.5,
+            "stores": 1,
+            "entries": 1,
+        }
+
+    def test_policy_limits_reuse_and_age(self):
+        """Test max_reuses for other businesses and max_age_days."""
+        self.cache.policy = ReusePolicy(max_reuses=1)
+        self._put()
+        args = ("How much does HVAC repair cost?", "hvac", "gpt-4")
+
+        assert self.cache.get(*args, "Client B", "Adrian", "MI") is not None
+        assert self.cache.get(*args, "Client C", "Adrian", "MI") is None
+        # The original business may always re-read its own answer
+        assert self.cache.get(*args, "ABC Heating", "Phoenix", "AZ") is not None
+
+        self.cache.policy = ReusePolicy(max_age_days=1)
+        with patch("answer_cache.time.time", return_value=time.time() + 2 * 86400):
+            assert self.cache.get(*args, "ABC Heating", "Phoenix", "AZ") is None
+
+    def test_context_requests_bypass_cache_by_default(self):
+        """Test that grounded requests are only cached when the policy allows."""
+        assert self.cache.usable("")
+        assert not self.cache.usable("We install Trane systems.")
+        self.cache.policy = ReusePolicy(reuse_with_context=True)
+        assert self.cache.usable("We install Trane systems.")
+
+    def test_evicts_least_recently_used_over_budget(self):
+        """Test that the size budget drops the oldest answers first."""
+        template = make_template(ANSWER, "ABC Heating", "Phoenix", "AZ")
+        self.cache.max_bytes = len(template.encode("utf-8")) * 2
+        for i in range(3):
+            self._put(f"Question number {i} about furnaces?")
+
+        assert self.cache.evictions >= 1
+        assert self.cache.stats()["hvac"]["entries"] == 2
+        assert (
+            self.cache.get(
+                "Question number 0 about furnaces?", "hvac", "gpt-4", "A", "B", "MI"
+            )
+            is None
+        )
+
+    def test_purge_by_niche(self):
+        """Test that purging a niche removes only its answers."""
+        self._put()
+        self.cache.put("Why is my sink slow?", "plumbing", "gpt-4", "x", "A", "B", "MI")
+
+        assert self.cache.purge(niche="hvac") == 1
+        assert self.cache.stats()["plumbing"]["entries"] == 1
+
+    def test_generate_answers_only_calls_llm_for_misses(self):
+        """Test FAQ generation for a second client reuses the first's answers."""
+        questions = ["How much does HVAC repair cost?", "Is a heat pump worth it?"]
+
+        def fake_answer(question, business_name, city, state, context="", **kwargs):
+            return f"{business_name} in {city} answers: {question}"
+
+        with patch.object(
+            faq_generator, "generate_answer", side_effect=fake_answer
+        ) as mock_answer:
+            faq_generator.generate_answers(
+                questions[:1], "ABC Heating", "Phoenix", "AZ", answer_cache=self.cache
+            )
+            answers = faq_generator.generate_answers(
+                questions, "Tri-State Heating", "Adrian", "MI", answer_cache=self.cache
+            )
+
+        assert answers == [
+            "Tri-State Heating in Adrian answers: How much does HVAC repair cost?",
+            "Tri-State Heating in Adrian answers: Is a heat pump worth it?",
+        ]
+        assert mock_answer.call_count == 2
@@ -0,0 +1,299 @@
+"""Unit tests for batch_jobs module."""
+
+import json
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import chatgpt_background
+import faq_generator
+import llm_cache
+from batch_jobs import (
+    BatchRequest,
+    client_requests,
+    ingest_batches,
+    ingest_results,
+    poll_batches,
+    submit_batches,
+    write_outputs,
+    write_request_files,
+)
+from llm_cache import LLMCache
+from llm_client import chat_completion
+
+
+def _requests(count, model="gpt-4"):
+    return [
+        BatchRequest(model, [{"role": "user", "content": f"question {i}"}])
+        for i in range(count)
+    ]
+
+
+def _result_line(custom_id, content, status=200):
+    body = {
+        "model": "gpt-4-0613",
+        "choices": [{"message": {"role": "assistant", "content": content}}],
+        "usage": {"total_tokens": 42},
+    }
+    record = {
+        "custom_id": custom_id,
+        "response": {"status_code": status, "body": body},
+        "error": None,
+    }
+    return json.dumps(record) + "\n"
+
+
+def _fake_batch_client(reply):
+    """OpenAI client mock that finishes each batch on its first retrieve."""
+    client = MagicMock()
+    uploads = []
+
+    def create_file(file, purpose):
+        uploads.append(file.read().decode("utf-8"))
+        return MagicMock(id=f"file-{len(uploads)}")
+
+    def create_batch(input_file_id, endpoint, completion_window):
+        return MagicMock(id=f"batch-{input_file_id}", status="validating")
+
+    def retrieve(batch_id):
+        return MagicMock(
+            status="completed",
+            output_file_id=batch_id.replace("batch-file", "out"),
+            request_counts=MagicMock(total=1, completed=1, failed=0),
+        )
+
+    def content(file_id):
+        lines = uploads[int(file_id.split("-")[1]) - 1].splitlines()
+        response = MagicMock()
+
+        def stream_to_file(path):
+            with open(path, "w", encoding="utf-8") as f:
+                for line in lines:
+                    request = json.loads(line)
+                    f.write(_result_line(request["custom_id"], reply(request["body"])))
+
+        response.__enter__.return_value.stream_to_file.side_effect = stream_to_file
+        return response
+
+    client.files.create.side_effect = create_file
+    client.batches.create.side_effect = create_batch
+    client.batches.retrieve.side_effect = retrieve
+    client.files.with_streaming_response.content.side_effect = content
+    return client
+
+
+class TestWriteRequestFiles:
+    """Test suite for compiling requests into JSONL files."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmpdir.name, "batch")
+        self.cache = LLMCache(os.path.join(self.tmpdir.name, "llm.sqlite3"))
+
+    def teardown_method(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_lines_are_batch_api_requests(self):
+        """Test the line format and that custom_id is the cache key."""
+        request = BatchRequest("gpt-4", [{"role": "user", "content": "hi"}])
+
+        (path,) = write_request_files([request], self.directory)
+
+        with open(path, encoding="utf-8") as f:
+            record = json.loads(f.readline())
+        assert record == {
+            "custom_id": request.key,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": "gpt-4",
+                "messages": [{"role": "user", "content": "hi"}],
+                "temperature": 0.7,
+            },
+        }
+
+    def test_skips_cached_and_repeated_requests(self):
+        """Test that only requests without a cached answer are written once."""
+        requests = _requests(3)
+        self.cache.put(requests[0].key, "gpt-4", "cached")
+
+        (path,) = write_request_files(
+            requests + requests, self.directory, cache=self.cache
+        )
+
+        with open(path, encoding="utf-8") as f:
+            ids = [json.loads(line)["custom_id"] for line in f]
+        assert ids == [requests[1].key, requests[2].key]
+
+    def test_files_split_at_request_and_byte_limits(self):
+        """Test that a new file starts before either limit is passed."""
+        requests = _requests(5)
+        line_bytes = len(requests[0].line().encode("utf-8"))
+
+        assert len(write_request_files(requests, self.directory, max_requests=2)) == 3
+        paths = write_request_files(
+            requests, self.directory, max_bytes=line_bytes * 2 + 1
+        )
+        assert [os.path.basename(p) for p in paths] == [
+            "requests-001.jsonl",
+            "requests-002.jsonl",
+            "requests-003.jsonl",
+        ]
+        assert all(os.path.getsize(p) <= line_bytes * 2 + 1 for p in paths)
+
+    def test_unfinished_round_blocks_new_compile(self):
+        """Test that results not yet ingested are never thrown away."""
+        paths = write_request_files(_requests(1), self.directory)
+        submit_batches(paths, self.directory, _fake_batch_client(lambda body: "a"))
+
+        with pytest.raises(RuntimeError):
+            write_request_files(_requests(1), self.directory)
+
+
+class TestSubmitPollIngest:
+    """Test suite for the batch round trip."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmpdir.name, "batch")
+        self.cache = LLMCache(os.path.join(self.tmpdir.name, "llm.sqlite3"))
+
+    def teardown_method(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_results_are_served_to_live_calls(self):
+        """Test that an ingested result answers the same live request."""
+        requests = _requests(3)
+        client = _fake_batch_client(lambda body: "A: " + body["messages"][0]["content"])
+        paths = write_request_files(requests, self.directory, max_requests=2)
+
+        submit_batches(paths, self.directory, client)
+        submit_batches(paths, self.directory, client)
+        batches = poll_batches(self.directory, client)
+        totals = ingest_batches(self.directory, self.cache)
+
+        assert client.batches.create.call_count == 2
+        assert [b["status"] for b in batches] == ["completed", "completed"]
+        assert totals == {"stored": 3, "failed": 0}
+        assert ingest_batches(self.directory, self.cache) == {"stored": 0, "failed": 0}
+        api = MagicMock()
+        answer = chat_completion(
+            requests[2].messages, model="gpt-4", client=api, cache=self.cache
+        )
+        assert answer == "A: question 2"
+        api.with_options.assert_not_called()
+
+    def test_failed_and_garbled_lines_are_counted(self):
+        """Test that only successful results reach the cache."""
+        path = os.path.join(self.tmpdir.name, "results-001.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(_result_line("a", "Answer"))
+            f.write(_result_line("b", "Error", status=500))
+            f.write(_result_line("c", "  "))
+            f.write("{not json\n\n")
+
+        assert ingest_results(path, self.cache) == {"stored": 1, "failed": 3}
+        assert self.cache.get("a") == "Answer"
+        assert self.cache.entries()[0]["tokens"] == 42
+
+
+class TestClientBatch:
+    """Test suite for compiling and writing whole client runs."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmpdir.name, "batch")
+        self.cache = LLMCache(os.path.join(self.tmpdir.name, "llm.sqlite3"))
+        self.config = {
+            "name": "ABC Heating",
+            "city": "Adrian",
+            "state": "MI",
+            "seed_keyword": "hvac",
+            "output_root": self.tmpdir.name,
+            "max_questions": 2,
+            "reuse_answers": False,
+            "batch_answers": True,
+        }
+
+    def teardown_method(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_compiled_runs_write_outputs_without_live_calls(self):
+        """Test the full round: compile, submit, ingest, then write files."""
+        client = _fake_batch_client(lambda body: "Batched answer")
+        with patch.object(
+            faq_generator, "fetch_paa_questions", return_value=["q1", "q2"]
+        ) as mock_fetch, patch.object(
+            chatgpt_background,
+            "load_site_text",
+            return_value="ABC Heating fixes furnaces.",
+        ), patch.object(
+            llm_cache, "default_llm_cache", return_value=self.cache
+        ), patch.object(
+            faq_generator, "client"
+        ) as faq_api, patch.object(
+            chatgpt_background, "client"
+        ) as background_api:
+            paths = write_request_files(
+                client_requests([self.config]), self.directory, self.cache
+            )
+            submit_batches(paths, self.directory, client)
+            poll_batches(self.directory, client)
+            ingest_batches(self.directory, self.cache)
+            counts = write_outputs([self.config])
+
+        assert counts == {"written": 2, "failed": 0}
+        assert mock_fetch.call_count == 1
+        faq_api.with_options.assert_not_called()
+        background_api.with_options.assert_not_called()
+        html = os.path.join(
+            self.tmpdir.name, "ABC Heating", "G Site", "ABC Heating - FAQs.html"
+        )
+        with open(html, encoding="utf-8") as f:
+            assert f.read().count("Batched answer") == 2
+        assert os.path.exists(
+            os.path.join(
+                self.tmpdir.name,
+                "ABC Heating",
+                "ABC Heating background information.docx",
+            )
+        )
+
+    def test_bad_config_is_skipped(self):
+        """Test that one failing client does not stop the compile."""
+        with patch.object(
+            faq_generator, "pending_answer_messages", side_effect=KeyError("city")
+        ):
+            requests = list(client_requests([self.config], background=False))
+
+        assert requests == []
+
+    def test_answer_cache_hits_are_journaled_not_compiled(self):
+        """Test that answers another client already has are not requested."""
+        answer_cache = MagicMock()
+        answer_cache.usable.return_value = True
+        answer_cache.get.side_effect = lambda q, *args: "Shared" if q == "q1" else None
+        config = dict(self.config, reuse_answers=True)
+
+        with patch.object(
+            faq_generator, "fetch_paa_questions", return_value=["q1", "q2"]
+        ), patch.object(
+            faq_generator, "default_answer_cache", return_value=answer_cache
+        ):
+            pending = faq_generator.pending_answer_messages(config)
+            journal = faq_generator.FaqJournal(
+                os.path.join(
+                    self.tmpdir.name,
+                    "ABC Heating",
+                    "G Site",
+                    "ABC Heating - FAQs.journal.jsonl",
+                )
+            )
+
+        assert len(pending) == 1 and "Q: q2" in pending[0][-1]["content"]
+        assert journal.answers() == {"q1": "Shared"}
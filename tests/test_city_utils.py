@@ -1,6 +1,6 @@
 """Unit tests for city_utils module."""
 
-from city_utils import handle_city_inputs
+from city_utils import fanout_cities, handle_city_inputs, location_pattern
 
 
 class TestHandleCityInputs:
@@ -67,3 +67,37 @@ class TestHandleCityInputs:
         assert result is config
         assert "nearby_10mi" in config
         assert "nearby_20mi" in config
+
+
+class TestFanoutCities:
+    """Test suite for multi-location city lists and location matching."""
+
+    def test_primary_city_first_without_duplicates(self):
+        """Test that configured nearby cities are kept and deduplicated."""
+        config = {
+            "city": "Adrian",
+            "nearby_10mi": ["Tecumseh", "adrian"],
+            "nearby_20mi": ["Blissfield", "Tecumseh"],
+        }
+
+        assert fanout_cities(config) == ["Adrian", "Tecumseh", "Blissfield"]
+
+    def test_generates_nearby_cities_when_missing(self):
+        """Test that handle_city_inputs fills in missing nearby lists."""
+        assert fanout_cities({"city": "Austin"}) == [
+            "Austin",
+            "Austin Heights",
+            "Austin North",
+            "Austin Valley",
+            "Austin Junction",
+        ]
+
+    def test_location_pattern(self):
+        """Test city, state name and capitalised abbreviation matching."""
+        pattern = location_pattern(["Adrian", "Tecumseh"], "MI")
+
+        assert pattern.search("Who repairs furnaces in tecumseh?")
+        assert pattern.search("Is HVAC repair expensive in Michigan?")
+        assert pattern.search("Do MI homes need a permit for a new furnace?")
+        assert not pattern.search("Do mini splits need a permit?")
+        assert not pattern.search("What is adrianite?")
@@ -0,0 +1,460 @@
+"""Unit tests for faq_generator module."""
+
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import requests
+
+import faq_generator
+from faq_generator import fetch_paa_questions
+from live_output import LiveOutput
+from city_utils import location_pattern
+from query_planner import LOCAL_VARIANT_TEMPLATES, QueryPlanner, YieldStats
+from serp_archive import SerpArchive
+from serp_cache import SerpCache
+
+
+def _serp_response(questions, status=200):
+    response = MagicMock()
+    response.status_code = status
+    response.json.return_value = {
+        "related_questions": [{"question": q} for q in questions]
+    }
+    return response
+
+
+class TestFetchPaaQuestions:
+    """Test suite for concurrent PAA fetching."""
+
+    def setup_method(self):
+        self.session = MagicMock()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = SerpCache(os.path.join(self.tmpdir.name, "serp.sqlite3"))
+        self.stats = YieldStats(os.path.join(self.tmpdir.name, "yield.sqlite3"))
+        self.planner = QueryPlanner(self.stats)
+        self.patchers = [
+            patch.object(faq_generator, "default_serp_cache", return_value=self.cache),
+            patch.object(
+                faq_generator, "default_query_planner", return_value=self.planner
+            ),
+            patch.object(faq_generator, "_get_serp_session", return_value=self.session),
+            patch.object(faq_generator, "resolve_uule", return_value="w+TEST"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def teardown_method(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        self.cache.close()
+        self.stats.close()
+        self.tmpdir.cleanup()
+
+    def test_order_is_deterministic_regardless_of_latency(self):
+        """Test that questions follow the plan's issue order when calls finish out of order."""
+
+        def fake_get(url, params, timeout):
+            # Later searches finish first
+            time.sleep(0.02 * (2 - params["start"] // 10))
+            return _serp_response(
+                [f"{params['q']}|{params['start']}|{i}" for i in range(2)]
+            )
+
+        self.session.get.side_effect = fake_get
+
+        questions = fetch_paa_questions(
+            "hvac", max_questions=100, geo_target="Austin, TX", similarity=None
+        )
+
+        assert len(questions) == 36
+        # First pages outrank deeper pages, so every variant's page 1 comes first
+        assert questions[:4] == [
+            "hvac|0|0",
+            "hvac|0|1",
+            "hvac near me|0|0",
+            "hvac near me|0|1",
+        ]
+        issued = [
+            f"{d.keyword}|{d.start}"
+            for d in self.planner.last_plan.decisions
+            if d.action == "run"
+        ]
+        assert questions[::2] == [f"{search}|0" for search in issued]
+
+    def test_planner_skips_dry_pages_and_stops_early(self):
+        """Test that dry variants lose deeper pages and few searches are issued."""
+
+        def fake_get(url, params, timeout):
+            if params["q"] != "hvac":
+                return _serp_response([])
+            return _serp_response(
+                [f"Question {params['start'] + i}?" for i in range(4)]
+            )
+
+        self.session.get.side_effect = fake_get
+
+        questions = fetch_paa_questions("hvac", max_questions=12, max_concurrency=2)
+
+        assert len(questions) == 12
+        decisions = self.planner.last_plan.decisions
+        skipped = [d for d in decisions if d.action == "skipped"]
+        assert len(skipped) == 10
+        assert "hvac" not in {d.keyword for d in skipped}
+        assert all(d.start > 0 for d in skipped)
+        # 3 pages of "hvac" plus one dry first-page probe per other variant
+        assert self.session.get.call_count == 8
+
+        # Learned yield ranks the productive variant above the dry ones
+        assert self.stats.expected_yield("{seed}", 0) > self.stats.expected_yield(
+            "{seed} near me", 0
+        )
+
+    def test_quota_filling_search_records_its_full_yield(self):
+        """Test that questions past max_questions still count toward yield."""
+        self.session.get.side_effect = lambda url, params, timeout: _serp_response(
+            [f"{params['q']} {params['start']} {i}" for i in range(5)]
+        )
+
+        questions = fetch_paa_questions("hvac", max_questions=3, max_concurrency=1)
+
+        assert len(questions) == 3
+        assert [(row["runs"], row["avg_new"]) for row in self.stats.rows()] == [
+            (1, 5.0)
+        ]
+
+    def test_near_duplicate_questions_are_collapsed(self):
+        """Test that reworded questions are dropped and the quota refilled."""
+        self.session.get.side_effect = [
+            _serp_response(
+                ["How much does HVAC repair cost?", "How much does an HVAC repair cost"]
+            ),
+            _serp_response(
+                ["How much do HVAC repairs cost?", "Is HVAC repair worth it?"]
+            ),
+        ] + [_serp_response([])] * 16
+
+        questions = fetch_paa_questions("hvac", max_questions=2, max_concurrency=1)
+
+        assert questions == [
+            "How much does HVAC repair cost?",
+            "Is HVAC repair worth it?",
+        ]
+
+    def test_uses_timeout_uule_and_dedupes(self):
+        """Test request parameters and duplicate question removal."""
+        self.session.get.return_value = _serp_response(["Same?", "Other?"])
+
+        questions = fetch_paa_questions("hvac", max_questions=100)
+
+        assert questions == ["Same?", "Other?"]
+        _, kwargs = self.session.get.call_args
+        assert kwargs["timeout"] == faq_generator.SERPAPI_TIMEOUT
+        assert kwargs["params"]["uule"] == "w+TEST"
+
+    def test_cancels_pending_searches_once_enough_questions(self):
+        """Test that searches not yet started are cancelled after max_questions."""
+        calls = []
+        lock = threading.Lock()
+
+        def fake_get(url, params, timeout):
+            with lock:
+                calls.append(params["q"])
+            time.sleep(0.02)
+            return _serp_response(
+                [f"{params['q']} {params['start']} {i}" for i in range(5)]
+            )
+
+        self.session.get.side_effect = fake_get
+
+        questions = fetch_paa_questions("hvac", max_questions=5, max_concurrency=2)
+
+        assert questions == [f"hvac 0 {i}" for i in range(5)]
+        time.sleep(0.1)
+        assert len(calls) < 18
+
+    def test_failed_searches_are_skipped(self):
+        """Test that request errors, bad JSON and API errors don't abort the run."""
+        bad_json = MagicMock(status_code=200)
+        bad_json.json.side_effect = ValueError("not json")
+        api_error = MagicMock(status_code=200)
+        api_error.json.return_value = {"error": "quota"}
+        responses = [requests.ConnectionError("down"), bad_json, api_error]
+
+        def fake_get(url, params, timeout):
+            if params["q"] == "hvac":
+                outcome = responses[params["start"] // 10]
+                if isinstance(outcome, Exception):
+                    raise outcome
+                return outcome
+            return _serp_response([f"{params['q']} {params['start']}"])
+
+        self.session.get.side_effect = fake_get
+
+        questions = fetch_paa_questions("hvac", max_questions=1)
+
+        assert questions == ["hvac near me 0"]
+
+    def test_responses_are_archived(self):
+        """Test that fresh and cached responses both reach the SERP archive."""
+        self.session.get.return_value = _serp_response(["q1", "q2"])
+        archive = SerpArchive(os.path.join(self.tmpdir.name, "archive.sqlite3"))
+
+        fetch_paa_questions("hvac", max_questions=2, serp_archive=archive)
+        # Cold stats again, so the same search is served from the SERP cache
+        fetch_paa_questions(
+            "hvac",
+            max_questions=2,
+            serp_archive=archive,
+            planner=QueryPlanner(YieldStats(":memory:")),
+        )
+
+        entries = archive.entries()
+        archive.close()
+        assert self.session.get.call_count == 1
+        assert archive.recorded == 2
+        assert entries[0]["serp"]["related_questions"][0] == {"question": "q1"}
+
+    def test_search_finishing_after_early_exit_is_archived(self):
+        """Test that a slow search still running at max_questions is kept."""
+        calls = []
+
+        def fake_get(url, params, timeout):
+            calls.append(params["q"])
+            if calls[0] != params["q"]:
+                time.sleep(0.2)
+            return _serp_response([f"{params['q']} {i}" for i in range(5)])
+
+        self.session.get.side_effect = fake_get
+        archive = SerpArchive(os.path.join(self.tmpdir.name, "archive.sqlite3"))
+
+        fetch_paa_questions(
+            "hvac", max_questions=5, max_concurrency=2, serp_archive=archive
+        )
+        archive.close()
+
+        assert len(calls) == 2
+        assert archive.recorded == 2
+
+    def test_zero_questions_makes_no_requests(self):
+        """Test that max_questions=0 returns immediately."""
+        assert fetch_paa_questions("hvac", max_questions=0) == []
+        self.session.get.assert_not_called()
+
+    def test_rerun_is_served_from_serp_cache(self):
+        """Test that an identical re-run makes no SerpAPI requests."""
+        self.session.get.side_effect = lambda url, params, timeout: _serp_response(
+            [f"{params['q']} {params['start']}"]
+        )
+        first = fetch_paa_questions("hvac", max_questions=100)
+        calls = self.session.get.call_count
+
+        second = fetch_paa_questions("hvac", max_questions=100)
+
+        assert first == second
+        assert self.session.get.call_count == calls
+        assert self.cache.stats()["credits_saved"] == 18
+
+
+class TestGenerateAnswers:
+    """Test suite for concurrent answer generation."""
+
+    def test_answers_keep_question_order(self):
+        """Test that answers line up with questions when calls finish out of order."""
+
+        def fake_answer(question, business_name, city, state, context="", **kwargs):
+            time.sleep(0.01 * (3 - int(question[-1])))
+            return f"answer {question[-1]} for {business_name}"
+
+        with patch.object(faq_generator, "generate_answer", side_effect=fake_answer):
+            answers = faq_generator.generate_answers(
+                ["q0", "q1", "q2"], "ABC Heating", "Phoenix", "AZ"
+            )
+
+        assert answers == [
+            "answer 0 for ABC Heating",
+            "answer 1 for ABC Heating",
+            "answer 2 for ABC Heating",
+        ]
+
+    def test_answers_stream_to_live_output(self):
+        """Test that each answer's tokens are streamed under its question."""
+
+        def fake_completion(messages, on_token=None, **kwargs):
+            question = messages[-1]["content"].split("Q: ")[1].split("\n")[0]
+            for piece in ("Yes, ", question):
+                on_token(piece)
+            return "Yes, " + question
+
+        live = LiveOutput()
+        with patch.object(
+            faq_generator, "chat_completion", side_effect=fake_completion
+        ):
+            answers = faq_generator.generate_answers(
+                ["q0", "q1"], "ABC Heating", "Phoenix", "AZ", live=live
+            )
+
+        assert answers == ["Yes, q0", "Yes, q1"]
+        events = live.drain()
+        for question in ("q0", "q1"):
+            mine = [(e.kind, e.text) for e in events if e.label == question]
+            assert mine == [
+                ("start", ""),
+                ("token", "Yes, "),
+                ("token", question),
+                ("end", ""),
+            ]
+
+
+class TestBatchedAnswers:
+    """Test suite for batched answer generation."""
+
+    def test_plan_respects_token_budget(self):
+        """Test that batches stay within the token budget and keep order."""
+        questions = ["How much does a new furnace cost?"] * 7
+
+        batches = faq_generator.plan_answer_batches(
+            questions, token_budget=700, answer_tokens=220
+        )
+
+        assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+        assert faq_generator.plan_answer_batches(
+            ["q?"], token_budget=10, answer_tokens=220
+        ) == [[0]]
+
+    def test_parse_objects_by_id_and_fenced_strings(self):
+        """Test both accepted array shapes, with a Markdown fence."""
+        content = '```json\n[{"id": 2, "answer": "B"}, {"id": 1, "answer": "A"}]\n```'
+        assert faq_generator.parse_batch_answers(content, 2) == ["A", "B"]
+        assert faq_generator.parse_batch_answers('["A", "", 3]', 3) == [
+            "A",
+            None,
+            None,
+        ]
+        assert faq_generator.parse_batch_answers("Sorry, I can't.", 2) == [None, None]
+
+    def test_unparsed_items_are_retried_singly(self):
+        """Test that only the items missing from a batch are re-requested."""
+        questions = [f"q{i}" for i in range(4)]
+
+        def fake_completion(messages, **kwargs):
+            # Second question is dropped from the batch response
+            return '[{"id": 1, "answer": "a0"}, {"id": 3, "answer": "a2"}, {"id": 4, "answer": "a3"}]'
+
+        with patch.object(
+            faq_generator, "chat_completion", side_effect=fake_completion
+        ) as mock_batch, patch.object(
+            faq_generator, "generate_answer", return_value="single a1"
+        ) as mock_single:
+            answers = faq_generator.generate_answers_batched(
+                questions, "ABC Heating", "Phoenix", "AZ", context="We fix furnaces."
+            )
+
+        assert answers == ["a0", "single a1", "a2", "a3"]
+        assert mock_batch.call_count == 1
+        prompt = mock_batch.call_args.args[0][1]["content"]
+        assert "We fix furnaces." in prompt and "4. q3" in prompt
+        mock_single.assert_called_once_with(
+            "q1", "ABC Heating", "Phoenix", "AZ", "We fix furnaces.", llm_cache=None
+        )
+
+
+class TestMultiLocation:
+    """Test suite for the multi-location FAQ fan-out."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def teardown_method(self):
+        self.tmpdir.cleanup()
+
+    def test_pages_share_location_independent_questions(self):
+        """Test that only questions naming a location stay per city."""
+        harvests = {
+            "Adrian": ["Is AC repair worth it?", "Best HVAC company in Adrian?"],
+            "Tecumseh": [
+                "Is an AC repair worth it?",
+                "Best HVAC company in Tecumseh?",
+                "How long does a furnace last?",
+            ],
+        }
+
+        pages = faq_generator.plan_location_pages(
+            harvests, location_pattern(list(harvests), "MI"), max_questions=3
+        )
+
+        assert pages == {
+            "Adrian": [
+                "Is AC repair worth it?",
+                "Best HVAC company in Adrian?",
+                "How long does a furnace last?",
+            ],
+            "Tecumseh": [
+                "Is AC repair worth it?",
+                "Best HVAC company in Tecumseh?",
+                "How long does a furnace last?",
+            ],
+        }
+
+    def test_answers_each_question_once_and_writes_page_per_city(self):
+        """Test that API calls grow with local questions, not with cities."""
+        cities = ["Adrian", "Tecumseh", "Blissfield", "Onsted"]
+        config = {
+            "name": "ABC Heating",
+            "city": cities[0],
+            "state": "MI",
+            "seed_keyword": "hvac",
+            "output_root": self.tmpdir.name,
+            "max_questions": 4,
+            "reuse_answers": False,
+            "cache_llm": False,
+            "multi_location": True,
+            "nearby_10mi": cities[1:3],
+            "nearby_20mi": cities[3:],
+        }
+        shared = ["Is AC repair worth it?", "How long does a furnace last?"]
+        lock = threading.Lock()
+        searches = {"running": 0, "peak": 0}
+
+        def fake_fetch(keyword, geo_target, max_concurrency, **kwargs):
+            with lock:
+                searches["running"] += max_concurrency
+                searches["peak"] = max(searches["peak"], searches["running"])
+            time.sleep(0.02)
+            with lock:
+                searches["running"] -= max_concurrency
+            city = geo_target.split(",")[0]
+            return shared + [f"Best HVAC company in {city}?"]
+
+        with patch.object(
+            faq_generator, "fetch_paa_questions", side_effect=fake_fetch
+        ) as mock_fetch, patch.object(
+            faq_generator,
+            "generate_answer",
+            side_effect=lambda question, name, city, *args, **kwargs: (
+                f"answer: {question} ({city})"
+            ),
+        ) as mock_answer:
+            faq_generator.run_faq_generator(config)
+
+        templates = [call.kwargs["templates"] for call in mock_fetch.call_args_list]
+        planners = [call.kwargs["planner"] for call in mock_fetch.call_args_list]
+        assert len(set(map(id, planners))) == len(cities)
+        assert len({id(planner.stats) for planner in planners}) == 1
+        assert templates[0] != LOCAL_VARIANT_TEMPLATES
+        assert templates[1:] == [LOCAL_VARIANT_TEMPLATES] * 3
+        assert searches["peak"] <= faq_generator.MAX_SERP_CONCURRENCY
+        assert mock_answer.call_count == len(shared) + len(cities)
+        for city in cities:
+            path = os.path.join(
+                self.tmpdir.name,
+                "ABC Heating",
+                "G Site",
+                f"ABC Heating - {city} FAQs.html",
+            )
+            with open(path, encoding="utf-8") as f:
+                html = f.read()
+            assert f"answer: Best HVAC company in {city}? ({city})" in html
+            assert all(f"answer: {q} (Adrian)" in html for q in shared)
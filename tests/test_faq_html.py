@@ -0,0 +1,94 @@
+"""Unit tests for faq_html module."""
+
+import gzip
+import os
+import tempfile
+
+import pytest
+
+from faq_generator import write_html_accordion
+from faq_html import FaqHtmlWriter, escape_text
+
+
+class TestFaqHtmlWriter:
+    """Test suite for the streaming FAQ accordion writer."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "faq.html")
+
+    def teardown_method(self):
+        self.tmpdir.cleanup()
+
+    def _read(self, path=None):
+        with open(path or self.path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_escapes_question_answer_and_title(self):
+        """Test that markup in text is escaped and newlines kept."""
+        write_html_accordion(
+            [("Is <R-22> banned?", 'Yes & "R-410A" replaced it.\nCall us.')],
+            "Smith & Sons",
+            self.path,
+        )
+        page = self._read()
+
+        assert "<title>Smith &amp; Sons - FAQs</title>" in page
+        assert ">Is &lt;R-22&gt; banned?</div>" in page
+        assert "Yes &amp; &quot;R-410A&quot; replaced it.<br>Call us." in page
+        assert "toggleContent('content0')" in page
+        assert page.rstrip().endswith("</html>")
+
+    def test_items_stream_in_question_order(self):
+        """Test that out-of-order answers are held until earlier ones arrive."""
+        with FaqHtmlWriter(self.path, "ABC", ["q0", "q1", "q2"]) as writer:
+            writer.add("q1", "a1")
+            assert "a1" not in self._read()
+            writer.add("q0", "a0")
+            partial = self._read()
+            assert partial.index("a0") < partial.index("a1")
+            assert "</html>" not in partial
+            writer.add("q2", "a2")
+            writer.add("q0", "duplicate")
+
+        page = self._read()
+        assert "duplicate" not in page
+        assert 'id="content2">a2<' in page
+
+    def test_unlisted_questions_follow_the_list(self):
+        """Test that questions outside the order are all kept, in call order."""
+        with FaqHtmlWriter(self.path, "ABC", ["q0"]) as writer:
+            writer.add("extra1", "e1")
+            writer.add("extra2", "e2")
+            writer.add("q0", "a0")
+
+        page = self._read()
+        assert page.index("a0") < page.index("e1") < page.index("e2")
+
+    def test_minified_gzip_copy_matches(self):
+        """Test the minified page and its precompressed copy."""
+        faq = [(f"Question {i}?", f"Answer {i}.") for i in range(50)]
+        plain = os.path.join(self.tmpdir.name, "plain.html")
+        write_html_accordion(faq, "ABC", plain)
+        write_html_accordion(faq, "ABC", self.path, minify=True, gzip_output=True)
+
+        page = self._read()
+        with gzip.open(self.path + ".gz", "rt", encoding="utf-8") as f:
+            assert f.read() == page
+        assert "\n" not in page
+        assert len(page) < len(self._read(plain))
+        assert page.count('class="accordion-item"') == 50
+
+    def test_failure_leaves_partial_page_without_gzip(self):
+        """Test that an error keeps streamed items but no .gz upload copy."""
+        with pytest.raises(RuntimeError):
+            with FaqHtmlWriter(self.path, "ABC", gzip_output=True) as writer:
+                writer.add("q0", "a0")
+                raise RuntimeError("answer failed")
+
+        assert "a0" in self._read()
+        assert os.listdir(self.tmpdir.name) == ["faq.html"]
+
+    def test_escape_text(self):
+        """Test escaping of quotes, ampersands and CRLF line breaks."""
+        assert escape_text(" a'b & c\r\nd ") == "a&#x27;b &amp; c<br>d"
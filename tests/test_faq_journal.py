@@ -0,0 +1,151 @@
+"""Unit tests for faq_journal module."""
+
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import faq_generator
+from faq_journal import FaqJournal
+
+PARAMS = {"seed_keyword": "hvac", "geo_target": "Adrian, MI", "max_questions": 3}
+
+
+class TestFaqJournal:
+    """Test suite for the append-only run journal."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "run.journal.jsonl")
+
+    def teardown_method(self):
+        self.tmpdir.cleanup()
+
+    def test_resumes_unfinished_run(self):
+        """Test that questions and answers survive reopening the journal."""
+        journal = FaqJournal(self.path)
+        assert journal.resume(PARAMS) is None
+        journal.record_questions(PARAMS, ["q1", "q2"])
+        journal.record_answer("q1", "a1")
+
+        reopened = FaqJournal(self.path)
+
+        assert reopened.resume(PARAMS) == ["q1", "q2"]
+        assert reopened.answers() == {"q1": "a1"}
+
+    def test_completed_or_changed_run_starts_fresh(self):
+        """Test that finished runs and new parameters discard the journal."""
+        journal = FaqJournal(self.path)
+        journal.record_questions(PARAMS, ["q1"])
+
+        assert FaqJournal(self.path).resume({**PARAMS, "max_questions": 5}) is None
+        assert not os.path.exists(self.path)
+
+        journal = FaqJournal(self.path)
+        journal.record_questions(PARAMS, ["q1"])
+        journal.record_answer("q1", "a1")
+        journal.mark_complete()
+
+        assert FaqJournal(self.path).resume(PARAMS) is None
+
+    def test_ignores_torn_last_line(self):
+        """Test that a partial write from a crash is skipped."""
+        journal = FaqJournal(self.path)
+        journal.record_questions(PARAMS, ["q1", "q2"])
+        journal.record_answer("q1", "a1")
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"type": "answer", "question": "q2", "ans')
+
+        reopened = FaqJournal(self.path)
+
+        assert reopened.resume(PARAMS) == ["q1", "q2"]
+        assert reopened.answers() == {"q1": "a1"}
+
+    def test_append_after_torn_line_is_kept(self):
+        """Test that an answer recorded after a crash is not merged away."""
+        journal = FaqJournal(self.path)
+        journal.record_questions(PARAMS, ["q1", "q2"])
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"type": "answer", "question": "q1", "ans')
+
+        resumed = FaqJournal(self.path)
+        resumed.record_answer("q2", "a2")
+
+        assert FaqJournal(self.path).answers() == {"q2": "a2"}
+
+    def test_run_faq_generator_resumes_after_failure(self):
+        """Test that a re-run only generates the answers the failed run lacked."""
+        config = {
+            "name": "ABC Heating",
+            "city": "Adrian",
+            "state": "MI",
+            "seed_keyword": "hvac",
+            "output_root": self.tmpdir.name,
+            "max_questions": 3,
+            "reuse_answers": False,
+            "cache_llm": False,
+        }
+        calls = []
+
+        def flaky_answer(question, business_name, city, state, context="", **kwargs):
+            calls.append(question)
+            if question == "q3" and calls.count("q3") == 1:
+                raise RuntimeError("OpenAI outage")
+            return f"answer {question}"
+
+        with patch.object(
+            faq_generator, "fetch_paa_questions", return_value=["q1", "q2", "q3"]
+        ) as mock_fetch, patch.object(
+            faq_generator, "generate_answer", side_effect=flaky_answer
+        ):
+            with pytest.raises(RuntimeError):
+                faq_generator.run_faq_generator(config)
+            faq_generator.run_faq_generator(config)
+
+        assert mock_fetch.call_count == 1
+        assert sorted(calls) == ["q1", "q2", "q3", "q3"]
+        output = os.path.join(
+            self.tmpdir.name, "ABC Heating", "G Site", "ABC Heating - FAQs.html"
+        )
+        with open(output, encoding="utf-8") as f:
+            html = f.read()
+        assert (
+            html.index("answer q1") < html.index("answer q2") < html.index("answer q3")
+        )
+
+    def test_answer_cache_hits_are_journaled_before_a_crash(self):
+        """Test that answers reused from the answer cache survive a failed run."""
+        config = {
+            "name": "ABC Heating",
+            "city": "Adrian",
+            "state": "MI",
+            "seed_keyword": "hvac",
+            "output_root": self.tmpdir.name,
+            "max_questions": 2,
+            "reuse_answers": True,
+            "cache_llm": False,
+        }
+        answer_cache = MagicMock()
+        answer_cache.usable.return_value = True
+        answer_cache.get.side_effect = lambda q, *args: "Shared" if q == "q1" else None
+
+        with patch.object(
+            faq_generator, "fetch_paa_questions", return_value=["q1", "q2"]
+        ), patch.object(
+            faq_generator, "default_answer_cache", return_value=answer_cache
+        ), patch.object(
+            faq_generator, "generate_answer", side_effect=RuntimeError("outage")
+        ):
+            with pytest.raises(RuntimeError):
+                faq_generator.run_faq_generator(config)
+
+        journal = FaqJournal(
+            os.path.join(
+                self.tmpdir.name,
+                "ABC Heating",
+                "G Site",
+                "ABC Heating - FAQs.journal.jsonl",
+            )
+        )
+        assert journal.answers() == {"q1": "Shared"}
@@ -0,0 +1,224 @@
+"""Unit tests for host_scheduler module."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from host_scheduler import HostScheduler, RobotsCache, TokenBucket, host_of
+from scraper import ScrapeResult, scrape_many, scrape_website_text
+
+ROBOTS = "User-agent: *\nDisallow: /private/\nCrawl-delay: 4\n"
+
+
+def _robots_session(text=ROBOTS, status=200):
+    response = MagicMock()
+    response.status_code = status
+    response.text = text
+    session = MagicMock()
+    session.get.return_value = response
+    return session
+
+
+class TestTokenBucket:
+    """Test suite for the per-host token bucket."""
+
+    def test_burst_then_rate(self):
+        """Test that a full bucket allows a burst, then refills at the rate."""
+        bucket = TokenBucket(rate=2.0, capacity=2)
+        now = time.monotonic()
+
+        for _ in range(2):
+            assert bucket.ready_at(now) == now
+            bucket.consume(now)
+
+        assert bucket.ready_at(now) == pytest.approx(now + 0.5)
+        assert bucket.ready_at(now + 0.5) == now + 0.5
+
+    def test_unlimited_bucket_is_always_ready(self):
+        """Test that rate=None never delays."""
+        bucket = TokenBucket(rate=None, capacity=1)
+        now = time.monotonic()
+        for _ in range(5):
+            bucket.consume(now)
+        assert bucket.ready_at(now) == now
+
+
+class TestRobotsCache:
+    """Test suite for the robots.txt cache."""
+
+    def test_rules_and_crawl_delay(self):
+        """Test that disallowed paths and Crawl-delay are honored."""
+        robots = RobotsCache(session=_robots_session())
+
+        assert robots.allowed("https://example.com/services/")
+        assert not robots.allowed("https://example.com/private/page")
+        assert robots.crawl_delay("https://example.com/") == 4.0
+
+    def test_fetches_once_per_host_until_ttl(self):
+        """Test that robots.txt is cached per host and refreshed after TTL."""
+        session = _robots_session()
+        robots = RobotsCache(ttl=60, session=session)
+
+        robots.allowed("https://example.com/a")
+        robots.allowed("https://example.com/b")
+        robots.allowed("https://other.example/a")
+        assert session.get.call_count == 2
+
+        with patch("host_scheduler.time.monotonic", return_value=time.monotonic() + 61):
+            robots.allowed("https://example.com/c")
+        assert session.get.call_count == 3
+
+    def test_missing_and_forbidden_robots(self):
+        """Test that 404 allows everything and 403 disallows everything."""
+        assert RobotsCache(session=_robots_session(status=404)).allowed(
+            "https://example.com/private/"
+        )
+        assert not RobotsCache(session=_robots_session(status=403)).allowed(
+            "https://example.com/"
+        )
+
+    def test_network_error_allows(self):
+        """Test that an unreachable robots.txt does not block scraping."""
+        session = MagicMock()
+        session.get.side_effect = requests.ConnectionError("down")
+
+        assert RobotsCache(session=session).allowed("https://example.com/")
+
+
+class TestHostScheduler:
+    """Test suite for per-host scheduling."""
+
+    def test_crawl_delay_lowers_host_rate(self):
+        """Test that Crawl-delay slows the host's bucket."""
+        scheduler = HostScheduler(
+            rate=10.0, robots=RobotsCache(session=_robots_session())
+        )
+
+        assert scheduler.allowed("https://example.com/")
+        assert scheduler._buckets["https://example.com"].rate == 0.25
+
+    def test_acquire_refuses_disallowed_url(self):
+        """Test that acquire() returns False for robots-blocked URLs."""
+        scheduler = HostScheduler(robots=RobotsCache(session=_robots_session()))
+
+        assert scheduler.acquire("https://example.com/") is True
+        assert scheduler.acquire("https://example.com/private/x") is False
+
+    def test_map_preserves_order_and_reports_blocked(self):
+        """Test input-order results and the on_blocked callback."""
+        scheduler = HostScheduler(
+            rate=None,
+            robots=RobotsCache(
+                session=_robots_session("User-agent: *\nDisallow: /private/\n")
+            ),
+        )
+        urls = [f"https://h{i % 3}.example/{i}" for i in range(20)]
+        urls.insert(5, "https://h0.example/private/x")
+
+        results = list(
+            scheduler.map(
+                lambda u: u.upper(),
+                urls,
+                max_workers=4,
+                on_blocked=lambda u: "blocked",
+            )
+        )
+
+        expected = [u.upper() for u in urls]
+        expected[5] = "blocked"
+        assert results == expected
+
+    def test_map_serves_ready_host_first(self):
+        """Test that a throttled host does not stall other hosts."""
+        scheduler = HostScheduler(rate=5.0, burst=1, respect_robots=False)
+        urls = ["https://slow.example/%d" % i for i in range(3)] + [
+            "https://fast%d.example/" % i for i in range(3)
+        ]
+        started = []
+        lock = threading.Lock()
+
+        def work(url):
+            with lock:
+                started.append(url)
+            return url
+
+        assert list(scheduler.map(work, urls, max_workers=1, window=10)) == urls
+        # The fast hosts each have a token, so they run before slow.example's
+        # second and third requests, which must wait for its bucket to refill.
+        assert [host_of(u) for u in started[:4]].count("https://slow.example") == 1
+
+    def test_map_blocked_urls_do_not_use_rate_tokens(self):
+        """Test that robots-blocked URLs do not delay allowed ones on the host."""
+        scheduler = HostScheduler(
+            rate=1.0,
+            burst=1,
+            robots=RobotsCache(
+                session=_robots_session("User-agent: *\nDisallow: /private/\n")
+            ),
+        )
+        urls = [f"https://a.example/private/{i}" for i in range(3)]
+        urls.append("https://a.example/open")
+
+        start = time.monotonic()
+        results = list(
+            scheduler.map(lambda u: "ok", urls, max_workers=1, on_blocked=str)
+        )
+
+        assert results == urls[:3] + ["ok"]
+        assert time.monotonic() - start < 0.5
+
+    def test_map_reraises_worker_errors_in_order(self):
+        """Test that a failing call is raised when its turn comes."""
+        scheduler = HostScheduler(rate=None, respect_robots=False)
+
+        def work(url):
+            if url.endswith("/1"):
+                raise RuntimeError("boom")
+            return url
+
+        results = scheduler.map(work, ["https://a.example/0", "https://a.example/1"])
+        assert next(results) == "https://a.example/0"
+        with pytest.raises(RuntimeError):
+            next(results)
+
+
+class TestScraperIntegration:
+    """Test suite for scheduler support in the scraper."""
+
+    @patch("scraper.requests.get")
+    def test_scrape_website_text_skips_disallowed(self, mock_get):
+        """Test that a robots-blocked URL is not fetched."""
+        scheduler = HostScheduler(robots=RobotsCache(session=_robots_session()))
+
+        assert (
+            scrape_website_text("https://example.com/private/", scheduler=scheduler)
+            == ""
+        )
+        mock_get.assert_not_called()
+
+    def test_scrape_many_reports_disallowed(self):
+        """Test that scrape_many returns an error result for blocked URLs."""
+        scheduler = HostScheduler(
+            rate=None, robots=RobotsCache(session=_robots_session())
+        )
+        session = MagicMock()
+        response = MagicMock()
+        response.status_code = 200
+        response.content = b"<p>Hello</p>"
+        response.headers = {"Content-Type": "text/html; charset=utf-8"}
+        session.get.return_value = response
+
+        results = scrape_many(
+            ["https://example.com/", "https://example.com/private/x"],
+            session=session,
+            scheduler=scheduler,
+        )
+
+        assert results[0] == ScrapeResult(
+            url="https://example.com/", text="Hello", status_code=200
+        )
+        assert results[1].error == "Disallowed by robots.txt"
+        session.get.assert_called_once()
@@ -0,0 +1,71 @@
+"""Unit tests for live_output module."""
+
+import threading
+
+import pytest
+
+from live_output import LiveEvent, LiveOutput, StreamTiming
+
+
+class TestLiveOutput:
+    """Test suite for the streamed-output queue and timing."""
+
+    def test_events_from_threads_keep_per_label_order(self):
+        """Test that concurrent writers' tokens arrive in order per label."""
+        live = LiveOutput()
+
+        def write(label):
+            live.start(label)
+            token = live.writer(label)
+            for i in range(50):
+                token(str(i))
+            live.end(label)
+
+        threads = [threading.Thread(target=write, args=(f"q{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        events = live.drain(max_events=10000)
+        for i in range(4):
+            mine = [e for e in events if e.label == f"q{i}"]
+            assert mine[0].kind == "start" and mine[-1].kind == "end"
+            assert [e.text for e in mine[1:-1]] == [str(n) for n in range(50)]
+        assert live.drain() == []
+
+    def test_drain_limit(self):
+        """Test that one poll renders at most max_events."""
+        live = LiveOutput()
+        for i in range(5):
+            live.token("q", str(i))
+
+        assert len(live.drain(max_events=3)) == 3
+        assert len(live.drain()) == 2
+
+    def test_timing_first_token_and_total(self):
+        """Test time-to-first-token per completion and the status line."""
+        timing = StreamTiming()
+        timing.started = 100.0
+        for event in [
+            LiveEvent("start", "q1", at=100.0),
+            LiveEvent("start", "q2", at=100.5),
+            LiveEvent("token", "q1", "a", at=100.8),
+            LiveEvent("token", "q1", "b", at=101.0),
+            LiveEvent("token", "q2", "c", at=101.7),
+            LiveEvent("end", "q1", at=102.0),
+        ]:
+            timing.apply(event)
+
+        assert timing.first_tokens == pytest.approx([0.8, 1.2])
+        assert timing.finished == 1
+        assert timing.describe(now=112.3) == (
+            "First token 0.8s (avg 1.0s over 2) | total 12.3s"
+        )
+
+    def test_timing_before_first_token(self):
+        """Test the status line while still waiting."""
+        timing = StreamTiming()
+        timing.started = 10.0
+
+        assert timing.describe(now=12.0) == "Waiting for first token | total 2.0s"
@@ -0,0 +1,179 @@
+"""Unit tests for llm_cache module."""
+
+import os
+import tempfile
+import zlib
+from unittest.mock import patch
+
+import llm_cache
+from llm_cache import LLMCache, completion_key, llm_cache_for_config, main
+
+MESSAGES = [
+    {"role": "system", "content": "You are an SEO assistant."},
+    {"role": "user", "content": "How much does AC repair cost in Phoenix?"},
+]
+ANSWER = "AC repair in Phoenix usually costs between $150 and $600."
+
+
+class TestCompletionKey:
+    """Test suite for content-addressed completion keys."""
+
+    def test_key_covers_model_messages_and_sampling(self):
+        """Test that every result-affecting input changes the key."""
+        key = completion_key("gpt-4", MESSAGES, {"temperature": 0.7})
+
+        assert key == completion_key("gpt-4", MESSAGES, {"temperature": 0.7})
+        assert key != completion_key("gpt-4o", MESSAGES, {"temperature": 0.7})
+        assert key != completion_key("gpt-4", MESSAGES[1:], {"temperature": 0.7})
+        assert key != completion_key("gpt-4", MESSAGES, {"temperature": 0.2})
+        assert key != completion_key(
+            "gpt-4", MESSAGES, {"temperature": 0.7, "max_tokens": 500}
+        )
+
+    def test_key_ignores_stream_and_parameter_order(self):
+        """Test that streaming and keyword order do not split the cache."""
+        key = completion_key("gpt-4", MESSAGES, {"temperature": 0.7, "max_tokens": 9})
+
+        assert key == completion_key(
+            "gpt-4", MESSAGES, {"stream": True, "max_tokens": 9, "temperature": 0.7}
+        )
+
+
+class TestLLMCache:
+    """Test suite for the SQLite completion cache."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "llm.sqlite3")
+        self.cache = LLMCache(self.path)
+        self.key = completion_key("gpt-4", MESSAGES, {"temperature": 0.7})
+
+    def teardown_method(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_round_trip_and_stats(self):
+        """Test that a stored completion is returned and counted as a hit."""
+        assert self.cache.get(self.key) is None
+        self.cache.put(self.key, "gpt-4", ANSWER, MESSAGES)
+
+        assert self.cache.get(self.key) == ANSWER
+        stats = self.cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["stores"] == 1
+        assert stats["tokens_saved"] > 0
+        assert stats["lifetime_tokens_saved"] == stats["tokens_saved"]
+
+    def test_bodies_are_compressed(self):
+        """Test that stored bodies are smaller than the text."""
+        text = "Furnace tune-ups prevent breakdowns. " * 200
+        self.cache.put(self.key, "gpt-4", text)
+
+        assert self.cache.stats()["size_bytes"] < len(text) / 10
+
+    def test_zlib_fallback_without_zstandard(self):
+        """Test that entries are stored with zlib when zstandard is missing."""
+        with patch.object(llm_cache, "zstandard", None):
+            self.cache.put(self.key, "gpt-4", ANSWER)
+            assert self.cache.get(self.key) == ANSWER
+
+    def test_bypassing_view_shares_the_cache(self):
+        """Test that a refresh view stores into the same cache, counted apart."""
+        self.cache.put(self.key, "gpt-4", "old answer")
+        refresh = self.cache.bypassing()
+
+        assert refresh.get(self.key) is None
+        refresh.put(self.key, "gpt-4", ANSWER)
+
+        assert self.cache.get(self.key) == ANSWER
+        assert (refresh.misses, refresh.stores) == (1, 1)
+        assert (self.cache.hits, self.cache.misses, self.cache.stores) == (1, 0, 1)
+
+        assert self.cache.entries()[0]["codec"] == "zlib"
+
+    def test_unreadable_codec_is_a_miss(self):
+        """Test that a zstd entry read without zstandard is regenerated."""
+        self.cache._conn.execute(
+            "INSERT INTO completions VALUES (?, 'gpt-4', 'zstd', ?, 1, 1, ?, ?, 0)",
+            (self.key, zlib.compress(b"x"), 1e12, 1e12),
+        )
+
+        with patch.object(llm_cache, "zstandard", None):
+            assert self.cache.get(self.key) is None
+
+    def test_expired_entries_miss(self):
+        """Test that entries older than the TTL are not served."""
+        self.cache.put(self.key, "gpt-4", ANSWER)
+        self.cache.ttl = -1
+
+        assert self.cache.get(self.key) is None
+        assert self.cache.purge(expired_only=True) == 1
+
+    def test_bypass_skips_lookup_but_stores(self):
+        """Test that a bypassing cache regenerates and refreshes entries."""
+        self.cache.put(self.key, "gpt-4", "old answer")
+        refresh = LLMCache(self.path, bypass=True)
+        try:
+            assert refresh.get(self.key) is None
+            refresh.put(self.key, "gpt-4", ANSWER)
+        finally:
+            refresh.close()
+
+        assert self.cache.get(self.key) == ANSWER
+
+    def test_lru_eviction_over_budget(self):
+        """Test that least recently used entries are evicted first."""
+        cache = LLMCache(os.path.join(self.tmpdir.name, "small.sqlite3"), max_bytes=1)
+        try:
+            cache.put("a", "gpt-4", ANSWER)
+            cache.put("b", "gpt-4", ANSWER)
+
+            assert cache.get("a") is None
+            assert cache.get("b") is None
+            assert cache.stats()["evictions"] == 2
+        finally:
+            cache.close()
+
+    def test_purge_by_model(self):
+        """Test that purging by model leaves other models' entries."""
+        self.cache.put("a", "gpt-4", ANSWER)
+        self.cache.put("b", "gpt-4o", ANSWER)
+
+        assert self.cache.purge(model="gpt-4") == 1
+        assert [entry["model"] for entry in self.cache.entries()] == ["gpt-4o"]
+
+    def test_cli_stats(self, capsys):
+        """Test the stats command prints entry count and tokens saved."""
+        self.cache.put(self.key, "gpt-4", ANSWER, MESSAGES)
+        main(["--path", self.path, "stats"])
+
+        assert "1 entries" in capsys.readouterr().out
+
+
+class TestCacheForConfig:
+    """Test suite for choosing the cache from a client config."""
+
+    def test_config_flags(self):
+        """Test the cache_llm and refresh_llm_cache keys."""
+        with patch.object(llm_cache, "default_llm_cache") as mock_default:
+            assert llm_cache_for_config({"cache_llm": False}) is None
+            llm_cache_for_config({})
+            llm_cache_for_config({"refresh_llm_cache": True})
+
+        assert [c.kwargs for c in mock_default.call_args_list] == [
+            {"bypass": False},
+            {"bypass": True},
+        ]
+
+    def test_default_opens_one_connection(self):
+        """Test that the normal and refresh defaults share one instance."""
+        with patch.object(llm_cache, "_default_caches", {}), patch.object(
+            llm_cache, "LLMCache"
+        ) as mock_cache:
+            cache = llm_cache.default_llm_cache()
+            refresh = llm_cache.default_llm_cache(bypass=True)
+
+        mock_cache.assert_called_once_with()
+        assert refresh is cache.bypassing.return_value
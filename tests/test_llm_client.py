@@ -0,0 +1,321 @@
+"""Unit tests for llm_client module."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import openai
+import pytest
+
+import llm_client
+from llm_cache import LLMCache
+from llm_client import (
+    AdaptiveConcurrency,
+    chat_completion,
+    map_ordered,
+    parse_duration,
+    retry_after,
+)
+
+
+def _rate_limit_error(headers=None, code=None):
+    response = MagicMock(status_code=429, headers=headers or {})
+    body = {"code": code} if code else None
+    return openai.RateLimitError("rate limited", response=response, body=body)
+
+
+def _raw_response(content, headers=None):
+    raw = MagicMock()
+    raw.headers = headers or {}
+    raw.parse.return_value.choices = [MagicMock()]
+    raw.parse.return_value.choices[0].message.content = content
+    return raw
+
+
+def _stream_response(pieces, fail_after=None):
+    """Raw response whose parse() yields stream chunks, optionally failing."""
+
+    def chunks():
+        for i, piece in enumerate(pieces):
+            if i == fail_after:
+                raise openai.APIConnectionError(request=MagicMock())
+            chunk = MagicMock()
+            chunk.choices = [MagicMock()]
+            chunk.choices[0].delta.content = piece
+            yield chunk
+
+    raw = MagicMock()
+    raw.headers = {}
+    raw.parse.side_effect = chunks
+    return raw
+
+
+def _client(side_effect):
+    client = MagicMock()
+    create = client.with_options.return_value.chat.completions.with_raw_response.create
+    create.side_effect = side_effect
+    return client, create
+
+
+class TestRetryAfter:
+    """Test suite for rate-limit header parsing."""
+
+    def test_parse_duration(self):
+        """Test OpenAI reset duration formats."""
+        assert parse_duration("6m0s") == 360.0
+        assert parse_duration("1.5s") == 1.5
+        assert parse_duration("20ms") == pytest.approx(0.02)
+        assert parse_duration("soon") is None
+
+    def test_header_precedence(self):
+        """Test that retry-after-ms wins over Retry-After and reset headers."""
+        headers = {
+            "retry-after-ms": "250",
+            "retry-after": "3",
+            "x-ratelimit-reset-requests": "10s",
+        }
+        assert retry_after(headers) == 0.25
+        assert retry_after({"retry-after": "3"}) == 3.0
+
+    def test_reset_headers_fallback(self):
+        """Test that the longest x-ratelimit-reset-* value is used."""
+        headers = {"x-ratelimit-reset-requests": "2s", "x-ratelimit-reset-tokens": "1m"}
+        assert retry_after(headers) == 60.0
+        assert retry_after(None) is None
+
+
+class TestAdaptiveConcurrency:
+    """Test suite for the AIMD concurrency limiter."""
+
+    def test_throttle_halves_limit(self):
+        """Test that a 429 halves the limit and successes grow it back."""
+        limiter = AdaptiveConcurrency(8)
+        limiter.acquire()
+        limiter.release(throttled=True)
+        assert limiter.limit == 4
+
+        for _ in range(4):
+            limiter.acquire()
+            limiter.release()
+        assert limiter.limit == 5
+
+    def test_limit_bounds_active_calls(self):
+        """Test that no more than ``limit`` callers run at once."""
+        limiter = AdaptiveConcurrency(2)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def work():
+            limiter.acquire()
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            limiter.release()
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak[0] == 2
+
+    def test_observe_pauses_when_quota_exhausted(self):
+        """Test that remaining-requests of 0 delays the next call."""
+        limiter = AdaptiveConcurrency(2)
+        limiter.observe(
+            {
+                "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-reset-requests": "50ms",
+            }
+        )
+
+        start = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - start >= 0.04
+
+
+class TestChatCompletion:
+    """Test suite for chat_completion retries."""
+
+    def test_retries_rate_limit_then_succeeds(self):
+        """Test that a 429 is retried after the server's Retry-After."""
+        client, create = _client(
+            [_rate_limit_error({"retry-after-ms": "10"}), _raw_response("  Answer ")]
+        )
+        limiter = AdaptiveConcurrency(4)
+
+        with patch.object(llm_client.time, "sleep") as mock_sleep:
+            result = chat_completion(
+                [{"role": "user", "content": "hi"}], client=client, limiter=limiter
+            )
+
+        assert result == "Answer"
+        assert create.call_count == 2
+        assert 0.01 <= mock_sleep.call_args.args[0] <= 0.51
+        assert limiter.limit == 2
+        client.with_options.assert_called_once_with(timeout=60.0, max_retries=0)
+
+    def test_insufficient_quota_is_not_retried(self):
+        """Test that quota exhaustion raises immediately."""
+        client, create = _client([_rate_limit_error(code="insufficient_quota")])
+
+        with pytest.raises(openai.RateLimitError):
+            chat_completion(
+                [{"role": "user", "content": "hi"}],
+                client=client,
+                limiter=AdaptiveConcurrency(),
+            )
+        assert create.call_count == 1
+
+    def test_gives_up_after_max_retries(self):
+        """Test that the last error is raised once retries are exhausted."""
+        client, create = _client(openai.APITimeoutError(request=MagicMock()))
+
+        with patch.object(llm_client.time, "sleep"):
+            with pytest.raises(openai.APITimeoutError):
+                chat_completion(
+                    [{"role": "user", "content": "hi"}],
+                    max_retries=2,
+                    client=client,
+                    limiter=AdaptiveConcurrency(),
+                )
+        assert create.call_count == 3
+
+
+class TestStreaming:
+    """Test suite for streamed chat completions."""
+
+    def test_pieces_reach_callback_in_order(self):
+        """Test that each streamed piece is delivered and the text joined."""
+        client, create = _client([_stream_response([" Fur", "nace", None, " fix "])])
+        pieces = []
+
+        result = chat_completion(
+            [{"role": "user", "content": "hi"}],
+            client=client,
+            limiter=AdaptiveConcurrency(2),
+            on_token=pieces.append,
+        )
+
+        assert result == "Furnace fix"
+        assert pieces == [" Fur", "nace", " fix "]
+        assert create.call_args.kwargs["stream"] is True
+
+    def test_failure_before_first_piece_is_retried(self):
+        """Test that a stream that breaks before any text is retried."""
+        client, create = _client(
+            [_stream_response(["a"], fail_after=0), _stream_response(["ok"])]
+        )
+        pieces = []
+
+        with patch.object(llm_client.time, "sleep"):
+            result = chat_completion(
+                [{"role": "user", "content": "hi"}],
+                client=client,
+                limiter=AdaptiveConcurrency(2),
+                on_token=pieces.append,
+            )
+
+        assert result == "ok"
+        assert pieces == ["ok"]
+        assert create.call_count == 2
+
+    def test_failure_mid_stream_is_raised(self):
+        """Test that text already delivered is never delivered twice."""
+        client, create = _client([_stream_response(["a", "b"], fail_after=1)])
+
+        with pytest.raises(openai.APIConnectionError):
+            chat_completion(
+                [{"role": "user", "content": "hi"}],
+                client=client,
+                limiter=AdaptiveConcurrency(2),
+                on_token=lambda piece: None,
+            )
+
+        assert create.call_count == 1
+
+
+class TestCachedCompletion:
+    """Test suite for chat completions served from an LLMCache."""
+
+    def setup_method(self):
+        self.cache = LLMCache(":memory:")
+
+    def teardown_method(self):
+        self.cache.close()
+
+    def test_identical_request_skips_api(self):
+        """Test that a repeated request is answered from the cache."""
+        client, create = _client([_raw_response("Answer")])
+        messages = [{"role": "user", "content": "hi"}]
+
+        for _ in range(2):
+            result = chat_completion(
+                messages, client=client, limiter=AdaptiveConcurrency(), cache=self.cache
+            )
+
+        assert result == "Answer"
+        assert create.call_count == 1
+        assert (self.cache.hits, self.cache.misses) == (1, 1)
+
+    def test_sampling_parameters_are_part_of_key(self):
+        """Test that a different temperature or max_tokens is a new request."""
+        client, create = _client([_raw_response(f"a{i}") for i in range(3)])
+        messages = [{"role": "user", "content": "hi"}]
+
+        results = [
+            chat_completion(
+                messages,
+                client=client,
+                limiter=AdaptiveConcurrency(),
+                cache=self.cache,
+                **params,
+            )
+            for params in ({}, {"temperature": 0.2}, {"max_tokens": 50})
+        ]
+
+        assert results == ["a0", "a1", "a2"]
+        assert create.call_count == 3
+
+    def test_hit_is_streamed_in_one_piece(self):
+        """Test that a cached completion still reaches on_token."""
+        client, create = _client([_stream_response(["Fur", "nace"])])
+        messages = [{"role": "user", "content": "hi"}]
+        chat_completion(
+            messages,
+            client=client,
+            limiter=AdaptiveConcurrency(),
+            on_token=lambda piece: None,
+            cache=self.cache,
+        )
+        pieces = []
+
+        result = chat_completion(
+            messages,
+            client=client,
+            limiter=AdaptiveConcurrency(),
+            on_token=pieces.append,
+            cache=self.cache,
+        )
+
+        assert result == "Furnace"
+        assert pieces == ["Furnace"]
+        assert create.call_count == 1
+
+
+class TestMapOrdered:
+    """Test suite for map_ordered."""
+
+    def test_preserves_input_order(self):
+        """Test that results follow input order when calls finish out of order."""
+
+        def slow(n):
+            time.sleep(0.01 * (5 - n))
+            return n * 10
+
+        assert map_ordered(slow, [0, 1, 2, 3, 4], max_workers=5) == [0, 10, 20, 30, 40]
+        assert map_ordered(slow, []) == []
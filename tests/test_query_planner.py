@@ -0,0 +1,81 @@
+"""Unit tests for query_planner module."""
+
+import os
+import tempfile
+
+from query_planner import PAGE_STARTS, QueryPlan, YieldStats
+
+TEMPLATES = ["{seed}", "{seed} cost", "{seed} near {geo}"]
+
+
+class TestQueryPlan:
+    """Test suite for the yield-aware search plan."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.stats = YieldStats(os.path.join(self.tmpdir.name, "yield.sqlite3"))
+
+    def teardown_method(self):
+        self.stats.close()
+        self.tmpdir.cleanup()
+
+    def plan(self):
+        return QueryPlan(self.stats, "hvac repair", "Adrian, MI", TEMPLATES)
+
+    def test_first_pages_run_in_template_order(self):
+        """Test that cold stats rank first pages ahead of deeper ones."""
+        plan = self.plan()
+        queries = [plan.next_query() for _ in TEMPLATES]
+
+        assert [q.keyword for q in queries] == [
+            "hvac repair",
+            "hvac repair cost",
+            "hvac repair near Adrian, MI",
+        ]
+        assert all(q.start == 0 for q in queries)
+        assert plan.next_query() is None
+
+    def test_next_page_opens_only_after_new_questions(self):
+        """Test that a dry page skips the variant's deeper pages."""
+        plan = self.plan()
+        first, second, _ = (plan.next_query() for _ in TEMPLATES)
+        plan.record(first, 3, 4)
+        plan.record(second, 0, 4)
+
+        follow_up = plan.next_query()
+        assert (follow_up.template, follow_up.start) == (TEMPLATES[0], 10)
+        skipped = [d for d in plan.decisions if d.action == "skipped"]
+        assert [(d.keyword, d.start) for d in skipped] == [
+            ("hvac repair cost", start) for start in PAGE_STARTS[1:]
+        ]
+
+    def test_learned_yield_reorders_and_opens_pages_early(self):
+        """Test that recorded stats rank variants and speculate on deeper pages."""
+        for _ in range(3):
+            self.stats.record(TEMPLATES[0], 0, 0, 4)
+            self.stats.record(TEMPLATES[2], 0, 6, 8)
+        plan = self.plan()
+
+        issued = []
+        query = plan.next_query()
+        while query:
+            issued.append((query.template, query.start))
+            query = plan.next_query()
+
+        assert issued[0] == (TEMPLATES[2], 0)
+        # Page 10 goes out before page 0 has been recorded
+        assert (TEMPLATES[2], 10) in issued
+        assert (TEMPLATES[0], 10) not in issued
+        assert "opened early" in plan.decisions[0].reason
+
+    def test_failed_search_is_not_recorded_in_stats(self):
+        """Test that a failed search closes the variant but leaves stats alone."""
+        plan = self.plan()
+        query = plan.next_query()
+        plan.record(query, 0, None)
+        plan.finish()
+
+        assert self.stats.rows() == []
+        skipped = [d for d in plan.decisions if d.action == "skipped"]
+        assert len(skipped) == len(PAGE_STARTS) - 1
+        assert all("failed" in d.reason for d in skipped)
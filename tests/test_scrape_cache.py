@@ -0,0 +1,139 @@
+"""Unit tests for scrape_cache module."""
+
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+import scraper
+from scrape_cache import ScrapeCache
+from scraper import scrape_many, scrape_website_text
+
+
+def _response(status=200, body=b"<p>Hello</p>", etag='"v1"', last_modified=None):
+    response = MagicMock()
+    response.status_code = status
+    response.content = body if status == 200 else b""
+    response.headers = {"Content-Type": "text/html; charset=utf-8"}
+    if etag:
+        response.headers["ETag"] = etag
+    if last_modified:
+        response.headers["Last-Modified"] = last_modified
+    return response
+
+
+class TestScrapeCache:
+    """Test suite for the persistent scraper cache."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ScrapeCache(os.path.join(self.tmpdir.name, "cache.sqlite3"))
+
+    def teardown_method(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    @patch("scraper.requests.get")
+    def test_first_fetch_is_unconditional_miss(self, mock_get):
+        """Test that an uncached URL is fetched without validators."""
+        mock_get.return_value = _response()
+
+        result = scrape_website_text("https://example.com", cache=self.cache)
+
+        assert result == "Hello"
+        mock_get.assert_called_once_with("https://example.com", timeout=10)
+        assert self.cache.stats()["misses"] == 1
+        assert self.cache.stats()["entries"] == 1
+
+    @patch("scraper.requests.get")
+    def test_sends_conditional_headers_for_cached_url(self, mock_get):
+        """Test that cached validators are sent on the next request."""
+        mock_get.return_value = _response(
+            etag='"abc"', last_modified="Wed, 01 Oct 2026 00:00:00 GMT"
+        )
+        scrape_website_text("https://example.com", cache=self.cache)
+
+        mock_get.return_value = _response(status=304)
+        scrape_website_text("https://example.com", cache=self.cache)
+
+        headers = mock_get.call_args.kwargs["headers"]
+        assert headers == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 01 Oct 2026 00:00:00 GMT",
+        }
+
+    @patch("scraper.extract_text", wraps=scraper.extract_text)
+    @patch("scraper.requests.get")
+    def test_not_modified_skips_parsing(self, mock_get, mock_extract):
+        """Test that a 304 is served from disk without re-parsing."""
+        mock_get.return_value = _response(body=b"<h1>Title</h1><p>Body</p>")
+        first = scrape_website_text("https://example.com", cache=self.cache)
+
+        mock_get.return_value = _response(status=304)
+        second = scrape_website_text("https://example.com", cache=self.cache)
+
+        assert first == second == "Title\nBody"
+        assert mock_extract.call_count == 1
+        stats = self.cache.stats()
+        assert stats["hits"] == 1
+        assert stats["text_hits"] == 1
+
+    @patch("scraper.requests.get")
+    def test_not_modified_with_new_limit_reparses_cached_body(self, mock_get):
+        """Test that a different max_paragraphs re-extracts from the cached body."""
+        mock_get.return_value = _response(body=b"<p>One</p><p>Two</p>")
+        scrape_website_text("https://example.com", max_paragraphs=2, cache=self.cache)
+
+        mock_get.return_value = _response(status=304)
+        result = scrape_website_text(
+            "https://example.com", max_paragraphs=1, cache=self.cache
+        )
+
+        assert result == "One"
+        assert self.cache.stats()["text_hits"] == 0
+
+    @patch("scraper.requests.get")
+    def test_unchanged_body_without_304_reuses_text(self, mock_get):
+        """Test that an identical 200 body reuses the cached text."""
+        mock_get.return_value = _response(etag=None)
+        scrape_website_text("https://example.com", cache=self.cache)
+        scrape_website_text("https://example.com", cache=self.cache)
+
+        assert self.cache.stats()["text_hits"] == 1
+
+    @patch("scraper.requests.get")
+    def test_evicts_least_recently_used(self, mock_get):
+        """Test that the size cap evicts the oldest pages first."""
+        self.cache.max_bytes = 250
+        body = b"<p>" + b"x" * 100 + b"</p>"
+        for name in ("a", "b", "c"):
+            mock_get.return_value = _response(body=body)
+            scrape_website_text(f"https://{name}.example", cache=self.cache)
+
+        assert self.cache.get("https://a.example") is None
+        assert self.cache.get("https://c.example") is not None
+        assert self.cache.stats()["evictions"] >= 1
+
+    def test_persists_between_instances(self):
+        """Test that cached pages survive reopening the cache file."""
+        response = _response()
+        self.cache.resolve(
+            "https://example.com", None, response, 20, lambda body, n, enc: "text"
+        )
+        self.cache.close()
+
+        self.cache = ScrapeCache(self.cache.path)
+
+        assert self.cache.get("https://example.com").etag == '"v1"'
+
+    def test_scrape_many_shares_cache(self):
+        """Test that scrape_many threads use the shared cache."""
+        session = MagicMock()
+        session.get.return_value = _response()
+
+        scrape_many(
+            ["https://a.example", "https://b.example"],
+            session=session,
+            cache=self.cache,
+        )
+
+        assert self.cache.stats()["entries"] == 2
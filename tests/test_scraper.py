@@ -1,8 +1,18 @@
 """Unit tests for scraper module."""
 
+import pytest
 from unittest.mock import patch, MagicMock
 from requests.exceptions import RequestException, Timeout, ConnectionError
-from scraper import scrape_website_text
+from scraper import (
+    SNIFF_BYTES,
+    detect_encoding,
+    extract_page_data,
+    extract_text,
+    extract_text_stream,
+    scrape_many,
+    scrape_page_data,
+    scrape_website_text,
+)
 
 
 class TestScraperWebsiteText:
@@ -14,7 +24,10 @@ class TestScraperWebsiteText:
         """Test successful website scraping returns extracted text."""
         # Mock response
         mock_response = MagicMock()
-        mock_response.text = "<html><body><h1>Title</h1><p>Content</p></body></html>"
+        mock_response.content = (
+            b"<html><body><h1>Title</h1><p>Content</p></body></html>"
+        )
+        mock_response.headers = {"Content-Type": "text/html; charset=utf-8"}
         mock_get.return_value = mock_response
 
         # Mock BeautifulSoup
@@ -64,7 +77,8 @@ class TestScraperWebsiteText:
     def test_respects_max_paragraphs_limit(self, mock_soup, mock_get):
         """Test that scraper respects max_paragraphs parameter."""
         mock_response = MagicMock()
-        mock_response.text = "<html><body></body></html>"
+        mock_response.content = b"<html><body></body></html>"
+        mock_response.headers = {"Content-Type": "text/html; charset=utf-8"}
         mock_get.return_value = mock_response
 
         # Create 10 mock tags
@@ -91,7 +105,8 @@ class TestScraperWebsiteText:
     def test_removes_script_and_style_elements(self, mock_soup, mock_get):
         """Test that script and style elements are removed."""
         mock_response = MagicMock()
-        mock_response.text = "<html><body></body></html>"
+        mock_response.content = b"<html><body></body></html>"
+        mock_response.headers = {"Content-Type": "text/html; charset=utf-8"}
         mock_get.return_value = mock_response
 
         mock_soup_instance = MagicMock()
@@ -114,7 +129,8 @@ class TestScraperWebsiteText:
     def test_filters_empty_text_blocks(self, mock_soup, mock_get):
         """Test that empty text blocks are filtered out."""
         mock_response = MagicMock()
-        mock_response.text = "<html><body></body></html>"
+        mock_response.content = b"<html><body></body></html>"
+        mock_response.headers = {"Content-Type": "text/html; charset=utf-8"}
         mock_get.return_value = mock_response
 
         # Create tags with some empty text
@@ -139,7 +155,8 @@ class TestScraperWebsiteText:
     def test_searches_for_h1_h2_p_tags(self, mock_soup, mock_get):
         """Test that scraper searches for h1, h2, and p tags."""
         mock_response = MagicMock()
-        mock_response.text = "<html><body></body></html>"
+        mock_response.content = b"<html><body></body></html>"
+        mock_response.headers = {"Content-Type": "text/html; charset=utf-8"}
         mock_get.return_value = mock_response
 
         mock_soup_instance = MagicMock()
@@ -156,7 +173,8 @@ class TestScraperWebsiteText:
     def test_uses_lxml_parser(self, mock_soup, mock_get):
         """Test that BeautifulSoup uses lxml parser."""
         mock_response = MagicMock()
-        mock_response.text = "<html><body></body></html>"
+        mock_response.content = b"<html><body></body></html>"
+        mock_response.headers = {"Content-Type": "text/html; charset=utf-8"}
         mock_get.return_value = mock_response
 
         mock_soup_instance = MagicMock()
@@ -170,12 +188,32 @@ class TestScraperWebsiteText:
         args = mock_soup.call_args
         assert args[0][1] == "lxml"
 
+    @patch("scraper.requests.get")
+    @patch("scraper.BeautifulSoup")
+    def test_passes_raw_bytes_with_sniffed_encoding(self, mock_soup, mock_get):
+        """Test that raw bytes and the header charset go straight to the parser."""
+        mock_response = MagicMock()
+        mock_response.content = b"<html><body></body></html>"
+        mock_response.headers = {"Content-Type": "text/html; charset=ISO-8859-1"}
+        mock_get.return_value = mock_response
+
+        mock_soup_instance = MagicMock()
+        mock_soup_instance.find_all.return_value = []
+        mock_soup.return_value = mock_soup_instance
+
+        scrape_website_text("https://example.com")
+
+        args = mock_soup.call_args
+        assert args[0][0] == b"<html><body></body></html>"
+        assert args[1]["from_encoding"] == "iso8859-1"
+
     @patch("scraper.requests.get")
     @patch("scraper.BeautifulSoup")
     def test_strips_whitespace_from_text(self, mock_soup, mock_get):
         """Test that text is stripped of whitespace."""
         mock_response = MagicMock()
-        mock_response.text = "<html><body></body></html>"
+        mock_response.content = b"<html><body></body></html>"
+        mock_response.headers = {"Content-Type": "text/html; charset=utf-8"}
         mock_get.return_value = mock_response
 
         mock_tag = MagicMock()
@@ -189,3 +227,268 @@ class TestScraperWebsiteText:
 
         # Verify get_text was called with strip=True
         mock_tag.get_text.assert_called_with(strip=True)
+
+
+class TestScrapeMany:
+    """Test suite for scrape_many batch function."""
+
+    @staticmethod
+    def _response(html, status=200):
+        response = MagicMock()
+        response.content = html.encode("utf-8")
+        response.headers = {"Content-Type": "text/html; charset=utf-8"}
+        response.status_code = status
+        return response
+
+    def test_returns_results_in_input_order(self):
+        """Test that results follow input order regardless of completion order."""
+        pages = {
+            "https://a.example": "<h1>A</h1>",
+            "https://b.example": "<p>B</p>",
+            "https://c.example": "<h2>C</h2>",
+        }
+        session = MagicMock()
+        session.get.side_effect = lambda url, timeout: self._response(pages[url])
+
+        results = scrape_many(list(pages), max_concurrency=3, session=session)
+
+        assert [r.url for r in results] == list(pages)
+        assert [r.text for r in results] == ["A", "B", "C"]
+        assert all(r.ok for r in results)
+
+    def test_reports_errors_per_url(self):
+        """Test that one failing URL does not affect the others."""
+        session = MagicMock()
+
+        def fake_get(url, timeout):
+            if "bad" in url:
+                raise ConnectionError("refused")
+            return self._response("<p>Fine</p>")
+
+        session.get.side_effect = fake_get
+
+        results = scrape_many(
+            ["https://good.example", "https://bad.example"], session=session
+        )
+
+        assert results[0].ok and results[0].text == "Fine"
+        assert not results[1].ok
+        assert "refused" in results[1].error
+        assert results[1].text == ""
+
+    def test_empty_url_list_returns_empty(self):
+        """Test that an empty URL list makes no requests."""
+        assert scrape_many([]) == []
+
+    def test_rejects_invalid_concurrency(self):
+        """Test that max_concurrency below 1 raises ValueError."""
+        with pytest.raises(ValueError):
+            scrape_many(["https://example.com"], max_concurrency=0)
+
+    @patch("scraper.create_session")
+    def test_creates_and_closes_pooled_session(self, mock_create):
+        """Test that an owned session is sized to the concurrency and closed."""
+        session = MagicMock()
+        session.get.return_value = self._response("<p>x</p>")
+        mock_create.return_value = session
+
+        scrape_many(["https://a.example", "https://b.example"], max_concurrency=4)
+
+        mock_create.assert_called_once_with(2)
+        session.close.assert_called_once()
+
+
+class TestStreamingExtraction:
+    """Test suite for streaming early-exit extraction."""
+
+    PAGE = (
+        b"<html><head><script>var x;</script></head><body>"
+        b"<header><h1>Site Nav Title</h1></header>"
+        b"<h1>Title <b>bold</b></h1><p>First &amp; best</p><!-- note -->"
+        b"<nav><p>Menu</p></nav><p>Keep <script>drop()</script>this</p>"
+        b"<form><p>Form text</p></form><h2>Sub</h2><p>Last</p>"
+        b"<footer><p>Copyright</p></footer></body></html>"
+    )
+
+    @staticmethod
+    def _chunks(data, size):
+        return [data[i : i + size] for i in range(0, len(data), size)]
+
+    def test_matches_full_parse_for_any_chunking(self):
+        """Test that streaming output matches extract_text regardless of chunking."""
+        expected = extract_text(self.PAGE.decode("utf-8"))
+        for size in (1, 5, 64, len(self.PAGE)):
+            assert extract_text_stream(self._chunks(self.PAGE, size)) == expected
+
+    def test_drops_non_content_subtrees(self):
+        """Test that header, nav, form, footer and script text is dropped."""
+        result = extract_text_stream([self.PAGE])
+
+        for dropped in ("Site Nav Title", "Menu", "Form text", "Copyright", "drop"):
+            assert dropped not in result
+
+    def test_stops_reading_after_max_paragraphs(self):
+        """Test that the chunk iterator is not consumed past the limit."""
+        consumed = []
+
+        def chunks():
+            for chunk in self._chunks(self.PAGE, 16):
+                consumed.append(chunk)
+                yield chunk
+            yield b"<p>" + b"x" * 10_000_000 + b"</p>"
+
+        result = extract_text_stream(chunks(), max_paragraphs=2)
+
+        assert result == "Titlebold\nFirst & best"
+        assert len(consumed) < len(self._chunks(self.PAGE, 16))
+
+    @patch("scraper.requests.get")
+    def test_scrape_website_text_stream_mode(self, mock_get):
+        """Test that stream mode requests a streamed body and closes it."""
+        mock_response = MagicMock()
+        mock_response.headers = {"Content-Type": "text/html"}
+        mock_response.iter_content.return_value = iter([self.PAGE])
+        mock_get.return_value = mock_response
+
+        result = scrape_website_text("https://example.com", stream=True)
+
+        assert result.startswith("Titlebold")
+        mock_get.assert_called_once_with("https://example.com", timeout=10, stream=True)
+        mock_response.close.assert_called_once()
+
+
+class TestDetectEncoding:
+    """Test suite for detect_encoding byte-level charset sniffing."""
+
+    def test_header_charset_wins(self):
+        """Test that a Content-Type charset is used without inspecting the body."""
+        body = b'<meta charset="windows-1252">'
+        assert detect_encoding("text/html; charset=UTF-8", body) == "utf-8"
+
+    def test_meta_charset(self):
+        """Test that a <meta charset> declaration is honored."""
+        body = b'<html><head><meta charset="windows-1252"></head>'
+        assert detect_encoding("text/html", body) == "cp1252"
+
+    def test_meta_http_equiv(self):
+        """Test that an http-equiv Content-Type declaration is honored."""
+        body = (
+            b'<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-1">'
+        )
+        assert detect_encoding(None, body) == "iso8859-1"
+
+    def test_byte_order_mark(self):
+        """Test that a UTF-8 BOM is recognized."""
+        assert detect_encoding(None, b"\xef\xbb\xbf<html>") == "utf-8"
+
+    def test_unknown_declared_charset_is_ignored(self):
+        """Test that an unknown header charset falls through to sniffing."""
+        assert detect_encoding("text/html; charset=bogus", b"<p>plain</p>") == "utf-8"
+
+    def test_undeclared_utf8_prefix(self):
+        """Test that valid UTF-8 without a declaration is detected as UTF-8."""
+        body = "<p>Caf\u00e9 \u2013 heating</p>".encode("utf-8")
+        assert detect_encoding(None, body) == "utf-8"
+
+    def test_truncated_multibyte_at_prefix_boundary(self):
+        """Test that a character split by the sniff window is not an error."""
+        body = b"a" * (8 * 1024 - 1) + "\u00e9".encode("utf-8")
+        assert detect_encoding(None, body) == "utf-8"
+
+    @patch("scraper.from_bytes")
+    def test_undeclared_legacy_bytes_use_prefix_detection(self, mock_detect):
+        """Test that non-UTF-8 bytes fall back to detection on the prefix only."""
+        mock_detect.return_value.best.return_value.encoding = "cp1252"
+        body = "<p>Caf\u00e9</p>".encode("cp1252") * 10_000
+
+        assert detect_encoding(None, body) == "cp1252"
+        assert len(mock_detect.call_args[0][0]) == SNIFF_BYTES
+
+    @patch("scraper.from_bytes")
+    def test_detection_failure_defaults_to_windows_1252(self, mock_detect):
+        """Test the HTML default when detection finds nothing."""
+        mock_detect.return_value.best.return_value = None
+
+        assert detect_encoding(None, b"<p>\xff\xfe\xfd</p>") == "cp1252"
+
+    def test_extract_text_decodes_bytes(self):
+        """Test that extract_text parses bytes with the given encoding."""
+        body = "<p>Caf\u00e9</p>".encode("cp1252")
+        assert extract_text(body, encoding="cp1252") == "Caf\u00e9"
+
+
+class TestExtractPageData:
+    """Test suite for single-pass structured-data extraction."""
+
+    PAGE = (
+        b"<html><head><title> Acme  HVAC </title>"
+        b'<meta name="Description" content="Austin AC repair">'
+        b'<meta property="og:site_name" content="Acme HVAC">'
+        b'<link rel="canonical" href="https://acme.example/">'
+        b'<script type="application/ld+json">{"@graph": [{"@type": "HVACBusiness",'
+        b' "name": "Acme HVAC", "telephone": "+1-512-555-0100", "address":'
+        b' {"@type": "PostalAddress", "streetAddress": "123 Main St",'
+        b' "addressLocality": "Austin", "addressRegion": "TX",'
+        b' "postalCode": "78701"}}, {"@type": "FAQPage"}]}</script>'
+        b'<script type="application/ld+json">{broken</script></head><body>'
+        b'<header><a href="tel:5125550100">Call</a><h2>Menu</h2></header>'
+        b"<h1>AC <b>Repair</b></h1><p>Hello <b>World</b></p><h3>Why us</h3>"
+        b"<p>Call (512) 555-0199 today</p>"
+        b"<footer><address>456 Oak Avenue, Suite 2<br>Round Rock, TX 78664"
+        b"</address><p>512.555.0100</p></footer></body></html>"
+    )
+
+    def test_collects_all_fields_in_one_pass(self):
+        """Test title, meta, canonical, headings and JSON-LD extraction."""
+        page = extract_page_data(self.PAGE, url="https://acme.example/")
+
+        assert page.url == "https://acme.example/"
+        assert page.title == "Acme HVAC"
+        assert page.meta_description == "Austin AC repair"
+        assert page.canonical == "https://acme.example/"
+        assert page.headings == [("h1", "AC Repair"), ("h3", "Why us")]
+        assert len(page.json_ld) == 1
+        assert page.schema_types() == ["HVACBusiness", "PostalAddress", "FAQPage"]
+
+    def test_text_matches_extract_text(self):
+        """Test that text blocks are identical to extract_text output."""
+        for max_paragraphs in (1, 20):
+            page = extract_page_data(self.PAGE, max_paragraphs)
+            assert page.text == extract_text(self.PAGE, max_paragraphs)
+
+    def test_nap_candidates(self):
+        """Test NAP from JSON-LD, tel: links and footer text, deduplicated."""
+        nap = extract_page_data(self.PAGE).nap
+
+        assert nap.names == ["Acme HVAC"]
+        assert nap.addresses == [
+            "123 Main St, Austin, TX 78701",
+            "456 Oak Avenue, Suite 2 Round Rock, TX 78664",
+        ]
+        assert nap.phones == ["+1-512-555-0100", "(512) 555-0199"]
+
+    def test_handles_empty_and_fragment_markup(self):
+        """Test that empty or partial documents do not raise."""
+        assert extract_page_data(b"").text == ""
+        assert extract_page_data("<p>Only text").text_blocks == ["Only text"]
+
+    @patch("scraper.requests.get")
+    def test_scrape_page_data_fetches_once(self, mock_get):
+        """Test that scrape_page_data makes one request and returns PageData."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = self.PAGE
+        mock_response.headers = {"Content-Type": "text/html; charset=utf-8"}
+        mock_get.return_value = mock_response
+
+        page = scrape_page_data("https://acme.example/")
+
+        mock_get.assert_called_once_with("https://acme.example/", timeout=10)
+        assert page.title == "Acme HVAC"
+
+    @patch("scraper.requests.get")
+    def test_scrape_page_data_returns_none_on_error(self, mock_get):
+        """Test that fetch errors return None."""
+        mock_get.side_effect = ConnectionError("down")
+
+        assert scrape_page_data("https://acme.example/") is None
@@ -0,0 +1,131 @@
+"""Unit tests for serp_archive module."""
+
+import os
+import tempfile
+
+from serp_archive import (
+    SerpArchive,
+    compact_serp,
+    competitor_domains,
+    local_pack_rank,
+    main,
+    related_searches,
+)
+
+PARAMS = {"engine": "google", "q": "hvac repair", "gl": "us", "start": 0, "uule": "w+A"}
+SERP = {
+    "search_metadata": {"id": "abc", "json_endpoint": "https://serpapi.com/x"},
+    "organic_results": [
+        {"position": 2, "link": "https://www.rivalhvac.com/repair", "thumbnail": "x"},
+        {"position": 1, "link": "https://abcheating.com/", "favicon": "y"},
+        {"position": 3, "link": "https://blog.rivalhvac.com/tips"},
+        {"position": 4, "link": "https://yelp.com/search?x"},
+    ],
+    "local_results": {
+        "places": [
+            {"position": 1, "title": "Rival HVAC", "serpapi_link": "z"},
+            {"position": 2, "title": "ABC Heating & Cooling, LLC"},
+        ],
+        "more_locations_link": "https://google.com/...",
+    },
+    "related_searches": [{"query": "hvac repair cost"}, {"query": "ac repair"}],
+    "related_questions": [{"question": "How much is HVAC repair?"}],
+    "pagination": {"next": "https://google.com/..."},
+}
+
+
+class TestExtractors:
+    """Test suite for the single-SERP extractors."""
+
+    def test_compact_keeps_features_and_drops_noise(self):
+        """Test that only archived features survive, without images or links."""
+        compact = compact_serp(SERP)
+
+        assert set(compact) == {
+            "organic_results",
+            "local_results",
+            "related_searches",
+            "related_questions",
+        }
+        assert "thumbnail" not in compact["organic_results"][0]
+        assert "serpapi_link" not in compact["local_results"]["places"][0]
+
+    def test_competitor_domains_in_rank_order(self):
+        """Test ordering by position, dedup and own-domain exclusion."""
+        assert competitor_domains(SERP) == [
+            "abcheating.com",
+            "rivalhvac.com",
+            "blog.rivalhvac.com",
+            "yelp.com",
+        ]
+        assert competitor_domains(SERP, exclude=["https://www.abcheating.com"]) == [
+            "rivalhvac.com",
+            "blog.rivalhvac.com",
+            "yelp.com",
+        ]
+        assert competitor_domains(SERP, exclude=["rivalhvac.com"])[-1] == "yelp.com"
+
+    def test_local_pack_rank(self):
+        """Test name matching in both local_results shapes."""
+        assert local_pack_rank(SERP, "ABC Heating") == 2
+        assert local_pack_rank(SERP, "Nobody Plumbing") is None
+        flat = {"local_results": [{"title": "abc heating"}]}
+        assert local_pack_rank(flat, "ABC Heating") == 1
+
+    def test_related_searches(self):
+        """Test that related searches come back in page order."""
+        assert related_searches(SERP) == ["hvac repair cost", "ac repair"]
+
+
+class TestSerpArchive:
+    """Test suite for the per-client SERP archive."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "archive.sqlite3")
+        self.archive = SerpArchive(self.path)
+
+    def teardown_method(self):
+        self.archive.close()
+        self.tmpdir.cleanup()
+
+    def test_record_and_reports(self):
+        """Test that archived searches feed all three reports."""
+        self.archive.record(PARAMS, SERP)
+        self.archive.record(dict(PARAMS, q="furnace repair"), SERP)
+        self.archive.record(dict(PARAMS, start=10), {"organic_results": []})
+
+        assert self.archive.stats()["entries"] == 3
+        assert self.archive.competitor_counts(exclude=["abcheating.com"])[0] == (
+            "blog.rivalhvac.com",
+            2,
+        )
+        assert self.archive.local_pack_ranks("ABC Heating") == {
+            ("hvac repair", "w+A"): 2,
+            ("furnace repair", "w+A"): 2,
+        }
+        assert self.archive.related_searches() == ["hvac repair cost", "ac repair"]
+
+    def test_repeat_search_replaces_entry(self):
+        """Test that re-recording a search keeps one, newest entry."""
+        self.archive.record(PARAMS, SERP)
+        self.archive.record(dict(PARAMS, api_key="k"), {"organic_results": []})
+
+        entries = self.archive.entries()
+        assert len(entries) == 1
+        assert entries[0]["serp"] == {"organic_results": []}
+
+    def test_record_after_close_is_ignored(self):
+        """Test that late searches cannot fail on a closed archive."""
+        self.archive.close()
+        self.archive.record(PARAMS, SERP)
+
+        assert self.archive.recorded == 0
+
+    def test_cli_competitors(self, capsys):
+        """Test the competitors command output."""
+        self.archive.record(PARAMS, SERP)
+
+        main([self.path, "competitors", "--exclude", "abcheating.com"])
+
+        assert "rivalhvac.com" in capsys.readouterr().out
@@ -0,0 +1,100 @@
+"""Unit tests for serp_cache module."""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+from serp_cache import SerpCache, cache_key, main
+
+PARAMS = {
+    "engine": "google",
+    "q": "hvac repair",
+    "hl": "en",
+    "gl": "us",
+    "start": 10,
+    "uule": "w+CAIQICIa",
+    "api_key": "secret",
+}
+DATA = {"related_questions": [{"question": "How much does AC repair cost?"}]}
+
+
+class TestSerpCache:
+    """Test suite for the SerpAPI response cache."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "serp.sqlite3")
+        self.cache = SerpCache(self.path)
+
+    def teardown_method(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_key_ignores_api_key(self):
+        """Test that only result-affecting parameters form the key."""
+        other = dict(PARAMS, api_key="different")
+        assert cache_key(PARAMS) == cache_key(other)
+        assert cache_key(PARAMS) != cache_key(dict(PARAMS, start=20))
+
+    def test_round_trip_and_stats(self):
+        """Test that a stored response is returned and counted as a hit."""
+        assert self.cache.get(PARAMS) is None
+        self.cache.put(PARAMS, DATA)
+
+        assert self.cache.get(PARAMS) == DATA
+        stats = self.cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["credits_saved"] == 1
+        assert stats["lifetime_credits_saved"] == 1
+
+    def test_bodies_are_compressed(self):
+        """Test that stored bodies are smaller than the JSON."""
+        big = {"organic_results": [{"snippet": "heating and cooling " * 20}] * 50}
+        self.cache.put(PARAMS, big)
+
+        assert self.cache.stats()["size_bytes"] < len(str(big)) / 10
+
+    def test_expired_entries_miss(self):
+        """Test that entries older than the TTL are not served."""
+        self.cache.put(PARAMS, DATA)
+        with patch("serp_cache.time.time", return_value=10**12):
+            assert self.cache.get(PARAMS) is None
+
+    def test_evicts_least_recently_used(self):
+        """Test that the size budget evicts the oldest entries."""
+        self.cache.put(dict(PARAMS, q="a"), DATA)
+        size = self.cache.stats()["size_bytes"]
+        self.cache.max_bytes = size * 2
+        self.cache.put(dict(PARAMS, q="b"), DATA)
+        self.cache.get(dict(PARAMS, q="a"))
+        self.cache.put(dict(PARAMS, q="c"), DATA)
+
+        assert self.cache.get(dict(PARAMS, q="b")) is None
+        assert self.cache.get(dict(PARAMS, q="a")) == DATA
+        assert self.cache.evictions == 1
+
+    def test_list_and_purge(self):
+        """Test listing and purging by query, expiry and everything."""
+        self.cache.put(dict(PARAMS, q="hvac repair"), DATA)
+        self.cache.put(dict(PARAMS, q="plumber"), DATA)
+
+        assert [e["q"] for e in self.cache.entries(query="hvac")] == ["hvac repair"]
+        assert self.cache.purge(expired_only=True) == 0
+        assert self.cache.purge(query="plumb") == 1
+        assert self.cache.purge(expired_only=False) == 1
+        assert self.cache.stats()["entries"] == 0
+
+    def test_cli(self, capsys):
+        """Test the stats, list and purge commands."""
+        self.cache.put(PARAMS, DATA)
+
+        main(["--path", self.path, "stats"])
+        main(["--path", self.path, "list"])
+        main(["--path", self.path, "purge", "--all"])
+
+        out = capsys.readouterr().out
+        assert "1 entries" in out
+        assert "'hvac repair' start=10" in out
+        assert "Purged 1 entries" in out
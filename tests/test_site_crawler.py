@@ -0,0 +1,241 @@
+"""Unit tests for site_crawler module."""
+
+import gzip
+import io
+import json
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from site_crawler import (
+    canonicalize_url,
+    corpus_text,
+    crawl_site,
+    discover_sitemap,
+    iter_corpus,
+    iter_sitemap_urls,
+)
+from host_scheduler import HostScheduler, RobotsCache
+from scraper import ScrapeResult
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def _sitemap_response(xml):
+    response = MagicMock()
+    response.raw = io.BytesIO(xml)
+    return response
+
+
+def _urlset(*urls):
+    locs = "".join(
+        f"<url><loc>{u}</loc><lastmod>2026-01-01</lastmod></url>" for u in urls
+    )
+    return f'<?xml version="1.0"?><urlset {NS}>{locs}</urlset>'.encode()
+
+
+class TestCanonicalizeUrl:
+    """Test suite for canonicalize_url."""
+
+    def test_normalizes_case_port_fragment_and_slash(self):
+        """Test scheme/host case, default port, fragment and trailing slash."""
+        assert (
+            canonicalize_url("HTTPS://Example.COM:443/Services/#top")
+            == "https://example.com/Services"
+        )
+
+    def test_drops_tracking_params_and_sorts_query(self):
+        """Test that tracking parameters are removed and the query is sorted."""
+        assert (
+            canonicalize_url("https://example.com/a?b=2&utm_source=x&a=1&gclid=z")
+            == "https://example.com/a?a=1&b=2"
+        )
+
+    def test_keeps_non_default_port(self):
+        """Test that a non-default port is preserved."""
+        assert (
+            canonicalize_url("http://example.com:8080/") == "http://example.com:8080/"
+        )
+
+
+class TestIterSitemapUrls:
+    """Test suite for streaming sitemap parsing."""
+
+    def test_reads_urlset(self):
+        """Test that page URLs are yielded in sitemap order."""
+        session = MagicMock()
+        session.get.return_value = _sitemap_response(
+            _urlset("https://example.com/a", "https://example.com/b")
+        )
+
+        urls = list(iter_sitemap_urls("https://example.com/sitemap.xml", session))
+
+        assert urls == ["https://example.com/a", "https://example.com/b"]
+
+    def test_follows_sitemap_index_and_gzip(self):
+        """Test that sitemap indexes are followed, including .gz children."""
+        index = (
+            f"<sitemapindex {NS}>"
+            "<sitemap><loc>https://example.com/pages.xml</loc></sitemap>"
+            "<sitemap><loc>https://example.com/posts.xml.gz</loc></sitemap>"
+            "</sitemapindex>"
+        ).encode()
+        bodies = {
+            "https://example.com/sitemap_index.xml": index,
+            "https://example.com/pages.xml": _urlset("https://example.com/a"),
+            "https://example.com/posts.xml.gz": gzip.compress(
+                _urlset("https://example.com/blog/1")
+            ),
+        }
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kw: _sitemap_response(bodies[url])
+
+        urls = list(iter_sitemap_urls("https://example.com/sitemap_index.xml", session))
+
+        assert urls == ["https://example.com/a", "https://example.com/blog/1"]
+
+    def test_skips_broken_sitemap(self):
+        """Test that an unparsable sitemap is skipped without raising."""
+        session = MagicMock()
+        session.get.return_value = _sitemap_response(b"<urlset><url><loc>")
+
+        assert list(iter_sitemap_urls("https://example.com/sitemap.xml", session)) == []
+
+    def test_sitemaps_wait_on_the_scheduler(self):
+        """Test that sitemap requests are scheduled and disallowed ones skipped."""
+        index = (
+            f"<sitemapindex {NS}>"
+            "<sitemap><loc>https://example.com/pages.xml</loc></sitemap>"
+            "<sitemap><loc>https://example.com/private.xml</loc></sitemap>"
+            "</sitemapindex>"
+        ).encode()
+        bodies = {
+            "https://example.com/sitemap_index.xml": index,
+            "https://example.com/pages.xml": _urlset("https://example.com/a"),
+        }
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kw: _sitemap_response(bodies[url])
+        scheduler = MagicMock()
+        scheduler.acquire.side_effect = lambda url: "private" not in url
+
+        urls = list(
+            iter_sitemap_urls(
+                "https://example.com/sitemap_index.xml", session, scheduler=scheduler
+            )
+        )
+
+        assert urls == ["https://example.com/a"]
+        assert [c.args[0] for c in scheduler.acquire.call_args_list] == [
+            "https://example.com/sitemap_index.xml",
+            "https://example.com/pages.xml",
+            "https://example.com/private.xml",
+        ]
+        assert session.get.call_count == 2
+
+
+class TestDiscoverSitemap:
+    """Test suite for sitemap discovery."""
+
+    def test_reads_sitemap_from_cached_robots(self):
+        """Test that the scheduler's robots.txt is used instead of a refetch."""
+        robots_session = MagicMock()
+        robots_session.get.return_value = MagicMock(
+            status_code=200,
+            text="User-agent: *\nDisallow:\nSitemap: https://example.com/map.xml\n",
+        )
+        scheduler = HostScheduler(rate=None, robots=RobotsCache(session=robots_session))
+        session = MagicMock()
+
+        found = discover_sitemap("https://example.com/", session, scheduler=scheduler)
+
+        assert found == "https://example.com/map.xml"
+        session.get.assert_not_called()
+        session.head.assert_not_called()
+
+    def test_probes_wait_on_the_scheduler(self):
+        """Test that candidate HEAD probes are scheduled like page fetches."""
+        session = MagicMock()
+        session.get.return_value = MagicMock(ok=False)
+        session.head.side_effect = lambda url, **kw: MagicMock(ok="wp-" in url)
+        scheduler = MagicMock(robots=None)
+        scheduler.acquire.return_value = True
+
+        found = discover_sitemap("https://example.com/", session, scheduler=scheduler)
+
+        assert found == "https://example.com/wp-sitemap.xml"
+        assert scheduler.acquire.call_count == 4
+
+
+class TestCrawlSite:
+    """Test suite for crawl_site corpus generation."""
+
+    @patch("site_crawler.iter_scrape")
+    @patch("site_crawler.iter_sitemap_urls")
+    def test_writes_filtered_deduplicated_corpus(self, mock_sitemap, mock_scrape):
+        """Test URL filtering, canonical dedupe and duplicate-text removal."""
+        mock_sitemap.return_value = iter(
+            [
+                "https://example.com/services/ac/",
+                "https://example.com/services/ac",
+                "https://example.com/services/heat/?utm_source=x",
+                "https://example.com/services/copy/",
+                "https://example.com/blog/post/",
+                "https://example.com/services/broken/",
+            ]
+        )
+
+        def fake_scrape(urls, **kwargs):
+            texts = {"ac": "AC repair", "heat": "Heating", "copy": "AC repair"}
+            for url in urls:
+                key = url.split("/services/")[1].split("/")[0]
+                if key == "broken":
+                    yield ScrapeResult(url=url, error="404")
+                else:
+                    yield ScrapeResult(url=url, text=texts[key], status_code=200)
+
+        mock_scrape.side_effect = fake_scrape
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = {
+                "name": "Test HVAC",
+                "url": "https://example.com/",
+                "output_root": tmpdir,
+                "sitemap_url": "https://example.com/sitemap.xml",
+            }
+            scheduler = HostScheduler(rate=None, respect_robots=False)
+            path = crawl_site(config, include=[r"/services/"], scheduler=scheduler)
+
+            assert path == os.path.join(
+                tmpdir, "Test HVAC", "Test HVAC site corpus.jsonl"
+            )
+            pages = list(iter_corpus(path))
+
+        assert [p["text"] for p in pages] == ["AC repair", "Heating"]
+        assert pages[0]["url"] == "https://example.com/services/ac/"
+        assert mock_scrape.call_args.kwargs["scheduler"] is scheduler
+
+    def test_corpus_text_respects_budget(self):
+        """Test that corpus_text stops at the character budget."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "corpus.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                for i in range(5):
+                    f.write(json.dumps({"url": f"u{i}", "text": "x" * 10}) + "\n")
+
+            text = corpus_text(path, max_chars=25, dedupe=False)
+
+        assert text == "x" * 10 + "\n\n" + "x" * 10 + "\n\n" + "x"
+
+    def test_corpus_text_drops_cross_page_boilerplate(self):
+        """Test that blocks repeated on later pages are dropped."""
+        cta = "Call Tri-State Heating today for a free in-home estimate!"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "corpus.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"url": "a", "text": f"AC repair\n{cta}"}) + "\n")
+                f.write(json.dumps({"url": "b", "text": f"Furnaces\n{cta}"}) + "\n")
+                f.write(json.dumps({"url": "c", "text": cta.upper()}) + "\n")
+
+            text = corpus_text(path)
+
+        assert text == f"AC repair\n{cta}\n\nFurnaces"
@@ -0,0 +1,144 @@
+"""Unit tests for summarizer module."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import summarizer
+from summarizer import chunk_text, first_stage_requests, summarize_text
+from text_dedup import estimate_tokens
+
+
+def _fake_completion(delay=0.0):
+    """Return a chat_completion stand-in that records prompts."""
+    prompts = []
+    lock = threading.Lock()
+
+    def complete(messages, **kwargs):
+        prompt = messages[-1]["content"]
+        with lock:
+            prompts.append((prompt, kwargs.get("max_tokens")))
+        time.sleep(delay)
+        if "Website content, part " in prompt:
+            part = prompt.split("Website content, part ", 1)[1].split(":", 1)[0]
+            return "summary of " + part
+        if prompt.startswith(summarizer.MERGE_INSTRUCTIONS):
+            return "merged summary"
+        return "FINAL"
+
+    return complete, prompts
+
+
+class TestChunkText:
+    """Test suite for token-budgeted chunking."""
+
+    def test_chunks_fit_budget_and_keep_order(self):
+        """Test that whole lines are packed in order under the budget."""
+        lines = [f"line {i} " + "word " * (i % 7) for i in range(200)]
+
+        chunks = chunk_text("\n".join(lines), token_budget=50)
+
+        assert all(estimate_tokens(chunk) <= 50 for chunk in chunks)
+        assert "\n".join(chunks).split("\n") == [line.strip() for line in lines]
+
+    def test_long_line_is_split_between_words(self):
+        """Test that a line over the budget is cut at word boundaries."""
+        chunks = chunk_text("furnace " * 100, token_budget=20)
+
+        assert len(chunks) > 1
+        assert all(
+            chunk.split() == ["furnace"] * len(chunk.split()) for chunk in chunks
+        )
+
+    def test_blank_text(self):
+        """Test that blank text yields no chunks."""
+        assert chunk_text("  \n\n ") == []
+
+
+class TestSummarizeText:
+    """Test suite for the map-reduce summary."""
+
+    def test_short_text_is_one_call(self):
+        """Test that text within one chunk keeps the single-prompt path."""
+        complete, prompts = _fake_completion()
+        with patch.object(summarizer, "chat_completion", side_effect=complete):
+            summary, report = summarize_text(
+                "We fix furnaces.", "Summarize.", "Business Name: ABC"
+            )
+
+        assert summary == "FINAL"
+        assert [stage.stage for stage in report.stages] == ["single"]
+        assert "Business Name: ABC" in prompts[0][0]
+        assert "We fix furnaces." in prompts[0][0]
+
+    def test_map_then_reduce_in_page_order(self):
+        """Test that every chunk is summarized and merged in order."""
+        text = "\n".join(f"page {i} " + "text " * 40 for i in range(12))
+        complete, prompts = _fake_completion()
+        with patch.object(summarizer, "chat_completion", side_effect=complete):
+            summary, report = summarize_text(text, "Summarize.", chunk_tokens=100)
+
+        assert summary == "FINAL"
+        assert [stage.stage for stage in report.stages] == ["map", "reduce"]
+        assert report.chunks == report.stages[0].calls == report.calls - 1
+        final = prompts[-1][0]
+        parts = [
+            f"summary of {i} of {report.chunks}" for i in range(1, report.chunks + 1)
+        ]
+        assert [final.index(part) for part in parts] == sorted(
+            final.index(part) for part in parts
+        )
+        assert all(
+            max_tokens == summarizer.PARTIAL_SUMMARY_TOKENS
+            for _, max_tokens in prompts[:-1]
+        )
+
+    def test_summaries_over_budget_are_merged_in_rounds(self):
+        """Test that summaries that do not fit one prompt are merged first."""
+        text = "\n".join("text " * 40 for _ in range(12))
+        complete, _ = _fake_completion()
+        with patch.object(summarizer, "chat_completion", side_effect=complete):
+            _, report = summarize_text(
+                text, "Summarize.", chunk_tokens=60, reduce_tokens=10
+            )
+
+        names = [stage.stage for stage in report.stages]
+        assert names[0] == "map" and names[-1] == "reduce"
+        assert names[1] == "merge 1"
+        assert report.stages[1].calls < report.stages[0].calls
+
+    def test_first_stage_requests_match_live_calls(self):
+        """Test that batch_jobs compiles the exact first-stage requests."""
+        for text, chunk_tokens in (("We fix furnaces.", 3000), ("text " * 400, 100)):
+            calls = []
+
+            def complete(messages, **kwargs):
+                calls.append((messages, kwargs))
+                return "summary"
+
+            with patch.object(summarizer, "chat_completion", side_effect=complete):
+                summarize_text(text, "Summarize.", "Header", chunk_tokens=chunk_tokens)
+            batch, params = first_stage_requests(
+                text, "Summarize.", "Header", chunk_tokens=chunk_tokens
+            )
+
+            live = calls[: len(batch)]
+            assert sorted(str(m) for m, _ in live) == sorted(str(m) for m in batch)
+            sampling = ("temperature", "max_tokens")
+            assert all(
+                [kwargs.get(k) for k in sampling] == [params.get(k) for k in sampling]
+                for _, kwargs in live
+            )
+
+    def test_map_latency_bounded_by_slowest_chunk(self):
+        """Test that chunks are summarized concurrently."""
+        text = "\n".join("text " * 40 for _ in range(8))
+        complete, _ = _fake_completion(delay=0.1)
+        with patch.object(summarizer, "chat_completion", side_effect=complete):
+            _, report = summarize_text(text, "Summarize.", chunk_tokens=60)
+
+        map_stage = report.stages[0]
+        assert map_stage.calls == 8
+        assert map_stage.seconds < 0.4
+        assert map_stage.slowest_call >= 0.1
+        assert map_stage.prompt_tokens > estimate_tokens(text)
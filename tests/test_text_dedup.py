@@ -0,0 +1,174 @@
+"""Unit tests for text_dedup module."""
+
+import random
+
+import pytest
+
+from text_dedup import (
+    BlockDeduper,
+    QuestionDeduper,
+    collapse_questions,
+    dedupe_pages,
+    estimate_tokens,
+    question_tokens,
+    shingles,
+    simhash,
+)
+
+SERVICE_AREA = (
+    "Proudly serving Adrian, Tecumseh, Blissfield and the surrounding areas "
+    "with heating and cooling repair since 1985."
+)
+TESTIMONIAL = (
+    "John was great, on time and very professional. Highly recommend "
+    "Tri-State for any HVAC work."
+)
+
+
+class TestFingerprints:
+    """Test suite for shingling and SimHash."""
+
+    def test_shingles_word_ngrams(self):
+        """Test overlapping lowercase word n-grams."""
+        assert shingles("Call Us today, now", size=2) == [
+            "call us",
+            "us today",
+            "today now",
+        ]
+
+    def test_short_text_is_one_shingle(self):
+        """Test that text shorter than the shingle size is kept whole."""
+        assert shingles("AC repair", size=3) == ["ac repair"]
+        assert shingles("   ") == []
+
+    def test_simhash_is_stable_and_case_insensitive(self):
+        """Test that SimHash ignores case and punctuation."""
+        assert simhash(SERVICE_AREA) == simhash(SERVICE_AREA.upper() + "!!")
+
+    def test_near_duplicates_have_close_hashes(self):
+        """Test that a one-word edit moves the hash by only a few bits."""
+        edited = SERVICE_AREA.replace("the surrounding", "surrounding")
+        assert bin(simhash(SERVICE_AREA) ^ simhash(edited)).count("1") <= 7
+        assert bin(simhash(SERVICE_AREA) ^ simhash(TESTIMONIAL)).count("1") > 7
+
+
+class TestDedupePages:
+    """Test suite for cross-page block deduplication."""
+
+    def test_removes_repeated_and_edited_boilerplate(self):
+        """Test that exact and lightly edited repeats are dropped after the first."""
+        pages = [
+            ["AC Repair", SERVICE_AREA, TESTIMONIAL],
+            ["Furnace Repair", SERVICE_AREA.replace("the surrounding", "surrounding")],
+            ["Duct Cleaning", TESTIMONIAL.replace("any", "all")],
+        ]
+
+        kept, report = dedupe_pages(pages)
+
+        assert kept == [
+            ["AC Repair", SERVICE_AREA, TESTIMONIAL],
+            ["Furnace Repair"],
+            ["Duct Cleaning"],
+        ]
+        assert report.blocks_in == 7
+        assert report.blocks_removed == 2
+        assert report.tokens_saved > 0
+
+    def test_short_blocks_need_exact_match(self):
+        """Test that short headings are not merged by SimHash."""
+        kept, report = dedupe_pages(
+            [["AC Repair"], ["AC Repair Services"], ["ac repair"]]
+        )
+
+        assert kept == [["AC Repair"], ["AC Repair Services"], []]
+        assert report.blocks_removed == 1
+
+    def test_reports_token_savings(self):
+        """Test that saved tokens equal the estimate for removed blocks."""
+        _, report = dedupe_pages([[TESTIMONIAL], [TESTIMONIAL], [TESTIMONIAL]])
+
+        assert report.tokens_saved == 2 * estimate_tokens(TESTIMONIAL)
+        assert report.tokens_in == 3 * estimate_tokens(TESTIMONIAL)
+
+    def test_unrelated_blocks_are_kept(self):
+        """Test that distinct random blocks are never merged."""
+        rng = random.Random(7)
+        vocab = [f"word{i}" for i in range(2000)]
+        pages = [
+            [" ".join(rng.choices(vocab, k=30)) for _ in range(20)] for _ in range(20)
+        ]
+
+        _, report = dedupe_pages(pages)
+
+        assert report.blocks_removed == 0
+
+    def test_rejects_unsupported_distance(self):
+        """Test that distances the band index cannot cover are rejected."""
+        with pytest.raises(ValueError):
+            BlockDeduper(max_distance=8)
+
+
+class TestQuestionDeduper:
+    """Test suite for near-duplicate question collapsing."""
+
+    def test_question_tokens_normalize(self):
+        """Test casefolding, punctuation, stopword and plural stripping."""
+        assert question_tokens("How much do HVAC Repairs cost?") == question_tokens(
+            "how much does an hvac repair cost"
+        )
+        assert "how" in question_tokens("How long does a furnace last?")
+
+    def test_collapses_rewordings_and_reports_calls_avoided(self):
+        """Test that rewordings collapse into the first question."""
+        questions = [
+            "How much does HVAC repair cost?",
+            "How much does an HVAC repair cost",
+            "How much does it cost to repair an HVAC system?",
+            "How much does AC repair cost?",
+            "How long does HVAC repair take?",
+        ]
+
+        kept, report = collapse_questions(questions)
+
+        assert kept == [
+            "How much does HVAC repair cost?",
+            "How much does AC repair cost?",
+            "How long does HVAC repair take?",
+        ]
+        assert report.questions_in == 5
+        assert report.llm_calls_avoided == 2
+        assert (
+            report.duplicates["How much does an HVAC repair cost"]
+            == "How much does HVAC repair cost?"
+        )
+
+    def test_matches_brute_force_pairs(self):
+        """Test that the prefix index finds the same matches as comparing all pairs."""
+        rng = random.Random(3)
+        vocab = [f"w{i}" for i in range(40)]
+        questions = [" ".join(rng.sample(vocab, rng.randint(2, 8))) for _ in range(400)]
+        questions += [q + " " + rng.choice(vocab) for q in questions[:100]]
+
+        deduper = QuestionDeduper(0.7)
+        kept = []
+        for question in questions:
+            tokens = question_tokens(question)
+            expected = next(
+                (
+                    k
+                    for k in kept
+                    if len(tokens & question_tokens(k))
+                    / len(tokens | question_tokens(k))
+                    >= 0.7
+                ),
+                None,
+            )
+            found = deduper.match(question)
+            assert (found is None) == (expected is None)
+            if found is None:
+                kept.append(question)
+
+    def test_rejects_unsupported_threshold(self):
+        """Test that threshold must be in (0, 1]."""
+        with pytest.raises(ValueError):
+            QuestionDeduper(0)
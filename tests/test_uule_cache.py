@@ -0,0 +1,105 @@
+"""Unit tests for uule_cache module."""
+
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import faq_generator
+from uule_cache import UuleCache, geo_targets_from_configs, normalize_geo_target
+
+
+class TestUuleCache:
+    """Test suite for the persistent uule cache."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "uule.sqlite3")
+        self.cache = UuleCache(self.path)
+
+    def teardown_method(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_normalize_geo_target(self):
+        """Test that spacing and case variants share one key."""
+        assert normalize_geo_target("  Adrian ,MI ") == "adrian, mi"
+        assert normalize_geo_target("New  York, NY") == "new york, ny"
+
+    def test_resolves_once_then_hits(self):
+        """Test that the resolver is called only for the first lookup."""
+        fetch = MagicMock(return_value="w+CAIQICIabc")
+
+        assert self.cache.resolve("Adrian, MI", fetch) == "w+CAIQICIabc"
+        assert self.cache.resolve("adrian,  mi", fetch) == "w+CAIQICIabc"
+
+        fetch.assert_called_once_with("Adrian, MI")
+        assert self.cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    def test_failures_are_not_cached(self):
+        """Test that a None result is retried on the next lookup."""
+        fetch = MagicMock(side_effect=[None, "w+CAIQICIabc"])
+
+        assert self.cache.resolve("Adrian, MI", fetch) is None
+        assert self.cache.resolve("Adrian, MI", fetch) == "w+CAIQICIabc"
+
+    def test_persists_between_instances(self):
+        """Test that resolved codes survive reopening the file."""
+        self.cache.resolve("Adrian, MI", lambda target: "w+CAIQICIabc")
+
+        reopened = UuleCache(self.path)
+        try:
+            assert reopened.get("ADRIAN, MI") == "w+CAIQICIabc"
+        finally:
+            reopened.close()
+
+    def test_concurrent_misses_are_coalesced(self):
+        """Test that parallel lookups of one city make a single request."""
+        calls = []
+
+        def slow_fetch(target):
+            calls.append(target)
+            time.sleep(0.05)
+            return "w+CAIQICIabc"
+
+        threads = [
+            threading.Thread(target=self.cache.resolve, args=("Adrian, MI", slow_fetch))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+
+    def test_prewarm_from_client_configs(self):
+        """Test that pre-warming resolves each unique client city once."""
+        configs = [
+            {"city": "Adrian", "state": "MI"},
+            {"city": "adrian", "state": "mi"},
+            {"city": "Phoenix", "state": "AZ"},
+            {"name": "No city"},
+        ]
+        targets = geo_targets_from_configs(configs)
+        fetch = MagicMock(side_effect=lambda target: "uule:" + target)
+
+        assert targets == ["Adrian, MI", "Phoenix, AZ"]
+        assert self.cache.prewarm(targets, fetch) == 2
+        assert fetch.call_count == 2
+        assert self.cache.get("phoenix, az") == "uule:Phoenix, AZ"
+
+    def test_resolve_uule_uses_cache(self):
+        """Test that resolve_uule calls SerpAPI once for a city not in the table."""
+        with patch.object(
+            faq_generator, "default_uule_cache", return_value=self.cache
+        ), patch.object(faq_generator, "_get_serp_session") as mock_session:
+            mock_session.return_value.get.return_value.json.return_value = [
+                {"uule": "w+CAIQICIabc"}
+            ]
+            assert faq_generator.resolve_uule("Mossyrock, WA") == "w+CAIQICIabc"
+            assert faq_generator.resolve_uule("Mossyrock, WA") == "w+CAIQICIabc"
+
+        assert mock_session.return_value.get.call_count == 1
+        assert "timeout" in mock_session.return_value.get.call_args.kwargs
@@ -0,0 +1,124 @@
+"""Unit tests for uule_encoder module."""
+
+import base64
+import os
+import string
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+import faq_generator
+from uule_encoder import GeoTargetIndex, default_index, encode_uule, offline_uule
+
+# uule values returned by serpapi.com/locations.json
+SERPAPI_UULES = {
+    "Austin,Texas,United States": "w+CAIQICIaQXVzdGluLFRleGFzLFVuaXRlZCBTdGF0ZXM=",
+    "New York,New York,United States": (
+        "w+CAIQICIfTmV3IFlvcmssTmV3IFlvcmssVW5pdGVkIFN0YXRlcw=="
+    ),
+}
+
+
+class TestEncodeUule:
+    """Test suite for the offline uule encoder."""
+
+    @pytest.mark.parametrize("name,expected", sorted(SERPAPI_UULES.items()))
+    def test_matches_serpapi(self, name, expected):
+        """Test that encoded values equal SerpAPI's."""
+        assert encode_uule(name) == expected
+
+    def test_matches_key_table_form_for_short_names(self):
+        """Test equivalence with the key-character formulation."""
+        key = string.ascii_uppercase + string.ascii_lowercase + string.digits + "-_"
+        name = "Adrian,Michigan,United States"
+        expected = (
+            "w+CAIQICI" + key[len(name)] + base64.b64encode(name.encode()).decode()
+        )
+        assert encode_uule(name) == expected
+
+    def test_long_names_use_varint_length(self):
+        """Test that names of 128+ bytes get a two-byte length prefix."""
+        name = "X" * 200
+        raw = base64.b64decode(encode_uule(name)[2:])
+        assert raw[5:7] == bytes([0xC8, 0x01])
+        assert raw[7:] == name.encode()
+
+
+class TestGeoTargetIndex:
+    """Test suite for canonical-name lookup."""
+
+    def test_bundled_table_lookups(self):
+        """Test abbreviation, full-state and canonical spellings."""
+        index = default_index()
+
+        assert index.canonical_name("Austin, TX") == "Austin,Texas,United States"
+        assert index.canonical_name("austin,  texas") == "Austin,Texas,United States"
+        assert index.canonical_name("Portland, OR") == "Portland,Oregon,United States"
+        assert index.canonical_name("Nowhere, ZZ") is None
+
+    def test_prefix_completion(self):
+        """Test that complete() returns names sharing a key prefix."""
+        names = default_index().complete("san ")
+        assert "San Diego,California,United States" in names
+        assert all(name.startswith("San") for name in names)
+
+    def test_loads_google_csv_format(self):
+        """Test that Google's full export format is accepted and filtered."""
+        csv_text = (
+            "Criteria ID,Name,Canonical Name,Parent ID,Country Code,"
+            "Target Type,Status\n"
+            '1,Adrian,"Adrian,Michigan,United States",2,US,City,Active\n'
+            '3,Oldtown,"Oldtown,Michigan,United States",2,US,City,Removed\n'
+            '4,49221,"49221,Michigan,United States",2,US,Postal Code,Active\n'
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "geotargets.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(csv_text)
+            index = GeoTargetIndex.load(path)
+
+        assert index.canonical_name("Adrian, MI") == "Adrian,Michigan,United States"
+        assert index.canonical_name("Oldtown, MI") is None
+        assert index.canonical_name("49221, MI") is None
+
+    def test_ambiguous_key_returns_none(self):
+        """Test that a key shared by two locations is not guessed."""
+        index = GeoTargetIndex([("springfield", "A"), ("springfield", "B")])
+        assert index.canonical_name("Springfield") is None
+
+
+class TestOfflineResolve:
+    """Test suite for offline geo-targeting in the FAQ generator."""
+
+    def test_offline_uule(self):
+        """Test the bundled-table shortcut."""
+        assert offline_uule("Austin, TX") == SERPAPI_UULES["Austin,Texas,United States"]
+
+    def test_resolve_uule_makes_no_network_call(self):
+        """Test that bundled locations never reach SerpAPI or the cache."""
+        with patch.object(
+            faq_generator, "_get_serp_session"
+        ) as mock_session, patch.object(
+            faq_generator, "default_uule_cache"
+        ) as mock_cache:
+            uule = faq_generator.resolve_uule("New York, NY")
+
+        assert uule == SERPAPI_UULES["New York,New York,United States"]
+        mock_session.assert_not_called()
+        mock_cache.assert_not_called()
+
+    def test_prewarm_counts_offline_misses(self, capsys):
+        """Test that towns missing from the bundled table are reported."""
+        configs = [
+            {"city": "Austin", "state": "TX"},
+            {"city": "Blissfield", "state": "MI"},
+        ]
+        with patch.object(faq_generator, "default_uule_cache") as mock_cache:
+            mock_cache.return_value.prewarm.return_value = 1
+            assert faq_generator.prewarm_uule_cache(configs) == 2
+
+        mock_cache.return_value.prewarm.assert_called_once_with(
+            ["Blissfield, MI"], faq_generator.fetch_uule
+        )
+        assert "(1 not in the bundled geotargets table)" in capsys.readouterr().out
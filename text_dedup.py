@@ -0,0 +1,436 @@
+r"""
+Module/Script Name: text_dedup.py
+Path: E:\projects\Project Tracking\text_dedup.py
+
+Description:
+Near-duplicate text block removal for scraped client sites. Fingerprints each
+block with a 64-bit SimHash over its word shingles, finds near-duplicates
+through banded lookup tables in near-linear time, and drops repeated CTA,
+testimonial and service-area blocks before they are sent to GPT-4. Also
+collapses near-duplicate PAA questions by token-set similarity so each
+distinct question is answered once.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.01
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.01 - Added token-set near-duplicate question collapsing
+* v1.00 - Initial release with shingled SimHash block deduplication
+"""
+
+import hashlib
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+# Words per shingle. Single words keep SimHash distances small for the
+# one- or two-word edits typical of repeated site blocks.
+SHINGLE_SIZE = 1
+
+# Blocks whose SimHashes differ in at most this many bits are duplicates
+DEFAULT_MAX_DISTANCE = 7
+
+# Blocks with fewer words are only removed on an exact (normalized) match;
+# SimHash is too coarse to tell "AC Repair" from "AC Repair Services".
+MIN_SIMHASH_WORDS = 6
+
+# SimHash is split into this many bands for candidate lookup. Two hashes
+# within DEFAULT_MAX_DISTANCE bits must agree exactly on at least one band
+# (pigeonhole), so only blocks sharing a band are ever compared.
+_BANDS = 8
+_BAND_BITS = 64 // _BANDS
+
+_WORD_RE = re.compile(r"\w+")
+
+# Questions whose normalized token sets have at least this Jaccard
+# similarity are treated as the same question
+DEFAULT_QUESTION_SIMILARITY = 0.8
+
+# Words that do not change what a question asks. Question words (how, what,
+# why, when, much, long) are kept: they separate "cost" from "duration".
+QUESTION_STOPWORDS = frozenset(
+    "a an the is are was were be been being do does did i me my mine you "
+    "your we our us it its they their them he she his her of to in on for "
+    "with at by from about into and or if so that this these those there "
+    "can could should would will shall may might must get got".split()
+)
+
+
+@dataclass
+class DedupReport:
+    """Summary of a deduplication pass.
+
+    Attributes:
+        blocks_in: Number of blocks examined.
+        blocks_removed: Number of near-duplicate blocks dropped.
+        tokens_in: Estimated prompt tokens before deduplication.
+        tokens_saved: Estimated prompt tokens removed.
+    """
+
+    blocks_in: int = 0
+    blocks_removed: int = 0
+    tokens_in: int = 0
+    tokens_saved: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate GPT token count for English text (about 4 characters each).
+
+    Args:
+        text: Text to measure.
+
+    Returns:
+        Estimated token count.
+    """
+    return (len(text) + 3) // 4
+
+
+def _hash64(value: str) -> int:
+    """Return a stable 64-bit hash of a string."""
+    return int.from_bytes(
+        hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    """Split text into overlapping lowercase word n-grams.
+
+    Args:
+        text: Text block.
+        size: Words per shingle. Defaults to 1.
+
+    Returns:
+        List of shingles. Blocks shorter than ``size`` words yield one
+        shingle holding every word.
+
+    Example:
+        >>> shingles("Call us today for service", size=3)
+        ['call us today', 'us today for', 'today for service']
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i : i + size]) for i in range(len(words) - size + 1)]
+
+
+def simhash(text: str) -> int:
+    """Compute a 64-bit SimHash over a block's word shingles.
+
+    Similar blocks produce hashes that differ in only a few bits.
+
+    Args:
+        text: Text block.
+
+    Returns:
+        64-bit SimHash fingerprint.
+    """
+    hashes = [format(_hash64(s), "064b") for s in shingles(text)]
+    if not hashes:
+        return 0
+    # Column-wise bit counts; zip/count keep the per-bit work in C
+    half = len(hashes) / 2
+    fingerprint = 0
+    for position, column in enumerate(zip(*hashes)):
+        if column.count("1") > half:
+            fingerprint |= 1 << (63 - position)
+    return fingerprint
+
+
+def normalize_block(text: str) -> str:
+    """Lowercase a block and collapse it to its words for exact matching.
+
+    Args:
+        text: Text block.
+
+    Returns:
+        Space-joined lowercase words.
+    """
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def _bands(fingerprint: int) -> List[Tuple[int, int]]:
+    """Split a fingerprint into (band index, band value) lookup keys."""
+    mask = (1 << _BAND_BITS) - 1
+    return [(i, (fingerprint >> (i * _BAND_BITS)) & mask) for i in range(_BANDS)]
+
+
+class BlockDeduper:
+    """Incremental near-duplicate filter over a stream of text blocks.
+
+    Blocks are fed page by page; each block is kept unless an earlier kept
+    block is an exact (normalized) match or within ``max_distance`` SimHash
+    bits. Only kept blocks that share a hash band are compared, so the total
+    work stays near-linear in the number of blocks.
+
+    Attributes:
+        max_distance: Maximum Hamming distance treated as duplicate.
+        report: Running DedupReport for every block seen so far.
+    """
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE) -> None:
+        """Initialize an empty deduper.
+
+        Args:
+            max_distance: Maximum Hamming distance treated as duplicate. Must
+                be below the band count (8) for the band lookup to be exact.
+                Defaults to 7.
+
+        Raises:
+            ValueError: If max_distance is not in the supported range.
+        """
+        if not 0 <= max_distance < _BANDS:
+            raise ValueError(f"max_distance must be between 0 and {_BANDS - 1}")
+        self.max_distance = max_distance
+        self.report = DedupReport()
+        self._exact: Set[str] = set()
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+
+    def is_duplicate(self, block: str) -> bool:
+        """Check a block against every kept block and keep it if new.
+
+        Args:
+            block: Text block.
+
+        Returns:
+            True if the block is a near-duplicate and should be dropped.
+        """
+        tokens = estimate_tokens(block)
+        self.report.blocks_in += 1
+        self.report.tokens_in += tokens
+
+        key = normalize_block(block)
+        duplicate = key in self._exact
+        fingerprint = None
+        if not duplicate and key.count(" ") + 1 >= MIN_SIMHASH_WORDS:
+            fingerprint = simhash(block)
+            duplicate = any(
+                bin(fingerprint ^ other).count("1") <= self.max_distance
+                for band in _bands(fingerprint)
+                for other in self._buckets.get(band, ())
+            )
+        if duplicate:
+            self.report.blocks_removed += 1
+            self.report.tokens_saved += tokens
+            return True
+
+        self._exact.add(key)
+        if fingerprint is not None:
+            for band in _bands(fingerprint):
+                self._buckets.setdefault(band, []).append(fingerprint)
+        return False
+
+    def filter(self, blocks: List[str]) -> List[str]:
+        """Return the blocks of one page that are not near-duplicates.
+
+        Args:
+            blocks: Text blocks of a page, in order.
+
+        Returns:
+            Blocks that were kept.
+        """
+        return [block for block in blocks if not self.is_duplicate(block)]
+
+
+def dedupe_pages(
+    pages: List[List[str]], max_distance: int = DEFAULT_MAX_DISTANCE
+) -> Tuple[List[List[str]], DedupReport]:
+    """Drop near-duplicate text blocks across a client's pages.
+
+    The first occurrence of each block is kept; later blocks that match it
+    exactly or are within ``max_distance`` SimHash bits are removed. See
+    BlockDeduper for the streaming form.
+
+    Args:
+        pages: One list of text blocks per page, in priority order.
+        max_distance: Maximum Hamming distance treated as duplicate.
+            Defaults to 7.
+
+    Returns:
+        Tuple of (pages with duplicates removed, DedupReport).
+
+    Raises:
+        ValueError: If max_distance is not in the supported range.
+
+    Example:
+        >>> pages = [["Call today for a free estimate!", "AC repair"],
+        ...          ["Call today for a free estimate", "Furnace repair"]]
+        >>> kept, report = dedupe_pages(pages)
+        >>> kept
+        [['Call today for a free estimate!', 'AC repair'], ['Furnace repair']]
+    """
+    deduper = BlockDeduper(max_distance)
+    kept = [deduper.filter(blocks) for blocks in pages]
+    return kept, deduper.report
+
+
+@dataclass
+class QuestionDedupReport:
+    """Summary of a question-collapsing pass.
+
+    Attributes:
+        questions_in: Number of questions examined.
+        questions_collapsed: Number of questions dropped as duplicates.
+        duplicates: Collapsed question text mapped to the kept question it
+            duplicates.
+    """
+
+    questions_in: int = 0
+    questions_collapsed: int = 0
+    duplicates: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def llm_calls_avoided(self) -> int:
+        """Answers no longer generated (one per collapsed question)."""
+        return self.questions_collapsed
+
+
+def question_tokens(question: str) -> FrozenSet[str]:
+    """Normalize a question to its set of meaningful words.
+
+    Casefolds, drops punctuation and QUESTION_STOPWORDS, and strips a
+    plural "s" from longer words so "costs" and "cost" match.
+
+    Args:
+        question: Question text.
+
+    Returns:
+        Frozen set of normalized words.
+
+    Example:
+        >>> sorted(question_tokens("How much does an HVAC repair cost?"))
+        ['cost', 'how', 'hvac', 'much', 'repair']
+    """
+    tokens = set()
+    for word in _WORD_RE.findall(question.casefold()):
+        if word in QUESTION_STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.add(word)
+    return frozenset(tokens)
+
+
+def _prefix(tokens: FrozenSet[str], threshold: float) -> List[str]:
+    """Return the tokens that must be shared by any set this similar.
+
+    Two sets with Jaccard >= threshold overlap in at least
+    ceil(threshold * size) tokens, so under one global token order they
+    share a token within the first size - ceil(threshold * size) + 1.
+    """
+    ordered = sorted(tokens, key=lambda token: (_hash64(token), token))
+    return ordered[: len(ordered) - math.ceil(threshold * len(ordered)) + 1]
+
+
+class QuestionDeduper:
+    """Incremental near-duplicate filter over a stream of questions.
+
+    A question is collapsed into the first kept question whose token set
+    has Jaccard similarity >= ``threshold``. Kept questions are indexed by
+    their prefix tokens only, so a new question is compared with the few
+    kept questions it could possibly match rather than all of them.
+
+    Attributes:
+        threshold: Minimum Jaccard similarity treated as duplicate.
+        report: Running QuestionDedupReport for every question seen.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_QUESTION_SIMILARITY) -> None:
+        """Initialize an empty deduper.
+
+        Args:
+            threshold: Jaccard similarity in (0, 1]. Defaults to 0.8.
+
+        Raises:
+            ValueError: If threshold is not in (0, 1].
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.report = QuestionDedupReport()
+        self._kept: List[Tuple[str, FrozenSet[str]]] = []
+        self._exact: Dict[str, str] = {}
+        self._index: Dict[str, List[int]] = {}
+
+    def match(self, question: str) -> Optional[str]:
+        """Check a question against the kept ones and keep it if new.
+
+        Args:
+            question: Question text.
+
+        Returns:
+            The kept question it duplicates, or None if it was kept.
+        """
+        self.report.questions_in += 1
+        tokens = question_tokens(question)
+        key = " ".join(sorted(tokens)) if tokens else normalize_block(question)
+        original = self._exact.get(key)
+        if original is None and tokens:
+            prefix = _prefix(tokens, self.threshold)
+            low, high = self.threshold * len(tokens), len(tokens) / self.threshold
+            checked: Set[int] = set()
+            for token in prefix:
+                for i in self._index.get(token, ()):
+                    if i in checked:
+                        continue
+                    checked.add(i)
+                    kept, other = self._kept[i]
+                    if not low <= len(other) <= high:
+                        continue
+                    overlap = len(tokens & other)
+                    if overlap / (len(tokens) + len(other) - overlap) >= self.threshold:
+                        original = kept
+                        break
+                if original is not None:
+                    break
+        if original is not None:
+            self.report.questions_collapsed += 1
+            self.report.duplicates[question] = original
+            return original
+
+        self._exact[key] = question
+        if tokens:
+            for token in _prefix(tokens, self.threshold):
+                self._index.setdefault(token, []).append(len(self._kept))
+            self._kept.append((question, tokens))
+        return None
+
+
+def collapse_questions(
+    questions: List[str], threshold: float = DEFAULT_QUESTION_SIMILARITY
+) -> Tuple[List[str], QuestionDedupReport]:
+    """Drop questions that are near-duplicates of an earlier question.
+
+    Args:
+        questions: Questions in priority order (first occurrence is kept).
+        threshold: Jaccard similarity treated as duplicate. Defaults to 0.8.
+
+    Returns:
+        Tuple of (kept questions, QuestionDedupReport).
+
+    Raises:
+        ValueError: If threshold is not in (0, 1].
+
+    Example:
+        >>> kept, report = collapse_questions([
+        ...     "How much does HVAC repair cost?",
+        ...     "How much does an HVAC repair cost",
+        ...     "How much does AC repair cost?"])
+        >>> kept, report.llm_calls_avoided
+        (['How much does HVAC repair cost?', 'How much does AC repair cost?'], 1)
+    """
+    deduper = QuestionDeduper(threshold)
+    kept = [question for question in questions if deduper.match(question) is None]
+    return kept, deduper.report
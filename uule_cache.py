@@ -0,0 +1,244 @@
+r"""
+Module/Script Name: uule_cache.py
+Path: E:\projects\Project Tracking\uule_cache.py
+
+Description:
+Persistent cache of resolved Google uule codes for the FAQ generator. A
+city's uule never changes, so each normalized "City, ST" geo target is
+resolved once, stored in a small SQLite file and served from memory on
+every later run. Concurrent misses for the same target share one lookup.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.00
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.00 - Initial release with in-memory index, coalesced misses and pre-warm
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+DEFAULT_UULE_CACHE_FILE = "uule_cache.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uule (
+    geo_target TEXT PRIMARY KEY,
+    uule TEXT NOT NULL,
+    resolved_at REAL NOT NULL
+)
+"""
+
+
+def normalize_geo_target(geo_target: str) -> str:
+    """Normalize a geo target so spelling variants share one cache entry.
+
+    Args:
+        geo_target: Location string such as "Phoenix,  AZ".
+
+    Returns:
+        Lowercase comma-separated parts with single spaces.
+
+    Example:
+        >>> normalize_geo_target("  Adrian ,MI ")
+        'adrian, mi'
+    """
+    parts = [" ".join(part.split()) for part in geo_target.split(",")]
+    return ", ".join(part for part in parts if part).lower()
+
+
+def geo_targets_from_configs(configs: Iterable[Dict[str, Any]]) -> List[str]:
+    """Collect the "City, ST" geo targets the FAQ generator will use.
+
+    Args:
+        configs: Client configuration dictionaries with city and state.
+
+    Returns:
+        Unique geo targets in first-seen order.
+    """
+    targets: List[str] = []
+    seen = set()
+    for config in configs:
+        city, state = config.get("city"), config.get("state")
+        if not city or not state:
+            continue
+        target = f"{city}, {state}"
+        key = normalize_geo_target(target)
+        if key not in seen:
+            seen.add(key)
+            targets.append(target)
+    return targets
+
+
+class UuleCache:
+    """SQLite-backed uule cache with an in-memory index.
+
+    Every stored entry is loaded into a dictionary when the cache opens, so
+    hits never touch the disk. Safe to share between threads.
+
+    Attributes:
+        path: Location of the SQLite cache file.
+        hits: Lookups answered from the cache.
+        misses: Lookups that had to call the resolver.
+    """
+
+    def __init__(self, path: str = DEFAULT_UULE_CACHE_FILE) -> None:
+        """Open (or create) the cache file and load it into memory.
+
+        Args:
+            path: SQLite file path. Defaults to uule_cache.sqlite3.
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._memory: Dict[str, str] = dict(
+            self._conn.execute("SELECT geo_target, uule FROM uule").fetchall()
+        )
+
+    def get(self, geo_target: str) -> Optional[str]:
+        """Return the cached uule for a geo target without resolving it.
+
+        Args:
+            geo_target: Location string (any spelling variant).
+
+        Returns:
+            Cached uule, or None if the target has not been resolved.
+        """
+        return self._memory.get(normalize_geo_target(geo_target))
+
+    def put(self, geo_target: str, uule: str) -> None:
+        """Store a resolved uule.
+
+        Args:
+            geo_target: Location string.
+            uule: Resolved uule code.
+        """
+        key = normalize_geo_target(geo_target)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO uule VALUES (?, ?, ?)",
+                (key, uule, time.time()),
+            )
+            self._conn.commit()
+            self._memory[key] = uule
+
+    def resolve(
+        self, geo_target: str, fetch: Callable[[str], Optional[str]]
+    ) -> Optional[str]:
+        """Return a geo target's uule, calling ``fetch`` only on a miss.
+
+        Concurrent misses for the same target wait for a single ``fetch``
+        call. Failed lookups (``fetch`` returning None) are not cached.
+
+        Args:
+            geo_target: Location string (e.g. "Adrian, MI").
+            fetch: Resolver called with the original geo target.
+
+        Returns:
+            uule code, or None if it could not be resolved.
+        """
+        key = normalize_geo_target(geo_target)
+        uule = self._memory.get(key)
+        if uule is not None:
+            self.hits += 1
+            return uule
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # Another thread (or another process writing the same file) may
+            # have resolved the target while we waited
+            uule = self._memory.get(key) or self._load(key)
+            if uule is not None:
+                self.hits += 1
+                return uule
+            self.misses += 1
+            uule = fetch(geo_target)
+            if uule:
+                self.put(geo_target, uule)
+            return uule
+
+    def _load(self, key: str) -> Optional[str]:
+        """Read one entry from disk into memory."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT uule FROM uule WHERE geo_target = ?", (key,)
+            ).fetchone()
+            if row:
+                self._memory[key] = row[0]
+        return row[0] if row else None
+
+    def prewarm(
+        self,
+        geo_targets: Iterable[str],
+        fetch: Callable[[str], Optional[str]],
+        max_workers: int = 4,
+    ) -> int:
+        """Resolve every uncached geo target ahead of the FAQ runs.
+
+        Args:
+            geo_targets: Location strings, e.g. from geo_targets_from_configs().
+            fetch: Resolver called for each uncached target.
+            max_workers: Parallel lookups. Defaults to 4.
+
+        Returns:
+            Number of targets that are now cached.
+        """
+        targets = list(geo_targets)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            results = list(executor.map(lambda t: self.resolve(t, fetch), targets))
+        return sum(1 for uule in results if uule)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and entry count.
+
+        Returns:
+            Dictionary with hits, misses and entries.
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._memory)}
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[UuleCache] = None
+_default_lock = threading.Lock()
+
+
+def default_uule_cache() -> UuleCache:
+    """Return the process-wide uule cache used by the FAQ generator.
+
+    Returns:
+        Lazily opened UuleCache at DEFAULT_UULE_CACHE_FILE.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = UuleCache()
+        return _default_cache
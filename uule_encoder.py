@@ -0,0 +1,276 @@
+r"""
+Module/Script Name: uule_encoder.py
+Path: E:\projects\Project Tracking\uule_encoder.py
+
+Description:
+Offline Google uule encoder. A uule is a fixed protobuf header plus the
+base64 of a Google Ads canonical location name ("Austin,Texas,United
+States"), so no SerpAPI round trip is needed once the canonical name is
+known. Canonical names come from a bundled geotargets table, indexed as a
+sorted key list for exact and prefix lookups. The bundled table only holds
+the 50 states and about 110 larger cities; most client towns are not in it
+and still resolve through the uule cache (one SerpAPI call per new town)
+until Google's full geotargets CSV is dropped in its place.
+
+Author(s):
+Rank Rocket Co (C) Copyright 2025 - All Rights Reserved
+
+Created Date:
+2026-10-18
+
+Last Modified Date:
+2026-10-18
+
+Version:
+v1.01
+
+License:
+CC BY-SA 4.0 - https://creativecommons.org/licenses/by-sa/4.0/
+
+Comments:
+* v1.01 - Documented the bundled table's coverage limit
+* v1.00 - Initial release with protobuf encoder and bundled US table
+"""
+
+import base64
+import csv
+import os
+import threading
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+
+from uule_cache import normalize_geo_target
+
+# Bundled subset of Google's geotargets CSV (Name, Canonical Name, Country
+# Code, Target Type): states and larger cities only, so small towns miss.
+# The full table from the Google Ads API docs uses the same column names
+# and can replace it as-is.
+DEFAULT_GEOTARGETS_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "geotargets_us.csv"
+)
+
+# Protobuf fields 1=2 (role), 2=32 (producer), then field 4 (canonical name)
+_UULE_HEADER = b"\x08\x02\x10\x20\x22"
+
+US_STATE_ABBREVIATIONS = {
+    "AL": "Alabama",
+    "AK": "Alaska",
+    "AZ": "Arizona",
+    "AR": "Arkansas",
+    "CA": "California",
+    "CO": "Colorado",
+    "CT": "Connecticut",
+    "DE": "Delaware",
+    "DC": "District of Columbia",
+    "FL": "Florida",
+    "GA": "Georgia",
+    "HI": "Hawaii",
+    "ID": "Idaho",
+    "IL": "Illinois",
+    "IN": "Indiana",
+    "IA": "Iowa",
+    "KS": "Kansas",
+    "KY": "Kentucky",
+    "LA": "Louisiana",
+    "ME": "Maine",
+    "MD": "Maryland",
+    "MA": "Massachusetts",
+    "MI": "Michigan",
+    "MN": "Minnesota",
+    "MS": "Mississippi",
+    "MO": "Missouri",
+    "MT": "Montana",
+    "NE": "Nebraska",
+    "NV": "Nevada",
+    "NH": "New Hampshire",
+    "NJ": "New Jersey",
+    "NM": "New Mexico",
+    "NY": "New York",
+    "NC": "North Carolina",
+    "ND": "North Dakota",
+    "OH": "Ohio",
+    "OK": "Oklahoma",
+    "OR": "Oregon",
+    "PA": "Pennsylvania",
+    "RI": "Rhode Island",
+    "SC": "South Carolina",
+    "SD": "South Dakota",
+    "TN": "Tennessee",
+    "TX": "Texas",
+    "UT": "Utah",
+    "VT": "Vermont",
+    "VA": "Virginia",
+    "WA": "Washington",
+    "WV": "West Virginia",
+    "WI": "Wisconsin",
+    "WY": "Wyoming",
+}
+_STATE_TO_ABBREVIATION = {
+    name.lower(): abbr.lower() for abbr, name in US_STATE_ABBREVIATIONS.items()
+}
+
+
+def _varint(value: int) -> bytes:
+    """Encode a non-negative integer as a protobuf varint."""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def encode_uule(canonical_name: str) -> str:
+    """Build a uule string from a Google canonical location name.
+
+    For names under 64 bytes this equals the widely used
+    ``"w+CAIQICI" + key[len(name)] + base64(name)`` form.
+
+    Args:
+        canonical_name: Canonical name, e.g. "Austin,Texas,United States".
+
+    Returns:
+        uule code accepted by Google and SerpAPI.
+
+    Example:
+        >>> encode_uule("Austin,Texas,United States")
+        'w+CAIQICIaQXVzdGluLFRleGFzLFVuaXRlZCBTdGF0ZXM='
+    """
+    name = canonical_name.encode("utf-8")
+    message = _UULE_HEADER + _varint(len(name)) + name
+    return "w+" + base64.b64encode(message).decode("ascii")
+
+
+def _keys_for(canonical_name: str) -> List[str]:
+    """Return the normalized geo-target keys a canonical name answers to."""
+    parts = [part.strip() for part in canonical_name.split(",")]
+    keys = [normalize_geo_target(canonical_name)]
+    if len(parts) == 3 and parts[2] == "United States":
+        city, state = parts[0], parts[1]
+        keys.append(normalize_geo_target(f"{city}, {state}"))
+        abbr = _STATE_TO_ABBREVIATION.get(state.lower())
+        if abbr:
+            keys.append(normalize_geo_target(f"{city}, {abbr}"))
+    return keys
+
+
+class GeoTargetIndex:
+    """Sorted (key, canonical name) index over a geotargets table.
+
+    Keys are normalized geo targets ("adrian, mi", "adrian, michigan",
+    "adrian, michigan, united states"). Two parallel sorted lists keep the
+    index compact; exact and prefix lookups are binary searches.
+    """
+
+    def __init__(self, entries: List[Tuple[str, str]]) -> None:
+        """Build the index.
+
+        Args:
+            entries: (normalized key, canonical name) pairs, in any order.
+        """
+        entries = sorted(set(entries))
+        self._keys = [key for key, _ in entries]
+        self._names = [name for _, name in entries]
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_GEOTARGETS_FILE) -> "GeoTargetIndex":
+        """Load an index from a geotargets CSV file.
+
+        Only active City and State rows are indexed; rows with Status
+        "Removed" (present in Google's full export) are skipped.
+
+        Args:
+            path: CSV with "Canonical Name" and "Target Type" columns.
+
+        Returns:
+            GeoTargetIndex over the file.
+        """
+        entries: List[Tuple[str, str]] = []
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                if row.get("Status", "Active") != "Active":
+                    continue
+                if row.get("Target Type") not in ("City", "State"):
+                    continue
+                name = row["Canonical Name"]
+                entries.extend((key, name) for key in _keys_for(name))
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def canonical_name(self, geo_target: str) -> Optional[str]:
+        """Return the canonical name for a geo target such as "Adrian, MI".
+
+        Args:
+            geo_target: City/state string in any case or spacing.
+
+        Returns:
+            Canonical name, or None if the target is not in the table (or
+            matches more than one location).
+        """
+        key = normalize_geo_target(geo_target)
+        i = bisect_left(self._keys, key)
+        matches = set()
+        while i < len(self._keys) and self._keys[i] == key:
+            matches.add(self._names[i])
+            i += 1
+        return matches.pop() if len(matches) == 1 else None
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Return canonical names whose geo-target key starts with a prefix.
+
+        Args:
+            prefix: Start of a geo target, e.g. "san ".
+            limit: Maximum names to return. Defaults to 10.
+
+        Returns:
+            Matching canonical names in key order, without duplicates.
+        """
+        key = normalize_geo_target(prefix)
+        names: List[str] = []
+        i = bisect_left(self._keys, key)
+        while i < len(self._keys) and self._keys[i].startswith(key):
+            if self._names[i] not in names:
+                names.append(self._names[i])
+                if len(names) >= limit:
+                    break
+            i += 1
+        return names
+
+
+_default_index: Optional[GeoTargetIndex] = None
+_default_lock = threading.Lock()
+
+
+def default_index() -> GeoTargetIndex:
+    """Return the bundled geotargets index, loading it on first use.
+
+    Returns:
+        GeoTargetIndex over DEFAULT_GEOTARGETS_FILE.
+    """
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = GeoTargetIndex.load()
+        return _default_index
+
+
+def offline_uule(geo_target: str) -> Optional[str]:
+    """Encode a geo target's uule locally, without any network call.
+
+    Args:
+        geo_target: Location string (e.g., "Adrian, MI").
+
+    Returns:
+        uule code, or None if the target is not in the bundled table.
+
+    Example:
+        >>> offline_uule("Austin, TX")
+        'w+CAIQICIaQXVzdGluLFRleGFzLFVuaXRlZCBTdGF0ZXM='
+    """
+    name = default_index().canonical_name(geo_target)
+    return encode_uule(name) if name else None